@@ -38,6 +38,26 @@ int config_init(void);
  */
 int config_load_from_file(const char* path);
 
+/** 重新加载配置时发生变化的配置项，见config_reload */
+#define CONFIG_CHANGED_LANGUAGE   0x01u
+#define CONFIG_CHANGED_LOG_LEVEL  0x02u
+#define CONFIG_CHANGED_LOG_FILE   0x04u
+#define CONFIG_CHANGED_MAX_SIZE   0x08u
+#define CONFIG_CHANGED_CONSOLE    0x10u
+
+/**
+ * @brief 重新加载配置文件并与当前配置比较
+ *
+ * 新配置解析完成后才替换当前配置，文件无法读取或解析失败时当前配置保持不变。
+ * 与config_load_from_file相同，文件中没有的配置项使用默认值。
+ * 调用方根据changed把变化的配置项应用到运行中的日志系统（如log_set_level、log_swap_file）
+ *
+ * @param path 配置文件路径，NULL表示上次加载的文件
+ * @param changed 输出发生变化的配置项（CONFIG_CHANGED_*的组合），可为NULL
+ * @return 0 表示成功，非零表示失败
+ */
+int config_reload(const char* path, unsigned int* changed);
+
 /**
  * @brief 获取日志级别配置
  * @return 日志级别字符串
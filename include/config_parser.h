@@ -0,0 +1,133 @@
+/**
+ * @file config_parser.h
+ * @brief Logloom 配置文件解析器
+ *
+ * 解析配置文件使用的YAML子集，生成带类型的节点树，C配置系统和Python绑定共用：
+ * - 块映射（key: value）和块序列（- item），按缩进嵌套，序列项中可以是映射
+ * - 流式序列 [a, b] 和流式映射 {a: 1}，可以跨行
+ * - 双引号字符串（支持转义）、单引号字符串、纯量
+ * - 注释、文档标记（---、...）
+ *
+ * 纯量按YAML 1.1规则解析为null、布尔、整数、浮点数或字符串，与PyYAML的safe_load一致，
+ * 但时间戳保留为字符串。跨行的纯量和引号字符串按YAML规则折叠。
+ * 不支持锚点、别名、标签和块纯量（| 和 >），遇到时报告错误而不是静默解析。
+ * 同一映射中的重复键视为错误。
+ */
+
+#ifndef LOGLOOM_CONFIG_PARSER_H
+#define LOGLOOM_CONFIG_PARSER_H
+
+#include <stddef.h>
+#include <stdbool.h>
+
+/**
+ * @brief 配置节点类型
+ */
+typedef enum {
+    CONFIG_NODE_NULL = 0,    /* 空值（~、null或省略的值） */
+    CONFIG_NODE_BOOL,        /* 布尔值 */
+    CONFIG_NODE_INT,         /* 整数 */
+    CONFIG_NODE_FLOAT,       /* 浮点数 */
+    CONFIG_NODE_STRING,      /* 字符串 */
+    CONFIG_NODE_SEQUENCE,    /* 序列 */
+    CONFIG_NODE_MAPPING      /* 映射 */
+} config_node_type_t;
+
+/**
+ * @brief 配置节点
+ *
+ * 序列和映射的子节点按文件中的顺序由child/next串联；
+ * 映射的子节点通过key记录键名。节点和字符串与所属文档一起释放
+ */
+typedef struct config_node {
+    config_node_type_t type;     /* 节点类型 */
+    const char* key;             /* 映射成员的键，其他节点为NULL */
+    const char* text;            /* 纯量的文本（字符串已去除引号并处理转义） */
+    long long int_value;         /* 整数值（CONFIG_NODE_INT） */
+    double float_value;          /* 浮点数值（CONFIG_NODE_FLOAT） */
+    bool bool_value;             /* 布尔值（CONFIG_NODE_BOOL） */
+    size_t count;                /* 子节点数量（序列和映射） */
+    struct config_node* child;   /* 第一个子节点 */
+    struct config_node* next;    /* 下一个兄弟节点 */
+} config_node_t;
+
+/** 解析后的配置文档 */
+typedef struct config_document config_document_t;
+
+/**
+ * @brief 解析配置文本
+ * @param text 配置文本
+ * @param length 文本长度
+ * @param error 解析失败时写入错误信息（包含行号），可为NULL
+ * @param error_size error缓冲区大小
+ * @return 配置文档，失败返回NULL。使用config_document_free释放
+ */
+config_document_t* config_parse_string(const char* text, size_t length, char* error, size_t error_size);
+
+/**
+ * @brief 释放配置文档
+ * @param doc 配置文档
+ */
+void config_document_free(config_document_t* doc);
+
+/**
+ * @brief 获取文档的根节点
+ * @param doc 配置文档
+ * @return 根节点，空文档的根节点类型为CONFIG_NODE_NULL
+ */
+const config_node_t* config_document_root(const config_document_t* doc);
+
+/**
+ * @brief 加载并解析配置文件（进程级缓存）
+ *
+ * 同一文件在内容未变化时（inode、大小和修改时间都相同）只解析一次，
+ * C配置系统和Python绑定共用解析结果。文件变化后重新解析，
+ * 旧文档保留到config_clear_documents，之前返回的指针保持有效
+ *
+ * @param path 配置文件路径
+ * @param error 失败时写入错误信息，可为NULL
+ * @param error_size error缓冲区大小
+ * @return 配置文档（调用方不得释放），失败返回NULL
+ */
+const config_document_t* config_load_document(const char* path, char* error, size_t error_size);
+
+/**
+ * @brief 释放所有缓存的配置文档
+ */
+void config_clear_documents(void);
+
+/**
+ * @brief 获取映射中指定键的子节点
+ * @param node 映射节点
+ * @param key 键名
+ * @return 子节点，node不是映射或键不存在时返回NULL
+ */
+const config_node_t* config_node_child(const config_node_t* node, const char* key);
+
+/**
+ * @brief 按点分隔的路径查找节点，如"logloom.log.level"
+ * @param node 起始节点
+ * @param path 路径
+ * @return 节点，路径不存在时返回NULL
+ */
+const config_node_t* config_node_get(const config_node_t* node, const char* path);
+
+/**
+ * @brief 按路径读取字符串，任何纯量都返回其文本
+ * @return 字符串，路径不存在、值为null或不是纯量时返回default_value
+ */
+const char* config_node_get_string(const config_node_t* node, const char* path, const char* default_value);
+
+/**
+ * @brief 按路径读取整数
+ * @return 整数，路径不存在或值不是整数时返回default_value
+ */
+long long config_node_get_int(const config_node_t* node, const char* path, long long default_value);
+
+/**
+ * @brief 按路径读取布尔值，整数0和1也视为布尔值
+ * @return 布尔值，路径不存在或值不是布尔值时返回default_value
+ */
+bool config_node_get_bool(const config_node_t* node, const char* path, bool default_value);
+
+#endif /* LOGLOOM_CONFIG_PARSER_H */
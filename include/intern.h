@@ -0,0 +1,45 @@
+#ifndef LOGLOOM_INTERN_H
+#define LOGLOOM_INTERN_H
+
+#include <stddef.h>
+#include <stdint.h>
+
+/**
+ * 全局字符串驻留表
+ *
+ * 模块名称和语言键在首次使用时映射为小整数ID（从1开始，0表示未驻留），
+ * 每个字符串只保存一份，在进程生命周期内保持有效。日志条目、过滤器和
+ * 记录缓冲区之间传递ID，热路径上比较整数而不是字符串。
+ */
+
+// 可驻留的字符串数量上限
+#define INTERN_MAX_IDS 65536
+
+/**
+ * 驻留字符串
+ * @param str 字符串
+ * @return 字符串的ID，str为NULL、内存不足或驻留表已满时返回0
+ */
+uint32_t intern_string(const char* str);
+
+/**
+ * 查找已驻留字符串的ID，不驻留新字符串
+ * @param str 字符串
+ * @return 字符串的ID，未驻留时返回0
+ */
+uint32_t intern_lookup(const char* str);
+
+/**
+ * 获取ID对应的驻留字符串
+ * @param id 字符串ID
+ * @return 驻留的字符串，ID无效时返回NULL
+ */
+const char* intern_get_string(uint32_t id);
+
+/**
+ * 获取已驻留的字符串数量
+ * @return 字符串数量
+ */
+size_t intern_get_count(void);
+
+#endif // LOGLOOM_INTERN_H
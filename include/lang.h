@@ -26,6 +26,14 @@ int lang_init(const char* default_lang);
  */
 bool lang_set_language(const char* lang_code);
 
+/**
+ * 设置当前线程的语言，不影响全局语言和其他线程
+ * 设置后本线程的lang_get/lang_getf/lang_get_current使用该语言
+ * @param lang_code 语言代码，NULL或空字符串表示恢复使用全局语言
+ * @return 成功返回true，语言不可用时返回false
+ */
+bool lang_set_thread_language(const char* lang_code);
+
 /**
  * 获取不带格式化的文本
  * @param key 语言键，如 "system.start_message"
@@ -33,6 +41,14 @@ bool lang_set_language(const char* lang_code);
  */
 const char* lang_get(const char* key);
 
+/**
+ * 在指定语言中获取不带格式化的文本，不切换全局语言或线程语言
+ * @param lang_code 语言代码，NULL时等同于lang_get，语言不可用时使用当前语言
+ * @param key 语言键
+ * @return 对应的语言文本，如果未找到则返回NULL
+ */
+const char* lang_get_in(const char* lang_code, const char* key);
+
 /**
  * 获取格式化后的文本，类似printf
  * @param key 语言键
@@ -54,7 +70,9 @@ void lang_cleanup();
 
 /**
  * 注册额外的语言资源文件
- * @param file_path YAML语言资源文件的路径
+ * 如果存在与源文件一致的编译缓存（同目录下的.llc文件或用户缓存目录中的缓存），
+ * 则直接映射缓存而不解析YAML；也可以直接传入.llc文件
+ * @param file_path YAML语言资源文件或编译缓存文件的路径
  * @param lang_code 语言代码，如"en", "zh"，如果为NULL，则从文件名推断
  * @return 成功返回true，失败返回false
  */
@@ -97,4 +115,51 @@ char** lang_get_supported_languages(int* count);
  */
 char** lang_get_language_keys(const char* lang_code, int* count);
 
+/**
+ * 热加载统计
+ */
+typedef struct {
+    unsigned long reload_count;   // 成功重建语言表的次数
+    unsigned long failure_count;  // 重建失败的次数
+    unsigned long keys_added;     // 累计新增的键
+    unsigned long keys_removed;   // 累计删除的键
+    unsigned long keys_changed;   // 累计修改的键
+    double last_latency_ms;       // 最近一次重建耗时
+    double max_latency_ms;        // 最长重建耗时
+    double total_latency_ms;      // 累计重建耗时
+} lang_reload_stats_t;
+
+/**
+ * 从注册过的资源文件重建一种语言的表
+ * 新表构建完成后原子替换旧表，读取方不加锁；旧表在lang_cleanup时释放，
+ * 之前lang_get返回的指针保持有效
+ * @param lang_code 语言代码
+ * @return 成功返回true，失败时保留旧表并返回false
+ */
+bool lang_reload_language(const char* lang_code);
+
+/**
+ * 检查注册过的文件和扫描过的目录，重建发生变化的语言
+ * @return 重建的语言数量
+ */
+int lang_reload_changed(void);
+
+/**
+ * 启动语言资源监视线程，Linux上使用inotify，否则按间隔检查文件状态
+ * @param interval_ms 检查间隔（毫秒），小于等于0时使用1000
+ * @return 成功返回true
+ */
+bool lang_watch_start(int interval_ms);
+
+/**
+ * 停止语言资源监视线程
+ */
+void lang_watch_stop(void);
+
+/**
+ * 获取热加载统计
+ * @param stats 输出参数
+ */
+void lang_get_reload_stats(lang_reload_stats_t* stats);
+
 #endif // LOGLOOM_LANG_H
@@ -3,6 +3,7 @@
 
 #include <stdbool.h>
 #include <stddef.h>
+#include <stdint.h>
 
 // 日志级别定义
 typedef enum {
@@ -20,6 +21,8 @@ typedef struct {
     const char* module;       // 模块名称
     const char* message;      // 日志消息
     const char* lang_key;     // 对应的语言键（可选）
+    uint32_t module_id;       // 模块名称的驻留ID（见intern.h），0表示未驻留
+    uint32_t lang_key_id;     // 语言键的驻留ID，0表示未驻留
 } log_entry_t;
 
 /**
@@ -37,8 +40,18 @@ int log_init(const char* level, const char* log_file);
  */
 void log_set_file(const char* filepath);
 
+/**
+ * 运行时切换日志文件，不阻塞正在写日志的线程
+ * 新文件在调用线程中打开，由下一次写日志的线程在持有日志锁时换上并关闭旧文件，
+ * 切换前后的日志不会丢失或交错
+ * @param filepath 新的日志文件路径，NULL或空字符串表示禁用文件输出
+ * @return 成功返回true，新文件无法打开时返回false，原文件继续使用
+ */
+bool log_swap_file(const char* filepath);
+
 /**
  * 设置日志级别
+ * 以一次原子写入切换，不需要日志锁，可在运行时随时调整
  * @param level 新的日志级别字符串 ("DEBUG", "INFO", "WARN", "ERROR", "FATAL")
  */
 void log_set_level(const char* level);
@@ -93,6 +106,26 @@ size_t log_get_max_backup_files(void);
  */
 bool log_rotate_now(void);
 
+/**
+ * 按当前路径重新打开日志文件，用于外部轮转（logrotate）之后
+ * 新文件在调用线程中打开，由下一次写日志的线程换上，写日志的线程不会因打开文件被阻塞
+ * @return 成功返回true，未设置日志文件或文件无法打开时返回false，原文件继续使用
+ */
+bool log_reopen(void);
+
+/**
+ * 请求在下一次写日志时重新打开日志文件
+ * 只设置一个原子标志，不加锁、不分配内存，可以在信号处理函数中调用
+ */
+void log_request_reopen(void);
+
+/**
+ * 安装信号处理函数，收到信号时调用log_request_reopen，通常用于SIGHUP
+ * @param signum 信号编号
+ * @return 成功返回true，失败返回false
+ */
+bool log_reopen_on_signal(int signum);
+
 /**
  * 调试级别日志
  * @param module 模块名称
@@ -142,6 +175,29 @@ void log_fatal(const char* module, const char* format, ...);
  */
 void log_with_lang(log_level_t level, const char* module, const char* lang_key, ...);
 
+/**
+ * 批量写入日志条目
+ * 只获取一次日志锁，将通过级别过滤的条目格式化到同一缓冲区后一次写出
+ * @param entries 日志条目数组（使用level、module、message字段，lang_key可选；驻留ID为0时由日志系统补齐）
+ * @param count 条目数量
+ * @return 实际写出的条目数量
+ */
+size_t log_write_batch(const log_entry_t* entries, size_t count);
+
+/**
+ * 日志记录回调类型
+ * 每条通过级别过滤并写出的日志都以结构化条目交给回调（message为格式化后的消息正文），
+ * 回调在日志锁之外调用
+ */
+typedef void (*log_record_hook_t)(const log_entry_t* entry, void* user_data);
+
+/**
+ * 设置日志记录回调
+ * @param hook 回调函数，NULL表示取消
+ * @param user_data 传给回调的用户数据
+ */
+void log_set_record_hook(log_record_hook_t hook, void* user_data);
+
 /**
  * 获取当前日志级别
  * @return 当前日志级别
@@ -71,6 +71,29 @@ typedef enum {
     PLUGIN_RESULT_RETRY          /**< 重试请求 */
 } plugin_result_t;
 
+/** 插件处理延迟直方图的桶数 */
+#define PLUGIN_STATS_BUCKETS 8
+
+/** 延迟直方图前7个桶的上界（微秒），最后一个桶收纳其余调用 */
+#define PLUGIN_STATS_BUCKET_BOUNDS_US {10, 50, 100, 500, 1000, 5000, 10000}
+
+/**
+ * @brief 插件处理统计
+ * 
+ * 加载器在每次调用插件处理函数时记录，通过plugin_get_stats查询
+ */
+typedef struct {
+    unsigned long calls;         /**< 处理函数调用次数（批处理每批计一次） */
+    unsigned long entries;       /**< 处理的日志条目数 */
+    unsigned long errors;        /**< 返回PLUGIN_RESULT_ERROR的次数 */
+    unsigned long filtered;      /**< 过滤器插件拒绝日志的次数 */
+    uint64_t total_ns;           /**< 累计处理耗时（纳秒） */
+    uint64_t max_ns;             /**< 单次调用最大耗时（纳秒） */
+    unsigned long histogram[PLUGIN_STATS_BUCKETS]; /**< 单次调用耗时直方图 */
+    size_t queue_depth;          /**< 异步插件当前队列深度 */
+    unsigned long dropped;       /**< 异步插件因队列满丢弃的条目数 */
+} plugin_stats_t;
+
 /**
  * @brief 插件辅助函数类型定义
  */
@@ -95,8 +118,10 @@ typedef struct {
  */
 typedef int (*plugin_init_func_t)(const plugin_helpers_t* helpers);
 typedef int (*plugin_process_func_t)(const log_entry_t* entry);
+typedef int (*plugin_process_batch_func_t)(const log_entry_t* entries, size_t count);
 typedef void (*plugin_shutdown_func_t)(void);
 typedef const plugin_info_t* (*plugin_info_func_t)(void);
+typedef int (*plugin_config_changed_func_t)(const plugin_helpers_t* helpers);
 
 /* 
  * 插件必须导出以下符号：
@@ -104,6 +129,8 @@ typedef const plugin_info_t* (*plugin_info_func_t)(void);
  * - plugin_process
  * - plugin_shutdown
  * - plugin_info（可选）
+ * - plugin_process_batch（可选，声明PLUGIN_CAP_BATCH能力时使用）
+ * - plugin_config_changed（可选，重新加载配置后调用）
  */
 
 /**
@@ -119,13 +146,41 @@ extern int plugin_init(const plugin_helpers_t* helpers);
 /**
  * @brief 处理日志条目
  * 
- * 插件核心处理函数，根据插件类型处理日志数据
+ * 插件核心处理函数，根据插件类型处理日志数据。
+ * 同步模式的插件可能被多个日志线程并发调用，插件内部状态需自行加锁
  * 
  * @param entry 日志条目指针
  * @return 处理结果状态码
  */
 extern int plugin_process(const log_entry_t* entry);
 
+/**
+ * @brief 批量处理日志条目
+ * 
+ * 可选导出。插件声明PLUGIN_CAP_BATCH能力并导出此函数时，
+ * 加载器会将多条日志一次性交给插件，插件可在批次末尾统一刷新输出。
+ * 异步插件每次接收工作线程取出的全部条目；同步输出插件的条目先在加载器中累积，
+ * 达到插件配置的batch_size条（默认64）或最早的条目已等待batch_interval_ms毫秒（默认1000）时交付
+ * 
+ * @param entries 日志条目数组
+ * @param count 条目数量
+ * @return 处理结果状态码
+ */
+extern int plugin_process_batch(const log_entry_t* entries, size_t count);
+
+/**
+ * @brief 插件配置发生变化
+ * 
+ * 可选导出。plugin_reload_config替换配置快照后，对配置节发生变化的
+ * 已启用插件调用，插件应在此重新读取配置并更新预先计算的状态。
+ * 调用期间加载器持有写锁，同步插件不会并发处理日志；
+ * 异步插件需自行与其工作线程同步
+ * 
+ * @param helpers 插件辅助函数结构体，读取的是新配置
+ * @return 0表示成功，非0表示失败（插件将被禁用）
+ */
+extern int plugin_config_changed(const plugin_helpers_t* helpers);
+
 /**
  * @brief 关闭插件
  * 
@@ -133,6 +188,45 @@ extern int plugin_process(const log_entry_t* entry);
  */
 extern void plugin_shutdown(void);
 
+/**
+ * @brief 获取插件处理统计（由插件加载器提供）
+ * 
+ * @param name 插件名称
+ * @param stats 输出统计信息
+ * @return 插件存在返回true，否则返回false
+ */
+bool plugin_get_stats(const char* name, plugin_stats_t* stats);
+
+/**
+ * @brief 批量分发日志条目到所有启用的输出插件（由插件加载器提供）
+ * 
+ * 同步批处理插件的条目进入累积缓冲，与plugin_sink_log共用批次阈值
+ * 
+ * @param entries 日志条目数组
+ * @param count 条目数量
+ */
+void plugin_sink_log_batch(const log_entry_t* entries, size_t count);
+
+/**
+ * @brief 交付同步批处理插件已累积的全部条目（由插件加载器提供）
+ * 
+ * 批次的最长累积时间只在分发日志时检查，日志稀疏时可定期调用此函数；
+ * 禁用、卸载插件和重新加载其配置时加载器会自动交付
+ */
+void plugin_flush_batches(void);
+
+/**
+ * @brief 重新加载插件特定配置（由插件加载器提供）
+ * 
+ * 插件配置在加载时解析为按插件的只读快照，get_config_*读取快照而不遍历JSON。
+ * 重新加载时整体替换快照并通知配置发生变化的插件；之前返回的字符串
+ * 在插件系统清理前保持有效
+ * 
+ * @param config_json 插件配置JSON（插件名称到配置节的对象），NULL表示生成的默认配置
+ * @return 配置发生变化的插件数量，解析失败返回-1
+ */
+int plugin_reload_config(const char* config_json);
+
 /**
  * @brief 获取插件信息
  * 
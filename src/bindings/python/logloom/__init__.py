@@ -8,14 +8,16 @@ A Python interface for the Logloom logging and internationalization library.
 import sys
 import os
 import enum
-from importlib.machinery import ExtensionFileLoader
+from importlib.machinery import ExtensionFileLoader, EXTENSION_SUFFIXES
 from importlib.util import spec_from_file_location, module_from_spec
 
-# 全局变量，用于纯Python实现
-_current_language = "en"  # 默认语言
+from .lang_context import (
+    _context_language, use_language, get_context_language,
+    set_context_language, reset_context_language
+)
 
-# 导入纯Python实现的国际化扩展函数
-from .lang import register_locale_file, register_locale_directory, get_supported_languages, get_language_keys, _resources
+# 全局变量，用于纯Python实现
+_current_language = "en"  # 默认语言，上下文语言（见lang_context）优先于它
 
 _mock_texts = {
     # 英文文本
@@ -42,75 +44,41 @@ _mock_texts = {
     }
 }
 
-# 尝试直接导入编译好的C扩展模块
+# 加载编译好的C扩展模块
+# 扩展模块与本包同名（logloom.*.so），安装或 build_ext --inplace 后位于本包的上级目录，
+# 会被包目录遮蔽，因此按确定的文件名直接加载，找不到时回退到纯Python实现
 _c_module = None
+
+def _load_c_extension():
+    """按扩展名后缀在本包上级目录中查找并加载C扩展模块"""
+    parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    for suffix in EXTENSION_SUFFIXES:
+        ext_path = os.path.join(parent_dir, 'logloom' + suffix)
+        if not os.path.isfile(ext_path):
+            continue
+        # 模块名必须与PyInit_logloom一致。单阶段初始化的扩展模块加载时会以该名称
+        # 写入sys.modules，替换正在导入的本包，加载后需恢复，否则之后的相对导入失败
+        loader = ExtensionFileLoader('logloom', ext_path)
+        spec = spec_from_file_location('logloom', ext_path, loader=loader)
+        package = sys.modules.get(__name__)
+        try:
+            module = module_from_spec(spec)
+            spec.loader.exec_module(module)
+        finally:
+            if package is not None:
+                sys.modules[__name__] = package
+        return module
+    return None
+
 try:
-    # 查找扩展模块
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    parent_dir = os.path.dirname(current_dir)
-    
-    # 查找.so文件（在Linux/Mac上）或.pyd文件（在Windows上）
-    for dirpath, _, filenames in os.walk(parent_dir):
-        for filename in filenames:
-            if (filename.startswith('logloom') and 
-                (filename.endswith('.so') or filename.endswith('.pyd'))):
-                ext_path = os.path.join(dirpath, filename)
-                try:
-                    # 动态加载扩展模块
-                    spec = spec_from_file_location('_logloom_c', ext_path)
-                    if spec:
-                        _c_module = module_from_spec(spec)
-                        spec.loader.exec_module(_c_module)
-                        # 导入成功，跳出循环
-                        break
-                except Exception:
-                    continue
-        if _c_module:
-            break
+    _c_module = _load_c_extension()
 except Exception as e:
     sys.stderr.write(f"Warning: Failed to import C extension module: {e}\n")
 
 # 如果找到C扩展模块，从中导入所有功能
 if _c_module:
-    # 导入C扩展模块中定义的所有函数和变量
-    for attr_name in dir(_c_module):
-        if not attr_name.startswith('_'):  # 跳过内部/私有属性
-            globals()[attr_name] = getattr(_c_module, attr_name)
-            
-            # 为导入的函数添加文档字符串（如果原函数没有）
-            if callable(globals()[attr_name]) and globals()[attr_name].__doc__ is None:
-                if attr_name == 'debug':
-                    globals()[attr_name].__doc__ = "记录调试级别的日志消息"
-                elif attr_name == 'info':
-                    globals()[attr_name].__doc__ = "记录信息级别的日志消息"
-                elif attr_name == 'warn':
-                    globals()[attr_name].__doc__ = "记录警告级别的日志消息"
-                elif attr_name == 'error':
-                    globals()[attr_name].__doc__ = "记录错误级别的日志消息"
-                elif attr_name == 'fatal':
-                    globals()[attr_name].__doc__ = "记录致命错误级别的日志消息"
-                elif attr_name == 'set_log_level':
-                    globals()[attr_name].__doc__ = "设置全局日志级别"
-                elif attr_name == 'set_log_file':
-                    globals()[attr_name].__doc__ = "设置日志输出文件路径"
-                elif attr_name == 'set_log_max_size':
-                    globals()[attr_name].__doc__ = "设置日志文件最大大小"
-                elif attr_name == 'set_output_console':
-                    globals()[attr_name].__doc__ = "设置是否输出到控制台"
-                elif attr_name == 'set_language':
-                    globals()[attr_name].__doc__ = "设置当前使用的语言"
-                elif attr_name == 'get_current_language':
-                    globals()[attr_name].__doc__ = "获取当前使用的语言代码"
-                elif attr_name == 'get_text':
-                    globals()[attr_name].__doc__ = "获取指定键的翻译文本"
-                elif attr_name == 'format_text':
-                    globals()[attr_name].__doc__ = "格式化指定键的翻译文本"
-                elif attr_name == 'initialize':
-                    globals()[attr_name].__doc__ = "初始化Logloom系统"
-                elif attr_name == 'cleanup':
-                    globals()[attr_name].__doc__ = "清理Logloom系统资源"
-                else:
-                    globals()[attr_name].__doc__ = f"{attr_name} API函数"
+    globals().update({name: getattr(_c_module, name)
+                      for name in dir(_c_module) if not name.startswith('_')})
 else:
     # 没有找到C扩展模块，提供纯Python实现的基本功能
     sys.stderr.write("Warning: Using pure Python implementation (limited functionality)\n")
@@ -175,6 +143,65 @@ else:
                     f.write(log_line)
             except Exception as e:
                 print(f"[ERROR] 无法写入日志文件: {e}")
+        
+        if _records._sinks:
+            _records.append_record(_log_level_ranks[level], module, message)
+    
+    # 日志级别权重，用于批量日志的级别过滤
+    _log_level_ranks = {"DEBUG": 0, "INFO": 1, "WARN": 2, "ERROR": 3, "FATAL": 4}
+    
+    def log_many(records):
+        """
+        批量记录日志
+        
+        Parameters:
+        -----------
+        records : iterable
+            (level, module, message) 元组的可迭代对象
+        
+        Returns:
+        --------
+        int
+            实际写出的日志条数
+        """
+        import time
+        
+        # 同一批次共用一个时间戳，所有日志行拼接后一次写出
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+        threshold = _log_level_ranks[_current_log_level]
+        lines = []
+        accepted = []
+        for level, module, message in records:
+            if hasattr(level, 'value'):
+                level = level.value
+            level = str(level).upper()
+            rank = _log_level_ranks.get(level)
+            if rank is None:
+                raise ValueError(f"无效的日志级别: {level}")
+            if rank < threshold:
+                continue
+            lines.append(f"[{timestamp}][{level}][{module}] {message}\n")
+            if _records._sinks:
+                accepted.append((rank, module, message))
+        
+        if not lines:
+            return 0
+        
+        data = "".join(lines)
+        if _console_enabled:
+            print(data, end='')
+        
+        if _log_file:
+            try:
+                with open(_log_file, 'a', encoding='utf-8') as f:
+                    f.write(data)
+            except Exception as e:
+                print(f"[ERROR] 无法写入日志文件: {e}")
+        
+        for rank, module, message in accepted:
+            _records.append_record(rank, module, message)
+        
+        return len(lines)
     
     # 配置函数
     def set_log_level(level):
@@ -195,6 +222,9 @@ else:
         # 同时更新默认logger的级别
         logger._current_level = level
         
+        # 同步所有Logger实例缓存的级别权重
+        _sync_level_cache(level)
+        
         return True
     
     def set_log_file(filepath):
@@ -238,7 +268,7 @@ else:
         # 验证语言代码
         # 1. 检查预定义语言
         # 2. 检查动态加载的语言资源
-        if lang_code not in _mock_texts and lang_code not in _resources:
+        if lang_code not in _mock_texts and lang_code not in _lang_resources():
             print(f"警告：不支持的语言代码 {lang_code}，使用英语")
             _current_language = "en"
             return False
@@ -247,21 +277,27 @@ else:
         return True
     
     def get_current_language():
-        """获取当前语言"""
-        return _current_language
+        """获取当前语言，设置了上下文语言时返回上下文语言"""
+        return _context_language.get() or _current_language
+    
+    def _lookup_text(lang, key):
+        """在指定语言中查找翻译文本，找不到时返回None"""
+        # 首先尝试从动态注册的资源中获取文本，热加载会整体替换语言表，只取一次
+        table = _lang_resources().get(lang)
+        if table is not None and key in table:
+            return table[key]
+        
+        # 尝试在指定语言中获取文本
+        text = _mock_texts.get(lang, {}).get(key)
+        
+        # 如果找不到，尝试英语
+        if text is None and lang != "en":
+            text = _mock_texts.get("en", {}).get(key)
+        return text
     
     def get_text(key, *args):
         """获取翻译文本"""
-        # 首先尝试从动态注册的资源中获取文本
-        if _current_language in _resources and key in _resources[_current_language]:
-            text = _resources[_current_language][key]
-        else:
-            # 尝试在当前语言中获取文本
-            text = _mock_texts.get(_current_language, {}).get(key)
-            
-            # 如果找不到，尝试英语
-            if text is None and _current_language != "en":
-                text = _mock_texts.get("en", {}).get(key)
+        text = _lookup_text(_context_language.get() or _current_language, key)
         
         # 仍找不到，返回键名
         if text is None:
@@ -270,42 +306,118 @@ else:
         # 应用格式化
         if args:
             try:
-                text = text.format(*args)
+                text = compile_template(text).format(args)
             except Exception as e:
                 print(f"警告：格式化文本失败: {e}")
         
         return text
     
     def format_text(key, *args, **kwargs):
-        """获取并格式化翻译文本"""
-        # 首先尝试从动态注册的资源中获取文本
-        if _current_language in _resources and key in _resources[_current_language]:
-            text = _resources[_current_language][key]
-        else:
-            # 尝试在当前语言中获取文本
-            text = _mock_texts.get(_current_language, {}).get(key)
-            
-            # 如果找不到，尝试英语
-            if text is None and _current_language != "en":
-                text = _mock_texts.get("en", {}).get(key)
+        """获取并格式化翻译文本，lang参数只影响本次查找，不切换当前语言"""
+        lang = kwargs.pop('lang', None) or _context_language.get() or _current_language
+        text = _lookup_text(lang, key)
         
         # 仍找不到，返回键名
         if text is None:
             return key
         
-        # 应用格式化
+        # 应用格式化，使用缓存的编译模板
         try:
             if kwargs:
-                text = text.format(**kwargs)
+                text = compile_template(text).format((), kwargs)
             elif args:
-                text = text.format(*args)
+                text = compile_template(text).format(args)
         except Exception as e:
             print(f"警告：格式化文本失败: {e}")
         
         return text
 
+def _lang_resources():
+    """获取纯Python国际化模块中动态注册的语言资源，首次调用时才导入该模块"""
+    from .lang import _resources
+    return _resources
+
+# 延迟导入的子模块及其提供的属性，避免导入本包时加载PyYAML和插件系统
+_LAZY_SUBMODULES = ('lang', 'plugin')
+_LAZY_ATTRIBUTES = {
+    'register_locale_file': 'lang',
+    'register_locale_directory': 'lang',
+    'get_supported_languages': 'lang',
+    'get_language_keys': 'lang',
+    'reload_language': 'lang',
+    'watch_locales': 'lang',
+    'stop_watching_locales': 'lang',
+    'get_locale_reload_stats': 'lang',
+    'get_locale_conflicts': 'lang',
+}
+
+def __getattr__(name):
+    """按需导入子模块及其导出的属性"""
+    import importlib
+    
+    if name in _LAZY_SUBMODULES:
+        return importlib.import_module(f'.{name}', __name__)
+    if name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module(f'.{_LAZY_ATTRIBUTES[name]}', __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# 原生日志记录管道：C扩展可用时记录由C日志管道产生
+from . import records as _records
+from .records import (
+    RecordBatch, add_record_sink, remove_record_sink, flush_records, set_record_batch_size
+)
+_records.bind_native(_c_module)
+
+# 模块名称和语言键的驻留表，C扩展可用时与C日志管道共用ID
+from . import interning as _interning
+from .interning import intern_id, interned_name, intern_count
+_interning.bind_native(_c_module)
+
+# 配置文件解析，C扩展可用时与C配置系统共用解析缓存
+from . import config_loader as _config_loader
+from .config_loader import ConfigError, load_config, clear_config_cache
+_config_loader.bind_native(_c_module)
+
+# 翻译模板编译缓存
+from .templates import (
+    compile_template, set_template_cache_size, template_cache_info, clear_template_cache
+)
+
 # 导入Logger类用于面向对象的API
-from .logger import Logger
+from .logger import Logger, AsyncLogger, _sync_level_cache
+
+if _c_module:
+    def set_log_level(level):
+        """设置全局日志级别"""
+        if hasattr(level, 'value'):
+            level = level.value
+        result = _c_module.set_log_level(level)
+        # C扩展中的级别变化需要同步到Logger实例缓存的级别权重
+        _sync_level_cache(level)
+        return result
+    
+    # 上下文语言通过lang参数传给C扩展，C扩展按该语言查找而不切换全局语言
+    def get_current_language():
+        """获取当前语言，设置了上下文语言时返回上下文语言"""
+        return _context_language.get() or _c_module.get_current_language()
+    
+    def get_text(key):
+        """获取翻译文本"""
+        lang = _context_language.get()
+        if lang:
+            return _c_module.get_text(key, lang=lang)
+        return _c_module.get_text(key)
+    
+    def format_text(key, *args, **kwargs):
+        """获取并格式化翻译文本，lang参数只影响本次查找"""
+        if 'lang' not in kwargs:
+            lang = _context_language.get()
+            if lang:
+                kwargs['lang'] = lang
+        return _c_module.format_text(key, *args, **kwargs)
 
 # 创建默认日志记录器实例
 logger = Logger("default")
@@ -313,6 +425,11 @@ logger = Logger("default")
 # 保存临时配置文件的路径，用于清理
 _temp_config_path = None
 
+# initialize使用的配置文件路径，供reconfigure和watch_config使用
+_config_path = None
+# 配置文件监视器，由watch_config创建
+_config_watcher = None
+
 def initialize(config=None):
     """
     初始化Logloom
@@ -327,7 +444,7 @@ def initialize(config=None):
     bool
         初始化是否成功
     """
-    global _temp_config_path, _current_language
+    global _temp_config_path, _current_language, _config_path
     
     # 处理字典类型的配置
     config_path = None
@@ -375,11 +492,18 @@ def initialize(config=None):
     elif config is not None:
         # 字符串路径
         config_path = config
+        _config_path = config
     
     # 调用C扩展模块初始化
     if _c_module and hasattr(_c_module, 'initialize'):
         try:
-            return _c_module.initialize(config_path or "")
+            result = _c_module.initialize(config_path or "")
+            # 配置文件可能修改了C扩展中的日志级别，重新同步Logger缓存的级别
+            if hasattr(_c_module, 'get_log_level'):
+                _sync_level_cache(_c_module.get_log_level())
+            else:
+                _sync_level_cache("DEBUG")
+            return result
         except Exception as e:
             print(f"[ERROR] 使用C扩展模块初始化失败: {e}")
     
@@ -389,9 +513,7 @@ def initialize(config=None):
     # 如果提供了配置文件路径，尝试解析
     if config_path and not isinstance(config, dict):  # 如果是字典类型，前面已经处理过了
         try:
-            import yaml
-            with open(config_path, 'r') as f:
-                yaml_config = yaml.safe_load(f)
+            yaml_config = load_config(config_path)
             
             # 应用基本配置
             if yaml_config and isinstance(yaml_config, dict):
@@ -409,8 +531,6 @@ def initialize(config=None):
                 language = yaml_config.get('logloom', {}).get('language')
                 if language:
                     set_language(language)
-        except ImportError:
-            print("[WARNING] 解析YAML配置需要PyYAML模块")
         except Exception as e:
             print(f"[ERROR] 解析配置文件失败: {e}")
     
@@ -427,6 +547,15 @@ def cleanup():
     """
     global _temp_config_path
     
+    # 停止配置文件监视
+    stop_watching_config()
+    
+    # 投递尚未交付的日志记录
+    try:
+        flush_records()
+    except Exception as e:
+        print(f"[WARNING] 投递日志记录失败: {e}")
+    
     # 调用C扩展模块清理
     if _c_module and hasattr(_c_module, 'cleanup'):
         try:
@@ -445,15 +574,189 @@ def cleanup():
     
     return True
 
+def _apply_settings(changes):
+    """纯Python实现：应用发生变化的配置项，语言资源不可用时保持当前语言"""
+    from .logger import _async_writer
+    
+    for name, (old, new) in list(changes.items()):
+        if name == 'level':
+            set_log_level(new)
+        elif name == 'file':
+            # 在写入顺序中切换，AsyncLogger已提交的记录仍写入原文件
+            _async_writer.call_in_order(set_log_file, new)
+        elif name == 'max_size':
+            set_log_max_size(new)
+        elif name == 'console':
+            set_output_console(new)
+        elif name == 'language':
+            if new in _mock_texts or new in _lang_resources():
+                set_language(new)
+            else:
+                del changes[name]
+
+def reconfigure(config_path=None):
+    """
+    按配置文件的当前内容调整运行中的日志系统，不需要重新初始化
+    
+    新配置与日志系统的当前状态比较，只应用不同的配置项。日志级别以一次写入切换；
+    日志文件在写入顺序中切换：C扩展在调用线程打开新文件，由下一次写日志的线程换上，
+    纯Python实现中AsyncLogger已提交的记录仍写入原文件。插件系统已初始化时，
+    按plugin.enabled和plugin.disabled列表启用或禁用插件。
+    
+    Parameters:
+    -----------
+    config_path : str, optional
+        配置文件路径，默认为initialize使用的配置文件
+    
+    Returns:
+    --------
+    dict
+        应用的配置变化：配置名 -> (原值, 新值)，插件状态变化的配置名为"plugin.<插件名>"
+    
+    Raises:
+    -------
+    ConfigError
+        配置文件有语法错误或日志级别无效，当前配置保持不变
+    OSError
+        配置文件无法读取或新的日志文件无法打开
+    """
+    global _config_path
+    from .config_watch import config_settings, diff_settings, apply_plugin_settings
+    
+    path = config_path or _config_path
+    if not path:
+        raise ValueError("没有可重新加载的配置文件")
+    
+    settings = config_settings(load_config(path))
+    level = settings.get('level')
+    if level is not None and level not in ('DEBUG', 'INFO', 'WARN', 'ERROR', 'FATAL'):
+        raise ConfigError(f"无效的日志级别: {level}")
+    
+    if _c_module and hasattr(_c_module, 'reconfigure'):
+        if settings.get('file') and os.path.dirname(settings['file']):
+            os.makedirs(os.path.dirname(settings['file']), exist_ok=True)
+        changes = _c_module.reconfigure(path)
+        if 'level' in changes:
+            _sync_level_cache(changes['level'][1])
+    else:
+        changes = diff_settings({
+            'level': _current_log_level,
+            'file': _log_file,
+            'max_size': _log_max_size,
+            'console': _console_enabled,
+            'language': _current_language,
+        }, settings)
+        _apply_settings(changes)
+    
+    changes.update(apply_plugin_settings(settings))
+    _config_path = path
+    return changes
+
+def watch_config(config_path=None, interval=None, use_inotify=True):
+    """
+    监视配置文件，内容变化后自动调用reconfigure
+    
+    Parameters:
+    -----------
+    config_path : str, optional
+        配置文件路径，默认为initialize使用的配置文件
+    interval : float, optional
+        检查间隔（秒），默认为config_watch.DEFAULT_INTERVAL
+    use_inotify : bool
+        是否使用inotify，为False或不可用时轮询文件状态
+    
+    Returns:
+    --------
+    ConfigWatcher
+        已启动的监视器
+    """
+    global _config_watcher
+    from .config_watch import ConfigWatcher, DEFAULT_INTERVAL
+    
+    path = config_path or _config_path
+    if not path:
+        raise ValueError("没有可监视的配置文件")
+    if _config_watcher:
+        if _config_watcher.path == os.path.abspath(path):
+            return _config_watcher
+        stop_watching_config()
+    
+    watcher = ConfigWatcher(path, reconfigure, interval or DEFAULT_INTERVAL, use_inotify)
+    watcher.start()
+    _config_watcher = watcher
+    return watcher
+
+def stop_watching_config():
+    """停止监视配置文件"""
+    global _config_watcher
+    
+    if _config_watcher:
+        _config_watcher.stop()
+        _config_watcher = None
+
+def get_config_reload_stats():
+    """获取配置文件重新加载统计，未监视配置文件时返回None"""
+    return _config_watcher.stats() if _config_watcher else None
+
+def reopen():
+    """
+    按当前路径重新打开日志文件，供外部轮转（logrotate）之后调用
+    
+    C扩展在调用线程中打开新文件，由下一次写日志的线程换上，正在写日志的线程不会等待；
+    即使没有调用，写日志时也会按inode发现文件被改名或删除、按大小发现文件被截断（copytruncate）。
+    纯Python实现每次写日志时按路径打开文件，外部轮转后自然写入新文件。
+    
+    Returns:
+    --------
+    bool
+        设置了日志文件并已重新打开时返回True
+    """
+    if _c_module:
+        return hasattr(_c_module, 'reopen') and _c_module.reopen()
+    return bool(_log_file)
+
+def reopen_on_signal(signum=None):
+    """
+    收到信号时重新打开日志文件，配合logrotate的postrotate脚本使用
+    
+    信号处理函数只设置一个标志，由下一次写日志的线程按路径打开新文件。
+    与signal.signal一样只能在主线程中调用。
+    
+    Parameters:
+    -----------
+    signum : int, optional
+        信号编号，默认为SIGHUP
+    
+    Returns:
+    --------
+    原来的信号处理函数
+    """
+    import signal
+    
+    def _request_reopen(signum, frame):
+        if _c_module and hasattr(_c_module, 'request_reopen'):
+            _c_module.request_reopen()
+    
+    return signal.signal(signal.SIGHUP if signum is None else signum, _request_reopen)
+
 # 版本信息
 __version__ = "1.2.1"
 
 # 显式导出纯Python实现的所有函数到模块全局命名空间
 # 这样可以确保在C扩展不可用时，这些函数仍然可以被导入使用
 __all__ = [
-    'LogLevel', 'debug', 'info', 'warn', 'error', 'fatal',
+    'LogLevel', 'debug', 'info', 'warn', 'error', 'fatal', 'log_many',
     'set_log_level', 'set_log_file', 'set_log_max_size', 'set_output_console',
     'set_language', 'get_current_language', 'get_text', 'format_text',
-    'initialize', 'cleanup', 'Logger', 'logger',
-    'register_locale_file', 'register_locale_directory', 'get_supported_languages', 'get_language_keys'
+    'initialize', 'cleanup', 'Logger', 'AsyncLogger', 'logger',
+    'RecordBatch', 'add_record_sink', 'remove_record_sink', 'flush_records', 'set_record_batch_size',
+    'intern_id', 'interned_name', 'intern_count',
+    'ConfigError', 'load_config', 'clear_config_cache',
+    'reconfigure', 'watch_config', 'stop_watching_config', 'get_config_reload_stats',
+    'reopen', 'reopen_on_signal',
+    'set_template_cache_size', 'template_cache_info', 'clear_template_cache',
+    'use_language', 'get_context_language', 'set_context_language', 'reset_context_language',
+    'register_locale_file', 'register_locale_directory', 'get_supported_languages', 'get_language_keys',
+    'reload_language', 'watch_locales', 'stop_watching_locales', 'get_locale_reload_stats',
+    'get_locale_conflicts'
 ]
\ No newline at end of file
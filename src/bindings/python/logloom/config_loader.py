@@ -0,0 +1,680 @@
+"""
+Logloom 配置文件解析
+====================
+
+配置文件使用YAML的一个子集：块映射和块序列、流式集合 [a, b] 和 {a: 1}、
+引号字符串、纯量和注释。纯量按YAML 1.1规则解析（与PyYAML的safe_load一致，
+时间戳保留为字符串），映射的键总是字符串。不支持锚点、别名、标签和块纯量
+（| 和 >），同一映射中的重复键视为错误，遇到时抛出ConfigError而不是静默解析。
+
+C扩展可用时由C的解析器（config_parser.c）解析文件，与C配置系统共用进程级的
+解析缓存；纯Python实现下由本模块按同样的语法解析。同一文件在内容未变化时
+（设备号、inode、大小和修改时间都相同）只解析一次。
+"""
+
+import os
+import re
+import threading
+
+# C扩展模块，由包初始化时通过bind_native设置
+_native = None
+
+# 解析结果缓存 {(st_dev, st_ino): (st_size, st_mtime_ns, 配置)}
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+class ConfigError(ValueError):
+    """配置文件语法错误，消息以"line N: "开头"""
+
+
+def bind_native(module):
+    """绑定C扩展模块，之后配置文件由C的解析器解析"""
+    global _native
+    with _cache_lock:
+        _native = module if hasattr(module, "parse_config") else None
+        _cache.clear()
+
+
+# ---------- 纯量解析 ----------
+
+_NULLS = frozenset(["", "~", "null", "Null", "NULL"])
+_TRUES = frozenset(["true", "True", "TRUE", "yes", "Yes", "YES", "on", "On", "ON"])
+_FALSES = frozenset(["false", "False", "FALSE", "no", "No", "NO", "off", "Off", "OFF"])
+
+_INT_RE = re.compile(r"""^(?:[-+]?0b[0-1_]+
+    |[-+]?0[0-7_]+
+    |[-+]?(?:0|[1-9][0-9_]*)
+    |[-+]?0x[0-9a-fA-F_]+
+    |[-+]?[1-9][0-9_]*(?::[0-5]?[0-9])+)$""", re.X)
+
+_FLOAT_RE = re.compile(r"""^(?:[-+]?(?:[0-9][0-9_]*)\.[0-9_]*(?:[eE][-+][0-9]+)?
+    |\.[0-9_]+(?:[eE][-+][0-9]+)?
+    |[-+]?[0-9][0-9_]*(?::[0-5]?[0-9])+\.[0-9_]*
+    |[-+]?\.(?:inf|Inf|INF)
+    |\.(?:nan|NaN|NAN))$""", re.X)
+
+# 纯量的第一个字符可能是数字时才尝试匹配数字
+_NUMBER_START = frozenset("0123456789+-.")
+
+
+def _sexagesimal(text):
+    value = 0
+    for part in text.split(":"):
+        value = value * 60 + float(part) if "." in part else value * 60 + int(part)
+    return value
+
+
+def _resolve_int(text):
+    text = text.replace("_", "")
+    sign = 1
+    if text[0] in "+-":
+        sign = -1 if text[0] == "-" else 1
+        text = text[1:]
+    if text == "0":
+        return 0
+    if text.startswith("0b"):
+        return sign * int(text[2:], 2)
+    if text.startswith("0x"):
+        return sign * int(text[2:], 16)
+    if text[0] == "0":
+        return sign * int(text, 8)
+    if ":" in text:
+        return sign * _sexagesimal(text)
+    return sign * int(text)
+
+
+def _resolve_float(text):
+    text = text.replace("_", "").lower()
+    sign = 1
+    if text[0] in "+-":
+        sign = -1 if text[0] == "-" else 1
+        text = text[1:]
+    if text == ".inf":
+        return sign * float("inf")
+    if text == ".nan":
+        return float("nan")
+    if ":" in text:
+        return sign * float(_sexagesimal(text))
+    return sign * float(text)
+
+
+def _resolve_plain(text):
+    """按YAML 1.1规则解析纯量的类型和值"""
+    if text in _NULLS:
+        return None
+    if text in _TRUES:
+        return True
+    if text in _FALSES:
+        return False
+    if text[0] in _NUMBER_START:
+        if _INT_RE.match(text):
+            return _resolve_int(text)
+        if _FLOAT_RE.match(text):
+            return _resolve_float(text)
+    return text
+
+
+_ESCAPES = {
+    "0": "\0", "a": "\a", "b": "\b", "t": "\t", "\t": "\t", "n": "\n", "v": "\v",
+    "f": "\f", "r": "\r", "e": "\x1b", " ": " ", '"': '"', "/": "/", "\\": "\\",
+    "N": "\x85", "_": "\xa0", "L": "\u2028", "P": "\u2029",
+}
+_HEX_ESCAPES = {"x": 2, "u": 4, "U": 8}
+
+
+class _Parser:
+    """按行解析配置文本，结构与config_parser.c一致"""
+
+    def __init__(self, text):
+        # 预处理后的行：[内容, 缩进, 行号, 跨行时最后一行的行号]
+        self.lines = []
+        self.pos = 0
+        self._split_lines(text)
+
+    def error(self, line, message):
+        return ConfigError("line %d: %s" % (line, message))
+
+    # ---------- 预处理 ----------
+
+    @staticmethod
+    def _scan_line(text, quote):
+        """
+        查找行尾注释的位置，返回(内容长度, 行尾未闭合的引号)
+
+        #位于行首或前面是空白，且不在引号内时开始注释；引号只在值的开头
+        （行首、空白、逗号、括号或冒号之后）才开始一个字符串
+        """
+        length = len(text)
+        if not quote and "#" not in text and "'" not in text and '"' not in text:
+            return length, quote
+        i = 0
+        while i < length:
+            c = text[i]
+            if quote:
+                if c == "\\" and quote == '"':
+                    i += 1
+                elif c == "'" and quote == "'" and i + 1 < length and text[i + 1] == "'":
+                    i += 1
+                elif c == quote:
+                    quote = ""
+            else:
+                prev = text[i - 1] if i > 0 else " "
+                if c == "#" and prev in " \t":
+                    return i, quote
+                if c in "\"'" and prev in " \t,[{:":
+                    quote = c
+            i += 1
+        return length, quote
+
+    def _split_lines(self, text):
+        if text.startswith("\ufeff"):
+            text = text[1:]
+        quote = ""
+        lines = self.lines
+        number = 0
+        for raw in text.split("\n"):
+            number += 1
+            if quote:
+                # 引号字符串的续行，并入上一行
+                content, quote = self._scan_line(raw, quote)
+                line = lines[-1]
+                tail = raw[:content]
+                line[0] += "\n" + (tail if quote else tail.rstrip(" \t\r"))
+                line[3] = number
+                continue
+
+            stripped = raw.lstrip(" ")
+            indent = len(raw) - len(stripped)
+            content, quote = self._scan_line(stripped, "")
+            stripped = stripped[:content]
+            if not quote:
+                stripped = stripped.rstrip(" \t\r")
+            if not stripped:
+                continue
+            if stripped[0] == "\t":
+                raise self.error(number, "tabs are not allowed in indentation")
+            if indent == 0 and not quote and (
+                    stripped[0] == "%" or
+                    (stripped[:3] in ("---", "...") and (len(stripped) == 3 or stripped[3] == " "))):
+                continue
+            lines.append([stripped, indent, number, number])
+
+    # ---------- 引号字符串 ----------
+
+    def parse_quoted(self, text, pos, line):
+        """解析引号字符串，返回(字符串, 结尾引号之后的位置)"""
+        quote = text[pos]
+        i = pos + 1
+        length = len(text)
+        out = []
+        kept = 0  # 转义产生的空白不随换行去除
+
+        while i < length:
+            c = text[i]
+            if c == quote:
+                if quote == "'" and i + 1 < length and text[i + 1] == "'":
+                    out.append("'")
+                    i += 2
+                    continue
+                return "".join(out), i + 1
+            if c == "\n" or c == "\r":
+                while len(out) > kept:
+                    chunk = out[-1].rstrip(" \t")
+                    if chunk:
+                        out[-1] = chunk
+                        break
+                    out.pop()
+                i, blank = self._skip_line_breaks(text, i)
+                out.append("\n" * blank if blank else " ")
+                continue
+            if c != "\\" or quote == "'":
+                # 连续的普通字符一次取出
+                end = i + 1
+                while end < length and text[end] not in (quote, "\\", "\n", "\r"):
+                    end += 1
+                out.append(text[i:end])
+                i = end
+                continue
+
+            i += 1
+            if i >= length:
+                break
+            c = text[i]
+            if c == "\n" or c == "\r":
+                # 转义的换行：续行直接拼接
+                i, blank = self._skip_line_breaks(text, i)
+                out.append("\n" * blank)
+                kept = len(out)
+                continue
+            if c in _ESCAPES:
+                out.append(_ESCAPES[c])
+            elif c in _HEX_ESCAPES:
+                digits = text[i + 1:i + 1 + _HEX_ESCAPES[c]]
+                try:
+                    if len(digits) != _HEX_ESCAPES[c]:
+                        raise ValueError(digits)
+                    code = int(digits, 16)
+                except ValueError:
+                    raise self.error(line, "invalid escape sequence") from None
+                if code > 0x10FFFF:
+                    raise self.error(line, "invalid unicode escape")
+                out.append(chr(code))
+                i += len(digits)
+            else:
+                raise self.error(line, "invalid escape sequence '\\%s'" % c)
+            kept = len(out)
+            i += 1
+
+        raise self.error(line, "unterminated quoted string")
+
+    @staticmethod
+    def _skip_line_breaks(text, i):
+        """跳过换行和续行缩进，返回(续行位置, 其后的空行数)"""
+        blank = 0
+        first = True
+        length = len(text)
+        while i < length and text[i] in "\r\n":
+            if text[i] == "\r" and i + 1 < length and text[i + 1] == "\n":
+                i += 1
+            i += 1
+            if not first:
+                blank += 1
+            first = False
+            while i < length and text[i] in " \t":
+                i += 1
+        return i, blank
+
+    def check_unsupported(self, text, line):
+        """检查纯量开头是否为不支持的YAML特性"""
+        if not text:
+            return
+        c = text[0]
+        if c in "|>":
+            raise self.error(line, "block scalars are not supported")
+        if c == "&":
+            raise self.error(line, "anchors are not supported")
+        if c == "*":
+            raise self.error(line, "aliases are not supported")
+        if c == "!":
+            raise self.error(line, "tags are not supported")
+        if c == "?" and (len(text) == 1 or text[1] == " "):
+            raise self.error(line, "complex keys are not supported")
+        if c in "@`":
+            raise self.error(line, "reserved indicator '%s'" % c)
+
+    # ---------- 流式集合 ----------
+
+    @staticmethod
+    def _flow_depth(text, depth):
+        """计算流式集合在一行内未闭合的括号层数"""
+        quote = ""
+        i = 0
+        length = len(text)
+        while i < length:
+            c = text[i]
+            if quote:
+                if c == "\\" and quote == '"':
+                    i += 1
+                elif c == "'" and quote == "'" and i + 1 < length and text[i + 1] == "'":
+                    i += 1
+                elif c == quote:
+                    quote = ""
+            elif c in "\"'" and (i == 0 or text[i - 1] in " \t,[{:"):
+                quote = c
+            elif c in "[{":
+                depth += 1
+            elif c in "]}":
+                depth -= 1
+            i += 1
+        return depth
+
+    @staticmethod
+    def _flow_skip_space(text, pos):
+        length = len(text)
+        while pos < length and text[pos] in " \t\n":
+            pos += 1
+        return pos
+
+    def _flow_plain(self, text, pos, line):
+        """读取流式纯量的原文，遇到逗号、括号或": "时结束"""
+        start = pos
+        length = len(text)
+        while pos < length:
+            c = text[pos]
+            if c in ",[]{}":
+                break
+            if c == ":" and (pos + 1 >= length or text[pos + 1] in " \t\n,]}"):
+                break
+            pos += 1
+        raw = text[start:pos].rstrip(" \t\n")
+        self.check_unsupported(raw, line)
+        return raw, pos
+
+    def _flow_node(self, text, pos, line):
+        pos = self._flow_skip_space(text, pos)
+        if pos >= len(text):
+            return None, pos
+        c = text[pos]
+        if c in "[{":
+            return self._flow_collection(text, pos, line)
+        if c in "\"'":
+            return self.parse_quoted(text, pos, line)
+        raw, pos = self._flow_plain(text, pos, line)
+        return _resolve_plain(raw), pos
+
+    def _flow_collection(self, text, pos, line):
+        mapping = text[pos] == "{"
+        close = "}" if mapping else "]"
+        result = {} if mapping else []
+        length = len(text)
+        pos += 1
+
+        while True:
+            pos = self._flow_skip_space(text, pos)
+            if pos >= length:
+                raise self.error(line, "unterminated flow collection, expected '%s'" % close)
+            if text[pos] == close:
+                return result, pos + 1
+
+            if mapping:
+                if text[pos] in "\"'":
+                    key, pos = self.parse_quoted(text, pos, line)
+                else:
+                    key, pos = self._flow_plain(text, pos, line)
+                    if key in _NULLS:
+                        key = ""
+                if not key:
+                    raise self.error(line, "empty key")
+                pos = self._flow_skip_space(text, pos)
+                value = None
+                if pos < length and text[pos] == ":":
+                    pos = self._flow_skip_space(text, pos + 1)
+                    if pos < length and text[pos] not in ",}":
+                        value, pos = self._flow_node(text, pos, line)
+                if key in result:
+                    raise self.error(line, "duplicate key '%s'" % key)
+                result[key] = value
+            else:
+                start = self._flow_skip_space(text, pos)
+                item, pos = self._flow_node(text, start, line)
+                pos = self._flow_skip_space(text, pos)
+                if pos < length and text[pos] == ":":
+                    # 序列中的单个键值对 [a: b] 是只有一个成员的映射，键取纯量的原文
+                    if item is None or text[start] in "[{":
+                        raise self.error(line, "complex keys are not supported")
+                    if text[start] not in "\"'":
+                        item = text[start:pos].rstrip(" \t\n")
+                    pos = self._flow_skip_space(text, pos + 1)
+                    value = None
+                    if pos < length and text[pos] not in ",]":
+                        value, pos = self._flow_node(text, pos, line)
+                    item = {item: value}
+                result.append(item)
+
+            pos = self._flow_skip_space(text, pos)
+            if pos >= length:
+                raise self.error(line, "unterminated flow collection, expected '%s'" % close)
+            if text[pos] == ",":
+                pos += 1
+            elif text[pos] != close:
+                raise self.error(line, "expected ',' or '%s' in flow collection" % close)
+
+    # ---------- 块结构 ----------
+
+    @staticmethod
+    def is_sequence_item(text):
+        return text[0] == "-" and (len(text) == 1 or text[1] == " ")
+
+    @staticmethod
+    def find_mapping_colon(text):
+        """查找映射键后的冒号（后面是空格或行尾），不是映射条目时返回-1"""
+        if not text or text[0] in "[{":
+            return -1
+        length = len(text)
+        if text[0] in "\"'":
+            quote = text[0]
+            i = 1
+            while i < length:
+                if text[i] == "\\" and quote == '"':
+                    i += 1
+                elif text[i] == quote:
+                    if quote == "'" and i + 1 < length and text[i + 1] == "'":
+                        i += 2
+                        continue
+                    break
+                i += 1
+            i += 1
+            while i < length and text[i] == " ":
+                i += 1
+            if i < length and text[i] == ":" and (i + 1 == length or text[i + 1] == " "):
+                return i
+            return -1
+        i = text.find(":")
+        while i >= 0:
+            if i + 1 == length or text[i + 1] in " \t":
+                return i
+            i = text.find(":", i + 1)
+        return -1
+
+    def _join_lines(self, text, end):
+        """将当前行的值与其后到end为止的续行拼接，续行之间的空行保留为换行"""
+        lines = self.lines
+        parts = [text]
+        for i in range(self.pos, end):
+            blank = lines[i][2] - lines[i - 1][3] - 1
+            parts.append("\n" * blank if blank else " ")
+            parts.append(lines[i][0])
+        self.pos = end
+        return "".join(parts)
+
+    def parse_inline(self, text, indent):
+        """解析行内的值（流式集合、引号字符串或纯量），并前进到值之后的行"""
+        lines = self.lines
+        number = lines[self.pos][2]
+        self.pos += 1
+        c = text[0]
+
+        if c in "[{":
+            # 未闭合的流式集合延续到后续行
+            depth = self._flow_depth(text, 0)
+            if depth > 0:
+                end = self.pos
+                while depth > 0 and end < len(lines):
+                    depth = self._flow_depth(lines[end][0], depth)
+                    end += 1
+                text = self._join_lines(text, end)
+            value, pos = self._flow_collection(text, 0, number)
+            if self._flow_skip_space(text, pos) < len(text):
+                raise self.error(number, "unexpected characters after flow collection")
+            return value
+
+        if c in "\"'":
+            value, pos = self.parse_quoted(text, 0, number)
+            if pos < len(text):
+                raise self.error(number, "unexpected characters after quoted string")
+            return value
+
+        if c == "-" and (len(text) == 1 or text[1] == " "):
+            raise self.error(number, "sequence entries are not allowed here")
+        self.check_unsupported(text, number)
+
+        # 多行纯量：缩进更深的后续行是同一个值
+        end = self.pos
+        while end < len(lines) and lines[end][1] > indent:
+            end += 1
+        if end > self.pos:
+            text = self._join_lines(text, end)
+        if self.find_mapping_colon(text) >= 0:
+            raise self.error(number, "mapping values are not allowed here")
+        return _resolve_plain(text)
+
+    def parse_key(self, text, line):
+        text = text.rstrip(" \t")
+        if not text:
+            raise self.error(line, "empty key")
+        if text[0] in "\"'":
+            return self.parse_quoted(text, 0, line)[0]
+        self.check_unsupported(text, line)
+        return text
+
+    def parse_nested(self, indent, allow_same_indent):
+        """解析值为空的键或序列项后面的嵌套块"""
+        if self.pos < len(self.lines):
+            text, next_indent = self.lines[self.pos][0], self.lines[self.pos][1]
+            if next_indent > indent or (
+                    allow_same_indent and next_indent == indent and self.is_sequence_item(text)):
+                return self.parse_block(next_indent)
+        return None
+
+    def parse_mapping(self, indent):
+        result = {}
+        lines = self.lines
+        while self.pos < len(lines):
+            text, line_indent, number = lines[self.pos][:3]
+            if line_indent < indent:
+                break
+            if line_indent > indent:
+                raise self.error(number, "unexpected indentation")
+            if self.is_sequence_item(text):
+                raise self.error(number, "expected a mapping key, found a sequence item")
+
+            colon = self.find_mapping_colon(text)
+            if colon < 0:
+                raise self.error(number, "expected 'key: value'")
+            key = self.parse_key(text[:colon], number)
+            rest = text[colon + 1:].lstrip(" \t")
+            if rest:
+                value = self.parse_inline(rest, indent)
+            else:
+                self.pos += 1
+                value = self.parse_nested(indent, True)
+            if key in result:
+                raise self.error(number, "duplicate key '%s'" % key)
+            result[key] = value
+        return result
+
+    def parse_sequence(self, indent):
+        result = []
+        lines = self.lines
+        while self.pos < len(lines):
+            line = lines[self.pos]
+            text, line_indent, number = line[:3]
+            if line_indent < indent or (line_indent == indent and not self.is_sequence_item(text)):
+                break
+            if line_indent > indent:
+                raise self.error(number, "unexpected indentation")
+
+            rest = text[1:].lstrip(" ")
+            if not rest:
+                self.pos += 1
+                result.append(self.parse_nested(indent, False))
+            elif self.is_sequence_item(rest) or self.find_mapping_colon(rest) >= 0:
+                # 序列项中的嵌套序列或映射：把本行视为从项内容处开始的块
+                line[0] = rest
+                line[1] = indent + len(text) - len(rest)
+                result.append(self.parse_block(line[1]))
+            else:
+                result.append(self.parse_inline(rest, indent))
+        return result
+
+    def parse_block(self, indent):
+        text = self.lines[self.pos][0]
+        if self.is_sequence_item(text):
+            return self.parse_sequence(indent)
+        if self.find_mapping_colon(text) < 0:
+            # 单独一行的值，例如只包含一个流式集合的文档
+            return self.parse_inline(text, -1)
+        return self.parse_mapping(indent)
+
+    def parse(self):
+        if not self.lines:
+            return None
+        result = self.parse_block(self.lines[0][1])
+        if self.pos < len(self.lines):
+            raise self.error(self.lines[self.pos][2], "unexpected indentation")
+        return result
+
+
+def parse_config_text(text):
+    """
+    解析配置文本
+
+    Parameters:
+    -----------
+    text : str
+        配置文本
+
+    Returns:
+    --------
+    配置内容：映射为dict，序列为list，纯量为None、bool、int、float或str
+
+    Raises:
+    -------
+    ConfigError
+        语法错误或使用了不支持的YAML特性
+    """
+    return _Parser(text).parse()
+
+
+def _copy_tree(value):
+    """复制配置树，缓存中的结果不被调用方修改"""
+    if isinstance(value, dict):
+        return {k: _copy_tree(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy_tree(v) for v in value]
+    return value
+
+
+def load_config(path):
+    """
+    加载并解析配置文件
+
+    同一文件在内容未变化时只解析一次，之后返回缓存结果的副本。
+
+    Parameters:
+    -----------
+    path : str
+        配置文件路径
+
+    Returns:
+    --------
+    配置内容，空文件返回None
+
+    Raises:
+    -------
+    OSError
+        文件不存在或无法读取
+    ConfigError
+        语法错误
+    """
+    st = os.stat(path)
+    key = (st.st_dev, st.st_ino)
+    with _cache_lock:
+        cached = _cache.get(key)
+        native = _native
+    if cached is not None and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+        return _copy_tree(cached[2])
+
+    if native is not None:
+        try:
+            config = native.parse_config(path)
+        except ValueError as e:
+            raise ConfigError(str(e)) from None
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        try:
+            config = parse_config_text(text)
+        except ConfigError as e:
+            raise ConfigError("%s: %s" % (path, e)) from None
+
+    with _cache_lock:
+        _cache[key] = (st.st_size, st.st_mtime_ns, config)
+    return _copy_tree(config)
+
+
+def clear_config_cache():
+    """清空解析结果缓存"""
+    with _cache_lock:
+        _cache.clear()
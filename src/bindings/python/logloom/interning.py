@@ -0,0 +1,79 @@
+"""
+Logloom 字符串驻留表
+====================
+
+模块名称和语言键在首次使用时映射为小整数ID（从1开始），每个字符串只保存
+一份。C扩展可用时ID由C的全局驻留表分配，与原生日志记录中的module_id一致；
+纯Python实现下由本模块分配。ID到字符串的映射在本地缓存，解码记录批次时
+同一模块的名称只创建一个字符串对象。
+"""
+
+import sys
+import threading
+
+# 字符串 -> ID，ID -> 字符串；只增不删，读取时无需加锁
+_ids = {}
+_names = {}
+_lock = threading.Lock()
+
+# C扩展模块，由包初始化时通过bind_native设置
+_native = None
+
+
+def bind_native(module):
+    """绑定C扩展模块，之后ID由C的驻留表分配"""
+    global _native
+    with _lock:
+        _native = module
+        _ids.clear()
+        _names.clear()
+
+
+def intern_id(name):
+    """
+    驻留字符串并返回其ID
+
+    Parameters:
+    -----------
+    name : str
+        模块名称或语言键
+
+    Returns:
+    --------
+    int
+        字符串的ID，同一字符串总是得到同一ID
+    """
+    id_ = _ids.get(name)
+    if id_ is not None:
+        return id_
+
+    if not isinstance(name, str):
+        raise TypeError("interned name must be a str")
+
+    with _lock:
+        id_ = _ids.get(name)
+        if id_ is None:
+            name = sys.intern(name)
+            id_ = _native.intern_id(name) if _native else len(_names) + 1
+            _names[id_] = name
+            _ids[name] = id_
+    return id_
+
+
+def interned_name(id_):
+    """返回ID对应的字符串，ID无效时返回None"""
+    name = _names.get(id_)
+    if name is not None or not _native:
+        return name
+
+    name = _native.interned_name(id_)
+    if name is not None:
+        with _lock:
+            name = _names.setdefault(id_, sys.intern(name))
+            _ids.setdefault(name, id_)
+    return name
+
+
+def intern_count():
+    """返回已驻留的字符串数量"""
+    return _native.intern_count() if _native else len(_names)
@@ -16,13 +16,18 @@ Python 版本的 Logloom 国际化支持模块
 
 import os
 import sys
-import yaml
 import ctypes
 import glob
+from collections import ChainMap
 from typing import Dict, Optional, Any, List
 import logging
 import locale
 
+from . import locale_cache as _locale_cache
+from . import locale_loader as _locale_loader
+from .templates import compile_template
+from .lang_context import get_context_language
+
 # 配置日志记录器
 logger = logging.getLogger("logloom.lang")
 
@@ -38,7 +43,17 @@ _lang_initialized = False
 _current_locale = "en"
 _locale_data = {}
 _c_lib = None
-_resources = {}  # 用于存储动态加载的语言资源 {language_code: {key: value}}
+# 用于存储动态加载的语言资源 {language_code: ChainMap}，maps[0]保留给直接写入的条目，
+# maps[1]是所有注册文件合并后的查找表（只有一个文件时可能是映射到内存的编译缓存）
+_resources = {}
+# 每种语言注册过的资源文件，按注册顺序，用于热加载时重建该语言
+_sources = {}
+# 注册过的资源目录及其文件匹配模式
+_directories = {}
+# 热加载监视器，由watch_locales创建
+_watcher = None
+# 批量注册时发现的键冲突
+_conflicts = []
 
 
 def _try_load_c_lib():
@@ -70,6 +85,11 @@ def _try_load_c_lib():
                 _c_lib.lang_free.argtypes = [ctypes.c_void_p]
                 _c_lib.lang_free.restype = None
                 
+                # 较早的库没有按语言查找的接口
+                if hasattr(_c_lib, 'lang_get_in'):
+                    _c_lib.lang_get_in.argtypes = [ctypes.c_char_p, ctypes.c_char_p]
+                    _c_lib.lang_get_in.restype = ctypes.c_char_p
+                
                 return True
             except Exception as e:
                 logger.debug(f"加载 C 库失败: {path}, {str(e)}")
@@ -82,6 +102,8 @@ def _load_locale_file(locale_name):
     """加载指定区域的语言文件"""
     global _locale_data
     
+    import yaml
+    
     _locale_data.clear()
     
     for locale_path in DEFAULT_LOCALE_PATHS:
@@ -154,11 +176,18 @@ def get(key):
     if not _lang_initialized:
         initialize()
     
+    # 上下文语言（见lang_context）优先于全局区域，只影响当前线程或任务
+    context_locale = get_context_language()
+    
     # 如果有 C 库，优先使用 C 库实现
     if _c_lib:
         try:
             c_key = ctypes.c_char_p(key.encode('utf-8'))
-            result = _c_lib.lang_get(c_key)
+            if context_locale and hasattr(_c_lib, 'lang_get_in'):
+                c_lang = ctypes.c_char_p(context_locale.encode('utf-8'))
+                result = _c_lib.lang_get_in(c_lang, c_key)
+            else:
+                result = _c_lib.lang_get(c_key)
             if result:
                 return result.decode('utf-8')
             return key
@@ -168,8 +197,13 @@ def get(key):
     # 纯 Python 实现
     try:
         # 检查当前语言的动态加载资源
-        if _current_locale in _resources and key in _resources[_current_locale]:
-            return _resources[_current_locale][key]
+        locale_name = context_locale or _current_locale
+        if locale_name in _resources and key in _resources[locale_name]:
+            return _resources[locale_name][key]
+        
+        # 层次化的语言数据只属于全局区域
+        if locale_name != _current_locale:
+            return key
             
         # 点号分隔的键支持层次化访问
         if '.' in key:
@@ -210,9 +244,9 @@ def getf(format_key, *args):
     # 获取格式化字符串
     format_str = get(format_key)
     
-    # 执行格式化
+    # 执行格式化，使用缓存的编译模板
     try:
-        return format_str.format(*args)
+        return compile_template(format_str).format(args)
     except Exception as e:
         logger.debug(f"格式化字符串失败: {format_key}, {str(e)}")
         return format_key
@@ -261,7 +295,7 @@ def get_current_locale():
     if not _lang_initialized:
         initialize()
     
-    return _current_locale
+    return get_context_language() or _current_locale
 
 
 def register_locale_file(file_path, lang_code=None):
@@ -296,56 +330,122 @@ def register_locale_file(file_path, lang_code=None):
     # 纯Python实现
     # 从文件名推断语言代码
     if not lang_code:
-        basename = os.path.basename(file_path)
-        # 移除扩展名
-        basename = os.path.splitext(basename)[0]
-        # 使用基本名称作为语言代码
-        lang_code = basename
+        lang_code = _infer_lang_code(file_path)
     
     if not lang_code:
         logger.error(f"无法确定文件的语言代码: {file_path}")
         return False
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
-            
-        if not data or not isinstance(data, dict):
-            logger.error(f"无效的YAML格式: {file_path}")
-            return False
-            
-        # 初始化语言资源字典
-        if lang_code not in _resources:
-            _resources[lang_code] = {}
-            
-        # 扁平化嵌套字典
-        def flatten_dict(d, parent_key='', sep='.'):
-            items = []
-            for k, v in d.items():
-                new_key = f"{parent_key}{sep}{k}" if parent_key else k
-                if isinstance(v, dict):
-                    items.extend(flatten_dict(v, new_key, sep=sep).items())
-                else:
-                    items.append((new_key, v))
-            return dict(items)
-            
-        flat_data = flatten_dict(data)
-        _resources[lang_code].update(flat_data)
-        
-        logger.info(f"成功注册语言资源文件: {file_path} (语言: {lang_code})")
-        return True
+        # 优先使用编译缓存，没有时解析YAML并写入缓存
+        flat_data = _locale_cache.load_locale_file(file_path)
     except Exception as e:
         logger.error(f"加载语言资源文件失败: {file_path} - {e}")
         return False
+    
+    return _add_locale_layer(file_path, lang_code, flat_data)
+
+
+def _infer_lang_code(file_path):
+    """从文件名推断语言代码"""
+    return os.path.splitext(os.path.basename(file_path))[0]
+
+
+def _add_locale_layer(file_path, lang_code, flat_data):
+    """把已加载的文件数据加入语言资源，优先于已注册的文件"""
+    return bool(_add_locale_layers(lang_code, [(file_path, flat_data)]))
+
+
+def _add_locale_layers(lang_code, layers):
+    """
+    把同一语言已加载的一批文件数据合并进语言资源，后面的文件优先
+    
+    合并后的查找表一次性替换旧表，查找开销不随注册的文件数增长
+    
+    Returns:
+        list: 成功加入的 (文件路径, 文件数据)
+    """
+    added = []
+    for file_path, flat_data in layers:
+        if flat_data is None:
+            logger.error(f"无效的YAML格式: {file_path}")
+            continue
+        added.append((file_path, flat_data))
+    if not added:
+        return added
+    
+    # 初始化语言资源
+    if lang_code not in _resources:
+        _resources[lang_code] = ChainMap()
+    
+    table = _resources[lang_code]
+    table.maps[1:] = [_locale_cache.merge_layers(table.maps[1:] + [flat_data for _, flat_data in added])]
+    
+    sources = _sources.setdefault(lang_code, [])
+    for file_path, _ in added:
+        abs_path = os.path.abspath(file_path)
+        if abs_path not in sources:
+            sources.append(abs_path)
+        if _watcher:
+            _watcher.watch_file(abs_path)
+        logger.info(f"成功注册语言资源文件: {file_path} (语言: {lang_code})")
+    return added
+
+
+def _register_locale_files(paths, max_workers=None):
+    """
+    并行加载一批语言文件，按给定顺序合并，返回成功注册的数量
+    
+    同一语言中多个文件给同一个键定义了不同的值时，后合并的文件生效，
+    冲突记录到get_locale_conflicts
+    """
+    loaded = _locale_loader.load_locale_files(paths, max_workers)
+    
+    # 按语言分组，每种语言只合并一次
+    pending = {}
+    for file_path, flat_data, error in loaded:
+        if error is not None:
+            logger.error(f"加载语言资源文件失败: {file_path} - {error}")
+            continue
+        pending.setdefault(_infer_lang_code(file_path), []).append((file_path, flat_data))
+    
+    layers = {}
+    count = 0
+    for lang_code, lang_layers in pending.items():
+        added = _add_locale_layers(lang_code, lang_layers)
+        if added:
+            layers[lang_code] = added
+            count += len(added)
+    
+    for lang_code in sorted(layers):
+        conflicts = _locale_loader.find_conflicts(lang_code, layers[lang_code])
+        if conflicts:
+            _conflicts.extend(conflicts)
+            logger.warning(f"语言 {lang_code} 中有 {len(conflicts)} 个键在多个文件中定义了不同的值，"
+                           f"例如 {conflicts[0]['key']}，以 {conflicts[0]['winner']} 为准")
+    return count
 
 
-def register_locale_directory(dir_path, pattern="*.yaml"):
+def get_locale_conflicts():
+    """
+    获取批量注册语言文件时发现的键冲突
+    
+    Returns:
+        list: [{"lang", "key", "files", "winner"}]
+    """
+    return list(_conflicts)
+
+
+def register_locale_directory(dir_path, pattern="*.yaml", max_workers=None):
     """
     注册目录中所有匹配模式的语言资源文件
     
+    文件在线程池中并行加载，按文件名顺序合并；目录列表按目录mtime缓存。
+    
     Args:
         dir_path: 包含语言资源文件的目录路径
         pattern: 文件匹配模式（默认为"*.yaml"）
+        max_workers: 并行加载的线程数，默认为locale_loader.DEFAULT_MAX_WORKERS
     
     Returns:
         int: 成功注册的文件数量
@@ -364,15 +464,113 @@ def register_locale_directory(dir_path, pattern="*.yaml"):
             logger.debug(f"使用C库注册语言资源目录失败: {str(e)}")
     
     # 纯Python实现
-    count = 0
-    for file_path in glob.glob(os.path.join(dir_path, pattern)):
-        if register_locale_file(file_path):
-            count += 1
+    count = _register_locale_files(_locale_loader.list_locale_files(dir_path, pattern), max_workers)
+    
+    patterns = _directories.setdefault(os.path.abspath(dir_path), [])
+    if pattern not in patterns:
+        patterns.append(pattern)
+    if _watcher:
+        _watcher.watch_directory(dir_path, pattern)
             
     logger.info(f"从目录 {dir_path} 注册了 {count} 个语言资源文件")
     return count
 
 
+def reload_language(lang_code):
+    """
+    从注册过的资源文件重建一种语言的资源表
+    
+    各文件合并为一个查找表后一次性替换旧表，读取方无需加锁；已删除的文件被跳过，
+    直接写入的条目（maps[0]）保留在新表中。
+    
+    Args:
+        lang_code: 语言代码
+    
+    Returns:
+        dict: 新增、删除和修改的键，格式见locale_watch.diff_tables
+    """
+    from .locale_watch import diff_tables
+    
+    old = _resources.get(lang_code)
+    layers = []
+    for file_path in _sources.get(lang_code, []):
+        if not os.path.isfile(file_path):
+            continue
+        flat_data = _locale_cache.load_locale_file(file_path)
+        if flat_data is None:
+            raise ValueError(f"无效的YAML格式: {file_path}")
+        layers.append(flat_data)
+    
+    new = ChainMap(old.maps[0] if old is not None else {}, _locale_cache.merge_layers(layers))
+    diff = diff_tables(lang_code, old, new)
+    _resources[lang_code] = new
+    return diff
+
+
+def _reload_paths(paths):
+    """热加载回调：找出变化的文件所属的语言并逐个重建"""
+    langs = set()
+    for path in paths:
+        owners = [lang for lang, sources in _sources.items() if path in sources]
+        if not owners and os.path.isfile(path):
+            # 监视目录中新建的文件，按文件名推断语言代码
+            lang_code = _infer_lang_code(path)
+            _sources.setdefault(lang_code, []).append(path)
+            owners = [lang_code]
+        langs.update(owners)
+    return [reload_language(lang) for lang in sorted(langs)]
+
+
+def watch_locales(interval=None, use_inotify=True):
+    """
+    监视注册过的语言资源文件和目录，文件变化后自动重建受影响的语言
+    
+    之后注册的文件和目录也会被监视。
+    
+    Args:
+        interval: 检查间隔（秒），默认为locale_watch.DEFAULT_INTERVAL
+        use_inotify: 是否使用inotify，为False或不可用时轮询文件状态
+    
+    Returns:
+        LocaleWatcher: 已启动的监视器
+    """
+    global _watcher
+    from .locale_watch import LocaleWatcher, DEFAULT_INTERVAL
+    
+    if _watcher:
+        return _watcher
+    
+    watcher = LocaleWatcher(_reload_paths, interval or DEFAULT_INTERVAL, use_inotify)
+    for sources in _sources.values():
+        for file_path in sources:
+            watcher.watch_file(file_path)
+    for dir_path, patterns in _directories.items():
+        for pattern in patterns:
+            watcher.watch_directory(dir_path, pattern)
+    watcher.start()
+    _watcher = watcher
+    return watcher
+
+
+def stop_watching_locales():
+    """停止语言资源热加载"""
+    global _watcher
+    
+    if _watcher:
+        _watcher.stop()
+        _watcher = None
+
+
+def get_locale_reload_stats():
+    """
+    获取热加载统计
+    
+    Returns:
+        dict: 重新加载次数、失败次数、延迟和键差异统计，未启用热加载时返回None
+    """
+    return _watcher.stats() if _watcher else None
+
+
 def get_supported_languages():
     """
     获取当前支持的所有语言代码列表
@@ -474,17 +672,13 @@ def scan_directory_with_glob(glob_pattern):
             logger.debug(f"使用C库进行glob扫描失败: {str(e)}")
     
     # 纯Python实现
-    count = 0
-    for file_path in glob.glob(glob_pattern):
-        if os.path.isfile(file_path) and register_locale_file(file_path):
-            count += 1
-    
-    return count
+    paths = sorted(p for p in glob.glob(glob_pattern) if os.path.isfile(p))
+    return _register_locale_files(paths)
 
 
 def auto_discover_resources():
     """
-    自动发现并加载语言资源文件
+    自动发现并加载语言资源文件，每个文件优先使用其编译缓存
     
     Returns:
         bool: 是否找到并加载了资源
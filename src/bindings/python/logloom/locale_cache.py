@@ -0,0 +1,454 @@
+"""
+Logloom 编译语言缓存
+====================
+
+把扁平化后的YAML语言文件保存为可以直接mmap的二进制快照，进程启动时不再
+解析YAML；多个进程映射同一个缓存文件，翻译文本由页缓存共享，只在查找时解码。
+
+文件布局（小端），与C中src/lang/lang.c的load_compiled_lang_file一致：
+- 文件头：魔数、格式版本、源文件mtime(纳秒)、源文件大小、源文件CRC32、
+  条目数、哈希桶数、字符串区大小
+- 哈希桶：bucket_count + 1 个u32，第i个桶的条目为entries[b[i]:b[i+1]]
+- 条目：键哈希、键偏移、键长度、值偏移、值长度，按桶排序
+- 字符串区：以NUL结尾的UTF-8键和值，C端可以直接引用
+
+缓存按以下顺序查找：源文件同目录下的同名.llc文件（由命令行工具预先生成，
+随语言文件一起部署），其次是用户缓存目录（首次加载YAML时自动写入）。
+源文件的mtime和大小与文件头一致时缓存有效，不一致时再比较CRC32。
+环境变量LOGLOOM_NO_LOCALE_CACHE设置为非空且不为0的值时不读写用户缓存目录，
+同目录下预先生成的缓存不受影响。
+
+命令行用法:
+    python -m logloom.locale_cache [--check] 路径...
+"""
+
+import os
+import sys
+import mmap
+import zlib
+import struct
+import logging
+import argparse
+import tempfile
+from collections.abc import Mapping
+
+logger = logging.getLogger("logloom.locale_cache")
+
+CACHE_MAGIC = b"LLOC"
+CACHE_VERSION = 1
+CACHE_SUFFIX = ".llc"
+
+# 魔数、版本、源mtime、源大小、源CRC32、条目数、哈希桶数、字符串区大小
+HEADER_STRUCT = struct.Struct("<4sIqQIIII")
+# 键哈希、键偏移、键长度、值偏移、值长度
+ENTRY_STRUCT = struct.Struct("<5I")
+BUCKET_STRUCT = struct.Struct("<I")
+
+# 首次加载YAML时自动写入的缓存目录
+DEFAULT_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+    "logloom", "locales"
+)
+# 关闭用户缓存目录的环境变量，C中src/lang/lang.c使用同一个变量
+NO_USER_CACHE_ENV = "LOGLOOM_NO_LOCALE_CACHE"
+
+
+def flatten_dict(d, parent_key='', sep='.'):
+    """将嵌套字典扁平化为点号分隔的键"""
+    items = []
+    for k, v in d.items():
+        new_key = f"{parent_key}{sep}{k}" if parent_key else k
+        if isinstance(v, dict):
+            items.extend(flatten_dict(v, new_key, sep=sep).items())
+        else:
+            items.append((new_key, v))
+    return dict(items)
+
+
+def sibling_cache_path(source_path):
+    """源文件同目录下的缓存路径，如locales/en.yaml对应locales/en.llc"""
+    return os.path.splitext(source_path)[0] + CACHE_SUFFIX
+
+
+def user_cache_path(source_path, cache_dir=None):
+    """用户缓存目录中的缓存路径，以源文件真实路径的CRC32区分同名文件"""
+    real_path = os.path.realpath(source_path)
+    stem = os.path.splitext(os.path.basename(real_path))[0]
+    name = f"{stem}-{zlib.crc32(real_path.encode('utf-8')):08x}{CACHE_SUFFIX}"
+    return os.path.join(cache_dir or DEFAULT_CACHE_DIR, name)
+
+
+def user_cache_enabled():
+    """是否读写用户缓存目录，每次调用时读取环境变量"""
+    return os.environ.get(NO_USER_CACHE_ENV, "") in ("", "0")
+
+
+def merge_layers(layers):
+    """
+    把同一语言的多个文件数据合并为一个查找表，后面的层优先
+
+    只有一层时原样返回，编译缓存仍按需解码；多层时合并为一个字典，
+    查找开销不随注册的文件数增长
+
+    Args:
+        layers: 按优先级从低到高排列的 {键: 文本} 映射
+
+    Returns:
+        合并后的映射
+    """
+    layers = [layer for layer in layers if layer]
+    if not layers:
+        return {}
+    if len(layers) == 1:
+        return layers[0]
+    merged = {}
+    for layer in layers:
+        merged.update(layer)
+    return merged
+
+
+def _file_crc32(path):
+    crc = 0
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            crc = zlib.crc32(chunk, crc)
+    return crc
+
+
+def build_cache(flat, mtime_ns, size, crc):
+    """
+    把扁平化的语言数据编码为缓存文件内容
+
+    Args:
+        flat: {键: 文本} 字典，值必须都是字符串
+        mtime_ns, size, crc: 源文件的mtime(纳秒)、大小和CRC32
+
+    Returns:
+        bytes: 缓存文件内容
+    """
+    bucket_count = 1
+    while bucket_count < len(flat):
+        bucket_count <<= 1
+    mask = bucket_count - 1
+
+    strings = bytearray()
+    entries = []
+    for key, value in flat.items():
+        if not isinstance(key, str) or not isinstance(value, str):
+            raise TypeError(f"语言条目必须是字符串: {key!r}")
+        key_bytes = key.encode('utf-8')
+        value_bytes = value.encode('utf-8')
+        key_offset = len(strings)
+        strings += key_bytes + b"\0"
+        value_offset = len(strings)
+        strings += value_bytes + b"\0"
+        entries.append((zlib.crc32(key_bytes), key_offset, len(key_bytes),
+                        value_offset, len(value_bytes)))
+
+    # 按桶排序后，每个桶的条目在数组中连续
+    entries.sort(key=lambda entry: entry[0] & mask)
+    buckets = [0] * (bucket_count + 1)
+    for entry in entries:
+        buckets[(entry[0] & mask) + 1] += 1
+    for i in range(bucket_count):
+        buckets[i + 1] += buckets[i]
+
+    out = bytearray(HEADER_STRUCT.pack(
+        CACHE_MAGIC, CACHE_VERSION, mtime_ns, size, crc,
+        len(entries), bucket_count, len(strings)
+    ))
+    out += struct.pack(f"<{bucket_count + 1}I", *buckets)
+    for entry in entries:
+        out += ENTRY_STRUCT.pack(*entry)
+    out += strings
+    return bytes(out)
+
+
+def _replace_file(path, data):
+    """
+    先写临时文件再原子替换，缓存文件从不被截断或原地改写
+
+    正在映射旧缓存的进程（包括C中的lang.c）继续读取旧文件，不会因文件变短收到SIGBUS
+    """
+    fd, tmp_path = tempfile.mkstemp(prefix=".llc-", dir=os.path.dirname(path) or ".")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        # mkstemp创建的文件只有属主可读，部署的同目录缓存需要能被其他用户的进程读取
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def write_cache(flat, source_path, cache_path, stat=None, crc=None):
+    """
+    为源文件写入缓存
+
+    Args:
+        flat: 扁平化的语言数据
+        source_path: 源YAML文件路径
+        cache_path: 缓存文件路径
+        stat, crc: 读取源文件前取得的stat结果和源文件CRC32，省略时重新计算
+
+    Returns:
+        bool: 是否写入成功
+    """
+    try:
+        if stat is None:
+            stat = os.stat(source_path)
+        if crc is None:
+            crc = _file_crc32(source_path)
+        data = build_cache(flat, stat.st_mtime_ns, stat.st_size, crc)
+        os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+        _replace_file(cache_path, data)
+        return True
+    except (OSError, TypeError) as e:
+        logger.debug(f"写入语言缓存失败: {cache_path}, {e}")
+        return False
+
+
+class CompiledLocale(Mapping):
+    """
+    映射到内存的编译语言缓存
+
+    只读映射，查找时按哈希索引定位条目并解码，已解码的文本会被记住
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < HEADER_STRUCT.size:
+                raise ValueError(f"语言缓存文件过短: {path}")
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            self._parse_header(size)
+        except Exception:
+            self._map.close()
+            raise
+        self._decoded = {}
+
+    def _parse_header(self, size):
+        (magic, version, self.source_mtime_ns, self.source_size, self.source_crc,
+         self._count, self._bucket_count, strings_size) = HEADER_STRUCT.unpack_from(self._map, 0)
+        if magic != CACHE_MAGIC or version != CACHE_VERSION:
+            raise ValueError(f"不支持的语言缓存格式: {self.path}")
+        bucket_count = self._bucket_count
+        if bucket_count == 0 or bucket_count & (bucket_count - 1):
+            raise ValueError(f"语言缓存哈希桶数无效: {self.path}")
+
+        self._buckets_offset = HEADER_STRUCT.size
+        self._entries_offset = self._buckets_offset + (bucket_count + 1) * BUCKET_STRUCT.size
+        self._strings_offset = self._entries_offset + self._count * ENTRY_STRUCT.size
+        if self._strings_offset + strings_size != size:
+            raise ValueError(f"语言缓存文件已损坏: {self.path}")
+
+    def is_fresh(self, source_path):
+        """判断缓存是否与源文件一致，源文件不存在时缓存即为唯一来源"""
+        try:
+            stat = os.stat(source_path)
+        except FileNotFoundError:
+            return True
+        if stat.st_size != self.source_size:
+            return False
+        if stat.st_mtime_ns == self.source_mtime_ns:
+            return True
+        # 只改变了mtime（如重新部署的同一文件），按内容比较
+        return _file_crc32(source_path) == self.source_crc
+
+    def close(self):
+        """解除内存映射"""
+        self._decoded = {}
+        self._map.close()
+
+    def _string(self, offset, length):
+        start = self._strings_offset + offset
+        return str(self._map[start:start + length], 'utf-8')
+
+    def _entry(self, index):
+        return ENTRY_STRUCT.unpack_from(self._map, self._entries_offset + index * ENTRY_STRUCT.size)
+
+    def __getitem__(self, key):
+        value = self._decoded.get(key)
+        if value is not None:
+            return value
+        if not isinstance(key, str):
+            raise KeyError(key)
+
+        key_bytes = key.encode('utf-8')
+        key_hash = zlib.crc32(key_bytes)
+        bucket = key_hash & (self._bucket_count - 1)
+        start, end = struct.unpack_from("<2I", self._map, self._buckets_offset + bucket * BUCKET_STRUCT.size)
+        for index in range(start, end):
+            entry_hash, key_offset, key_length, value_offset, value_length = self._entry(index)
+            if entry_hash != key_hash or key_length != len(key_bytes):
+                continue
+            key_start = self._strings_offset + key_offset
+            if self._map[key_start:key_start + key_length] == key_bytes:
+                value = self._string(value_offset, value_length)
+                self._decoded[key] = value
+                return value
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self):
+        for index in range(self._count):
+            _, key_offset, key_length, _, _ = self._entry(index)
+            yield self._string(key_offset, key_length)
+
+    def __len__(self):
+        return self._count
+
+
+def open_cache(source_path):
+    """
+    打开源文件对应的有效缓存
+
+    Returns:
+        CompiledLocale或None（没有缓存或缓存已过期）
+    """
+    cache_paths = [sibling_cache_path(source_path)]
+    if user_cache_enabled():
+        cache_paths.append(user_cache_path(source_path))
+    for cache_path in cache_paths:
+        if not os.path.isfile(cache_path):
+            continue
+        try:
+            compiled = CompiledLocale(cache_path)
+        except (OSError, ValueError) as e:
+            logger.debug(f"忽略无效的语言缓存: {cache_path}, {e}")
+            continue
+        if compiled.is_fresh(source_path):
+            return compiled
+        compiled.close()
+        logger.debug(f"语言缓存已过期: {cache_path}")
+    return None
+
+
+def load_locale_file(file_path):
+    """
+    加载语言文件的扁平化数据，优先使用有效的编译缓存
+
+    没有可用缓存时解析YAML，并在用户缓存目录中写入缓存供后续进程使用，
+    设置了LOGLOOM_NO_LOCALE_CACHE时不写入
+
+    Args:
+        file_path: YAML语言文件或.llc缓存文件的路径
+
+    Returns:
+        {键: 文本} 映射，文件内容不是字典时返回None
+    """
+    if file_path.endswith(CACHE_SUFFIX):
+        return CompiledLocale(file_path)
+
+    compiled = open_cache(file_path)
+    if compiled is not None:
+        return compiled
+
+    import yaml
+
+    # 在读取前取得stat，读取期间文件被修改时下次加载能发现缓存过期
+    stat = os.stat(file_path)
+    with open(file_path, 'rb') as f:
+        raw = f.read()
+    data = yaml.safe_load(raw.decode('utf-8'))
+    if not data or not isinstance(data, dict):
+        return None
+
+    flat = flatten_dict(data)
+    if user_cache_enabled():
+        write_cache(flat, file_path, user_cache_path(file_path), stat=stat, crc=zlib.crc32(raw))
+    return flat
+
+
+def compile_locale_file(source_path, cache_path=None):
+    """
+    把YAML语言文件编译为缓存文件，默认写到源文件同目录下
+
+    Returns:
+        str: 缓存文件路径
+
+    Raises:
+        ValueError: 文件内容不是字典或包含非字符串的值
+        OSError: 读写文件失败
+    """
+    import yaml
+
+    cache_path = cache_path or sibling_cache_path(source_path)
+    stat = os.stat(source_path)
+    with open(source_path, 'rb') as f:
+        raw = f.read()
+    data = yaml.safe_load(raw.decode('utf-8'))
+    if not data or not isinstance(data, dict):
+        raise ValueError(f"无效的YAML格式: {source_path}")
+
+    try:
+        content = build_cache(flatten_dict(data), stat.st_mtime_ns, stat.st_size, zlib.crc32(raw))
+    except TypeError as e:
+        raise ValueError(f"{source_path}: {e}") from None
+
+    _replace_file(cache_path, content)
+    return cache_path
+
+
+def _collect_sources(paths):
+    sources = []
+    for path in paths:
+        if os.path.isdir(path):
+            sources.extend(sorted(
+                os.path.join(path, name) for name in os.listdir(path)
+                if name.endswith((".yaml", ".yml"))
+            ))
+        else:
+            sources.append(path)
+    return sources
+
+
+def main(argv=None):
+    """命令行入口：编译或检查语言文件的缓存"""
+    parser = argparse.ArgumentParser(
+        prog="python -m logloom.locale_cache",
+        description="把YAML语言文件编译为可mmap的.llc缓存文件"
+    )
+    parser.add_argument("paths", nargs="+", help="YAML语言文件或包含语言文件的目录")
+    parser.add_argument("--check", action="store_true", help="只检查缓存是否存在且有效，不写入")
+    args = parser.parse_args(argv)
+
+    failed = 0
+    for source in _collect_sources(args.paths):
+        cache_path = sibling_cache_path(source)
+        if args.check:
+            try:
+                compiled = CompiledLocale(cache_path)
+            except (OSError, ValueError) as e:
+                print(f"{source}: 缓存无效 ({e})")
+                failed += 1
+                continue
+            fresh = compiled.is_fresh(source)
+            compiled.close()
+            print(f"{source}: {'缓存有效' if fresh else '缓存已过期'}")
+            failed += not fresh
+            continue
+
+        try:
+            compile_locale_file(source, cache_path)
+        except (OSError, ValueError) as e:
+            print(f"{source}: 编译失败 ({e})", file=sys.stderr)
+            failed += 1
+            continue
+        print(f"{source} -> {cache_path}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,289 @@
+"""
+Logloom 语言资源热加载
+======================
+
+监视已注册的语言资源文件和目录，文件变化后只重建受影响的语言：新的语言表
+完整构建后用一次赋值替换旧表，读取方不加锁，也不会看到构建到一半的表。
+
+Linux上使用inotify（通过ctypes调用libc，无需额外依赖）监视文件所在的目录，
+这样编辑器先写临时文件再重命名的保存方式也能被发现；其他平台或inotify不可用
+时按固定间隔比较文件的mtime和大小。两种方式都以文件状态快照判断哪些文件发生
+了变化，inotify只负责及时唤醒检查。
+"""
+
+import os
+import sys
+import glob
+import time
+import errno
+import select
+import ctypes
+import ctypes.util
+import fnmatch
+import logging
+import threading
+
+logger = logging.getLogger("logloom.locale_watch")
+
+# inotify事件：写入关闭、移入/移出、创建、删除、属性变化（touch）
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_WATCH_MASK = (_IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO |
+               _IN_CREATE | _IN_DELETE)
+
+# 默认检查间隔（秒），inotify模式下为等待事件的超时时间
+DEFAULT_INTERVAL = 1.0
+# 收到inotify事件后等待同一批写入结束的时间（秒）
+DEFAULT_SETTLE = 0.05
+
+
+class _Inotify:
+    """libc inotify接口的最小封装"""
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._add_watch.restype = ctypes.c_int
+
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self.fd = fd
+        self._watched = set()
+
+    def add_directory(self, path):
+        if path in self._watched:
+            return True
+        if self._add_watch(self.fd, os.fsencode(path), _WATCH_MASK) < 0:
+            logger.debug(f"无法监视目录: {path} ({os.strerror(ctypes.get_errno())})")
+            return False
+        self._watched.add(path)
+        return True
+
+    def drain(self):
+        """读出所有待处理的事件，返回是否有事件"""
+        got = False
+        while True:
+            try:
+                if not os.read(self.fd, 65536):
+                    return got
+                got = True
+            except OSError as e:
+                if e.errno in (errno.EAGAIN, errno.EWOULDBLOCK):
+                    return got
+                raise
+
+    def close(self):
+        os.close(self.fd)
+
+
+def _open_inotify():
+    """打开inotify，不可用时返回None"""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        return _Inotify()
+    except (OSError, AttributeError) as e:
+        logger.debug(f"inotify不可用，使用轮询: {e}")
+        return None
+
+
+def _file_state(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+class LocaleWatcher:
+    """
+    语言资源文件监视器
+
+    reload_callback(paths)接收一批发生变化（修改、新建或删除）的文件路径，
+    返回每个重建语言的差异列表[{"lang", "added", "removed", "changed"}]，
+    失败时抛出异常。
+    """
+
+    def __init__(self, reload_callback, interval=DEFAULT_INTERVAL, use_inotify=True):
+        self._reload = reload_callback
+        self.interval = interval
+        self._files = set()
+        self._directories = {}      # 目录 -> 文件匹配模式列表
+        self._snapshot = {}         # 文件路径 -> (mtime_ns, size, inode)
+        # 重新加载回调可能注册新文件并再次进入watch_file
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._inotify = _open_inotify() if use_inotify else None
+        # inotify模式下线程阻塞在select上，stop通过管道唤醒它
+        self._wake = os.pipe() if self._inotify else None
+        self._stats = {
+            "backend": "inotify" if self._inotify else "polling",
+            "reloads": 0,
+            "failures": 0,
+            "keys_added": 0,
+            "keys_removed": 0,
+            "keys_changed": 0,
+            "last_latency_ms": 0.0,
+            "max_latency_ms": 0.0,
+            "total_latency_ms": 0.0,
+            "last_reload": None,
+            "last_error": None,
+        }
+
+    def watch_file(self, path):
+        """监视一个语言资源文件"""
+        path = os.path.abspath(path)
+        with self._lock:
+            self._files.add(path)
+            self._snapshot.setdefault(path, _file_state(path))
+        if self._inotify:
+            self._inotify.add_directory(os.path.dirname(path))
+
+    def watch_directory(self, path, pattern="*.yaml"):
+        """监视目录中匹配模式的语言资源文件，包括之后新建的文件"""
+        path = os.path.abspath(path)
+        with self._lock:
+            patterns = self._directories.setdefault(path, [])
+            if pattern not in patterns:
+                patterns.append(pattern)
+            for file_path in glob.glob(os.path.join(glob.escape(path), pattern)):
+                self._snapshot.setdefault(file_path, _file_state(file_path))
+        if self._inotify:
+            self._inotify.add_directory(path)
+
+    def _current_paths(self):
+        paths = set(self._files)
+        for directory, patterns in self._directories.items():
+            try:
+                names = os.listdir(directory)
+            except OSError:
+                continue
+            for name in names:
+                if any(fnmatch.fnmatch(name, pattern) for pattern in patterns):
+                    paths.add(os.path.join(directory, name))
+        # 已删除的文件也要与快照比较
+        paths.update(self._snapshot)
+        return paths
+
+    def check(self):
+        """
+        比较文件状态并重新加载发生变化的文件
+
+        Returns:
+        --------
+        list
+            本次重建的语言差异列表
+        """
+        with self._lock:
+            changed = []
+            for path in self._current_paths():
+                state = _file_state(path)
+                if self._snapshot.get(path) != state:
+                    changed.append(path)
+                    if state is None and path not in self._files:
+                        # 目录中已删除的文件不再跟踪
+                        self._snapshot.pop(path, None)
+                    else:
+                        self._snapshot[path] = state
+            if not changed:
+                return []
+            return self._apply(sorted(changed))
+
+    def _apply(self, paths):
+        stats = self._stats
+        start = time.perf_counter()
+        try:
+            diffs = self._reload(paths) or []
+        except Exception as e:
+            stats["failures"] += 1
+            stats["last_error"] = f"{paths}: {e}"
+            logger.error(f"重新加载语言资源失败: {paths} - {e}")
+            return []
+
+        latency = (time.perf_counter() - start) * 1000.0
+        stats["reloads"] += 1
+        stats["last_latency_ms"] = latency
+        stats["max_latency_ms"] = max(stats["max_latency_ms"], latency)
+        stats["total_latency_ms"] += latency
+        for diff in diffs:
+            stats["keys_added"] += len(diff["added"])
+            stats["keys_removed"] += len(diff["removed"])
+            stats["keys_changed"] += len(diff["changed"])
+        stats["last_reload"] = {"paths": paths, "diffs": diffs, "latency_ms": latency}
+        logger.info(f"已重新加载语言资源: {', '.join(d['lang'] for d in diffs) or '-'} "
+                    f"({latency:.2f} ms)")
+        return diffs
+
+    def stats(self):
+        """返回重新加载次数、失败次数、延迟和键差异统计"""
+        with self._lock:
+            return dict(self._stats)
+
+    def start(self):
+        """启动后台监视线程"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="logloom-locale-watch", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """停止后台监视线程"""
+        self._stop.set()
+        if self._wake:
+            os.write(self._wake[1], b"x")
+        if self._thread:
+            self._thread.join(timeout if timeout is not None else self.interval * 2)
+            self._thread = None
+        if self._inotify:
+            self._inotify.close()
+            self._inotify = None
+        if self._wake:
+            for fd in self._wake:
+                os.close(fd)
+            self._wake = None
+
+    @property
+    def running(self):
+        return bool(self._thread and self._thread.is_alive())
+
+    def _run(self):
+        while not self._stop.is_set():
+            if self._inotify:
+                try:
+                    ready, _, _ = select.select([self._inotify.fd, self._wake[0]], [], [], self.interval)
+                except (OSError, ValueError):
+                    break
+                if self._wake[0] in ready or not ready or not self._inotify.drain():
+                    continue
+                # 合并同一次保存产生的多个事件
+                self._stop.wait(DEFAULT_SETTLE)
+                if self._inotify:
+                    self._inotify.drain()
+            elif self._stop.wait(self.interval):
+                break
+            try:
+                self.check()
+            except Exception as e:
+                logger.error(f"检查语言资源文件失败: {e}")
+
+
+def diff_tables(lang_code, old, new):
+    """比较同一语言重建前后的两张表，返回新增、删除和修改的键"""
+    old = old if old is not None else {}
+    old_keys = set(old)
+    new_keys = set(new)
+    return {
+        "lang": lang_code,
+        "added": sorted(new_keys - old_keys),
+        "removed": sorted(old_keys - new_keys),
+        "changed": sorted(k for k in old_keys & new_keys if old[k] != new[k]),
+    }
@@ -7,9 +7,10 @@ Logloom Logger 类
 
 import sys
 import threading
-import inspect
 import os
 import time
+import queue
+import atexit
 
 # 尝试获取C扩展函数
 try:
@@ -272,6 +273,37 @@ except ImportError:
         return True
 
 
+# 日志级别权重，数值越大越严重
+_LEVEL_RANKS = {
+    "DEBUG": 0,
+    "INFO": 1,
+    "WARN": 2,
+    "ERROR": 3,
+    "FATAL": 4
+}
+
+# 底层全局日志级别对应的权重缓存，新建的Logger实例以此为初始值
+_global_level_rank = _LEVEL_RANKS["INFO"]
+
+
+def _sync_level_cache(level):
+    """
+    底层全局日志级别变化后，同步Logger实例缓存的级别权重
+
+    纯Python模式下通过set_level设置了实例级别的Logger按实例级别过滤，
+    不受全局级别影响，因此不同步。未知的级别按DEBUG处理，即不做提前过滤，交由底层判断。
+    """
+    global _global_level_rank
+    
+    if hasattr(level, 'value'):
+        level = level.value
+    rank = _LEVEL_RANKS.get(str(level).upper(), _LEVEL_RANKS["DEBUG"])
+    _global_level_rank = rank
+    for instance in Logger._instances:
+        if not instance._has_instance_level:
+            instance._level_rank = rank
+
+
 class Logger:
     """
     Logloom日志记录器，提供友好的Python API
@@ -296,11 +328,15 @@ class Logger:
         self._log_file = None  # 日志文件路径
         self._instance_lock = threading.RLock()  # 实例级别的锁
         self._instance_id = id(self)  # 实例ID，用于纯Python实现中跟踪不同的实例
+        # 缓存的有效级别权重，日志方法据此在格式化消息前快速过滤
+        self._level_rank = _global_level_rank
+        # 纯Python模式下是否设置了实例级别，设置后缓存的权重不再跟随全局级别
+        self._has_instance_level = False
         
         # 将实例添加到实例列表
         Logger._instances.append(self)
         
-    def _get_caller_module(self):
+    def _get_caller_module(self, depth=2):
         """
         从调用栈获取调用者的模块名
         如果在初始化时提供了名称，则使用该名称
@@ -308,20 +344,31 @@ class Logger:
         if self.name:
             return self.name
             
+        import inspect
+        
         # 获取调用栈
         stack = inspect.stack()
-        # 第0层是当前函数，第1层是日志方法，第2层是用户代码
-        if len(stack) >= 3:
-            caller_frame = stack[2]
+        # 默认第0层是当前函数，第1层是日志方法，第2层是用户代码
+        if len(stack) > depth:
+            caller_frame = stack[depth]
             module = inspect.getmodule(caller_frame[0])
             if module:
                 return os.path.basename(module.__file__).split('.')[0]
         
         return "unknown"
     
-    def debug(self, message, *args, **kwargs):
-        """记录调试级别日志"""
-        module = kwargs.pop('module', None) or self._get_caller_module()
+    def _log(self, level, log_func, message, args, kwargs):
+        """
+        记录日志的公共流程
+
+        先用缓存的级别权重判断是否需要记录，被过滤的消息直接返回，
+        不会触发调用栈查找、消息格式化以及日志文件切换。
+        """
+        if _LEVEL_RANKS[level] < self._level_rank:
+            return
+        
+        # 第0层是_get_caller_module，第1层是_log，第2层是日志方法，第3层是用户代码
+        module = kwargs.pop('module', None) or self._get_caller_module(3)
         
         # 格式化消息
         if args or kwargs:
@@ -330,94 +377,38 @@ class Logger:
             except Exception as e:
                 message = f"{message} (格式化失败: {e})"
         
+        self._emit(log_func, module, message)
+    
+    def _emit(self, log_func, module, message):
+        """将已格式化的日志消息交给底层日志函数写出"""
         # 总是传递实例ID，无论是否使用C扩展
         if not _has_c_extension:
-            _debug(module, message, self._instance_id)
+            log_func(module, message, self._instance_id)
         else:
             # 对于C扩展，我们需要先设置当前实例的日志文件
             if self._log_file:
                 _set_log_file(self._log_file)
-            _debug(module, message)
+            log_func(module, message)
+    
+    def debug(self, message, *args, **kwargs):
+        """记录调试级别日志"""
+        self._log("DEBUG", _debug, message, args, kwargs)
     
     def info(self, message, *args, **kwargs):
         """记录信息级别日志"""
-        module = kwargs.pop('module', None) or self._get_caller_module()
-        
-        # 格式化消息
-        if args or kwargs:
-            try:
-                message = message.format(*args, **kwargs)
-            except Exception as e:
-                message = f"{message} (格式化失败: {e})"
-        
-        # 总是传递实例ID，无论是否使用C扩展
-        if not _has_c_extension:
-            _info(module, message, self._instance_id)
-        else:
-            # 对于C扩展，我们需要先设置当前实例的日志文件
-            if self._log_file:
-                _set_log_file(self._log_file)
-            _info(module, message)
+        self._log("INFO", _info, message, args, kwargs)
     
     def warn(self, message, *args, **kwargs):
         """记录警告级别日志"""
-        module = kwargs.pop('module', None) or self._get_caller_module()
-        
-        # 格式化消息
-        if args or kwargs:
-            try:
-                message = message.format(*args, **kwargs)
-            except Exception as e:
-                message = f"{message} (格式化失败: {e})"
-        
-        # 总是传递实例ID，无论是否使用C扩展
-        if not _has_c_extension:
-            _warn(module, message, self._instance_id)
-        else:
-            # 对于C扩展，我们需要先设置当前实例的日志文件
-            if self._log_file:
-                _set_log_file(self._log_file)
-            _warn(module, message)
+        self._log("WARN", _warn, message, args, kwargs)
     
     def error(self, message, *args, **kwargs):
         """记录错误级别日志"""
-        module = kwargs.pop('module', None) or self._get_caller_module()
-        
-        # 格式化消息
-        if args or kwargs:
-            try:
-                message = message.format(*args, **kwargs)
-            except Exception as e:
-                message = f"{message} (格式化失败: {e})"
-        
-        # 总是传递实例ID，无论是否使用C扩展
-        if not _has_c_extension:
-            _error(module, message, self._instance_id)
-        else:
-            # 对于C扩展，我们需要先设置当前实例的日志文件
-            if self._log_file:
-                _set_log_file(self._log_file)
-            _error(module, message)
+        self._log("ERROR", _error, message, args, kwargs)
     
     def fatal(self, message, *args, **kwargs):
         """记录致命错误级别日志"""
-        module = kwargs.pop('module', None) or self._get_caller_module()
-        
-        # 格式化消息
-        if args or kwargs:
-            try:
-                message = message.format(*args, **kwargs)
-            except Exception as e:
-                message = f"{message} (格式化失败: {e})"
-        
-        # 总是传递实例ID，无论是否使用C扩展
-        if not _has_c_extension:
-            _fatal(module, message, self._instance_id)
-        else:
-            # 对于C扩展，我们需要先设置当前实例的日志文件
-            if self._log_file:
-                _set_log_file(self._log_file)
-            _fatal(module, message)
+        self._log("FATAL", _fatal, message, args, kwargs)
     
     def warning(self, message, *args, **kwargs):
         """记录警告级别日志（别名）"""
@@ -449,8 +440,12 @@ class Logger:
         # 在纯Python模式下，设置实例级别的日志级别
         if not _has_c_extension:
             _set_instance_log_level(self._instance_id, level)
+            self._level_rank = _LEVEL_RANKS[level]
+            self._has_instance_level = True
         else:
             _set_log_level(level)
+            # 底层级别是全局的，所有实例的缓存都需要同步
+            _sync_level_cache(level)
     
     def set_file(self, file_path):
         """设置日志输出文件路径"""
@@ -498,4 +493,115 @@ class Logger:
     
     def get_level(self):
         """获取当前日志级别"""
-        return self._current_level
\ No newline at end of file
+        return self._current_level
+
+
+class _AsyncWriter:
+    """
+    AsyncLogger共享的后台写入线程
+
+    所有记录按提交顺序写出，刷新标记排在队列中，
+    写入线程处理到标记时通知等待的协程。
+    """
+    
+    _STOP = object()
+    _FLUSH = object()
+    _CALL = object()
+    
+    def __init__(self):
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._lock = threading.Lock()
+    
+    def submit(self, item):
+        """提交一条记录或刷新标记，必要时启动写入线程"""
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name="logloom-async-writer", daemon=True)
+                    self._thread.start()
+                    atexit.register(self.stop)
+        self._queue.put(item)
+    
+    def call_in_order(self, func, *args):
+        """
+        在写入顺序中执行func
+
+        写入线程运行时func排在已提交的记录之后、由写入线程执行，
+        之前提交的记录按原设置写出；写入线程未启动时直接执行。
+        """
+        if self._thread is None:
+            func(*args)
+            return
+        self._queue.put((self._CALL, func, args))
+    
+    def stop(self):
+        """写出剩余记录并停止写入线程"""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is not None:
+            self._queue.put(self._STOP)
+            thread.join()
+    
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is self._STOP:
+                break
+            
+            if item[0] is self._FLUSH:
+                # 刷新标记：之前提交的记录都已写出。等待的协程可能已被取消，
+                # 事件循环也可能已经关闭，此时没有需要通知的对象
+                future = item[1]
+                if future.done():
+                    continue
+                try:
+                    future.get_loop().call_soon_threadsafe(_resolve_flush, future)
+                except RuntimeError:
+                    pass
+                continue
+            
+            if item[0] is self._CALL:
+                try:
+                    item[1](*item[2])
+                except Exception as e:
+                    print(f"[ERROR] 写入线程执行设置失败: {e}")
+                continue
+            
+            logger_instance, log_func, module, message = item
+            try:
+                Logger._emit(logger_instance, log_func, module, message)
+            except Exception as e:
+                print(f"[ERROR] 异步写入日志失败: {e}")
+
+
+def _resolve_flush(future):
+    """在事件循环中完成刷新等待"""
+    if not future.done():
+        future.set_result(None)
+
+
+_async_writer = _AsyncWriter()
+
+
+class AsyncLogger(Logger):
+    """
+    面向asyncio应用的日志记录器
+
+    日志方法在调用方只做级别判断和消息格式化，文件写入等阻塞操作
+    交给后台写入线程完成，不会阻塞事件循环。
+    """
+    
+    def _emit(self, log_func, module, message):
+        """将日志记录提交到后台写入线程"""
+        _async_writer.submit((self, log_func, module, message))
+    
+    async def flush(self):
+        """等待此前提交的所有日志记录写出"""
+        import asyncio
+        
+        future = asyncio.get_running_loop().create_future()
+        _async_writer.submit((_AsyncWriter._FLUSH, future))
+        await future
@@ -18,15 +18,23 @@ import importlib.util
 import importlib.machinery
 import inspect
 import threading
+import queue
+import time
+import atexit
 import logging
 import traceback
+import asyncio
+import bisect
+import math
+import collections
 from typing import Dict, List, Optional, Any, Type, Callable, Union, Set, Tuple
 
 from .plugin_base import (
     Plugin, FilterPlugin, SinkPlugin, AIPlugin, LangPlugin,
     PluginType, PluginMode, PluginCapability, PluginResult, PluginInfo,
-    LogEntry, PluginHelpers
+    LogEntry, PluginHelpers, PluginConfig
 )
+from .rules_filter import RulesFilterPlugin
 
 # 配置日志记录器
 logger = logging.getLogger("logloom.plugin.loader")
@@ -37,6 +45,29 @@ DEFAULT_PLUGIN_PATHS = [
     os.path.expanduser("~/.local/lib/logloom/plugins"),  # 用户级插件
     "/usr/lib/logloom/plugins"  # 系统级插件
 ]
+DEFAULT_BATCH_SIZE = 64  # 批处理输出插件每批的最大条目数
+DEFAULT_BATCH_INTERVAL = 1.0  # 批处理输出插件未满批时的最长等待时间（秒）
+DEFAULT_ASYNC_QUEUE_SIZE = 1024  # 异步插件队列默认容量
+ASYNC_POLICY_DROP = "drop"  # 队列满时丢弃新条目
+ASYNC_POLICY_BLOCK = "block"  # 队列满时阻塞日志线程
+DEFAULT_DISCOVERY_CACHE = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+    "logloom", "plugin_cache.json"
+)  # 插件发现缓存文件
+DISCOVERY_CACHE_VERSION = 1  # 插件发现缓存格式版本，格式变化时旧缓存整体失效
+# 插件处理延迟直方图前7个桶的上界（秒），与C中的PLUGIN_STATS_BUCKET_BOUNDS_US一致，最后一个桶收纳其余调用
+STATS_BUCKET_BOUNDS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01)
+ERROR_LOG_INTERVAL = 1000  # 插件首次出错后，每累计这么多次错误才再输出一条错误日志
+BREAKER_CLOSED = "closed"  # 熔断器关闭，正常调用插件
+BREAKER_OPEN = "open"  # 熔断器打开，插件被暂停
+BREAKER_HALF_OPEN = "half_open"  # 探测中，下一次调用的结果决定恢复还是再次熔断
+DEFAULT_BREAKER_WINDOW = 20  # 熔断器统计最近多少次调用
+DEFAULT_BREAKER_ERROR_RATE = 0.5  # 最近调用中失败比例达到该值时熔断，0表示不启用熔断
+DEFAULT_BREAKER_LATENCY = 0.0  # 单次调用耗时超过该值（秒）视为失败，0表示不限制
+DEFAULT_BREAKER_RESET_TIMEOUT = 30.0  # 熔断后多久（秒）重新启用插件进行探测
+
+# 随插件系统提供的内置插件，只有在plugin_configs中存在对应配置节时才注册
+BUILTIN_PLUGINS: Tuple[Type[Plugin], ...] = (RulesFilterPlugin,)
 
 
 class PluginInstance:
@@ -61,6 +92,310 @@ class PluginInstance:
         self.module = None  # Python模块对象
 
 
+class PluginStats:
+    """
+    插件处理统计，对应C中的plugin_stats_t
+    
+    记录处理函数的调用次数、处理条目数、错误数、过滤数、累计/最大耗时和耗时直方图
+    """
+    
+    __slots__ = ("calls", "entries", "errors", "filtered", "total_time", "max_time", "histogram", "_lock")
+    
+    def __init__(self):
+        self.calls = 0
+        self.entries = 0
+        self.errors = 0
+        self.filtered = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.histogram = [0] * (len(STATS_BUCKET_BOUNDS) + 1)
+        self._lock = threading.Lock()
+    
+    def record(self, elapsed: float, entries: int = 1, error: bool = False):
+        """
+        记录一次处理函数调用
+        
+        Args:
+            elapsed: 调用耗时（秒）
+            entries: 本次处理的条目数
+            error: 调用是否出错
+        
+        Returns:
+            记录后的累计错误数
+        """
+        bucket = bisect.bisect_left(STATS_BUCKET_BOUNDS, elapsed)
+        with self._lock:
+            self.calls += 1
+            self.entries += entries
+            self.total_time += elapsed
+            if elapsed > self.max_time:
+                self.max_time = elapsed
+            self.histogram[bucket] += 1
+            if error:
+                self.errors += 1
+            return self.errors
+    
+    def add_error(self) -> int:
+        """记录一次在调用之外发生的错误（如异步插件的协程失败），返回累计错误数"""
+        with self._lock:
+            self.errors += 1
+            return self.errors
+    
+    def add_filtered(self):
+        """记录过滤器插件拒绝了一条日志"""
+        with self._lock:
+            self.filtered += 1
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """返回统计信息的快照"""
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "entries": self.entries,
+                "errors": self.errors,
+                "filtered": self.filtered,
+                "total_time": self.total_time,
+                "avg_time": self.total_time / self.calls if self.calls else 0.0,
+                "max_time": self.max_time,
+                "histogram": list(self.histogram),
+            }
+
+
+class CircuitBreaker:
+    """
+    插件熔断器
+    
+    统计最近window次调用的结果，失败（抛出异常、返回ERROR或RETRY、耗时超过latency）
+    的比例达到error_rate时熔断。熔断期间插件被禁用，reset_timeout秒后重新启用并进入探测状态，
+    探测调用成功则恢复，失败则再次熔断
+    """
+    
+    __slots__ = ("window", "error_rate", "latency", "reset_timeout", "state", "trips",
+                 "_results", "_failures", "_threshold", "_lock")
+    
+    def __init__(self, window: int = DEFAULT_BREAKER_WINDOW,
+                 error_rate: float = DEFAULT_BREAKER_ERROR_RATE,
+                 latency: float = DEFAULT_BREAKER_LATENCY,
+                 reset_timeout: float = DEFAULT_BREAKER_RESET_TIMEOUT):
+        self.window = max(1, int(window))
+        self.error_rate = float(error_rate)
+        self.latency = float(latency)
+        self.reset_timeout = float(reset_timeout)
+        self.state = BREAKER_CLOSED
+        self.trips = 0
+        self._results: collections.deque = collections.deque(maxlen=self.window)
+        self._failures = 0
+        # 窗口未满时失败次数达到阈值也会熔断，持续失败的插件无需等满一个窗口
+        self._threshold = max(1, math.ceil(self.error_rate * self.window))
+        self._lock = threading.Lock()
+    
+    @property
+    def enabled(self) -> bool:
+        """是否启用熔断"""
+        return self.error_rate > 0
+    
+    @property
+    def failures(self) -> int:
+        """最近window次调用中的失败次数"""
+        return self._failures
+    
+    def record(self, elapsed: float, failed: bool) -> Optional[str]:
+        """
+        记录一次调用结果
+        
+        Args:
+            elapsed: 调用耗时（秒）
+            failed: 调用是否失败
+        
+        Returns:
+            熔断器状态发生变化时返回新状态，否则返回None
+        """
+        if self.latency > 0 and elapsed > self.latency:
+            failed = True
+        
+        with self._lock:
+            if self.state == BREAKER_OPEN:
+                return None
+            if self.state == BREAKER_HALF_OPEN:
+                if failed:
+                    return self._open()
+                self.state = BREAKER_CLOSED
+                self._results.clear()
+                self._failures = 0
+                return BREAKER_CLOSED
+            
+            if len(self._results) == self.window:
+                self._failures -= self._results[0]
+            self._results.append(failed)
+            self._failures += failed
+            if failed and self._failures >= self._threshold:
+                return self._open()
+        return None
+    
+    def half_open(self) -> bool:
+        """熔断超时后进入探测状态，熔断器未打开时返回False"""
+        with self._lock:
+            if self.state != BREAKER_OPEN:
+                return False
+            self.state = BREAKER_HALF_OPEN
+            return True
+    
+    def reset(self):
+        """关闭熔断器并清空调用记录"""
+        with self._lock:
+            self.state = BREAKER_CLOSED
+            self._results.clear()
+            self._failures = 0
+    
+    def _open(self) -> str:
+        self.state = BREAKER_OPEN
+        self.trips += 1
+        return BREAKER_OPEN
+
+
+def _report_plugin_error(errors: int, message: str):
+    """
+    输出插件错误日志，只有首次出错和之后每累计ERROR_LOG_INTERVAL次错误时输出错误级别日志，
+    其余错误只计数，避免出错的插件在每条日志上都输出堆栈
+    """
+    if errors == 1 or errors % ERROR_LOG_INTERVAL == 0:
+        logger.error(f"{message}（累计 {errors} 次）")
+        logger.debug(traceback.format_exc())
+    else:
+        logger.debug(message)
+
+
+class AsyncPluginWorker:
+    """
+    异步插件工作线程，对应C中的plugin_async_queue_t
+    
+    每个ASYNC模式的输出/AI插件拥有一个有界队列和一个工作线程，
+    日志线程只负责入队，慢速插件不会拖慢其他日志线程
+    """
+    
+    _STOP = object()
+    
+    def __init__(self, plugin: Plugin, maxsize: int = DEFAULT_ASYNC_QUEUE_SIZE,
+                 policy: str = ASYNC_POLICY_DROP, batch_size: int = DEFAULT_BATCH_SIZE,
+                 stats: Optional[PluginStats] = None,
+                 on_result: Optional[Callable[[Plugin, float, bool], None]] = None,
+                 breaker: Optional[CircuitBreaker] = None):
+        """
+        创建队列并启动工作线程
+        
+        Args:
+            plugin: 插件实例
+            maxsize: 队列容量
+            policy: 队列满时的策略，ASYNC_POLICY_DROP或ASYNC_POLICY_BLOCK
+            batch_size: 声明了BATCH能力的插件每次最多处理的条目数
+            stats: 记录插件处理统计的对象
+            on_result: 每次调用后以(插件, 耗时, 是否失败)回调
+            breaker: 插件的熔断器，熔断期间队列中的条目被跳过
+        """
+        self.plugin = plugin
+        self.plugin_stats = stats if stats is not None else PluginStats()
+        self.on_result = on_result
+        self.breaker = breaker
+        self.policy = policy
+        self.batch_size = batch_size
+        self.queue: queue.Queue = queue.Queue(maxsize)
+        self.dropped = 0
+        self.processed = 0
+        self._counter_lock = threading.Lock()
+        self._loop = None
+        self._thread = threading.Thread(
+            target=self._run, name=f"logloom-plugin-{plugin.name}", daemon=True
+        )
+        self._thread.start()
+    
+    def submit(self, log_entry: LogEntry) -> bool:
+        """
+        将日志条目放入队列
+        
+        Returns:
+            入队成功返回True，按丢弃策略被丢弃返回False
+        """
+        try:
+            if self.policy == ASYNC_POLICY_BLOCK:
+                self.queue.put(log_entry)
+            else:
+                self.queue.put_nowait(log_entry)
+            return True
+        except queue.Full:
+            with self._counter_lock:
+                self.dropped += 1
+            return False
+    
+    def stop(self):
+        """处理完队列中剩余的条目后停止工作线程"""
+        self.queue.put(self._STOP)
+        if self._thread is not threading.current_thread():
+            self._thread.join()
+    
+    def stats(self) -> Dict[str, int]:
+        """返回队列深度、容量、丢弃数和已处理数"""
+        return {
+            "queue_depth": self.queue.qsize(),
+            "queue_capacity": self.queue.maxsize,
+            "dropped": self.dropped,
+            "processed": self.processed,
+        }
+    
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self.queue.get()
+            if item is self._STOP:
+                break
+            # 顺带取出已在队列中的条目，声明了BATCH能力的插件整批处理
+            batch = [item]
+            while len(batch) < self.batch_size:
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is self._STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._process(batch)
+            with self._counter_lock:
+                self.processed += len(batch)
+        
+        if self._loop is not None:
+            self._loop.close()
+    
+    def _process(self, batch: List[LogEntry]):
+        plugin = self.plugin
+        if plugin.info.capabilities & PluginCapability.BATCH:
+            calls = [(plugin.process_batch, batch, len(batch))]
+        else:
+            calls = [(plugin.process, entry, 1) for entry in batch]
+        
+        for func, arg, entries in calls:
+            if self.breaker is not None and self.breaker.state == BREAKER_OPEN:
+                return
+            start = time.perf_counter()
+            try:
+                result = func(arg)
+                if inspect.isawaitable(result):
+                    # 异步插件在工作线程自己的事件循环中运行
+                    if self._loop is None:
+                        self._loop = asyncio.new_event_loop()
+                    result = self._loop.run_until_complete(result)
+            except Exception as e:
+                elapsed = time.perf_counter() - start
+                errors = self.plugin_stats.record(elapsed, entries, error=True)
+                _report_plugin_error(errors, f"异步插件 {plugin.name} 处理日志时出错: {str(e)}")
+                if self.on_result is not None:
+                    self.on_result(plugin, elapsed, True)
+                continue
+            elapsed = time.perf_counter() - start
+            self.plugin_stats.record(elapsed, entries, result == PluginResult.ERROR)
+            if self.on_result is not None:
+                self.on_result(plugin, elapsed, result in (PluginResult.ERROR, PluginResult.RETRY))
+
+
 class PluginManager:
     """插件管理器，负责发现、加载和管理插件"""
     
@@ -72,8 +407,47 @@ class PluginManager:
         self.disabled_plugins: Set[str] = set()  # 禁用的插件名称集合
         self.ordered_plugins: List[str] = []  # 顺序插件列表
         self.plugin_configs: Dict[str, Any] = {}  # 插件特定配置
+        # 插件配置快照，配置加载或重新加载时构建一次，get_config_*直接读取快照
+        self.config_path: Optional[str] = None
+        self._config_version = 0
+        self._config_snapshots: Dict[str, PluginConfig] = {}
+        self._config_listeners: List[Callable[[str, PluginConfig, PluginConfig], None]] = []
         self.initialized = False  # 是否已初始化
         self.lock = threading.RLock()  # 线程锁
+        # 按类型预先排序的分发元组，只在插件加载、卸载或启用状态变化时重建，
+        # 分发日志时直接迭代，无需加锁
+        self._dispatch: Dict[PluginType, Tuple[Plugin, ...]] = {}
+        # 声明了BATCH能力的输出插件按插件累积日志条目，
+        # 达到批大小或超过刷新间隔时整批交给process_batch
+        self.batch_size = DEFAULT_BATCH_SIZE
+        self.batch_interval = DEFAULT_BATCH_INTERVAL
+        self._batch_buffers: Dict[Plugin, List[LogEntry]] = {}
+        self._batch_started: Dict[Plugin, float] = {}
+        self._batch_lock = threading.Lock()
+        self._batch_stop = threading.Event()
+        self._batch_flusher: Optional[threading.Thread] = None
+        # ASYNC模式的输出/AI插件各自的工作线程，随分发元组一起重建
+        self.async_queue_size = DEFAULT_ASYNC_QUEUE_SIZE
+        self.async_queue_policy = ASYNC_POLICY_DROP
+        self._async_workers: Dict[Plugin, AsyncPluginWorker] = {}
+        # 插件发现缓存：插件路径 -> {"mtime": 修改时间, "classes": [插件类元数据]}，
+        # 持久化到磁盘，未变化的插件文件无需导入即可得知其中的插件名称和信息
+        self.discovery_cache_path: Optional[str] = DEFAULT_DISCOVERY_CACHE
+        self._discovery_cache: Optional[Dict[str, Dict[str, Any]]] = None
+        self._discovery_cache_dirty = False
+        self._plugin_modules: Dict[str, Any] = {}  # 本次加载中已导入的插件模块
+        self._discovered_instances: Dict[Tuple[str, str], Plugin] = {}  # 发现时创建、尚未使用的插件实例
+        # 已发现但被禁用、尚未导入的插件：名称 -> (插件路径, 类名)，首次启用时才导入
+        self._deferred_plugins: Dict[str, Tuple[str, str]] = {}
+        # 各插件的处理统计，插件卸载时移除
+        self._stats: Dict[Plugin, PluginStats] = {}
+        # 各插件的熔断器及其待执行的熔断/探测定时器，参数可在plugin_configs中按插件覆盖
+        self.breaker_window = DEFAULT_BREAKER_WINDOW
+        self.breaker_error_rate = DEFAULT_BREAKER_ERROR_RATE
+        self.breaker_latency = DEFAULT_BREAKER_LATENCY
+        self.breaker_reset_timeout = DEFAULT_BREAKER_RESET_TIMEOUT
+        self._breakers: Dict[Plugin, CircuitBreaker] = {}
+        self._breaker_timers: Dict[str, threading.Timer] = {}
     
     def initialize(self, plugin_dir: Optional[str] = None, config_path: Optional[str] = None) -> int:
         """
@@ -103,6 +477,7 @@ class PluginManager:
                 logger.warning(f"指定的插件目录不存在: {abs_plugin_dir}")
         
         # 从配置文件加载
+        self.config_path = config_path
         if config_path and os.path.isfile(config_path):
             try:
                 with open(config_path, 'r') as f:
@@ -130,6 +505,30 @@ class PluginManager:
                 if 'plugin_configs' in config and isinstance(config['plugin_configs'], dict):
                     self.plugin_configs = config['plugin_configs']
                 
+                # 加载批处理参数
+                if isinstance(config.get('batch_size'), int) and config['batch_size'] > 0:
+                    self.batch_size = config['batch_size']
+                if isinstance(config.get('batch_interval'), (int, float)) and config['batch_interval'] > 0:
+                    self.batch_interval = float(config['batch_interval'])
+                
+                # 加载异步插件队列参数
+                if isinstance(config.get('async_queue_size'), int) and config['async_queue_size'] > 0:
+                    self.async_queue_size = config['async_queue_size']
+                if config.get('async_queue_policy') in (ASYNC_POLICY_DROP, ASYNC_POLICY_BLOCK):
+                    self.async_queue_policy = config['async_queue_policy']
+                
+                # 加载熔断器参数
+                if isinstance(config.get('breaker_window'), int) and config['breaker_window'] > 0:
+                    self.breaker_window = config['breaker_window']
+                for key in ('breaker_error_rate', 'breaker_latency', 'breaker_reset_timeout'):
+                    if isinstance(config.get(key), (int, float)) and config[key] >= 0:
+                        setattr(self, key, float(config[key]))
+                
+                # 加载插件发现缓存路径，false或null表示不使用缓存
+                if 'discovery_cache' in config:
+                    cache_path = config['discovery_cache']
+                    self.discovery_cache_path = os.path.expanduser(cache_path) if isinstance(cache_path, str) else None
+                
                 logger.info(f"从配置文件加载了插件系统配置: {config_path}")
             except Exception as e:
                 logger.error(f"加载配置文件失败: {str(e)}")
@@ -186,6 +585,125 @@ class PluginManager:
         """
         return self.plugin_configs.get(plugin_name)
     
+    def get_config_snapshot(self, plugin_name: str) -> PluginConfig:
+        """
+        获取插件的配置快照，首次调用时构建
+        
+        Args:
+            plugin_name: 插件名称
+        
+        Returns:
+            配置快照，插件没有配置时为空快照
+        """
+        snapshot = self._config_snapshots.get(plugin_name)
+        if snapshot is None:
+            snapshot = PluginConfig(plugin_name, self.plugin_configs.get(plugin_name), self._config_version)
+            snapshot = self._config_snapshots.setdefault(plugin_name, snapshot)
+        return snapshot
+    
+    def _attach_config(self, plugin: Plugin):
+        """为插件设置配置快照，插件声明了config_schema时按schema构建"""
+        schema = getattr(type(plugin), 'config_schema', None)
+        if schema:
+            snapshot = PluginConfig(plugin.name, self.plugin_configs.get(plugin.name),
+                                    self._config_version, schema)
+        else:
+            snapshot = self.get_config_snapshot(plugin.name)
+        plugin.set_config(snapshot)
+    
+    def add_config_listener(self, callback: Callable[[str, PluginConfig, PluginConfig], None]):
+        """
+        注册配置变化监听器
+        
+        重新加载配置后，对每个配置发生变化的插件调用callback(插件名称, 旧快照, 新快照)
+        
+        Args:
+            callback: 回调函数
+        """
+        with self.lock:
+            if callback not in self._config_listeners:
+                self._config_listeners = self._config_listeners + [callback]
+    
+    def remove_config_listener(self, callback: Callable[[str, PluginConfig, PluginConfig], None]):
+        """
+        移除配置变化监听器
+        
+        Args:
+            callback: 之前注册的回调函数
+        """
+        with self.lock:
+            self._config_listeners = [cb for cb in self._config_listeners if cb != callback]
+    
+    def reload_config(self, config_path: Optional[str] = None) -> int:
+        """
+        重新加载插件配置（plugin_configs）
+        
+        只有配置内容发生变化的插件会得到新的快照：已加载的插件通过
+        on_config_change收到通知，随后调用已注册的配置变化监听器。
+        读取配置的线程无需加锁，替换前取到的旧快照保持不变
+        
+        Args:
+            config_path: 配置文件路径，默认为初始化时使用的路径
+        
+        Returns:
+            0表示成功，非0表示失败
+        """
+        config_path = config_path or self.config_path
+        if not config_path:
+            logger.error("没有可重新加载的插件配置文件")
+            return -1
+        
+        try:
+            with open(config_path, 'r') as f:
+                config = json.load(f)
+        except Exception as e:
+            logger.error(f"重新加载配置文件失败: {str(e)}")
+            return -1
+        
+        plugin_configs = config.get('plugin_configs') if isinstance(config, dict) else None
+        if not isinstance(plugin_configs, dict):
+            plugin_configs = {}
+        
+        changes = []
+        with self.lock:
+            self.config_path = config_path
+            old_configs = self.plugin_configs
+            changed = [name for name in set(old_configs) | set(plugin_configs)
+                       if old_configs.get(name) != plugin_configs.get(name)]
+            if not changed:
+                return 0
+            
+            self._config_version += 1
+            self.plugin_configs = plugin_configs
+            old_snapshots = self._config_snapshots
+            snapshots = dict(old_snapshots)
+            for name in changed:
+                snapshots.pop(name, None)
+            self._config_snapshots = snapshots
+            
+            for name in sorted(changed):
+                old = old_snapshots.get(name) or PluginConfig(name, old_configs.get(name), self._config_version - 1)
+                changes.append((name, old, self.get_config_snapshot(name)))
+                
+                instance = self.plugin_list.get(name)
+                if instance:
+                    instance.config = plugin_configs.get(name)
+                    try:
+                        self._attach_config(instance.plugin)
+                    except Exception as e:
+                        logger.error(f"插件 {name} 处理配置变化异常: {str(e)}")
+            listeners = self._config_listeners
+        
+        for name, old, new in changes:
+            for callback in listeners:
+                try:
+                    callback(name, old, new)
+                except Exception as e:
+                    logger.error(f"配置变化监听器异常: {str(e)}")
+        
+        logger.info(f"重新加载了插件配置: {config_path}，{len(changes)} 个插件的配置发生变化")
+        return 0
+    
     def create_plugin_helpers(self) -> PluginHelpers:
         """
         创建插件辅助函数
@@ -212,14 +730,7 @@ class PluginManager:
         Returns:
             配置值，如果未找到则返回默认值
         """
-        config = self.get_plugin_config(plugin_name)
-        if not config or key not in config:
-            return default_value
-        
-        try:
-            return int(config[key])
-        except (ValueError, TypeError):
-            return default_value
+        return self.get_config_snapshot(plugin_name).get_int(key, default_value)
     
     def get_config_string(self, plugin_name: str, key: str, default_value: str) -> str:
         """
@@ -233,14 +744,7 @@ class PluginManager:
         Returns:
             配置值，如果未找到则返回默认值
         """
-        config = self.get_plugin_config(plugin_name)
-        if not config or key not in config:
-            return default_value
-        
-        try:
-            return str(config[key])
-        except (ValueError, TypeError):
-            return default_value
+        return self.get_config_snapshot(plugin_name).get_string(key, default_value)
     
     def get_config_bool(self, plugin_name: str, key: str, default_value: bool) -> bool:
         """
@@ -254,18 +758,7 @@ class PluginManager:
         Returns:
             配置值，如果未找到则返回默认值
         """
-        config = self.get_plugin_config(plugin_name)
-        if not config or key not in config:
-            return default_value
-        
-        value = config[key]
-        if isinstance(value, bool):
-            return value
-        elif isinstance(value, str):
-            return value.lower() in ('true', 'yes', '1', 'on')
-        elif isinstance(value, int):
-            return value != 0
-        return default_value
+        return self.get_config_snapshot(plugin_name).get_bool(key, default_value)
     
     def get_config_array(self, plugin_name: str, key: str) -> List[str]:
         """
@@ -278,14 +771,7 @@ class PluginManager:
         Returns:
             字符串数组，如果未找到则返回空数组
         """
-        config = self.get_plugin_config(plugin_name)
-        if not config or key not in config:
-            return []
-        
-        value = config[key]
-        if isinstance(value, list):
-            return [str(item) for item in value]
-        return []
+        return self.get_config_snapshot(plugin_name).get_array(key)
     
     def discover_plugins(self) -> List[str]:
         """
@@ -320,6 +806,142 @@ class PluginManager:
         
         return plugin_files
     
+    def _plugin_mtime(self, plugin_path: str) -> Optional[float]:
+        """
+        获取插件的修改时间，插件包取目录及其中Python文件的最新修改时间
+        
+        Args:
+            plugin_path: 插件文件或目录路径
+        
+        Returns:
+            修改时间，无法读取时返回None
+        """
+        try:
+            mtime = os.stat(plugin_path).st_mtime
+            if os.path.isdir(plugin_path):
+                with os.scandir(plugin_path) as entries:
+                    for entry in entries:
+                        if entry.name.endswith('.py'):
+                            mtime = max(mtime, entry.stat().st_mtime)
+            return mtime
+        except OSError:
+            return None
+    
+    def _load_discovery_cache(self) -> Dict[str, Dict[str, Any]]:
+        """读取磁盘上的插件发现缓存，缓存不存在、损坏或版本不符时返回空缓存"""
+        if self._discovery_cache is not None:
+            return self._discovery_cache
+        
+        self._discovery_cache = {}
+        if not self.discovery_cache_path or not os.path.isfile(self.discovery_cache_path):
+            return self._discovery_cache
+        
+        try:
+            with open(self.discovery_cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, dict) and data.get('version') == DISCOVERY_CACHE_VERSION:
+                self._discovery_cache = data.get('plugins') or {}
+        except (OSError, ValueError) as e:
+            logger.debug(f"读取插件发现缓存失败: {self.discovery_cache_path}, {str(e)}")
+        return self._discovery_cache
+    
+    def save_discovery_cache(self) -> bool:
+        """
+        将插件发现缓存写回磁盘，缓存未变化时不写
+        
+        Returns:
+            成功或无需写入返回True，失败返回False
+        """
+        if not self._discovery_cache_dirty or not self.discovery_cache_path:
+            return True
+        
+        # 先写临时文件再替换，避免并发启动的进程读到写了一半的缓存
+        tmp_path = f"{self.discovery_cache_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.discovery_cache_path) or '.', exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': DISCOVERY_CACHE_VERSION, 'plugins': self._discovery_cache},
+                          f, ensure_ascii=False)
+            os.replace(tmp_path, self.discovery_cache_path)
+        except OSError as e:
+            logger.debug(f"写入插件发现缓存失败: {self.discovery_cache_path}, {str(e)}")
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            return False
+        
+        self._discovery_cache_dirty = False
+        return True
+    
+    def _import_plugin_module(self, plugin_path: str) -> Optional[Any]:
+        """导入插件模块，同一次加载中每个插件文件只导入一次"""
+        module = self._plugin_modules.get(plugin_path)
+        if module is None:
+            module, _ = self.load_plugin_module(plugin_path)
+            if module is not None:
+                self._plugin_modules[plugin_path] = module
+        return module
+    
+    def discover_plugin_classes(self, plugin_path: str) -> List[Dict[str, Any]]:
+        """
+        获取插件文件中各插件类的元数据，插件文件未变化时直接使用发现缓存而不导入
+        
+        Args:
+            plugin_path: 插件文件或目录路径
+        
+        Returns:
+            插件类元数据列表，每项包含class、name、type、version、author、description
+        """
+        cache = self._load_discovery_cache()
+        mtime = self._plugin_mtime(plugin_path)
+        cached = cache.get(plugin_path)
+        if mtime is not None and cached and cached.get('mtime') == mtime:
+            return cached.get('classes', [])
+        
+        module = self._import_plugin_module(plugin_path)
+        if module is None:
+            # 导入失败不写入缓存，下次启动时重试
+            return []
+        
+        classes = []
+        for plugin_class in self.find_plugin_classes(module):
+            try:
+                plugin = plugin_class()
+            except Exception as e:
+                logger.error(f"实例化插件失败: {plugin_class.__name__}, {str(e)}")
+                continue
+            info = plugin.info
+            classes.append({
+                'class': plugin_class.__name__,
+                'name': getattr(plugin, 'name', None) or plugin_class.__name__,
+                'type': int(info.type),
+                'version': info.version,
+                'author': info.author,
+                'description': info.description,
+            })
+            # 加载时直接使用这个实例，避免重复构造
+            self._discovered_instances[(plugin_path, plugin_class.__name__)] = plugin
+        
+        if mtime is not None:
+            cache[plugin_path] = {'mtime': mtime, 'classes': classes}
+            self._discovery_cache_dirty = True
+        return classes
+    
+    def get_discovered_plugins(self) -> List[Dict[str, Any]]:
+        """
+        列出搜索路径中发现的全部插件，不加载插件
+        
+        Returns:
+            插件元数据列表，在discover_plugin_classes的基础上增加path和enabled
+        """
+        discovered = []
+        for plugin_path in self.discover_plugins():
+            for meta in self.discover_plugin_classes(plugin_path):
+                discovered.append(dict(meta, path=plugin_path, enabled=self.is_plugin_enabled(meta['name'])))
+        self.save_discovery_cache()
+        return discovered
+    
     def load_plugin_module(self, plugin_path: str) -> Tuple[Optional[Any], str]:
         """
         加载插件模块
@@ -415,20 +1037,23 @@ class PluginManager:
         
         return plugin_classes
     
-    def instantiate_plugin(self, plugin_class: Type[Plugin], plugin_path: str) -> Optional[PluginInstance]:
+    def instantiate_plugin(self, plugin_class: Type[Plugin], plugin_path: str,
+                           plugin: Optional[Plugin] = None) -> Optional[PluginInstance]:
         """
         实例化插件
         
         Args:
             plugin_class: 插件类
             plugin_path: 插件文件路径
+            plugin: 已创建的插件对象，为None时新建
         
         Returns:
             插件实例，如果失败则返回None
         """
         try:
             print(f"[DEBUG] 实例化插件类: {plugin_class.__name__}")
-            plugin = plugin_class()
+            if plugin is None:
+                plugin = plugin_class()
             
             # 从类名或路径推断插件名称
             plugin_name = getattr(plugin, 'name', None) or plugin_class.__name__
@@ -456,6 +1081,7 @@ class PluginManager:
             )
             instance.config = config
             instance.enabled = enabled
+            self._attach_config(plugin)
             
             return instance
         
@@ -478,6 +1104,13 @@ class PluginManager:
         
         loaded_count = 0
         
+        # 先注册已配置的内置插件
+        for plugin_class in BUILTIN_PLUGINS:
+            plugin = plugin_class()
+            if (plugin.name in self.plugin_configs and plugin.name not in self.plugin_list
+                    and self.register_plugin(plugin)):
+                loaded_count += 1
+        
         # 创建插件辅助函数
         helpers = self.create_plugin_helpers()
         
@@ -486,61 +1119,381 @@ class PluginManager:
         logger.info(f"发现了 {len(plugin_files)} 个潜在插件文件")
         
         for plugin_path in plugin_files:
-            # 加载模块
-            module, module_name = self.load_plugin_module(plugin_path)
-            if not module:
-                continue
-            
-            # 查找插件类
-            plugin_classes = self.find_plugin_classes(module)
+            # 从发现缓存获取插件类元数据，插件文件未变化时不导入
+            plugin_classes = self.discover_plugin_classes(plugin_path)
             if not plugin_classes:
                 logger.debug(f"在模块中未找到插件类: {plugin_path}")
                 print(f"[DEBUG] 在模块中未找到插件类: {plugin_path}")
                 continue
             
-            # 为每个插件类创建实例
-            for plugin_class in plugin_classes:
-                with self.lock:
-                    # 实例化插件
-                    instance = self.instantiate_plugin(plugin_class, plugin_path)
-                    if not instance:
-                        continue
-                    
-                    # 检查是否已存在同名插件
-                    if instance.name in self.plugin_list:
-                        logger.warning(f"插件 {instance.name} 已加载，跳过")
-                        continue
-                    
-                    # 初始化插件
-                    try:
-                        print(f"[DEBUG] 初始化插件: {instance.name}")
-                        init_result = instance.plugin.init(helpers)
-                        if init_result != 0:
-                            logger.error(f"初始化插件 {instance.name} 失败: 错误码 {init_result}")
-                            print(f"[DEBUG] 初始化插件 {instance.name} 失败: 错误码 {init_result}")
-                            instance.enabled = False
-                        else:
-                            logger.info(f"插件 {instance.name} 初始化成功")
-                            print(f"[DEBUG] 插件 {instance.name} 初始化成功")
-                            loaded_count += 1
-                    except Exception as e:
-                        logger.error(f"初始化插件 {instance.name} 异常: {str(e)}")
-                        print(f"[DEBUG] 初始化插件 {instance.name} 异常: {str(e)}")
-                        print(f"[DEBUG] 详细错误信息: {traceback.format_exc()}")
-                        instance.enabled = False
-                    
-                    # 保存插件实例和模块
-                    self.plugin_list[instance.name] = instance
-                    instance.module = module
+            for meta in plugin_classes:
+                name = meta['name']
+                if name in self.plugin_list:
+                    logger.warning(f"插件 {name} 已加载，跳过")
+                    continue
+                
+                # 禁用的插件只记录位置，首次启用时才导入
+                if not self.is_plugin_enabled(name):
+                    logger.info(f"插件 {name} 已被禁用，跳过加载")
+                    self._deferred_plugins[name] = (plugin_path, meta['class'])
+                    continue
+                
+                if self._load_discovered_plugin(plugin_path, meta['class'], helpers):
+                    loaded_count += 1
+        
+        self._discovered_instances.clear()
+        self.save_discovery_cache()
+        self._stop_workers(self._rebuild_dispatch())
         
         logger.info(f"成功加载了 {loaded_count} 个插件")
         return loaded_count
     
+    def _load_discovered_plugin(self, plugin_path: str, class_name: str, helpers: PluginHelpers) -> bool:
+        """
+        导入并初始化发现的插件类
+        
+        Args:
+            plugin_path: 插件文件或目录路径
+            class_name: 插件类名
+            helpers: 插件辅助函数
+        
+        Returns:
+            插件初始化成功返回True，否则返回False
+        """
+        module = self._import_plugin_module(plugin_path)
+        plugin_class = getattr(module, class_name, None) if module else None
+        if plugin_class is None:
+            logger.error(f"在插件模块中未找到插件类: {plugin_path}, {class_name}")
+            return False
+        
+        with self.lock:
+            # 实例化插件
+            plugin = self._discovered_instances.pop((plugin_path, class_name), None)
+            instance = self.instantiate_plugin(plugin_class, plugin_path, plugin)
+            if not instance:
+                return False
+            
+            # 检查是否已存在同名插件
+            if instance.name in self.plugin_list:
+                logger.warning(f"插件 {instance.name} 已加载，跳过")
+                return False
+            
+            # 初始化插件
+            initialized = False
+            try:
+                print(f"[DEBUG] 初始化插件: {instance.name}")
+                init_result = instance.plugin.init(helpers)
+                if init_result != 0:
+                    logger.error(f"初始化插件 {instance.name} 失败: 错误码 {init_result}")
+                    print(f"[DEBUG] 初始化插件 {instance.name} 失败: 错误码 {init_result}")
+                    instance.enabled = False
+                else:
+                    logger.info(f"插件 {instance.name} 初始化成功")
+                    print(f"[DEBUG] 插件 {instance.name} 初始化成功")
+                    initialized = True
+            except Exception as e:
+                logger.error(f"初始化插件 {instance.name} 异常: {str(e)}")
+                print(f"[DEBUG] 初始化插件 {instance.name} 异常: {str(e)}")
+                print(f"[DEBUG] 详细错误信息: {traceback.format_exc()}")
+                instance.enabled = False
+            
+            # 保存插件实例和模块
+            self.plugin_list[instance.name] = instance
+            instance.module = module
+            return initialized
+    
+    def _load_deferred_plugin(self, name: str) -> Tuple[bool, List[AsyncPluginWorker]]:
+        """
+        首次启用时导入并加载之前因禁用而跳过的插件
+        
+        Args:
+            name: 插件名称
+        
+        Returns:
+            (成功返回True、失败返回False, 需要调用方在释放锁后停止的工作线程)
+        """
+        with self.lock:
+            plugin_path, class_name = self._deferred_plugins.pop(name)
+            self.disabled_plugins.discard(name)
+            if self.enabled_plugins:
+                self.enabled_plugins.add(name)
+            
+            loaded = self._load_discovered_plugin(plugin_path, class_name, self.create_plugin_helpers())
+            stale = self._rebuild_dispatch()
+        
+        if loaded:
+            logger.info(f"插件 {name} 已启用")
+        return loaded, stale
+    
+    def register_plugin(self, plugin: Plugin, path: str = "<builtin>") -> bool:
+        """
+        注册一个已实例化的插件（例如内置插件或在程序中定义的插件）
+        
+        Args:
+            plugin: 插件实例
+            path: 插件来源路径，仅用于显示
+        
+        Returns:
+            成功返回True，失败返回False
+        """
+        if not self.initialized:
+            logger.error("插件系统尚未初始化，无法注册插件")
+            return False
+        
+        name = plugin.name
+        if not self.is_plugin_enabled(name):
+            logger.info(f"插件 {name} 已被禁用，跳过注册")
+            return False
+        
+        with self.lock:
+            if name in self.plugin_list:
+                logger.warning(f"插件 {name} 已加载，跳过")
+                return False
+            
+            instance = PluginInstance(name, path, plugin, self.get_plugin_order(name))
+            instance.config = self.get_plugin_config(name)
+            self._attach_config(plugin)
+            
+            try:
+                init_result = plugin.init(self.create_plugin_helpers())
+            except Exception as e:
+                logger.error(f"初始化插件 {name} 异常: {str(e)}")
+                return False
+            if init_result != 0:
+                logger.error(f"初始化插件 {name} 失败: 错误码 {init_result}")
+                return False
+            
+            self.plugin_list[name] = instance
+            stale = self._rebuild_dispatch()
+        self._stop_workers(stale)
+        
+        logger.info(f"插件 {name} 注册成功")
+        return True
+    
+    def _rebuild_dispatch(self):
+        """
+        按类型重建已启用插件的有序分发元组
+        
+        已移除插件的工作线程不在这里停止，而是返回给调用方：发起移除的操作
+        在释放锁后用_stop_workers停止它们，其他操作不会等待这些线程
+        
+        Returns:
+            已从分发中移除的工作线程
+        """
+        with self.lock:
+            instances = sorted(
+                (instance for instance in self.plugin_list.values()
+                 if instance.enabled and instance.plugin),
+                key=lambda instance: instance.order
+            )
+            dispatch = {}
+            for plugin_type in PluginType:
+                dispatch[plugin_type] = tuple(
+                    instance.plugin for instance in instances
+                    if instance.plugin.info.type == plugin_type
+                )
+            
+            # 为新启用的异步插件启动工作线程，停止已移除插件的工作线程
+            wanted = {
+                plugin
+                for plugin_type in (PluginType.SINK, PluginType.AI)
+                for plugin in dispatch[plugin_type]
+                if plugin.info.mode == PluginMode.ASYNC
+            }
+            workers = {}
+            for plugin in wanted:
+                workers[plugin] = self._async_workers.get(plugin) or self._create_async_worker(plugin)
+            stale = [worker for plugin, worker in self._async_workers.items() if plugin not in wanted]
+            
+            # 整体替换引用，正在分发的线程继续使用旧的元组
+            self._async_workers = workers
+            self._dispatch = dispatch
+            return stale
+    
+    @staticmethod
+    def _stop_workers(workers: List[AsyncPluginWorker]):
+        """
+        停止_rebuild_dispatch移除的工作线程，队列中剩余的条目会先处理完
+        
+        调用方不能持有self.lock：停止时等待队列处理完，处理过程中熔断器需要获取该锁，
+        而且慢速插件的积压不应阻塞插件的注册、启用和禁用
+        """
+        for worker in workers:
+            worker.stop()
+    
+    def _create_async_worker(self, plugin: Plugin) -> AsyncPluginWorker:
+        """按插件配置（queue_size、queue_policy）创建异步工作线程"""
+        config = self.get_plugin_config(plugin.name) or {}
+        maxsize = config.get('queue_size', self.async_queue_size)
+        if not isinstance(maxsize, int) or maxsize <= 0:
+            maxsize = self.async_queue_size
+        policy = config.get('queue_policy', self.async_queue_policy)
+        if policy not in (ASYNC_POLICY_DROP, ASYNC_POLICY_BLOCK):
+            policy = self.async_queue_policy
+        return AsyncPluginWorker(plugin, maxsize, policy, self.batch_size,
+                                 self._stats_for(plugin), self._record_result, self._breaker_for(plugin))
+    
+    def _stop_async_workers(self):
+        """停止所有异步工作线程，队列中剩余的条目会先处理完"""
+        with self.lock:
+            workers = list(self._async_workers.values())
+            self._async_workers = {}
+            self._dispatch = {}
+        self._stop_workers(workers)
+    
+    def _stats_for(self, plugin: Plugin) -> PluginStats:
+        """获取插件的处理统计对象，首次调用时创建"""
+        stats = self._stats.get(plugin)
+        if stats is None:
+            stats = self._stats.setdefault(plugin, PluginStats())
+        return stats
+    
+    def _breaker_for(self, plugin: Plugin) -> CircuitBreaker:
+        """获取插件的熔断器，首次调用时按全局和插件配置（breaker_*）创建"""
+        breaker = self._breakers.get(plugin)
+        if breaker is None:
+            config = self.get_plugin_config(plugin.name) or {}
+            
+            def option(key, default):
+                value = config.get(key, default)
+                return value if isinstance(value, (int, float)) and value >= 0 else default
+            
+            breaker = self._breakers.setdefault(plugin, CircuitBreaker(
+                int(option('breaker_window', self.breaker_window)) or self.breaker_window,
+                option('breaker_error_rate', self.breaker_error_rate),
+                option('breaker_latency', self.breaker_latency),
+                option('breaker_reset_timeout', self.breaker_reset_timeout),
+            ))
+        return breaker
+    
+    def _record_result(self, plugin: Plugin, elapsed: float, failed: bool):
+        """将一次调用结果计入插件的熔断器，熔断或恢复时执行相应动作"""
+        breaker = self._breaker_for(plugin)
+        if not breaker.enabled:
+            return
+        
+        change = breaker.record(elapsed, failed)
+        if change == BREAKER_OPEN:
+            # 在定时器线程中禁用插件：当前线程可能是该插件的工作线程，
+            # 或者正持有分发路径上的锁
+            self._start_breaker_timer(plugin, 0, self._open_circuit)
+        elif change == BREAKER_CLOSED:
+            logger.info(f"插件 {plugin.name} 探测调用成功，已恢复正常调用")
+    
+    def _start_breaker_timer(self, plugin: Plugin, delay: float, action: Callable[[Plugin], None]):
+        """为插件启动熔断相关的定时器，替换该插件之前的定时器"""
+        timer = threading.Timer(delay, action, (plugin,))
+        timer.daemon = True
+        with self.lock:
+            previous = self._breaker_timers.get(plugin.name)
+            if previous is not None:
+                previous.cancel()
+            self._breaker_timers[plugin.name] = timer
+        timer.start()
+    
+    def _cancel_breaker(self, name: str):
+        """取消插件待执行的熔断定时器并关闭其熔断器"""
+        with self.lock:
+            timer = self._breaker_timers.pop(name, None)
+            instance = self.plugin_list.get(name)
+        if timer is not None:
+            timer.cancel()
+        if instance is not None and instance.plugin in self._breakers:
+            self._breakers[instance.plugin].reset()
+    
+    def _open_circuit(self, plugin: Plugin):
+        """熔断：输出一条汇总日志，禁用插件，并安排之后的探测"""
+        breaker = self._breaker_for(plugin)
+        with self.lock:
+            instance = self.plugin_list.get(plugin.name)
+            # 插件已被手动禁用（例如禁用时工作线程仍在处理积压的失败条目）时不再安排探测
+            if (instance is None or instance.plugin is not plugin or not instance.enabled
+                    or breaker.state != BREAKER_OPEN):
+                return
+            logger.warning(
+                f"插件 {plugin.name} 最近 {breaker.window} 次调用中有 {breaker.failures} 次失败或超时，"
+                f"已熔断并暂停调用，{breaker.reset_timeout:g} 秒后重试"
+            )
+            _, stale = self._set_enabled(plugin.name, False)
+        self._stop_workers(stale)
+        self._start_breaker_timer(plugin, breaker.reset_timeout, self._probe_circuit)
+    
+    def _probe_circuit(self, plugin: Plugin):
+        """熔断超时：重新启用插件，下一次调用作为探测"""
+        breaker = self._breaker_for(plugin)
+        with self.lock:
+            instance = self.plugin_list.get(plugin.name)
+            if instance is None or instance.plugin is not plugin or not breaker.half_open():
+                return
+            self._breaker_timers.pop(plugin.name, None)
+            logger.info(f"插件 {plugin.name} 熔断超时，重新启用以进行探测")
+            _, stale = self._set_enabled(plugin.name, True)
+        self._stop_workers(stale)
+    
+    def get_stats(self, name: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        获取插件处理统计
+        
+        Args:
+            name: 插件名称，为None时返回所有已加载插件
+        
+        Returns:
+            插件名称到统计信息的映射。统计信息包括calls、entries、errors、filtered、
+            total_time、avg_time、max_time（秒）、histogram（按STATS_BUCKET_BOUNDS分桶的调用次数）、
+            breaker_state和breaker_trips，异步插件另有queue_depth、queue_capacity和dropped
+        """
+        with self.lock:
+            instances = [
+                instance for instance in self.plugin_list.values()
+                if name is None or instance.name == name
+            ]
+        
+        result = {}
+        for instance in sorted(instances, key=lambda instance: instance.order):
+            stats = self._stats_for(instance.plugin).snapshot()
+            breaker = self._breaker_for(instance.plugin)
+            stats["breaker_state"] = breaker.state
+            stats["breaker_trips"] = breaker.trips
+            worker = self._async_workers.get(instance.plugin)
+            if worker is not None:
+                queue_stats = worker.stats()
+                stats["queue_depth"] = queue_stats["queue_depth"]
+                stats["queue_capacity"] = queue_stats["queue_capacity"]
+                stats["dropped"] = queue_stats["dropped"]
+            result[instance.name] = stats
+        return result
+    
+    def get_queue_stats(self, name: Optional[str] = None) -> Dict[str, Dict[str, int]]:
+        """
+        获取异步插件的队列统计
+        
+        Args:
+            name: 插件名称，为None时返回所有异步插件
+        
+        Returns:
+            插件名称到统计信息（queue_depth、queue_capacity、dropped、processed）的映射
+        """
+        return {
+            plugin.name: worker.stats()
+            for plugin, worker in self._async_workers.items()
+            if name is None or plugin.name == name
+        }
+    
     def unload_all_plugins(self):
         """卸载所有插件"""
         if not self.initialized:
             return
         
+        # 关闭插件前先交付尚未满批的日志，并处理完异步队列
+        self.flush_batches()
+        self._stop_async_workers()
+        
+        with self.lock:
+            timers = list(self._breaker_timers.values())
+            self._breaker_timers.clear()
+        for timer in timers:
+            timer.cancel()
+        
         with self.lock:
             # 复制键列表以避免在迭代过程中修改字典
             plugin_names = list(self.plugin_list.keys())
@@ -559,7 +1512,13 @@ class PluginManager:
                 # 从字典中移除
                 del self.plugin_list[name]
             
+            self._stats.clear()
+            self._breakers.clear()
+            self._deferred_plugins.clear()
+            self._plugin_modules.clear()
+            stale = self._rebuild_dispatch()
             logger.info(f"已卸载所有插件")
+        self._stop_workers(stale)
     
     def set_plugin_enabled(self, name: str, enabled: bool) -> bool:
         """
@@ -575,17 +1534,75 @@ class PluginManager:
         if not self.initialized:
             return False
         
+        # 手动设置状态时取消熔断器的暂停和探测
+        self._cancel_breaker(name)
+        result, stale = self._set_enabled(name, enabled)
+        self._stop_workers(stale)
+        return result
+    
+    def apply_plugin_lists(self, enabled: Optional[List[str]] = None,
+                           disabled: Optional[List[str]] = None) -> Dict[str, bool]:
+        """
+        运行时替换启用/禁用插件列表，只切换按新列表应处于不同状态的插件
+        
+        只有按新旧列表判断的启用状态发生变化的插件才会被切换，
+        被熔断器暂停或手动切换过状态的插件不受无关修改的影响
+        
+        Args:
+            enabled: 新的启用插件列表，None表示保持当前列表
+            disabled: 新的禁用插件列表，None表示保持当前列表
+        
+        Returns:
+            状态发生变化的插件：名称 -> 新状态
+        """
+        changed = {}
+        stale = []
+        with self.lock:
+            names = list(self.plugin_list) + [name for name in self._deferred_plugins
+                                              if name not in self.plugin_list]
+            previous = {name: self.is_plugin_enabled(name) for name in names}
+            if enabled is not None:
+                self.enabled_plugins = set(enabled)
+            if disabled is not None:
+                self.disabled_plugins = set(disabled)
+            
+            for name in names:
+                wanted = self.is_plugin_enabled(name)
+                instance = self.plugin_list.get(name)
+                current = instance.enabled if instance else False
+                if wanted == previous[name] or wanted == current:
+                    continue
+                self._cancel_breaker(name)
+                result, removed = self._set_enabled(name, wanted)
+                stale.extend(removed)
+                if result:
+                    changed[name] = wanted
+        self._stop_workers(stale)
+        return changed
+    
+    def _set_enabled(self, name: str, enabled: bool) -> Tuple[bool, List[AsyncPluginWorker]]:
+        """
+        设置插件状态，供set_plugin_enabled和熔断器使用
+        
+        Returns:
+            (成功返回True、失败返回False, 需要调用方在释放锁后停止的工作线程)
+        """
         with self.lock:
             if name not in self.plugin_list:
+                if enabled and name in self._deferred_plugins:
+                    return self._load_deferred_plugin(name)
                 logger.error(f"插件 {name} 未找到，无法更改其状态")
-                return False
+                return False, []
             
             instance = self.plugin_list[name]
+            if not enabled:
+                self.flush_batches(instance.plugin)
             instance.enabled = enabled
             instance.plugin.enabled = enabled
+            stale = self._rebuild_dispatch()
             
             logger.info(f"插件 {name} 已{'启用' if enabled else '禁用'}")
-            return True
+            return True, stale
     
     def get_plugin(self, name: str) -> Optional[Plugin]:
         """
@@ -628,17 +1645,8 @@ class PluginManager:
         if not self.initialized:
             return []
         
-        plugins = []
-        with self.lock:
-            for instance in self.plugin_list.values():
-                if (instance.enabled and 
-                    instance.plugin and 
-                    instance.plugin.info.type == plugin_type):
-                    plugins.append(instance.plugin)
-        
-        # 按优先级排序
-        plugins.sort(key=lambda p: self.get_plugin_order(p.name))
-        return plugins
+        # 分发元组已按优先级排序
+        return list(self._dispatch.get(plugin_type, ()))
     
     def get_filter_plugins(self) -> List[Plugin]:
         """获取所有过滤器插件"""
@@ -665,17 +1673,12 @@ class PluginManager:
         if not self.initialized:
             return True  # 默认通过
         
-        filters = self.get_filter_plugins()
-        
-        for plugin in filters:
-            try:
-                result = plugin.process(log_entry)
-                if result != PluginResult.OK:
-                    # 过滤器插件要求过滤
-                    return False
-            except Exception as e:
-                logger.error(f"过滤器插件 {plugin.name} 处理日志时出错: {str(e)}")
-                logger.debug(traceback.format_exc())
+        for plugin in self._dispatch.get(PluginType.FILTER, ()):
+            result = self._invoke(plugin, plugin.process, log_entry, "过滤器插件")
+            if result is not None and result != PluginResult.OK:
+                # 过滤器插件要求过滤
+                self._stats_for(plugin).add_filtered()
+                return False
         
         return True
     
@@ -689,14 +1692,227 @@ class PluginManager:
         if not self.initialized:
             return
         
-        sinks = self.get_sink_plugins()
+        for plugin in self._dispatch.get(PluginType.SINK, ()):
+            if plugin.info.mode == PluginMode.ASYNC and self._submit_async(plugin, log_entry):
+                continue
+            if plugin.info.capabilities & PluginCapability.BATCH:
+                self._add_to_batch(plugin, log_entry)
+                continue
+            self._invoke(plugin, plugin.process, log_entry, "输出插件")
+    
+    def process_record_batch(self, batch):
+        """
+        使用所有输出插件处理一批已写出的日志记录
+        
+        可作为记录接收函数注册（logloom.add_record_sink），使C日志管道写出的日志
+        也交给输出插件。声明了BATCH能力的同步插件一次性接收整批条目，
+        之前逐条累积的条目先行交付；异步插件逐条入队；其余插件逐条处理
+        
+        Args:
+            batch: RecordBatch，或(timestamp, level, module, message)元组的序列
+        """
+        if not self.initialized:
+            return
+        
+        sinks = self._dispatch.get(PluginType.SINK, ())
+        if not sinks:
+            return
+        entries = [LogEntry(level, timestamp, message, module)
+                   for timestamp, level, module, message in batch]
+        if not entries:
+            return
         
         for plugin in sinks:
+            worker = self._async_workers.get(plugin)
+            if plugin.info.mode == PluginMode.ASYNC and worker is not None:
+                for entry in entries:
+                    worker.submit(entry)
+                continue
+            if plugin.info.capabilities & PluginCapability.BATCH:
+                self.flush_batches(plugin)
+                self._deliver_batch(plugin, entries)
+                continue
+            for entry in entries:
+                self._invoke(plugin, plugin.process, entry, "输出插件")
+    
+    def _invoke(self, plugin: Plugin, func: Callable, arg: Any, kind: str, entries: int = 1) -> Any:
+        """
+        调用插件处理函数并记录耗时和结果
+        
+        异步插件返回的协程在同步路径中执行，计入本次调用的耗时
+        
+        Args:
+            plugin: 插件实例
+            func: 处理函数（process或process_batch）
+            arg: 日志条目或日志条目列表
+            kind: 插件类别名称，用于错误日志
+            entries: 本次处理的条目数
+        
+        Returns:
+            处理函数的返回值，抛出异常时返回None
+        """
+        # 已熔断但尚未从分发列表中移除的插件直接跳过
+        if self._breaker_for(plugin).state == BREAKER_OPEN:
+            return None
+        
+        stats = self._stats_for(plugin)
+        start = time.perf_counter()
+        try:
+            result = func(arg)
+            if inspect.isawaitable(result):
+                result = self._run_async_sink(plugin, result)
+        except Exception as e:
+            elapsed = time.perf_counter() - start
+            errors = stats.record(elapsed, entries, error=True)
+            _report_plugin_error(errors, f"{kind} {plugin.name} 处理日志时出错: {str(e)}")
+            self._record_result(plugin, elapsed, True)
+            return None
+        elapsed = time.perf_counter() - start
+        stats.record(elapsed, entries, result == PluginResult.ERROR)
+        self._record_result(plugin, elapsed, result in (PluginResult.ERROR, PluginResult.RETRY))
+        return result
+    
+    def _submit_async(self, plugin: Plugin, log_entry: LogEntry) -> bool:
+        """
+        将日志条目交给插件的异步工作线程
+        
+        Returns:
+            插件有工作线程（无论条目是否被丢弃）返回True，否则返回False
+        """
+        worker = self._async_workers.get(plugin)
+        if worker is None:
+            return False
+        worker.submit(log_entry)
+        return True
+    
+    def _add_to_batch(self, plugin: Plugin, log_entry: LogEntry):
+        """
+        将日志条目加入插件的待处理批次，满批或超时后立即交付
+        """
+        now = time.monotonic()
+        with self._batch_lock:
+            batch = self._batch_buffers.get(plugin)
+            if batch is None:
+                batch = self._batch_buffers[plugin] = []
+                self._batch_started[plugin] = now
+            batch.append(log_entry)
+            
+            if (len(batch) < self.batch_size and
+                    now - self._batch_started[plugin] < self.batch_interval):
+                self._ensure_batch_flusher()
+                return
+            
+            del self._batch_buffers[plugin]
+            del self._batch_started[plugin]
+        
+        # 在锁外交付，避免慢速插件阻塞其他线程入队
+        self._deliver_batch(plugin, batch)
+    
+    def _deliver_batch(self, plugin: Plugin, batch: List[LogEntry]):
+        """调用插件的process_batch处理一整批日志条目"""
+        self._invoke(plugin, plugin.process_batch, batch, "输出插件", len(batch))
+    
+    def flush_batches(self, plugin: Optional[Plugin] = None, expired_only: bool = False):
+        """
+        交付尚未满批的日志条目
+        
+        Args:
+            plugin: 只刷新指定插件的批次，为None时刷新所有插件
+            expired_only: 只刷新等待时间已超过batch_interval的批次
+        """
+        now = time.monotonic()
+        with self._batch_lock:
+            candidates = [plugin] if plugin is not None else list(self._batch_buffers)
+            pending = []
+            for target in candidates:
+                if target not in self._batch_buffers:
+                    continue
+                if expired_only and now - self._batch_started[target] < self.batch_interval:
+                    continue
+                pending.append((target, self._batch_buffers.pop(target)))
+                del self._batch_started[target]
+        
+        for target, batch in pending:
+            self._deliver_batch(target, batch)
+    
+    def _ensure_batch_flusher(self):
+        """按需启动后台刷新线程（调用方需持有_batch_lock）"""
+        if self._batch_flusher is not None and self._batch_flusher.is_alive():
+            return
+        if self._batch_flusher is None:
+            atexit.register(self.flush_batches)
+        self._batch_stop.clear()
+        self._batch_flusher = threading.Thread(
+            target=self._batch_flush_loop, name="logloom-batch-flusher", daemon=True
+        )
+        self._batch_flusher.start()
+    
+    def _batch_flush_loop(self):
+        """后台线程：定期交付等待超时的批次"""
+        while not self._batch_stop.wait(self.batch_interval / 2):
+            self.flush_batches(expired_only=True)
+    
+    def _run_async_sink(self, plugin: Plugin, awaitable):
+        """
+        在同步调用路径中执行异步输出插件
+        
+        当前线程有运行中的事件循环时作为任务调度，否则就地运行至完成。
+        
+        Returns:
+            就地运行时返回协程的结果，作为任务调度时返回None
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self._await_sink(plugin, awaitable))
+        
+        loop.create_task(self._await_sink(plugin, awaitable))
+        return None
+    
+    async def _await_sink(self, plugin: Plugin, awaitable):
+        try:
+            return await awaitable
+        except Exception as e:
+            errors = self._stats_for(plugin).add_error()
+            _report_plugin_error(errors, f"输出插件 {plugin.name} 处理日志时出错: {str(e)}")
+            self._record_result(plugin, 0.0, True)
+            return None
+    
+    async def process_with_sinks_async(self, log_entry: LogEntry):
+        """
+        在事件循环中使用所有输出插件处理日志条目
+        
+        异步输出插件直接在当前事件循环中等待，同步输出插件照常调用。
+        
+        Args:
+            log_entry: 日志条目
+        """
+        if not self.initialized:
+            return
+        
+        for plugin in self._dispatch.get(PluginType.SINK, ()):
+            if plugin.info.mode == PluginMode.ASYNC and self._submit_async(plugin, log_entry):
+                continue
+            if plugin.info.capabilities & PluginCapability.BATCH:
+                self._add_to_batch(plugin, log_entry)
+                continue
+            if self._breaker_for(plugin).state == BREAKER_OPEN:
+                continue
+            stats = self._stats_for(plugin)
+            start = time.perf_counter()
             try:
-                plugin.process(log_entry)
+                result = plugin.process(log_entry)
+                if inspect.isawaitable(result):
+                    result = await result
             except Exception as e:
-                logger.error(f"输出插件 {plugin.name} 处理日志时出错: {str(e)}")
-                logger.debug(traceback.format_exc())
+                elapsed = time.perf_counter() - start
+                errors = stats.record(elapsed, error=True)
+                _report_plugin_error(errors, f"输出插件 {plugin.name} 处理日志时出错: {str(e)}")
+                self._record_result(plugin, elapsed, True)
+                continue
+            elapsed = time.perf_counter() - start
+            stats.record(elapsed, error=(result == PluginResult.ERROR))
+            self._record_result(plugin, elapsed, result in (PluginResult.ERROR, PluginResult.RETRY))
     
     def process_with_ai(self, log_entry: LogEntry):
         """
@@ -708,14 +1924,10 @@ class PluginManager:
         if not self.initialized:
             return
         
-        ai_plugins = self.get_ai_plugins()
-        
-        for plugin in ai_plugins:
-            try:
-                plugin.process(log_entry)
-            except Exception as e:
-                logger.error(f"AI分析插件 {plugin.name} 处理日志时出错: {str(e)}")
-                logger.debug(traceback.format_exc())
+        for plugin in self._dispatch.get(PluginType.AI, ()):
+            if plugin.info.mode == PluginMode.ASYNC and self._submit_async(plugin, log_entry):
+                continue
+            self._invoke(plugin, plugin.process, log_entry, "AI分析插件")
     
     def shutdown(self):
         """关闭插件系统"""
@@ -723,7 +1935,11 @@ class PluginManager:
             return
         
         self.unload_all_plugins()
+        self._batch_stop.set()
+        if self._batch_flusher is not None and self._batch_flusher is not threading.current_thread():
+            self._batch_flusher.join()
         self.plugin_list = {}
+        self._dispatch = {}
         self.initialized = False
         logger.info("插件系统已关闭")
 
@@ -758,6 +1974,16 @@ def scan_and_load() -> int:
     return plugin_manager.load_all_plugins()
 
 
+def get_discovered_plugins() -> List[Dict[str, Any]]:
+    """
+    列出搜索路径中发现的全部插件，插件文件未变化时不导入
+    
+    Returns:
+        插件元数据列表
+    """
+    return plugin_manager.get_discovered_plugins()
+
+
 def unload_all():
     """卸载所有插件"""
     plugin_manager.unload_all_plugins()
@@ -791,6 +2017,60 @@ def sink_log(log_entry: LogEntry):
     plugin_manager.process_with_sinks(log_entry)
 
 
+def flush_batches():
+    """交付所有批处理输出插件中尚未满批的日志条目"""
+    plugin_manager.flush_batches()
+
+
+def sink_records(batch):
+    """
+    使用输出插件处理一批已写出的日志记录
+    
+    注册为记录接收函数后，C日志管道写出的日志也会交给输出插件：
+    logloom.add_record_sink(sink_records)
+    
+    Args:
+        batch: RecordBatch，或(timestamp, level, module, message)元组的序列
+    """
+    plugin_manager.process_record_batch(batch)
+
+
+def get_stats(name: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    获取插件处理统计
+    
+    Args:
+        name: 插件名称，为None时返回所有已加载插件
+    
+    Returns:
+        插件名称到统计信息的映射
+    """
+    return plugin_manager.get_stats(name)
+
+
+def get_queue_stats(name: Optional[str] = None) -> Dict[str, Dict[str, int]]:
+    """
+    获取异步插件的队列统计
+    
+    Args:
+        name: 插件名称，为None时返回所有异步插件
+    
+    Returns:
+        插件名称到统计信息的映射
+    """
+    return plugin_manager.get_queue_stats(name)
+
+
+async def sink_log_async(log_entry: LogEntry):
+    """
+    在事件循环中使用输出插件处理日志条目
+    
+    Args:
+        log_entry: 日志条目
+    """
+    await plugin_manager.process_with_sinks_async(log_entry)
+
+
 def ai_process(log_entry: LogEntry):
     """
     使用AI分析插件处理日志条目
@@ -801,6 +2081,20 @@ def ai_process(log_entry: LogEntry):
     plugin_manager.process_with_ai(log_entry)
 
 
+def register_plugin(plugin: Plugin, path: str = "<builtin>") -> bool:
+    """
+    注册一个已实例化的插件
+    
+    Args:
+        plugin: 插件实例
+        path: 插件来源路径，仅用于显示
+    
+    Returns:
+        成功返回True，失败返回False
+    """
+    return plugin_manager.register_plugin(plugin, path)
+
+
 def set_plugin_enabled(name: str, enabled: bool) -> bool:
     """
     设置插件状态（启用/禁用）
@@ -841,6 +2135,39 @@ def get_plugin_info(name: str) -> Optional[PluginInfo]:
     return plugin_manager.get_plugin_info(name)
 
 
+def reload_config(config_path: Optional[str] = None) -> int:
+    """
+    重新加载插件配置，配置发生变化的插件会收到通知
+    
+    Args:
+        config_path: 配置文件路径，默认为初始化时使用的路径
+    
+    Returns:
+        0表示成功，非0表示失败
+    """
+    return plugin_manager.reload_config(config_path)
+
+
+def add_config_listener(callback: Callable[[str, PluginConfig, PluginConfig], None]):
+    """
+    注册配置变化监听器，回调参数为(插件名称, 旧快照, 新快照)
+    
+    Args:
+        callback: 回调函数
+    """
+    plugin_manager.add_config_listener(callback)
+
+
+def remove_config_listener(callback: Callable[[str, PluginConfig, PluginConfig], None]):
+    """
+    移除配置变化监听器
+    
+    Args:
+        callback: 之前注册的回调函数
+    """
+    plugin_manager.remove_config_listener(callback)
+
+
 def get_plugins_by_type(plugin_type: PluginType) -> List[Plugin]:
     """
     获取指定类型的所有插件
@@ -8,9 +8,12 @@ Python 版本的 Logloom 插件系统基础接口
 确保与 C 版本的插件系统功能一致，包括：
 - 插件类型和模式枚举
 - 插件信息结构
+- 插件配置快照
 - 插件基类定义
 """
 
+import sys
+import json
 from abc import ABC, abstractmethod
 from enum import IntEnum
 from typing import Dict, Any, List, Optional, Union
@@ -50,6 +53,8 @@ class PluginResult(IntEnum):
 class PluginInfo:
     """插件信息类，对应 C 中的 plugin_info_t"""
     
+    __slots__ = ("name", "version", "author", "type", "mode", "capabilities", "description")
+    
     def __init__(self,
                  name: str,
                  version: str,
@@ -92,7 +97,17 @@ class PluginInfo:
 
 
 class LogEntry:
-    """日志条目类，对应 C 中的 log_entry_t"""
+    """
+    日志条目类，对应 C 中的 log_entry_t
+    
+    使用__slots__避免每个条目的实例字典；context在首次访问时才创建。
+    模块名称经过驻留，同一模块的所有条目共用一个字符串对象。
+    to_dict()和to_json()的结果在首次调用时缓存，由所有插件共享，
+    插件不应修改返回的字典。修改条目字段后需调用invalidate()使缓存失效
+    """
+    
+    __slots__ = ("level", "timestamp", "message", "module", "file", "line",
+                 "_context", "_dict", "_json")
     
     def __init__(self,
                  level: int,
@@ -117,22 +132,218 @@ class LogEntry:
         self.level = level
         self.timestamp = timestamp
         self.message = message
-        self.module = module
+        self.module = sys.intern(module) if type(module) is str else module
         self.file = file
         self.line = line
-        self.context = context or {}
+        self._context = context or None
+        self._dict = None
+        self._json = None
+    
+    @property
+    def context(self) -> Dict[str, Any]:
+        """上下文信息字典，首次访问时创建"""
+        if self._context is None:
+            self._context = {}
+        return self._context
+    
+    @context.setter
+    def context(self, value: Dict[str, Any]):
+        self._context = value
+        self.invalidate()
+    
+    def invalidate(self):
+        """丢弃缓存的序列化结果"""
+        self._dict = None
+        self._json = None
     
     def to_dict(self) -> Dict[str, Any]:
-        """转换为字典形式"""
-        return {
-            "level": self.level,
-            "timestamp": self.timestamp,
-            "message": self.message,
-            "module": self.module,
-            "file": self.file,
-            "line": self.line,
-            "context": self.context
-        }
+        """转换为字典形式（缓存，只读）"""
+        if self._dict is None:
+            self._dict = {
+                "level": self.level,
+                "timestamp": self.timestamp,
+                "message": self.message,
+                "module": self.module,
+                "file": self.file,
+                "line": self.line,
+                "context": self._context if self._context is not None else {}
+            }
+        return self._dict
+    
+    def to_json(self) -> str:
+        """转换为JSON字符串（缓存）"""
+        if self._json is None:
+            self._json = json.dumps(self.to_dict(), ensure_ascii=False, default=str)
+        return self._json
+
+
+# 配置值类型转换，转换失败返回_MISSING；PluginManager.get_config_*与PluginConfig规则一致
+_MISSING = object()
+_UNRESOLVED = object()
+
+
+def _config_int(value):
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return _MISSING
+
+
+def _config_string(value):
+    try:
+        return str(value)
+    except (ValueError, TypeError):
+        return _MISSING
+
+
+def _config_bool(value):
+    if isinstance(value, bool):
+        return value
+    elif isinstance(value, str):
+        return value.lower() in ('true', 'yes', '1', 'on')
+    elif isinstance(value, int):
+        return value != 0
+    return _MISSING
+
+
+def _config_array(value):
+    if isinstance(value, list):
+        return tuple(str(item) for item in value)
+    return _MISSING
+
+
+def _converter_for(default_value):
+    """按schema默认值的类型选择转换函数，bool需在int之前判断"""
+    if isinstance(default_value, bool):
+        return _config_bool
+    if isinstance(default_value, int):
+        return _config_int
+    if isinstance(default_value, str):
+        return _config_string
+    if isinstance(default_value, (list, tuple)):
+        return _config_array
+    return None
+
+
+class PluginConfig:
+    """
+    插件配置快照（只读）
+    
+    配置加载或重新加载时为每个插件构建一次，之后不再修改；重新加载时整体替换为
+    新的快照，持有旧快照的线程继续读取旧值。键名是合法标识符的配置项同时作为
+    实例属性，可直接以config.key读取；插件类通过config_schema声明的配置项按
+    默认值的类型预先转换，未配置时为默认值。get_int等按类型读取的结果在首次
+    读取后缓存，热路径上重复读取只是一次字典查找
+    """
+    
+    def __init__(self,
+                 plugin_name: str,
+                 values: Optional[Dict[str, Any]] = None,
+                 version: int = 0,
+                 schema: Optional[Dict[str, Any]] = None):
+        """
+        构建配置快照
+        
+        Args:
+            plugin_name: 插件名称
+            values: 插件配置（plugin_configs中该插件的部分），会被复制
+            version: 配置版本号，每次重新加载配置时递增
+            schema: 配置项名称到默认值的映射
+        """
+        values = dict(values) if isinstance(values, dict) else {}
+        attrs = self.__dict__
+        attrs['_plugin_name'] = plugin_name
+        attrs['_values'] = values
+        attrs['_version'] = version
+        attrs['_typed'] = {}
+        
+        for key, value in values.items():
+            if isinstance(key, str) and key.isidentifier() and not key.startswith('_') \
+                    and not hasattr(PluginConfig, key):
+                attrs[key] = value
+        
+        for key, default_value in (schema or {}).items():
+            if key.startswith('_') or hasattr(PluginConfig, key):
+                continue
+            convert = _converter_for(default_value)
+            value = values.get(key, _MISSING)
+            if value is not _MISSING and convert is not None:
+                value = convert(value)
+            attrs[key] = default_value if value is _MISSING else value
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("插件配置快照是只读的")
+    
+    def __delattr__(self, name):
+        raise AttributeError("插件配置快照是只读的")
+    
+    def __contains__(self, key) -> bool:
+        return key in self._values
+    
+    def __getitem__(self, key):
+        return self._values[key]
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, PluginConfig):
+            return NotImplemented
+        return self._plugin_name == other._plugin_name and self._values == other._values
+    
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        return f"PluginConfig({self._plugin_name!r}, {self._values!r}, version={self._version})"
+    
+    @property
+    def plugin_name(self) -> str:
+        """插件名称"""
+        return self._plugin_name
+    
+    @property
+    def version(self) -> int:
+        """配置版本号"""
+        return self._version
+    
+    def get(self, key: str, default_value: Any = None) -> Any:
+        """获取原始配置值"""
+        return self._values.get(key, default_value)
+    
+    def keys(self):
+        """配置键"""
+        return self._values.keys()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """返回配置的副本"""
+        return dict(self._values)
+    
+    def _typed_value(self, kind: str, key: str, convert):
+        cache_key = (kind, key)
+        value = self._typed.get(cache_key, _UNRESOLVED)
+        if value is _UNRESOLVED:
+            value = self._values.get(key, _MISSING)
+            if value is not _MISSING:
+                value = convert(value)
+            self._typed[cache_key] = value
+        return value
+    
+    def get_int(self, key: str, default_value: int = 0) -> int:
+        """获取整数配置，未配置或无法转换时返回默认值"""
+        value = self._typed_value('int', key, _config_int)
+        return default_value if value is _MISSING else value
+    
+    def get_string(self, key: str, default_value: str = "") -> str:
+        """获取字符串配置，未配置或无法转换时返回默认值"""
+        value = self._typed_value('string', key, _config_string)
+        return default_value if value is _MISSING else value
+    
+    def get_bool(self, key: str, default_value: bool = False) -> bool:
+        """获取布尔值配置，未配置或无法转换时返回默认值"""
+        value = self._typed_value('bool', key, _config_bool)
+        return default_value if value is _MISSING else value
+    
+    def get_array(self, key: str) -> List[str]:
+        """获取字符串数组配置，未配置或不是数组时返回空数组"""
+        value = self._typed_value('array', key, _config_array)
+        return [] if value is _MISSING else list(value)
 
 
 class PluginHelpers:
@@ -228,6 +439,9 @@ class Plugin(ABC):
     这个类对应C插件中导出的函数集合（plugin_init、plugin_process、plugin_shutdown、plugin_info）
     """
     
+    # 插件声明的配置项：名称 -> 默认值，配置快照按默认值的类型转换后作为属性提供
+    config_schema: Dict[str, Any] = {}
+    
     def __init__(self, name: str, version: str, author: str, 
                  plugin_type: PluginType = PluginType.UNKNOWN,
                  mode: PluginMode = PluginMode.SYNC,
@@ -256,6 +470,7 @@ class Plugin(ABC):
         )
         self._helpers = None
         self._enabled = False
+        self._config: Optional[PluginConfig] = None
     
     @property
     def info(self) -> PluginInfo:
@@ -277,6 +492,46 @@ class Plugin(ABC):
         """设置插件启用状态"""
         self._enabled = value
     
+    @property
+    def config(self) -> PluginConfig:
+        """
+        当前配置快照
+        
+        由插件管理器在初始化插件之前设置，重新加载配置后替换为新快照。
+        热路径中读取配置时应使用此属性（如self.config.max_length），
+        而不是每次调用get_config_*
+        """
+        config = self._config
+        if config is None:
+            config = self._config = PluginConfig(self.name, schema=self.config_schema)
+        return config
+    
+    def set_config(self, config: PluginConfig):
+        """
+        替换配置快照，由插件管理器调用
+        
+        已有快照且配置内容发生变化时调用on_config_change
+        
+        Args:
+            config: 新的配置快照
+        """
+        old = self._config
+        self._config = config
+        if old is not None and old != config:
+            self.on_config_change(old, config)
+    
+    def on_config_change(self, old: PluginConfig, new: PluginConfig):
+        """
+        配置重新加载后的回调，默认不做任何处理
+        
+        根据配置预先编译状态的插件应重写此方法以重新计算
+        
+        Args:
+            old: 旧的配置快照
+            new: 新的配置快照
+        """
+        pass
+    
     @abstractmethod
     def init(self, helpers: PluginHelpers) -> int:
         """
@@ -304,6 +559,25 @@ class Plugin(ABC):
         """
         pass
     
+    def process_batch(self, entries: List[LogEntry]) -> int:
+        """
+        批量处理日志条目（对应C中的plugin_process_batch函数）
+        
+        声明了PluginCapability.BATCH能力的插件由管理器按批调用此方法。
+        默认实现逐条调用process，插件可重写以便在批次末尾统一刷新输出
+        
+        Args:
+            entries: 日志条目列表
+        
+        Returns:
+            全部条目处理成功返回PluginResult.OK，否则返回PluginResult.ERROR
+        """
+        result = PluginResult.OK
+        for entry in entries:
+            if self.process(entry) != PluginResult.OK:
+                result = PluginResult.ERROR
+        return result
+    
     @abstractmethod
     def shutdown(self):
         """
@@ -323,6 +597,8 @@ class Plugin(ABC):
         Returns:
             配置值，如果未找到则返回默认值
         """
+        if self._config is not None:
+            return self._config.get_int(key, default_value)
         if self._helpers and self._helpers.get_config_int:
             return self._helpers.get_int(self.name, key, default_value)
         return default_value
@@ -338,6 +614,8 @@ class Plugin(ABC):
         Returns:
             配置值，如果未找到则返回默认值
         """
+        if self._config is not None:
+            return self._config.get_string(key, default_value)
         if self._helpers and self._helpers.get_config_string:
             return self._helpers.get_string(self.name, key, default_value)
         return default_value
@@ -353,6 +631,8 @@ class Plugin(ABC):
         Returns:
             配置值，如果未找到则返回默认值
         """
+        if self._config is not None:
+            return self._config.get_bool(key, default_value)
         if self._helpers and self._helpers.get_config_bool:
             return self._helpers.get_bool(self.name, key, default_value)
         return default_value
@@ -367,6 +647,8 @@ class Plugin(ABC):
         Returns:
             字符串数组，如果未找到则返回空数组
         """
+        if self._config is not None:
+            return self._config.get_array(key)
         if self._helpers and self._helpers.get_config_array:
             return self._helpers.get_array(self.name, key)
         return []
@@ -392,7 +674,12 @@ class FilterPlugin(Plugin):
 
 
 class SinkPlugin(Plugin):
-    """输出插件基类"""
+    """
+    输出插件基类
+    
+    process 可以定义为 ``async def``，异步输出插件由 sink_log_async
+    在事件循环中直接等待执行。
+    """
     
     def __init__(self, name: str, version: str, author: str,
                  mode: PluginMode = PluginMode.SYNC,
@@ -0,0 +1,266 @@
+"""
+Logloom 原生日志记录
+====================
+
+C日志管道把写出的日志以定长记录加共享文本区的形式成批交给Python：
+RecordBatch 用memoryview包装这两块缓冲区，只在迭代或索引时解包单条记录，
+投递路径上不为每条日志创建Python对象。纯Python实现下由RecordBuffer按同样的
+布局累积记录，因此记录接收函数不需要区分两种实现。
+
+每条记录带有模块名称的驻留ID（见interning），同一批次中同一模块的名称在
+文本区只出现一次，解包时同一模块只解码一次。
+"""
+
+import sys
+import time
+import atexit
+import struct
+import threading
+
+from .interning import intern_id, interned_name, _names as _interned_names
+
+# 与C扩展中的native_record_t一致：时间戳、级别、模块偏移、模块长度、消息偏移、消息长度、模块ID
+RECORD_STRUCT = struct.Struct("=d6I")
+
+# 级别数值对应的名称，与C中的log_level_t一致
+LEVEL_NAMES = ("DEBUG", "INFO", "WARN", "ERROR", "FATAL")
+
+# 默认每批记录数
+DEFAULT_BATCH_SIZE = 256
+
+
+class RecordBatch:
+    """
+    一批日志记录的只读视图
+
+    迭代或索引得到 (timestamp, level, module, message) 元组，level为级别数值，
+    同一模块的module是同一个字符串对象
+    """
+
+    __slots__ = ("records", "text", "_count")
+
+    def __init__(self, records, text):
+        self.records = memoryview(records)
+        self.text = memoryview(text)
+        self._count = len(self.records) // RECORD_STRUCT.size
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        for fields in RECORD_STRUCT.iter_unpack(self.records):
+            yield self._decode(fields)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("record index out of range")
+        return self._decode(RECORD_STRUCT.unpack_from(self.records, index * RECORD_STRUCT.size))
+
+    def levels(self):
+        """只解包级别字段，返回各条记录的级别数值列表"""
+        return [fields[1] for fields in RECORD_STRUCT.iter_unpack(self.records)]
+
+    def module_ids(self):
+        """只解包模块ID字段，返回各条记录的模块驻留ID列表"""
+        return [fields[6] for fields in RECORD_STRUCT.iter_unpack(self.records)]
+
+    def _decode(self, fields):
+        timestamp, level, module_offset, module_length, message_offset, message_length, module_id = fields
+        text = self.text
+        module = _interned_names.get(module_id)
+        if module is None:
+            module = (interned_name(module_id) if module_id else None) or \
+                str(text[module_offset:module_offset + module_length], "utf-8", "replace")
+        # C端按字节截断的消息可能在多字节字符中间结束
+        message = str(text[message_offset:message_offset + message_length], "utf-8", "replace")
+        return (timestamp, level, module, message)
+
+
+class RecordBuffer:
+    """纯Python实现下按原生记录布局累积日志"""
+
+    def __init__(self):
+        self._records = bytearray()
+        self._text = bytearray()
+        self._count = 0
+        self._modules = {}      # 模块ID -> 本批次文本区中的(偏移, 长度)
+
+    def __len__(self):
+        return self._count
+
+    def append(self, level, module, message, timestamp=None):
+        """追加一条记录，返回缓冲区中的记录数"""
+        module_id = intern_id(module or "")
+        location = self._modules.get(module_id)
+        if location is None:
+            module_bytes = (module or "").encode("utf-8")
+            location = self._modules[module_id] = (len(self._text), len(module_bytes))
+            self._text += module_bytes
+        message_bytes = (message or "").encode("utf-8")
+        message_offset = len(self._text)
+        self._text += message_bytes
+        self._records += RECORD_STRUCT.pack(
+            time.time() if timestamp is None else timestamp, level,
+            location[0], location[1], message_offset, len(message_bytes), module_id
+        )
+        self._count += 1
+        return self._count
+
+    def detach(self):
+        """取出缓冲区中的全部记录，没有记录时返回None"""
+        if not self._count:
+            return None
+        batch = RecordBatch(bytes(self._records), bytes(self._text))
+        self._records = bytearray()
+        self._text = bytearray()
+        self._count = 0
+        self._modules = {}
+        return batch
+
+
+# 已注册的记录接收函数，写时复制以便分发时无需加锁
+_sinks = ()
+_lock = threading.Lock()
+_buffer = RecordBuffer()
+_batch_size = DEFAULT_BATCH_SIZE
+_local = threading.local()
+_atexit_registered = False
+
+# C扩展模块，由包初始化时通过bind_native设置
+_native = None
+
+
+def bind_native(module):
+    """绑定C扩展模块，之后记录由C日志管道产生"""
+    global _native
+    _native = module
+    if _native and _sinks:
+        _native.set_record_sink(_dispatch_native)
+
+
+def add_record_sink(sink):
+    """
+    注册记录接收函数
+
+    Parameters:
+    -----------
+    sink : callable
+        接收RecordBatch的函数，在产生日志的线程中被调用。
+        插件系统的输出插件不会自动收到记录，需要时注册logloom.plugin.sink_records
+
+    Returns:
+    --------
+    bool
+        注册是否成功，重复注册返回False
+    """
+    global _sinks, _atexit_registered
+
+    if not callable(sink):
+        raise TypeError("record sink must be callable")
+
+    with _lock:
+        if sink in _sinks:
+            return False
+        first = not _sinks
+        _sinks = _sinks + (sink,)
+        if not _atexit_registered:
+            atexit.register(flush_records)
+            _atexit_registered = True
+
+    if first and _native:
+        _native.set_record_sink(_dispatch_native)
+    return True
+
+
+def remove_record_sink(sink):
+    """
+    注销记录接收函数，注销前先投递缓冲区中的记录
+
+    Returns:
+    --------
+    bool
+        是否找到并注销了该函数
+    """
+    global _sinks
+
+    if sink not in _sinks:
+        return False
+
+    flush_records()
+    with _lock:
+        _sinks = tuple(s for s in _sinks if s != sink)
+        last = not _sinks
+
+    if last and _native:
+        _native.set_record_sink(None)
+    return True
+
+
+def set_record_batch_size(size):
+    """设置每批投递的记录数"""
+    global _batch_size
+
+    size = int(size)
+    if size < 1:
+        raise ValueError("batch size must be at least 1")
+
+    with _lock:
+        _batch_size = size
+    if _native:
+        _native.set_record_batch_size(size)
+
+
+def flush_records():
+    """
+    立即投递缓冲区中的记录
+
+    Returns:
+    --------
+    int
+        投递的记录数
+    """
+    if _native:
+        return _native.flush_records()
+
+    if getattr(_local, "delivering", False):
+        return 0
+    with _lock:
+        batch = _buffer.detach()
+    if batch is None:
+        return 0
+    _deliver(batch)
+    return len(batch)
+
+
+def append_record(level, module, message):
+    """纯Python实现下追加一条已写出的日志，攒满一批时投递"""
+    if not _sinks:
+        return
+
+    with _lock:
+        count = _buffer.append(level, module, message)
+        # 接收函数中记录的日志留在缓冲区，等下一批投递
+        if count < _batch_size or getattr(_local, "delivering", False):
+            return
+        batch = _buffer.detach()
+    _deliver(batch)
+
+
+def _dispatch_native(records, text):
+    """C扩展投递记录批次的入口"""
+    _deliver(RecordBatch(records, text))
+
+
+def _deliver(batch):
+    """将一批记录依次交给各接收函数，单个接收函数失败不影响其他函数"""
+    _local.delivering = True
+    try:
+        for sink in _sinks:
+            try:
+                sink(batch)
+            except Exception as e:
+                sys.stderr.write(f"[WARNING] 日志记录接收函数执行失败: {e}\n")
+    finally:
+        _local.delivering = False
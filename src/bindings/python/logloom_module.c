@@ -1,10 +1,14 @@
 #define PY_SSIZE_T_CLEAN
 #include <Python.h>
 #include <structmember.h>
+#include <pthread.h>
+#include <stdint.h>
 
 #include "lang.h"
 #include "log.h"
 #include "config.h"
+#include "intern.h"
+#include "config_parser.h"
 
 // 日志级别对应表
 static const char* log_levels[] = {"DEBUG", "INFO", "WARN", "ERROR", "FATAL", NULL};
@@ -27,13 +31,360 @@ LOG_WRAPPER(warn)
 LOG_WRAPPER(error)
 LOG_WRAPPER(fatal)
 
+// 解析日志级别对象（字符串或带value属性的枚举），返回级别值，无效时返回-1并设置异常
+static int parse_log_level(PyObject* level_obj) {
+    PyObject* value = NULL;
+    int level = -1;
+    
+    if (PyUnicode_Check(level_obj)) {
+        value = level_obj;
+        Py_INCREF(value);
+    } else if (PyObject_HasAttrString(level_obj, "value")) {
+        value = PyObject_GetAttrString(level_obj, "value");
+    }
+    
+    if (value && PyUnicode_Check(value)) {
+        const char* name = PyUnicode_AsUTF8(value);
+        for (int i = 0; name && log_levels[i]; i++) {
+            if (strcasecmp(name, log_levels[i]) == 0) {
+                level = i;
+                break;
+            }
+        }
+    }
+    
+    if (level < 0 && !PyErr_Occurred()) {
+        PyErr_Format(PyExc_ValueError, "Invalid log level: %R", level_obj);
+    }
+    Py_XDECREF(value);
+    return level;
+}
+
+// 批量记录日志的包装函数，records为(level, module, message)元组序列
+static PyObject* logloom_log_many(PyObject* self, PyObject* args) {
+    PyObject* records;
+    if (!PyArg_ParseTuple(args, "O", &records))
+        return NULL;
+    
+    PyObject* seq = PySequence_Fast(records, "records must be an iterable of (level, module, message)");
+    if (!seq)
+        return NULL;
+    
+    Py_ssize_t count = PySequence_Fast_GET_SIZE(seq);
+    if (count == 0) {
+        Py_DECREF(seq);
+        return PyLong_FromLong(0);
+    }
+    
+    // 每条记录的字段序列需要在写入完成前保持存活，以保证UTF-8指针有效
+    log_entry_t* entries = PyMem_Calloc((size_t)count, sizeof(log_entry_t));
+    PyObject** fields = PyMem_Calloc((size_t)count, sizeof(PyObject*));
+    if (!entries || !fields) {
+        PyMem_Free(entries);
+        PyMem_Free(fields);
+        Py_DECREF(seq);
+        return PyErr_NoMemory();
+    }
+    
+    Py_ssize_t parsed = 0;
+    for (; parsed < count; parsed++) {
+        PyObject* item = PySequence_Fast_GET_ITEM(seq, parsed);
+        PyObject* record = PySequence_Fast(item, "each record must be a (level, module, message) sequence");
+        if (!record)
+            break;
+        fields[parsed] = record;
+        
+        if (PySequence_Fast_GET_SIZE(record) != 3) {
+            PyErr_SetString(PyExc_ValueError, "each record must have exactly 3 fields: (level, module, message)");
+            break;
+        }
+        
+        int level = parse_log_level(PySequence_Fast_GET_ITEM(record, 0));
+        if (level < 0)
+            break;
+        
+        const char* module = PyUnicode_AsUTF8(PySequence_Fast_GET_ITEM(record, 1));
+        const char* message = module ? PyUnicode_AsUTF8(PySequence_Fast_GET_ITEM(record, 2)) : NULL;
+        if (!message)
+            break;
+        
+        entries[parsed].level = (log_level_t)level;
+        entries[parsed].module = module;
+        entries[parsed].message = message;
+    }
+    
+    size_t written = 0;
+    if (!PyErr_Occurred()) {
+        Py_BEGIN_ALLOW_THREADS
+        written = log_write_batch(entries, (size_t)count);
+        Py_END_ALLOW_THREADS
+    }
+    
+    for (Py_ssize_t i = 0; i < count; i++) {
+        Py_XDECREF(fields[i]);
+    }
+    PyMem_Free(fields);
+    PyMem_Free(entries);
+    Py_DECREF(seq);
+    
+    if (PyErr_Occurred())
+        return NULL;
+    return PyLong_FromSize_t(written);
+}
+
+// ---- 原生日志记录管道 ----
+// C日志管道写出的每条日志以定长记录追加到本地缓冲区，模块名和消息正文追加到共享文本区；
+// 攒满一批后一次性交给注册的Python分发函数，Python端通过memoryview按需解包，
+// 投递路径上不为单条日志创建任何Python对象。记录中带有模块名称的驻留ID，
+// 同一批次中同一模块的名称只写入文本区一次
+
+// 定长日志记录，布局与Python端的struct格式"=d6I"一致
+typedef struct {
+    double timestamp;
+    uint32_t level;
+    uint32_t module_offset;
+    uint32_t module_length;
+    uint32_t message_offset;
+    uint32_t message_length;
+    uint32_t module_id;
+} native_record_t;
+
+// 批次内模块名称在文本区中的位置，按驻留ID直接映射
+#define RECORD_MODULE_SLOTS 64
+
+typedef struct {
+    uint32_t id;
+    uint32_t offset;
+    uint32_t length;
+} record_module_slot_t;
+
+// 记录缓冲区
+typedef struct {
+    native_record_t* records;
+    size_t count;
+    size_t capacity;
+    char* text;
+    size_t text_length;
+    size_t text_capacity;
+    record_module_slot_t modules[RECORD_MODULE_SLOTS];
+} record_buffer_t;
+
+#define DEFAULT_RECORD_BATCH_SIZE 256
+
+static pthread_mutex_t record_lock = PTHREAD_MUTEX_INITIALIZER;
+static record_buffer_t record_buffer;
+static size_t record_batch_size = DEFAULT_RECORD_BATCH_SIZE;
+static PyObject* record_sink = NULL;         // 受GIL保护
+static __thread int record_delivering = 0;   // 防止分发函数内再次记录日志时重入投递
+
+static void record_buffer_free(record_buffer_t* buffer) {
+    free(buffer->records);
+    free(buffer->text);
+    memset(buffer, 0, sizeof(*buffer));
+}
+
+// 追加文本到文本区，返回偏移量，失败返回-1
+static long record_buffer_append_text(record_buffer_t* buffer, const char* str, size_t length) {
+    if (buffer->text_length + length > buffer->text_capacity) {
+        size_t capacity = buffer->text_capacity ? buffer->text_capacity : 4096;
+        while (capacity < buffer->text_length + length) {
+            capacity *= 2;
+        }
+        if (capacity > UINT32_MAX) {
+            return -1;
+        }
+        char* text = realloc(buffer->text, capacity);
+        if (!text) {
+            return -1;
+        }
+        buffer->text = text;
+        buffer->text_capacity = capacity;
+    }
+    long offset = (long)buffer->text_length;
+    memcpy(buffer->text + buffer->text_length, str, length);
+    buffer->text_length += length;
+    return offset;
+}
+
+// 追加一条日志记录，内存不足时丢弃该条
+static void record_buffer_append(record_buffer_t* buffer, const log_entry_t* entry) {
+    if (buffer->count == buffer->capacity) {
+        size_t capacity = buffer->capacity ? buffer->capacity * 2 : 64;
+        native_record_t* records = realloc(buffer->records, capacity * sizeof(native_record_t));
+        if (!records) {
+            return;
+        }
+        buffer->records = records;
+        buffer->capacity = capacity;
+    }
+    
+    const char* module = entry->module ? entry->module : "";
+    const char* message = entry->message ? entry->message : "";
+    uint32_t module_id = entry->module_id ? entry->module_id : intern_string(module);
+    record_module_slot_t* slot = module_id ? &buffer->modules[module_id % RECORD_MODULE_SLOTS] : NULL;
+    size_t message_length = strlen(message);
+    size_t saved_length = buffer->text_length;
+    size_t module_length;
+    long module_offset;
+    
+    if (slot && slot->id == module_id) {
+        // 本批次已写入过该模块名称
+        module_offset = slot->offset;
+        module_length = slot->length;
+    } else {
+        module_length = strlen(module);
+        module_offset = record_buffer_append_text(buffer, module, module_length);
+    }
+    long message_offset = module_offset < 0 ? -1 : record_buffer_append_text(buffer, message, message_length);
+    if (message_offset < 0) {
+        buffer->text_length = saved_length;
+        return;
+    }
+    if (slot && slot->id != module_id) {
+        slot->id = module_id;
+        slot->offset = (uint32_t)module_offset;
+        slot->length = (uint32_t)module_length;
+    }
+    
+    native_record_t* record = &buffer->records[buffer->count++];
+    record->timestamp = (double)entry->timestamp;
+    record->level = (uint32_t)entry->level;
+    record->module_offset = (uint32_t)module_offset;
+    record->module_length = (uint32_t)module_length;
+    record->message_offset = (uint32_t)message_offset;
+    record->message_length = (uint32_t)message_length;
+    record->module_id = module_id;
+}
+
+// 取出当前缓冲区的全部记录，调用者需持有record_lock
+static void record_buffer_detach(record_buffer_t* out) {
+    *out = record_buffer;
+    memset(&record_buffer, 0, sizeof(record_buffer));
+}
+
+// 将一批记录交给Python分发函数，调用者需持有GIL，完成后释放批次内存
+static void deliver_records(record_buffer_t* batch) {
+    if (batch->count > 0 && record_sink) {
+        PyObject* sink = record_sink;
+        Py_INCREF(sink);
+        PyObject* records = PyBytes_FromStringAndSize((const char*)batch->records,
+                                                      (Py_ssize_t)(batch->count * sizeof(native_record_t)));
+        PyObject* text = records ? PyBytes_FromStringAndSize(batch->text, (Py_ssize_t)batch->text_length) : NULL;
+        PyObject* result = text ? PyObject_CallFunctionObjArgs(sink, records, text, NULL) : NULL;
+        if (!result) {
+            PyErr_WriteUnraisable(sink);
+        }
+        Py_XDECREF(result);
+        Py_XDECREF(text);
+        Py_XDECREF(records);
+        Py_DECREF(sink);
+    }
+    record_buffer_free(batch);
+}
+
+// 日志记录回调，由C日志管道在日志锁之外调用
+static void record_hook(const log_entry_t* entry, void* user_data) {
+    (void)user_data;
+    record_buffer_t batch = {0};
+    
+    pthread_mutex_lock(&record_lock);
+    record_buffer_append(&record_buffer, entry);
+    if (record_buffer.count >= record_batch_size && !record_delivering) {
+        record_buffer_detach(&batch);
+    }
+    pthread_mutex_unlock(&record_lock);
+    
+    if (batch.count == 0) {
+        return;
+    }
+    if (!Py_IsInitialized()) {
+        record_buffer_free(&batch);
+        return;
+    }
+    
+    record_delivering = 1;
+    PyGILState_STATE gil = PyGILState_Ensure();
+    deliver_records(&batch);
+    PyGILState_Release(gil);
+    record_delivering = 0;
+}
+
+// 立即投递缓冲区中的记录，调用者需持有GIL，返回投递的记录数
+static size_t flush_native_records(void) {
+    record_buffer_t batch = {0};
+    if (record_delivering) {
+        return 0;
+    }
+    
+    pthread_mutex_lock(&record_lock);
+    record_buffer_detach(&batch);
+    pthread_mutex_unlock(&record_lock);
+    
+    size_t count = batch.count;
+    record_delivering = 1;
+    deliver_records(&batch);
+    record_delivering = 0;
+    return count;
+}
+
+// 设置接收记录批次的Python分发函数，None表示取消
+static PyObject* logloom_set_record_sink(PyObject* self, PyObject* args) {
+    PyObject* sink;
+    if (!PyArg_ParseTuple(args, "O", &sink))
+        return NULL;
+    
+    if (sink != Py_None && !PyCallable_Check(sink)) {
+        PyErr_SetString(PyExc_TypeError, "record sink must be callable or None");
+        return NULL;
+    }
+    
+    if (sink == Py_None) {
+        log_set_record_hook(NULL, NULL);
+        flush_native_records();
+        Py_CLEAR(record_sink);
+    } else {
+        Py_INCREF(sink);
+        Py_XSETREF(record_sink, sink);
+        log_set_record_hook(record_hook, NULL);
+    }
+    
+    Py_RETURN_NONE;
+}
+
+// 设置记录批次大小
+static PyObject* logloom_set_record_batch_size(PyObject* self, PyObject* args) {
+    Py_ssize_t size;
+    if (!PyArg_ParseTuple(args, "n", &size))
+        return NULL;
+    
+    if (size < 1) {
+        PyErr_SetString(PyExc_ValueError, "batch size must be at least 1");
+        return NULL;
+    }
+    
+    pthread_mutex_lock(&record_lock);
+    record_batch_size = (size_t)size;
+    pthread_mutex_unlock(&record_lock);
+    
+    Py_RETURN_NONE;
+}
+
+// 立即投递缓冲区中的记录
+static PyObject* logloom_flush_records(PyObject* self, PyObject* Py_UNUSED(ignored)) {
+    return PyLong_FromSize_t(flush_native_records());
+}
+
 // 获取语言字符串的包装函数
-static PyObject* logloom_lang_get(PyObject* self, PyObject* args) {
+static PyObject* logloom_lang_get(PyObject* self, PyObject* args, PyObject* kwargs) {
     const char* key;
-    if (!PyArg_ParseTuple(args, "s", &key))
+    const char* lang_code = NULL;
+    static char* kwlist[] = {"key", "lang", NULL};
+    
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "s|z", kwlist, &key, &lang_code))
         return NULL;
     
-    const char* value = lang_get(key);
+    // 指定lang时只在该语言中查找，不切换全局语言
+    const char* value = lang_code ? lang_get_in(lang_code, key) : lang_get(key);
     if (!value) {
         PyErr_Format(PyExc_KeyError, "Language key not found: %s", key);
         return NULL;
@@ -42,6 +393,75 @@ static PyObject* logloom_lang_get(PyObject* self, PyObject* args) {
     return PyUnicode_FromString(value);
 }
 
+// 已解码的翻译模板，按lang_get返回的模板指针索引，最近使用的排在最后；受GIL保护
+#define TEMPLATE_CACHE_SIZE 256
+static PyObject* template_cache = NULL;
+
+// 返回模板对应的Python字符串（新引用），命中缓存时不再解码UTF-8
+static PyObject* get_template_object(const char* template) {
+    if (!template_cache && !(template_cache = PyDict_New()))
+        return NULL;
+    
+    PyObject* ptr_key = PyLong_FromVoidPtr((void*)template);
+    if (!ptr_key)
+        return NULL;
+    
+    PyObject* cached = PyDict_GetItemWithError(template_cache, ptr_key);
+    if (cached) {
+        // 重新注册语言资源后同一地址可能存放了其他模板，内容一致才使用缓存
+        const char* text = PyUnicode_AsUTF8(cached);
+        if (!text) {
+            Py_DECREF(ptr_key);
+            return NULL;
+        }
+        if (strcmp(text, template) == 0) {
+            // 删除后重新插入，移到最近使用的位置
+            Py_INCREF(cached);
+            if (PyDict_DelItem(template_cache, ptr_key) < 0 ||
+                PyDict_SetItem(template_cache, ptr_key, cached) < 0) {
+                Py_DECREF(cached);
+                cached = NULL;
+            }
+            Py_DECREF(ptr_key);
+            return cached;
+        }
+    } else if (PyErr_Occurred()) {
+        Py_DECREF(ptr_key);
+        return NULL;
+    }
+    
+    PyObject* result = PyUnicode_FromString(template);
+    if (!result) {
+        Py_DECREF(ptr_key);
+        return NULL;
+    }
+    
+    // 缓存已满时淘汰最久未使用的模板
+    if (!cached && PyDict_Size(template_cache) >= TEMPLATE_CACHE_SIZE) {
+        Py_ssize_t pos = 0;
+        PyObject* oldest_key;
+        PyObject* oldest_value;
+        if (PyDict_Next(template_cache, &pos, &oldest_key, &oldest_value)) {
+            Py_INCREF(oldest_key);
+            int rc = PyDict_DelItem(template_cache, oldest_key);
+            Py_DECREF(oldest_key);
+            if (rc < 0) {
+                Py_DECREF(ptr_key);
+                Py_DECREF(result);
+                return NULL;
+            }
+        }
+    }
+    
+    int rc = PyDict_SetItem(template_cache, ptr_key, result);
+    Py_DECREF(ptr_key);
+    if (rc < 0) {
+        Py_DECREF(result);
+        return NULL;
+    }
+    return result;
+}
+
 // 格式化语言字符串的包装函数
 static PyObject* logloom_lang_getf(PyObject* self, PyObject* args, PyObject* kwargs) {
     const char* key = NULL;
@@ -51,16 +471,31 @@ static PyObject* logloom_lang_getf(PyObject* self, PyObject* args, PyObject* kwa
     if (!PyArg_ParseTuple(args, "s|O", &key, &pos_args))
         return NULL;
     
+    // lang关键字参数指定本次查找的语言，不作为格式化参数
+    const char* lang_code = NULL;
+    PyObject* lang_obj = kwargs ? PyDict_GetItemString(kwargs, "lang") : NULL;
+    if (lang_obj) {
+        if (lang_obj != Py_None && !(lang_code = PyUnicode_AsUTF8(lang_obj)))
+            return NULL;
+        Py_INCREF(lang_obj);
+        int rc = PyDict_DelItemString(kwargs, "lang");
+        if (rc < 0) {
+            Py_DECREF(lang_obj);
+            return NULL;
+        }
+    }
+    
     // 获取模板字符串
-    const char* template = lang_get(key);
+    const char* template = lang_code ? lang_get_in(lang_code, key) : lang_get(key);
+    Py_XDECREF(lang_obj);
     if (!template) {
         // 如果模板不存在，返回一个默认错误信息
         PyErr_Format(PyExc_KeyError, "Language key not found: %s", key);
         return NULL;
     }
     
-    // 使用Python的字符串格式化
-    PyObject* formatted = PyUnicode_FromString(template);
+    // 使用Python的字符串格式化，模板对象来自缓存
+    PyObject* formatted = get_template_object(template);
     if (!formatted)
         return NULL;
     
@@ -283,6 +718,11 @@ static PyObject* logloom_set_log_level(PyObject* self, PyObject* args) {
     Py_RETURN_NONE;
 }
 
+// 获取当前日志级别的包装函数
+static PyObject* logloom_get_log_level(PyObject* self, PyObject* Py_UNUSED(ignored)) {
+    return PyUnicode_FromString(log_get_level_string());
+}
+
 // 设置语言的包装函数
 static PyObject* logloom_set_language(PyObject* self, PyObject* args) {
     const char* lang_code;
@@ -375,6 +815,117 @@ static PyObject* logloom_set_output_console(PyObject* self, PyObject* args) {
     Py_RETURN_NONE;
 }
 
+// 按当前路径重新打开日志文件，新文件在调用线程中打开，由下一次写日志的线程换上
+static PyObject* logloom_reopen(PyObject* self, PyObject* Py_UNUSED(ignored)) {
+    bool reopened;
+    Py_BEGIN_ALLOW_THREADS
+    reopened = log_reopen();
+    Py_END_ALLOW_THREADS
+    return PyBool_FromLong(reopened);
+}
+
+// 请求在下一次写日志时重新打开日志文件，只设置原子标志，供信号处理函数使用
+static PyObject* logloom_request_reopen(PyObject* self, PyObject* Py_UNUSED(ignored)) {
+    log_request_reopen();
+    Py_RETURN_NONE;
+}
+
+// 将一项配置变化(旧值, 新值)写入结果字典，pair为NULL时返回false
+static bool set_change(PyObject* changes, const char* name, PyObject* pair) {
+    if (!pair) {
+        return false;
+    }
+    int result = PyDict_SetItemString(changes, name, pair);
+    Py_DECREF(pair);
+    return result == 0;
+}
+
+// 按配置文件的当前内容调整运行中的日志系统
+// 新配置与日志系统的当前状态比较，只应用不同的配置项：级别、大小上限和控制台开关以原子写入切换，
+// 日志文件由log_swap_file在当前线程打开、由下一次写日志的线程换上，运行中的日志调用不会被阻塞
+static PyObject* logloom_reconfigure(PyObject* self, PyObject* args) {
+    const char* config_path = NULL;
+    if (!PyArg_ParseTuple(args, "|z", &config_path))
+        return NULL;
+    
+    if (config_reload(config_path, NULL) != 0) {
+        PyErr_Format(PyExc_ValueError, "Failed to reload config file: %s",
+                     config_path ? config_path : "(last loaded)");
+        return NULL;
+    }
+    
+    PyObject* changes = PyDict_New();
+    if (!changes)
+        return NULL;
+    
+    // 日志级别
+    int current_level = log_get_level();
+    for (int i = 0; log_levels[i]; i++) {
+        if (strcasecmp(config_get_log_level(), log_levels[i]) == 0) {
+            if (i != current_level) {
+                if (!set_change(changes, "level", Py_BuildValue("(ss)", log_levels[current_level], log_levels[i])))
+                    goto error;
+                log_set_level(log_levels[i]);
+            }
+            break;
+        }
+    }
+    
+    // 日志文件大小上限
+    size_t max_size = config_get_max_log_size();
+    size_t current_max_size = log_get_max_file_size();
+    if (max_size != current_max_size) {
+        if (!set_change(changes, "max_size", Py_BuildValue("(nn)", (Py_ssize_t)current_max_size, (Py_ssize_t)max_size)))
+            goto error;
+        log_set_max_file_size(max_size);
+    }
+    
+    // 控制台输出
+    bool console = config_is_console_enabled();
+    if (console != log_is_console_enabled()) {
+        if (!set_change(changes, "console", Py_BuildValue("(NN)", PyBool_FromLong(!console), PyBool_FromLong(console))))
+            goto error;
+        log_set_console_enabled(console ? 1 : 0);
+    }
+    
+    // 默认语言，语言资源不可用时保持当前语言
+    const char* language = config_get_language();
+    const char* current_language = lang_get_current();
+    if (language[0] && (!current_language || strcmp(language, current_language) != 0)) {
+        PyObject* pair = Py_BuildValue("(zs)", current_language, language);
+        if (!pair)
+            goto error;
+        if (!lang_set_language(language)) {
+            Py_DECREF(pair);
+        } else if (!set_change(changes, "language", pair)) {
+            goto error;
+        }
+    }
+    
+    // 日志文件，空字符串表示禁用文件输出
+    const char* file = config_get_log_file()[0] ? config_get_log_file() : NULL;
+    const char* current_file = log_get_file_path();
+    if ((file == NULL) != (current_file == NULL) || (file && strcmp(file, current_file) != 0)) {
+        // 旧路径在新文件换上后释放，先记录下来
+        PyObject* pair = Py_BuildValue("(zz)", current_file, file);
+        if (!pair)
+            goto error;
+        if (!log_swap_file(file)) {
+            Py_DECREF(pair);
+            PyErr_Format(PyExc_OSError, "无法打开日志文件: %s", file);
+            goto error;
+        }
+        if (!set_change(changes, "file", pair))
+            goto error;
+    }
+    
+    return changes;
+    
+error:
+    Py_DECREF(changes);
+    return NULL;
+}
+
 // 初始化Logloom的包装函数
 static PyObject* logloom_initialize(PyObject* self, PyObject* args) {
     const char* config_path = NULL;
@@ -450,14 +1001,117 @@ static PyObject* logloom_initialize(PyObject* self, PyObject* args) {
 
 // 清理Logloom的包装函数
 static PyObject* logloom_cleanup(PyObject* self, PyObject* Py_UNUSED(ignored)) {
+    // 先投递尚未交付的记录，再关闭日志系统
+    flush_native_records();
     log_cleanup();
     lang_cleanup();
     config_cleanup();
+    Py_CLEAR(template_cache);
     
     Py_RETURN_NONE;
 }
 
 // 模块方法定义
+// 驻留字符串，返回驻留ID
+static PyObject* logloom_intern_id(PyObject* self, PyObject* args) {
+    const char* name;
+    if (!PyArg_ParseTuple(args, "s", &name))
+        return NULL;
+    
+    uint32_t id = intern_string(name);
+    if (!id) {
+        PyErr_SetString(PyExc_MemoryError, "intern table is full");
+        return NULL;
+    }
+    return PyLong_FromUnsignedLong(id);
+}
+
+// 返回驻留ID对应的字符串，ID无效时返回None
+static PyObject* logloom_interned_name(PyObject* self, PyObject* args) {
+    unsigned long id;
+    if (!PyArg_ParseTuple(args, "k", &id))
+        return NULL;
+    
+    const char* name = id <= UINT32_MAX ? intern_get_string((uint32_t)id) : NULL;
+    if (!name)
+        Py_RETURN_NONE;
+    return PyUnicode_DecodeUTF8(name, strlen(name), "replace");
+}
+
+// 返回已驻留的字符串数量
+static PyObject* logloom_intern_count(PyObject* self, PyObject* Py_UNUSED(ignored)) {
+    return PyLong_FromSize_t(intern_get_count());
+}
+
+// 将配置节点转换为Python对象：映射为dict，序列为list，纯量为对应的Python类型
+static PyObject* config_node_to_object(const config_node_t* node) {
+    switch (node->type) {
+        case CONFIG_NODE_BOOL:
+            return PyBool_FromLong(node->bool_value);
+        case CONFIG_NODE_INT:
+            return PyLong_FromLongLong(node->int_value);
+        case CONFIG_NODE_FLOAT:
+            return PyFloat_FromDouble(node->float_value);
+        case CONFIG_NODE_STRING:
+            return PyUnicode_DecodeUTF8(node->text, strlen(node->text), "replace");
+        case CONFIG_NODE_SEQUENCE: {
+            PyObject* list = PyList_New((Py_ssize_t)node->count);
+            if (!list)
+                return NULL;
+            Py_ssize_t index = 0;
+            for (const config_node_t* child = node->child; child; child = child->next) {
+                PyObject* item = config_node_to_object(child);
+                if (!item) {
+                    Py_DECREF(list);
+                    return NULL;
+                }
+                PyList_SET_ITEM(list, index++, item);
+            }
+            return list;
+        }
+        case CONFIG_NODE_MAPPING: {
+            PyObject* dict = PyDict_New();
+            if (!dict)
+                return NULL;
+            for (const config_node_t* child = node->child; child; child = child->next) {
+                PyObject* value = config_node_to_object(child);
+                int failed = !value || PyDict_SetItemString(dict, child->key, value) < 0;
+                Py_XDECREF(value);
+                if (failed) {
+                    Py_DECREF(dict);
+                    return NULL;
+                }
+            }
+            return dict;
+        }
+        default:
+            Py_RETURN_NONE;
+    }
+}
+
+// 解析配置文件，与C配置系统共用进程级的解析缓存
+static PyObject* logloom_parse_config(PyObject* self, PyObject* args) {
+    const char* path;
+    if (!PyArg_ParseTuple(args, "s", &path))
+        return NULL;
+    
+    if (access(path, R_OK) != 0) {
+        PyErr_SetFromErrnoWithFilename(PyExc_OSError, path);
+        return NULL;
+    }
+    
+    char error[512];
+    const config_document_t* doc;
+    Py_BEGIN_ALLOW_THREADS
+    doc = config_load_document(path, error, sizeof(error));
+    Py_END_ALLOW_THREADS
+    if (!doc) {
+        PyErr_SetString(PyExc_ValueError, error);
+        return NULL;
+    }
+    return config_node_to_object(config_document_root(doc));
+}
+
 static PyMethodDef LogloomMethods[] = {
     {"initialize", logloom_initialize, METH_VARARGS,
      "Initialize Logloom with an optional config file path"},
@@ -473,12 +1127,30 @@ static PyMethodDef LogloomMethods[] = {
      "Log an error message"},
     {"fatal", logloom_log_fatal, METH_VARARGS,
      "Log a fatal message"},
-    {"get_text", logloom_lang_get, METH_VARARGS,
-     "Get localized text by key"},
+    {"log_many", logloom_log_many, METH_VARARGS,
+     "Log a batch of (level, module, message) records with a single write"},
+    {"set_record_sink", logloom_set_record_sink, METH_VARARGS,
+     "Set the callable receiving batches of native log records, or None to disable"},
+    {"set_record_batch_size", logloom_set_record_batch_size, METH_VARARGS,
+     "Set how many native log records are buffered before delivery"},
+    {"intern_id", logloom_intern_id, METH_VARARGS,
+     "Intern a module name or language key and return its integer ID"},
+    {"interned_name", logloom_interned_name, METH_VARARGS,
+     "Return the string for an interned ID, or None"},
+    {"intern_count", logloom_intern_count, METH_NOARGS,
+     "Return the number of interned strings"},
+    {"parse_config", logloom_parse_config, METH_VARARGS,
+     "Parse a config file with the native parser and return its contents"},
+    {"flush_records", logloom_flush_records, METH_NOARGS,
+     "Deliver buffered native log records immediately"},
+    {"get_text", (PyCFunction)logloom_lang_get, METH_VARARGS | METH_KEYWORDS,
+     "Get localized text by key, optionally in the given language"},
     {"format_text", (PyCFunction)logloom_lang_getf, METH_VARARGS | METH_KEYWORDS,
      "Format localized text with arguments"},
     {"set_log_level", logloom_set_log_level, METH_VARARGS,
      "Set the log level"},
+    {"get_log_level", logloom_get_log_level, METH_NOARGS,
+     "Get the current log level"},
     {"set_language", logloom_set_language, METH_VARARGS,
      "Set the current language"},
     {"get_language", logloom_get_language, METH_NOARGS,
@@ -491,6 +1163,12 @@ static PyMethodDef LogloomMethods[] = {
      "Set the maximum log file size"},
     {"set_output_console", logloom_set_output_console, METH_VARARGS,
      "Enable or disable console output"},
+    {"reconfigure", logloom_reconfigure, METH_VARARGS,
+     "Apply changed settings from the config file to the running logger and return them"},
+    {"reopen", logloom_reopen, METH_NOARGS,
+     "Reopen the log file at its current path after external rotation"},
+    {"request_reopen", logloom_request_reopen, METH_NOARGS,
+     "Request the log file to be reopened on the next write"},
     
     // 新增国际化扩展功能API
     {"register_locale_file", (PyCFunction)logloom_register_locale_file, METH_VARARGS | METH_KEYWORDS,
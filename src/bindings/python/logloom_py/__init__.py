@@ -6,8 +6,8 @@ A Python interface for the Logloom logging and internationalization library.
 """
 import sys
 import os
-import inspect
 import enum
+import threading
 
 # 尝试直接从系统路径导入C扩展模块，如果导入失败，则使用纯Python实现
 try:
@@ -48,6 +48,8 @@ except ImportError:
     
 from .logger import Logger
 from .config import config
+from .templates import compile_template
+from .logloom_pure import set_strict_mode, is_strict_mode
 
 # 添加API别名，使API与文档一致
 def set_log_level(level):
@@ -100,7 +102,7 @@ try:
         scan_and_load as plugin_scan_and_load,
         unload_all as plugin_unload_all,
         shutdown as plugin_shutdown,
-        filter_log, sink_log, ai_process,
+        filter_log, sink_log, sink_log_async, ai_process,
         set_plugin_enabled, get_plugin, get_plugin_info
     )
 except ImportError as e:
@@ -111,10 +113,15 @@ except ImportError as e:
     plugin_initialize = plugin_scan_and_load = plugin_unload_all = plugin_shutdown = lambda *args, **kwargs: None
     filter_log = sink_log = ai_process = lambda *args, **kwargs: None
     set_plugin_enabled = get_plugin = get_plugin_info = lambda *args, **kwargs: None
+    
+    async def sink_log_async(*args, **kwargs):
+        return None
 
 # 纯Python备用实现
 _current_language = "en"  # 默认语言为英文
 _initialized = False
+_missing_keys = {}  # 负查找缓存 {lang_code: set(key)}，内置文本在运行时不会变化
+_call_guard = threading.local()  # 线程本地的递归调用保护标记
 
 # 模拟的国际化文本
 _mock_texts = {
@@ -158,13 +165,14 @@ logger = Logger()
 # 导出主要函数和类，使它们可以直接从logloom_py导入
 __all__ = [
     'initialize', 'cleanup', 'set_language', 'get_current_language',
-    'get_text', 'format_text', 'logger', 'Logger', 'LogLevel', 'config',
+    'get_text', 'format_text', 'set_strict_mode', 'is_strict_mode',
+    'logger', 'Logger', 'LogLevel', 'config',
     'set_log_file', 'set_log_level', 'set_log_max_size', 'set_output_console',
     # 插件系统相关
     'Plugin', 'FilterPlugin', 'SinkPlugin', 'AIPlugin', 'LangPlugin',
     'PluginType', 'PluginMode', 'PluginCapability', 'PluginResult',
     'initialize_plugins', 'load_plugins', 'unload_plugins', 'shutdown_plugins',
-    'filter_log', 'sink_log', 'ai_process',
+    'filter_log', 'sink_log', 'sink_log_async', 'ai_process',
     'set_plugin_enabled', 'get_plugin', 'get_plugin_info'
 ]
 
@@ -353,6 +361,20 @@ def get_current_language():
     
     return _current_language
 
+def _lookup_mock_text(lang, key):
+    """在内置文本中查找翻译键，先查当前语言再回退到英语，找不到时记入负查找缓存"""
+    missing = _missing_keys.get(lang)
+    if missing is not None and key in missing:
+        return None
+    
+    text = _mock_texts.get(lang, {}).get(key)
+    if text is None and lang != 'en':
+        text = _mock_texts.get('en', {}).get(key)
+    
+    if text is None:
+        _missing_keys.setdefault(lang, set()).add(key)
+    return text
+
 def get_text(key, *args):
     """
     获取指定键的国际化文本
@@ -372,15 +394,14 @@ def get_text(key, *args):
     Raises:
     -------
     KeyError
-        当测试模式下找不到指定的键
+        严格模式下找不到指定的键（见 set_strict_mode）
     """
     # 防止递归调用
-    _recursion_guard = getattr(get_text, '_recursion_guard', False)
-    if _recursion_guard:
+    if getattr(_call_guard, 'active', False):
         return key  # 递归时直接返回键名
     
     try:
-        get_text._recursion_guard = True
+        _call_guard.active = True
         
         # 优先使用C扩展获取文本
         if _has_c_extension:
@@ -390,32 +411,24 @@ def get_text(key, *args):
                 print(f"[WARNING] 获取文本失败: {e}")
         
         # 回退到Python实现
-        lang = _current_language
-        
-        # 尝试在当前语言中查找文本
-        text = _mock_texts.get(lang, {}).get(key)
-        
-        # 如果找不到，尝试在英语中查找
-        if text is None and lang != 'en':
-            text = _mock_texts.get('en', {}).get(key)
+        text = _lookup_mock_text(_current_language, key)
         
-        # 如果仍然找不到，根据测试需要抛出KeyError或使用键名
+        # 如果仍然找不到，严格模式下抛出KeyError，否则使用键名
         if text is None:
-            # 对于test_开头的测试用例，抛出KeyError
-            if sys.gettrace() is not None or any(frame.filename.endswith('test_logloom_i18n.py') for frame in inspect.stack()):
+            if is_strict_mode():
                 raise KeyError(f"未找到翻译键: {key}")
             text = key
         
         # 执行格式化（如果有参数）
         if args:
             try:
-                text = text.format(*args)
+                text = compile_template(text).format(args)
             except Exception as e:
                 print(f"[WARNING] 格式化文本失败: {e}")
         
         return text
     finally:
-        get_text._recursion_guard = False
+        _call_guard.active = False
 
 def format_text(key, *args, **kwargs):
     """
@@ -436,12 +449,11 @@ def format_text(key, *args, **kwargs):
         格式化后的翻译文本
     """
     # 防止递归调用
-    _recursion_guard = getattr(format_text, '_recursion_guard', False)
-    if _recursion_guard:
+    if getattr(_call_guard, 'active', False):
         return key  # 递归时直接返回键名
     
     try:
-        format_text._recursion_guard = True
+        _call_guard.active = True
         
         # 优先使用C扩展获取并格式化文本
         if _has_c_extension:
@@ -450,34 +462,29 @@ def format_text(key, *args, **kwargs):
             except Exception as e:
                 print(f"[WARNING] 格式化文本失败: {e}")
         
-        # 回退到Python实现
-        # 先获取文本 - 不递归调用get_text，直接实现类似逻辑
-        lang = _current_language
-        
-        # 尝试在当前语言中查找文本
-        text = _mock_texts.get(lang, {}).get(key)
+        # 回退到Python实现，lang参数只影响本次查找
+        lang = kwargs.pop('lang', None) or _current_language
+        text = _lookup_mock_text(lang, key)
         
-        # 如果找不到，尝试在英语中查找
-        if text is None and lang != 'en':
-            text = _mock_texts.get('en', {}).get(key)
-        
-        # 如果仍然找不到，返回键名
+        # 如果仍然找不到，严格模式下抛出KeyError，否则返回键名
         if text is None:
+            if is_strict_mode():
+                raise KeyError(f"未找到翻译键: {key}")
             text = key
         
-        # 执行格式化
+        # 执行格式化，使用缓存的编译模板
         if args or kwargs:
             try:
                 if kwargs:
-                    text = text.format(**kwargs)
+                    text = compile_template(text).format((), kwargs)
                 elif args:
-                    text = text.format(*args)
+                    text = compile_template(text).format(args)
             except Exception as e:
                 print(f"[WARNING] 格式化文本失败: {e}")
         
         return text
     finally:
-        format_text._recursion_guard = False
+        _call_guard.active = False
 
 # 插件系统包装函数
 def initialize_plugins(plugin_dir=None, config_path=None):
@@ -535,21 +542,33 @@ Logloom 纯Python实现包
 from .logloom_pure import (
     initialize, cleanup,
     debug, info, warn, warning, error, fatal, critical,
-    get_text, format_text,
+    get_text, format_text, set_strict_mode, is_strict_mode,
     set_log_level, set_language, get_language, get_current_language,
     set_log_file, set_log_max_size, set_output_console,
     register_locale_file, register_locale_directory,
     scan_directory_with_glob, auto_discover_resources,
-    get_supported_languages, get_language_keys
+    get_supported_languages, get_language_keys,
+    reload_language, watch_locales, stop_watching_locales, get_locale_reload_stats,
+    get_locale_conflicts,
+    reconfigure, watch_config, stop_watching_config, get_config_reload_stats,
+    reopen, reopen_on_signal
+)
+from .lang_context import (
+    use_language, get_context_language, set_context_language, reset_context_language
 )
 
 __all__ = [
     'initialize', 'cleanup',
     'debug', 'info', 'warn', 'warning', 'error', 'fatal', 'critical',
-    'get_text', 'format_text', 
+    'get_text', 'format_text', 'set_strict_mode', 'is_strict_mode',
     'set_log_level', 'set_language', 'get_language', 'get_current_language',
     'set_log_file', 'set_log_max_size', 'set_output_console',
     'register_locale_file', 'register_locale_directory',
     'scan_directory_with_glob', 'auto_discover_resources',
-    'get_supported_languages', 'get_language_keys'
+    'get_supported_languages', 'get_language_keys',
+    'reload_language', 'watch_locales', 'stop_watching_locales', 'get_locale_reload_stats',
+    'get_locale_conflicts',
+    'reconfigure', 'watch_config', 'stop_watching_config', 'get_config_reload_stats',
+    'reopen', 'reopen_on_signal',
+    'use_language', 'get_context_language', 'set_context_language', 'reset_context_language'
 ]
\ No newline at end of file
@@ -9,6 +9,11 @@ import yaml
 import os
 import sys
 
+try:
+    from .config_loader import load_config
+except ImportError:
+    from config_loader import load_config
+
 # 尝试导入C扩展模块，如果不可用则忽略
 try:
     import logloom
@@ -75,47 +80,46 @@ class Config:
             return True
         
         try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                loaded_config = yaml.safe_load(f)
+            loaded_config = load_config(config_path)
+            
+            if not loaded_config:
+                print(f"警告：配置文件 {config_path} 为空或格式不正确")
+                return False
                 
-                if not loaded_config:
-                    print(f"警告：配置文件 {config_path} 为空或格式不正确")
-                    return False
-                    
-                if not isinstance(loaded_config, dict):
-                    print(f"错误：配置文件 {config_path} 格式不正确，应为YAML词典")
-                    return False
-                    
-                # 递归更新配置，保留默认值
-                self._update_dict(self._config, loaded_config)
+            if not isinstance(loaded_config, dict):
+                print(f"错误：配置文件 {config_path} 格式不正确，应为YAML词典")
+                return False
                 
-                # 如果加载的是原始结构，同步到测试需要的结构
-                if 'logloom' in loaded_config:
-                    logloom_cfg = loaded_config.get('logloom', {})
-                    
-                    # 同步日志配置
-                    log_cfg = logloom_cfg.get('log', {})
-                    if log_cfg:
-                        self._config['logging']['default_level'] = log_cfg.get('level', 'INFO')
-                        self._config['logging']['output_path'] = log_cfg.get('file', 'log.txt')
-                        self._config['logging']['max_file_size'] = log_cfg.get('max_size', 10485760)
-                    
-                    # 同步国际化配置
-                    self._config['i18n']['default_language'] = logloom_cfg.get('language', 'zh')
+            # 递归更新配置，保留默认值
+            self._update_dict(self._config, loaded_config)
+            
+            # 如果加载的是原始结构，同步到测试需要的结构
+            if 'logloom' in loaded_config:
+                logloom_cfg = loaded_config.get('logloom', {})
                 
-                # 同样，如果使用的是测试结构，同步到原始结构
-                if 'logging' in loaded_config:
-                    log_cfg = loaded_config.get('logging', {})
-                    self._config['logloom']['log']['level'] = log_cfg.get('default_level', 'INFO')
-                    self._config['logloom']['log']['file'] = log_cfg.get('output_path', 'log.txt')
-                    self._config['logloom']['log']['max_size'] = log_cfg.get('max_file_size', 10485760)
+                # 同步日志配置
+                log_cfg = logloom_cfg.get('log', {})
+                if log_cfg:
+                    self._config['logging']['default_level'] = log_cfg.get('level', 'INFO')
+                    self._config['logging']['output_path'] = log_cfg.get('file', 'log.txt')
+                    self._config['logging']['max_file_size'] = log_cfg.get('max_size', 10485760)
                 
-                if 'i18n' in loaded_config:
-                    i18n_cfg = loaded_config.get('i18n', {})
-                    self._config['logloom']['language'] = i18n_cfg.get('default_language', 'zh')
-                    
-                self._config_path = config_path
-                return True
+                # 同步国际化配置
+                self._config['i18n']['default_language'] = logloom_cfg.get('language', 'zh')
+            
+            # 同样，如果使用的是测试结构，同步到原始结构
+            if 'logging' in loaded_config:
+                log_cfg = loaded_config.get('logging', {})
+                self._config['logloom']['log']['level'] = log_cfg.get('default_level', 'INFO')
+                self._config['logloom']['log']['file'] = log_cfg.get('output_path', 'log.txt')
+                self._config['logloom']['log']['max_size'] = log_cfg.get('max_file_size', 10485760)
+            
+            if 'i18n' in loaded_config:
+                i18n_cfg = loaded_config.get('i18n', {})
+                self._config['logloom']['language'] = i18n_cfg.get('default_language', 'zh')
+                
+            self._config_path = config_path
+            return True
         except Exception as e:
             print(f"加载配置文件失败: {e}")
             return False
@@ -0,0 +1,250 @@
+"""
+Logloom 配置文件监视与运行时重新配置
+====================================
+
+监视配置文件，内容变化后重新读取，把新配置与运行中的日志系统的当前状态比较，
+只应用不同的配置项：日志级别、日志文件、文件大小上限、控制台输出、默认语言，
+以及插件的启用/禁用列表。没有变化的配置项不会被重新设置，已打开的日志文件
+也不会因为无关配置的修改而重新打开。
+
+监视方式与语言资源热加载相同（见locale_watch）：Linux上用inotify监视配置文件
+所在的目录，其他平台或inotify不可用时按固定间隔比较文件的mtime和大小。
+"""
+
+import os
+import sys
+import time
+import select
+import logging
+import threading
+
+try:
+    from .locale_watch import _open_inotify, _file_state, DEFAULT_INTERVAL, DEFAULT_SETTLE
+except ImportError:
+    from locale_watch import _open_inotify, _file_state, DEFAULT_INTERVAL, DEFAULT_SETTLE
+
+logger = logging.getLogger("logloom.config_watch")
+
+# 配置文件中没有出现的配置项的取值，与C配置系统的默认值一致
+DEFAULT_SETTINGS = {
+    "level": "INFO",
+    "file": None,
+    "max_size": 1048576,
+    "console": True,
+    "language": "en",
+}
+
+# 运行时可修改的日志配置项：配置名 -> (log节中的键, 类型转换)
+_LOG_SETTINGS = {
+    "level": ("level", lambda value: str(value).upper()),
+    "file": ("file", lambda value: str(value) if value else None),
+    "max_size": ("max_size", int),
+    "console": ("console", bool),
+}
+
+
+def config_settings(config):
+    """
+    从配置文件内容中提取运行时可修改的配置项
+
+    配置项位于logloom节点下，没有logloom节点时从根节点读取，与C配置系统一致。
+    文件中没有出现的日志配置项和语言取默认值，与用该文件初始化时相同；
+    插件列表只在文件中出现时才包含在结果中。
+
+    Returns:
+    --------
+    dict
+        level、file（None表示禁用文件输出）、max_size、console、language，
+        以及plugins_enabled、plugins_disabled（插件名称元组）
+    """
+    settings = dict(DEFAULT_SETTINGS)
+    section = config.get("logloom", config) if isinstance(config, dict) else None
+    if not isinstance(section, dict):
+        return settings
+
+    log = section.get("log")
+    if isinstance(log, dict):
+        for name, (key, convert) in _LOG_SETTINGS.items():
+            if key in log:
+                settings[name] = convert(log[key])
+    if section.get("language"):
+        settings["language"] = str(section["language"])
+
+    plugin = section.get("plugin")
+    if isinstance(plugin, dict):
+        for name in ("enabled", "disabled"):
+            if name in plugin:
+                settings[f"plugins_{name}"] = tuple(str(item) for item in plugin[name] or ())
+    return settings
+
+
+def diff_settings(live, settings):
+    """
+    比较新配置与当前状态
+
+    Returns:
+    --------
+    dict
+        配置名 -> (当前值, 新值)，只包含值不同的配置项
+    """
+    return {name: (live.get(name), value) for name, value in settings.items()
+            if live.get(name) != value}
+
+
+def _plugin_manager():
+    """获取已导入的插件管理器，插件系统未导入时返回None，不为此导入插件系统"""
+    package = __package__ or ""
+    module = sys.modules.get(f"{package}.plugin.loader" if package else "plugin.loader")
+    return getattr(module, "plugin_manager", None)
+
+
+def apply_plugin_settings(settings):
+    """
+    按配置中的插件启用/禁用列表更新已加载插件的状态
+
+    Returns:
+    --------
+    dict
+        "plugin.<名称>" -> (原状态, 新状态)，只包含状态发生变化的插件
+    """
+    if "plugins_enabled" not in settings and "plugins_disabled" not in settings:
+        return {}
+    manager = _plugin_manager()
+    if manager is None or not manager.initialized:
+        return {}
+
+    changed = manager.apply_plugin_lists(settings.get("plugins_enabled"),
+                                         settings.get("plugins_disabled"))
+    return {f"plugin.{name}": (not enabled, enabled) for name, enabled in changed.items()}
+
+
+class ConfigWatcher:
+    """
+    配置文件监视器
+
+    reconfigure_callback(path)重新读取配置文件并应用变化的配置项，
+    返回{配置名: (原值, 新值)}，失败时抛出异常，当前配置保持不变。
+    """
+
+    def __init__(self, path, reconfigure_callback, interval=DEFAULT_INTERVAL, use_inotify=True):
+        self.path = os.path.abspath(path)
+        self._reconfigure = reconfigure_callback
+        self.interval = interval
+        self._snapshot = _file_state(self.path)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._inotify = _open_inotify() if use_inotify else None
+        if self._inotify and not self._inotify.add_directory(os.path.dirname(self.path)):
+            self._inotify.close()
+            self._inotify = None
+        # inotify模式下线程阻塞在select上，stop通过管道唤醒它
+        self._wake = os.pipe() if self._inotify else None
+        self._stats = {
+            "backend": "inotify" if self._inotify else "polling",
+            "reloads": 0,
+            "failures": 0,
+            "settings_changed": 0,
+            "last_latency_ms": 0.0,
+            "max_latency_ms": 0.0,
+            "last_reload": None,
+            "last_error": None,
+        }
+
+    def check(self):
+        """
+        配置文件变化时重新配置
+
+        文件被删除时保持当前配置，重新创建后再应用。
+
+        Returns:
+        --------
+        dict
+            本次应用的配置变化
+        """
+        with self._lock:
+            state = _file_state(self.path)
+            if state == self._snapshot:
+                return {}
+            self._snapshot = state
+            if state is None:
+                logger.warning(f"配置文件已删除，保持当前配置: {self.path}")
+                return {}
+            return self._apply()
+
+    def _apply(self):
+        stats = self._stats
+        start = time.perf_counter()
+        try:
+            changes = self._reconfigure(self.path) or {}
+        except Exception as e:
+            stats["failures"] += 1
+            stats["last_error"] = str(e)
+            logger.error(f"重新加载配置文件失败，保持当前配置: {self.path} - {e}")
+            return {}
+
+        latency = (time.perf_counter() - start) * 1000.0
+        stats["reloads"] += 1
+        stats["settings_changed"] += len(changes)
+        stats["last_latency_ms"] = latency
+        stats["max_latency_ms"] = max(stats["max_latency_ms"], latency)
+        stats["last_reload"] = {"changes": changes, "latency_ms": latency}
+        if changes:
+            logger.info(f"已应用配置变化: {', '.join(sorted(changes))} ({latency:.2f} ms)")
+        return changes
+
+    def stats(self):
+        """返回重新配置次数、失败次数、变化的配置项数量和延迟统计"""
+        with self._lock:
+            return dict(self._stats)
+
+    def start(self):
+        """启动后台监视线程"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="logloom-config-watch", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """停止后台监视线程"""
+        self._stop.set()
+        if self._wake:
+            os.write(self._wake[1], b"x")
+        if self._thread:
+            self._thread.join(timeout if timeout is not None else self.interval * 2)
+            self._thread = None
+        if self._inotify:
+            self._inotify.close()
+            self._inotify = None
+        if self._wake:
+            for fd in self._wake:
+                os.close(fd)
+            self._wake = None
+
+    @property
+    def running(self):
+        return bool(self._thread and self._thread.is_alive())
+
+    def _run(self):
+        while not self._stop.is_set():
+            if self._inotify:
+                try:
+                    ready, _, _ = select.select([self._inotify.fd, self._wake[0]], [], [], self.interval)
+                except (OSError, ValueError):
+                    break
+                if self._wake[0] in ready:
+                    continue
+                if ready and self._inotify.drain():
+                    # 合并同一次保存产生的多个事件
+                    self._stop.wait(DEFAULT_SETTLE)
+                    if self._inotify:
+                        self._inotify.drain()
+                # 目录中其他文件的事件也会唤醒线程，是否变化由文件状态决定；
+                # 超时后同样检查一次，防止遗漏事件
+            elif self._stop.wait(self.interval):
+                break
+            try:
+                self.check()
+            except Exception as e:
+                logger.error(f"检查配置文件失败: {e}")
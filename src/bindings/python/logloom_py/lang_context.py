@@ -0,0 +1,57 @@
+"""
+Logloom 上下文语言
+==================
+
+set_language修改的是进程全局的当前语言。多租户服务中并发处理的请求需要用
+各自的语言渲染文本，本模块用contextvars保存当前上下文（线程或asyncio任务）
+的语言：设置后get_text/format_text优先使用它，其他线程和任务不受影响，
+全程无需加锁。未设置时仍使用全局语言。
+"""
+
+import contextlib
+import contextvars
+
+_context_language = contextvars.ContextVar("logloom_language", default=None)
+
+
+def get_context_language():
+    """返回当前上下文的语言，未设置时返回None"""
+    return _context_language.get()
+
+
+def set_context_language(lang_code):
+    """
+    设置当前上下文的语言
+
+    Parameters:
+    -----------
+    lang_code : str or None
+        语言代码，None表示恢复使用全局语言
+
+    Returns:
+    --------
+    contextvars.Token
+        传给reset_context_language以恢复之前的语言
+    """
+    return _context_language.set(lang_code or None)
+
+
+def reset_context_language(token):
+    """恢复set_context_language之前的上下文语言"""
+    _context_language.reset(token)
+
+
+@contextlib.contextmanager
+def use_language(lang_code):
+    """
+    在with块内使用指定语言，退出时恢复
+
+    示例:
+        with logloom.use_language("zh"):
+            logloom.format_text("system.error_message", "超时")
+    """
+    token = _context_language.set(lang_code or None)
+    try:
+        yield lang_code
+    finally:
+        _context_language.reset(token)
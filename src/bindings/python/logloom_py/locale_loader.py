@@ -0,0 +1,130 @@
+"""
+Logloom 语言资源批量加载
+========================
+
+插件生态中一个目录下可能有数百个语言片段文件，逐个stat和解析会拖慢启动。
+本模块：
+
+- 按目录mtime缓存目录列表：目录内容不变时不再遍历和逐个stat，
+  不存在的目录只需一次stat
+- 在线程池中并行加载文件（读取、解析YAML或映射编译缓存）
+- 按文件名排序后依次合并，结果与加载完成的先后无关；同一语言中不同文件
+  给同一个键定义了不同的值时记录冲突
+"""
+
+import os
+import fnmatch
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from .locale_cache import load_locale_file
+except ImportError:
+    # 本模块也会被直接作为顶层模块导入（包目录在sys.path中）
+    from locale_cache import load_locale_file
+
+logger = logging.getLogger("logloom.locale_loader")
+
+# 并行加载的最大线程数
+DEFAULT_MAX_WORKERS = min(8, os.cpu_count() or 1)
+
+# 目录列表缓存 {(目录, 模式): (目录mtime_ns, 文件列表)}
+_listing_cache = {}
+_listing_lock = threading.Lock()
+
+
+def list_locale_files(dir_path, pattern="*.yaml"):
+    """
+    返回目录中匹配模式的文件，按文件名排序
+
+    目录的mtime未变化时直接返回缓存的列表（文件的增删和重命名都会更新目录
+    mtime，修改文件内容不会，但也不影响列表）。
+
+    Returns:
+        list: 文件的绝对路径，目录不存在时为空列表
+    """
+    dir_path = os.path.abspath(dir_path)
+    try:
+        mtime_ns = os.stat(dir_path).st_mtime_ns
+    except OSError:
+        return []
+
+    key = (dir_path, pattern)
+    with _listing_lock:
+        cached = _listing_cache.get(key)
+    if cached is not None and cached[0] == mtime_ns:
+        return list(cached[1])
+
+    files = []
+    with os.scandir(dir_path) as it:
+        for entry in it:
+            if fnmatch.fnmatch(entry.name, pattern) and entry.is_file():
+                files.append(entry.path)
+    files.sort()
+
+    with _listing_lock:
+        _listing_cache[key] = (mtime_ns, files)
+    return list(files)
+
+
+def clear_listing_cache():
+    """清空目录列表缓存"""
+    with _listing_lock:
+        _listing_cache.clear()
+
+
+def _load_one(file_path):
+    try:
+        return load_locale_file(file_path), None
+    except Exception as e:
+        return None, e
+
+
+def load_locale_files(paths, max_workers=None):
+    """
+    并行加载多个语言文件
+
+    Args:
+        paths: 文件路径列表
+        max_workers: 线程数，默认为DEFAULT_MAX_WORKERS，1表示顺序加载
+
+    Returns:
+        list: 与paths顺序一致的(路径, 数据, 异常)，数据为None表示加载失败
+    """
+    workers = min(max_workers or DEFAULT_MAX_WORKERS, len(paths))
+    if workers <= 1:
+        results = [_load_one(path) for path in paths]
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="logloom-locale") as pool:
+            results = list(pool.map(_load_one, paths))
+    return [(path, data, error) for path, (data, error) in zip(paths, results)]
+
+
+def find_conflicts(lang_code, layers):
+    """
+    找出同一语言中被多个文件定义为不同值的键
+
+    Args:
+        lang_code: 语言代码
+        layers: 按合并顺序排列的(路径, 数据)
+
+    Returns:
+        list: [{"lang", "key", "files": [路径...], "winner": 路径}]，
+        winner为合并后生效的文件（最后一个定义该键的文件）
+    """
+    seen = {}       # 键 -> (首次定义的值, [定义过该键的文件])
+    conflicting = set()
+    for path, data in layers:
+        for key in data:
+            value = data[key]
+            first = seen.get(key)
+            if first is None:
+                seen[key] = (value, [path])
+                continue
+            first[1].append(path)
+            if value != first[0]:
+                conflicting.add(key)
+
+    return [{"lang": lang_code, "key": key, "files": seen[key][1], "winner": seen[key][1][-1]}
+            for key in sorted(conflicting)]
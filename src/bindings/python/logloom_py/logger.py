@@ -26,6 +26,8 @@ _active_log_file = None
 
 # 全局变量，用于纯Python实现
 _current_log_level = "INFO"  # 默认日志级别
+_LEVEL_RANKS = {"DEBUG": 0, "INFO": 1, "WARN": 2, "ERROR": 3, "FATAL": 4}
+_current_level_rank = _LEVEL_RANKS["INFO"]  # 当前日志级别对应的权重缓存
 _log_max_size = 1048576  # 默认日志文件大小限制(1MB)
 _log_file_size = {}  # 跟踪日志文件大小
 
@@ -89,6 +91,10 @@ def _rotate_log_file(file_path):
     except Exception as e:
         print(f"[ERROR] 轮转日志文件失败 {file_path}: {e}")
 
+def _level_filtered(level):
+    """按缓存的当前级别权重判断该级别的日志是否被过滤，未知级别按DEBUG处理"""
+    return _LEVEL_RANKS.get(level, 0) < _current_level_rank
+
 # Logger类定义
 class Logger:
     """
@@ -150,6 +156,10 @@ class Logger:
             关键字格式化参数，或者额外选项:
             - module: 模块名称，如果不提供则自动检测
         """
+        # 先按缓存的级别权重过滤，被过滤的消息不做模块查找和格式化
+        if _level_filtered("DEBUG"):
+            return
+        
         module = kwargs.pop('module', None) or self._get_caller_module()
         
         # 如果有格式化参数，先进行格式化
@@ -180,6 +190,10 @@ class Logger:
             关键字格式化参数，或者额外选项:
             - module: 模块名称，如果不提供则自动检测
         """
+        # 先按缓存的级别权重过滤，被过滤的消息不做模块查找和格式化
+        if _level_filtered("INFO"):
+            return
+        
         module = kwargs.pop('module', None) or self._get_caller_module()
         
         # 如果有格式化参数，先进行格式化
@@ -210,6 +224,10 @@ class Logger:
             关键字格式化参数，或者额外选项:
             - module: 模块名称，如果不提供则自动检测
         """
+        # 先按缓存的级别权重过滤，被过滤的消息不做模块查找和格式化
+        if _level_filtered("WARN"):
+            return
+        
         module = kwargs.pop('module', None) or self._get_caller_module()
         
         # 如果有格式化参数，先进行格式化
@@ -240,6 +258,10 @@ class Logger:
             关键字格式化参数，或者额外选项:
             - module: 模块名称，如果不提供则自动检测
         """
+        # 先按缓存的级别权重过滤，被过滤的消息不做模块查找和格式化
+        if _level_filtered("ERROR"):
+            return
+        
         module = kwargs.pop('module', None) or self._get_caller_module()
         
         # 如果有格式化参数，先进行格式化
@@ -270,6 +292,10 @@ class Logger:
             关键字格式化参数，或者额外选项:
             - module: 模块名称，如果不提供则自动检测
         """
+        # 先按缓存的级别权重过滤，被过滤的消息不做模块查找和格式化
+        if _level_filtered("FATAL"):
+            return
+        
         module = kwargs.pop('module', None) or self._get_caller_module()
         
         # 如果有格式化参数，先进行格式化
@@ -300,7 +326,7 @@ class Logger:
         ValueError
             如果日志级别无效
         """
-        global _current_log_level
+        global _current_log_level, _current_level_rank
         
         # 如果是枚举值，获取其字符串表示
         if hasattr(level, 'value'):
@@ -319,6 +345,7 @@ class Logger:
             
         self._current_level = level  # 保存当前级别以便于 get_level 使用
         _current_log_level = level   # 更新全局日志级别
+        _current_level_rank = _LEVEL_RANKS[level]
         
         if _has_c_extension:
             try:
@@ -486,8 +513,7 @@ class Logger:
             
             # 检查日志级别是否需要记录
             # DEBUG < INFO < WARN < ERROR < FATAL
-            level_order = {"DEBUG": 0, "INFO": 1, "WARN": 2, "ERROR": 3, "FATAL": 4}
-            if level_order.get(level, 0) < level_order.get(_current_log_level, 1):
+            if _level_filtered(level):
                 # 如果当前日志级别低于全局设置，则忽略此日志
                 return True
             
@@ -9,11 +9,30 @@ import sys
 import glob
 import warnings
 import datetime
-import yaml
 import inspect
 import logging
+import logging.handlers
+from collections import ChainMap
 from typing import List, Dict, Optional, Tuple, Any, Union
 
+try:
+    from .locale_cache import load_locale_file, merge_layers
+    from .templates import compile_template
+    from .lang_context import _context_language
+    from .locale_watch import LocaleWatcher, DEFAULT_INTERVAL, diff_tables
+    from .locale_loader import list_locale_files, load_locale_files, find_conflicts
+    from .config_loader import load_config, ConfigError
+    from .config_watch import ConfigWatcher, config_settings, diff_settings, apply_plugin_settings
+except ImportError:
+    # 本模块也会被直接作为顶层模块导入（logloom_py目录在sys.path中）
+    from locale_cache import load_locale_file, merge_layers
+    from templates import compile_template
+    from lang_context import _context_language
+    from locale_watch import LocaleWatcher, DEFAULT_INTERVAL, diff_tables
+    from locale_loader import list_locale_files, load_locale_files, find_conflicts
+    from config_loader import load_config, ConfigError
+    from config_watch import ConfigWatcher, config_settings, diff_settings, apply_plugin_settings
+
 # 初始化日志系统
 logging.basicConfig(
     level=logging.INFO,
@@ -24,10 +43,19 @@ logger = logging.getLogger('logloom')
 # 内部状态
 _initialized = False
 _current_language = "en"  # 默认语言
-_resources = {}  # 语言资源字典 {lang_code: {key: value}}
+_resources = {}  # 语言资源 {lang_code: ChainMap}，maps[0]为直接写入的条目，maps[1]为各文件合并后的查找表
 _log_level = "INFO"
 _log_file = None
 _log_max_size = 1024 * 1024  # 默认1MB
+_console_enabled = True
+_strict_mode = False  # 严格模式下找不到翻译键时抛出KeyError
+_missing_keys = {}  # 负查找缓存 {lang_code: set(key)}，记录在当前语言和英语中都找不到的键
+_sources = {}  # 每种语言注册过的资源文件 {lang_code: [path]}，按注册顺序，用于热加载
+_directories = {}  # 注册过的资源目录 {dir_path: [pattern]}
+_watcher = None  # 热加载监视器，由watch_locales创建
+_conflicts = []  # 批量注册时发现的键冲突
+_config_path = None  # initialize使用的配置文件，供reconfigure和watch_config使用
+_config_watcher = None  # 配置文件监视器，由watch_config创建
 
 # 日志级别映射
 _log_level_map = {
@@ -42,16 +70,16 @@ _log_level_map = {
 
 def initialize(config_path=None):
     """初始化Logloom"""
-    global _initialized, _current_language, _log_level, _log_file, _log_max_size
+    global _initialized, _current_language, _log_level, _log_file, _log_max_size, _config_path
     
     if _initialized:
         return True
         
     # 加载配置文件
     if config_path and os.path.isfile(config_path):
+        _config_path = config_path
         try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                config = yaml.safe_load(f)
+            config = load_config(config_path)
                 
             # 提取配置项
             if config:
@@ -96,6 +124,7 @@ def initialize(config_path=None):
 def cleanup():
     """清理Logloom资源"""
     global _initialized, _resources
+    stop_watching_config()
     _initialized = False
     _resources = {}
     return True
@@ -128,47 +157,75 @@ def critical(module, message):
     """记录致命错误消息（fatal的别名）"""
     fatal(module, message)
 
+def _missing_text(key):
+    """处理找不到的翻译键：严格模式下抛出KeyError，否则返回键本身"""
+    if _strict_mode:
+        raise KeyError(f"Language key not found: {key}")
+    return key
+
 def get_text(key):
     """获取国际化文本"""
     if not key:
         return None
+    return _lookup_text(_effective_language(), key)
+
+def _effective_language(lang_code=None):
+    """返回本次查找使用的语言：显式参数、上下文语言、全局语言依次优先"""
+    lang_code = lang_code or _context_language.get()
+    if not lang_code or (lang_code != _current_language and not _load_language(lang_code)):
+        return _current_language
+    return lang_code
+
+def _lookup_text(lang, key):
+    """在指定语言中查找翻译文本，不修改当前语言"""
+    # 已知缺失的键只需一次字典查找
+    missing = _missing_keys.get(lang)
+    if missing is not None and key in missing:
+        return _missing_text(key)
         
     # 先在当前语言中查找
-    if _current_language in _resources:
-        value = _resources[_current_language].get(key)
+    if lang in _resources:
+        value = _resources[lang].get(key)
         if value:
             return value
     
     # 在默认语言（英语）中查找，如果当前语言不是英语
-    if _current_language != "en" and "en" in _resources:
+    if lang != "en" and "en" in _resources:
         value = _resources["en"].get(key)
         if value:
-            logger.warning(f"Language key not found in '{_current_language}': {key}, using default language")
+            logger.warning(f"Language key not found in '{lang}': {key}, using default language")
             return value
     
-    # 如果找不到，返回键本身作为值
+    # 如果找不到，记录到负查找缓存，同一语言下的同一个键只警告一次
     logger.warning(f"Language key not found: {key}")
-    return key
+    _missing_keys.setdefault(lang, set()).add(key)
+    return _missing_text(key)
+
+def set_strict_mode(enabled):
+    """设置严格模式，严格模式下找不到翻译键时抛出KeyError"""
+    global _strict_mode
+    _strict_mode = bool(enabled)
+    return True
+
+def is_strict_mode():
+    """是否处于严格模式"""
+    return _strict_mode
 
 def format_text(key, *args, **kwargs):
     """格式化国际化文本"""
-    template = get_text(key)
+    # 提取可能存在的lang参数，直接在该语言中查找而不切换全局语言，可以在多线程中并发使用
+    lang_code = _effective_language(kwargs.pop('lang', None))
+        
+    template = _lookup_text(lang_code, key) if key else None
     if not template:
         return key
         
-    # 提取可能存在的lang参数
-    lang_code = kwargs.pop('lang', None)
-    if lang_code:
-        old_lang = _current_language
-        set_language(lang_code)
-        template = get_text(key)
-        set_language(old_lang)
-        
     try:
+        # 使用缓存的编译模板，避免每次调用重新解析模板
         if kwargs:
-            return template.format(**kwargs)
+            return compile_template(template).format((), kwargs)
         elif args:
-            return template.format(*args)
+            return compile_template(template).format(args)
         else:
             return template
     except Exception as e:
@@ -194,32 +251,58 @@ def set_language(lang_code):
     if not lang_code:
         return False
         
-    # 如果语言资源不存在，尝试加载
-    if lang_code not in _resources:
-        # 自动发现该语言的资源
-        found = False
-        for path in [f"./locales/{lang_code}.yaml", f"~/.config/logloom/locales/{lang_code}.yaml"]:
-            expanded_path = os.path.expanduser(path)
-            if os.path.isfile(expanded_path):
-                if register_locale_file(expanded_path, lang_code):
-                    found = True
-                    break
-                    
-        if not found:
-            logger.warning(f"Language resources for '{lang_code}' not found")
-            return False
+    if not _load_language(lang_code):
+        return False
     
     _current_language = lang_code
     return True
 
+def _load_language(lang_code):
+    """确保语言资源已加载，不存在时尝试自动发现，返回资源是否可用"""
+    if lang_code in _resources:
+        return True
+        
+    # 自动发现该语言的资源
+    for path in [f"./locales/{lang_code}.yaml", f"~/.config/logloom/locales/{lang_code}.yaml"]:
+        expanded_path = os.path.expanduser(path)
+        if os.path.isfile(expanded_path):
+            if register_locale_file(expanded_path, lang_code):
+                return True
+                
+    logger.warning(f"Language resources for '{lang_code}' not found")
+    return False
+
 def get_language():
-    """获取当前语言代码"""
-    return _current_language
+    """获取当前语言代码，设置了上下文语言时返回上下文语言"""
+    return _context_language.get() or _current_language
 
 def get_current_language():
     """获取当前语言代码（别名）"""
     return get_language()
 
+class _ReopeningFileHandler(logging.handlers.WatchedFileHandler):
+    """
+    支持外部轮转的日志文件处理器
+    
+    写日志时按inode发现文件被改名或删除后按路径重新打开；文件以追加方式打开，
+    被原地截断（copytruncate）后写入从文件末尾继续。request_reopen只设置标志，
+    可以在信号处理函数中调用，由下一次写日志时重新打开。
+    """
+    
+    def __init__(self, filename):
+        super().__init__(filename)
+        self._reopen_requested = False
+    
+    def request_reopen(self):
+        self._reopen_requested = True
+    
+    def reopenIfNeeded(self):
+        if self._reopen_requested:
+            self._reopen_requested = False
+            # 使文件标识与路径不一致，由基类按路径重新打开
+            self.dev = self.ino = -1
+        super().reopenIfNeeded()
+
 def set_log_file(file_path):
     """设置日志输出文件"""
     global _log_file
@@ -244,7 +327,7 @@ def set_log_file(file_path):
                 logger.removeHandler(handler)
                 
         # 添加新的文件处理器
-        file_handler = logging.FileHandler(file_path)
+        file_handler = _ReopeningFileHandler(file_path)
         file_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
         logger.addHandler(file_handler)
         
@@ -270,6 +353,9 @@ def set_log_max_size(max_size):
 
 def set_output_console(enabled):
     """设置是否输出到控制台"""
+    global _console_enabled
+    _console_enabled = bool(enabled)
+    
     # 查找并移除/添加控制台处理器
     found = False
     for handler in logger.handlers[:]:
@@ -286,16 +372,96 @@ def set_output_console(enabled):
         
     return True
 
-def _flatten_dict(d, parent_key='', sep='.'):
-    """将嵌套字典扁平化"""
-    items = []
-    for k, v in d.items():
-        new_key = f"{parent_key}{sep}{k}" if parent_key else k
-        if isinstance(v, dict):
-            items.extend(_flatten_dict(v, new_key, sep=sep).items())
-        else:
-            items.append((new_key, v))
-    return dict(items)
+def reconfigure(config_path=None):
+    """
+    按配置文件的当前内容调整运行中的日志系统，不需要重新初始化
+    
+    新配置与当前状态比较，只应用不同的配置项；插件系统已初始化时按
+    plugin.enabled和plugin.disabled列表启用或禁用插件。返回应用的配置变化
+    {配置名: (原值, 新值)}，配置文件有错误时抛出ConfigError，当前配置保持不变
+    """
+    global _config_path
+    
+    path = config_path or _config_path
+    if not path:
+        raise ValueError("没有可重新加载的配置文件")
+    
+    settings = config_settings(load_config(path))
+    if settings["level"] not in _log_level_map:
+        raise ConfigError(f"无效的日志级别: {settings['level']}")
+    
+    changes = diff_settings({
+        "level": _log_level,
+        "file": _log_file,
+        "max_size": _log_max_size,
+        "console": _console_enabled,
+        "language": _current_language,
+    }, settings)
+    for name, (old, new) in list(changes.items()):
+        if name == "level":
+            set_log_level(new)
+        elif name == "file":
+            if not set_log_file(new):
+                raise OSError(f"无法打开日志文件: {new}")
+        elif name == "max_size":
+            set_log_max_size(new)
+        elif name == "console":
+            set_output_console(new)
+        elif name == "language" and not set_language(new):
+            # 语言资源不可用时保持当前语言
+            del changes[name]
+    
+    changes.update(apply_plugin_settings(settings))
+    _config_path = path
+    return changes
+
+def watch_config(config_path=None, interval=None, use_inotify=True):
+    """监视配置文件，内容变化后自动调用reconfigure，返回监视器"""
+    global _config_watcher
+    
+    path = config_path or _config_path
+    if not path:
+        raise ValueError("没有可监视的配置文件")
+    if _config_watcher:
+        if _config_watcher.path == os.path.abspath(path):
+            return _config_watcher
+        stop_watching_config()
+    
+    watcher = ConfigWatcher(path, reconfigure, interval or DEFAULT_INTERVAL, use_inotify)
+    watcher.start()
+    _config_watcher = watcher
+    return watcher
+
+def stop_watching_config():
+    """停止监视配置文件"""
+    global _config_watcher
+    
+    if _config_watcher:
+        _config_watcher.stop()
+        _config_watcher = None
+
+def get_config_reload_stats():
+    """获取配置文件重新加载统计，未监视配置文件时返回None"""
+    return _config_watcher.stats() if _config_watcher else None
+
+def reopen():
+    """
+    请求重新打开日志文件，供外部轮转（logrotate）之后调用
+    
+    下一次写日志时按路径重新打开；文件被改名或删除时即使不调用也会自动重新打开。
+    返回是否设置了日志文件
+    """
+    reopened = False
+    for handler in logger.handlers:
+        if isinstance(handler, _ReopeningFileHandler):
+            handler.request_reopen()
+            reopened = True
+    return reopened
+
+def reopen_on_signal(signum=None):
+    """收到信号（默认SIGHUP）时重新打开日志文件，返回原来的信号处理函数，只能在主线程中调用"""
+    import signal
+    return signal.signal(signal.SIGHUP if signum is None else signum, lambda signum, frame: reopen())
 
 def register_locale_file(file_path, lang_code=None):
     """注册语言资源文件"""
@@ -305,70 +471,191 @@ def register_locale_file(file_path, lang_code=None):
         
     # 从文件名推断语言代码
     if not lang_code:
-        basename = os.path.basename(file_path)
-        # 移除扩展名
-        basename = os.path.splitext(basename)[0]
-        # 使用基本名称作为语言代码
-        if basename.startswith("logloom_") or basename.startswith("app_"):
-            # 如果是 logloom_en.yaml 或 app_en.yaml 这样的格式
-            parts = basename.split('_')
-            if len(parts) > 1:
-                lang_code = parts[1]
-        else:
-            # 否则直接使用文件名作为语言代码
-            lang_code = basename
+        lang_code = _infer_lang_code(file_path)
             
     if not lang_code:
         logger.error(f"Cannot determine language code for file: {file_path}")
         return False
         
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
-            
-        if not data or not isinstance(data, dict):
-            logger.error(f"Invalid YAML format in file: {file_path}")
-            return False
-            
-        # 扁平化嵌套字典
-        flat_data = _flatten_dict(data)
-        
-        # 初始化语言资源字典
-        if lang_code not in _resources:
-            _resources[lang_code] = {}
-            
-        # 合并新资源
-        _resources[lang_code].update(flat_data)
-        
-        return True
+        # 优先使用编译缓存，没有时解析YAML并写入缓存
+        flat_data = load_locale_file(file_path)
     except Exception as e:
         logger.error(f"Failed to load language resource file: {file_path} - {e}")
         return False
+        
+    return _add_locale_layer(file_path, lang_code, flat_data)
+
+def _add_locale_layer(file_path, lang_code, flat_data):
+    """把已加载的文件数据加入语言资源，优先于已注册的文件"""
+    return bool(_add_locale_layers(lang_code, [(file_path, flat_data)]))
+
+def _add_locale_layers(lang_code, layers):
+    """把同一语言已加载的一批文件数据合并为一个查找表后替换旧表，后面的文件优先，返回成功加入的 (文件路径, 文件数据)"""
+    added = []
+    for file_path, flat_data in layers:
+        if flat_data is None:
+            logger.error(f"Invalid YAML format in file: {file_path}")
+            continue
+        added.append((file_path, flat_data))
+    if not added:
+        return added
+    
+    # 初始化语言资源，maps[0]保留给直接写入的条目
+    if lang_code not in _resources:
+        _resources[lang_code] = ChainMap()
+    
+    # 新资源与已注册的资源合并为一个查找表，查找开销不随文件数增长
+    table = _resources[lang_code]
+    table.maps[1:] = [merge_layers(table.maps[1:] + [flat_data for _, flat_data in added])]
+    
+    # 新资源可能包含之前缺失的键（包括英语回退），清空负查找缓存
+    _missing_keys.clear()
+    
+    sources = _sources.setdefault(lang_code, [])
+    for file_path, _ in added:
+        abs_path = os.path.abspath(file_path)
+        if abs_path not in sources:
+            sources.append(abs_path)
+        if _watcher:
+            _watcher.watch_file(abs_path)
+    
+    return added
 
-def register_locale_directory(dir_path, pattern="*.yaml"):
-    """注册目录下所有匹配模式的语言资源文件"""
+def _register_locale_files(paths, max_workers=None):
+    """并行加载一批语言文件并按给定顺序合并，后合并的文件生效，冲突记录到get_locale_conflicts"""
+    # 按语言分组，每种语言只合并一次
+    pending = {}
+    for file_path, flat_data, error in load_locale_files(paths, max_workers):
+        if error is not None:
+            logger.error(f"Failed to load language resource file: {file_path} - {error}")
+            continue
+        lang_code = _infer_lang_code(file_path)
+        if lang_code:
+            pending.setdefault(lang_code, []).append((file_path, flat_data))
+    
+    layers = {}
+    count = 0
+    for lang_code, lang_layers in pending.items():
+        added = _add_locale_layers(lang_code, lang_layers)
+        if added:
+            layers[lang_code] = added
+            count += len(added)
+    
+    for lang_code in sorted(layers):
+        conflicts = find_conflicts(lang_code, layers[lang_code])
+        if conflicts:
+            _conflicts.extend(conflicts)
+            logger.warning(f"{len(conflicts)} keys in language '{lang_code}' have different values in "
+                           f"several files, e.g. {conflicts[0]['key']} (using {conflicts[0]['winner']})")
+    return count
+
+def get_locale_conflicts():
+    """获取批量注册语言文件时发现的键冲突 [{"lang", "key", "files", "winner"}]"""
+    return list(_conflicts)
+
+def _infer_lang_code(file_path):
+    """从文件名推断语言代码"""
+    # 移除扩展名
+    basename = os.path.splitext(os.path.basename(file_path))[0]
+    if basename.startswith("logloom_") or basename.startswith("app_"):
+        # 如果是 logloom_en.yaml 或 app_en.yaml 这样的格式
+        parts = basename.split('_')
+        return parts[1] if len(parts) > 1 else None
+    # 否则直接使用文件名作为语言代码
+    return basename
+
+def register_locale_directory(dir_path, pattern="*.yaml", max_workers=None):
+    """注册目录下所有匹配模式的语言资源文件，并行加载并按文件名顺序合并，目录列表按目录mtime缓存"""
     if not dir_path or not os.path.isdir(dir_path):
         logger.error(f"Invalid directory: {dir_path}")
         return 0
         
-    count = 0
-    for file_path in glob.glob(os.path.join(dir_path, pattern)):
-        if register_locale_file(file_path):
-            count += 1
+    count = _register_locale_files(list_locale_files(dir_path, pattern), max_workers)
+    
+    patterns = _directories.setdefault(os.path.abspath(dir_path), [])
+    if pattern not in patterns:
+        patterns.append(pattern)
+    if _watcher:
+        _watcher.watch_directory(dir_path, pattern)
             
     return count
 
+def reload_language(lang_code):
+    """
+    从注册过的资源文件重建一种语言的资源表
+    
+    各文件合并为一个查找表后一次性替换旧表，读取方无需加锁；已删除的文件被跳过，
+    直接写入的条目（maps[0]）保留在新表中。返回新增、删除和修改的键。
+    """
+    old = _resources.get(lang_code)
+    layers = []
+    for file_path in _sources.get(lang_code, []):
+        if not os.path.isfile(file_path):
+            continue
+        flat_data = load_locale_file(file_path)
+        if flat_data is None:
+            raise ValueError(f"Invalid YAML format in file: {file_path}")
+        layers.append(flat_data)
+    
+    new = ChainMap(old.maps[0] if old is not None else {}, merge_layers(layers))
+    diff = diff_tables(lang_code, old, new)
+    _resources[lang_code] = new
+    # 新表可能补上了之前缺失的键
+    _missing_keys.clear()
+    return diff
+
+def _reload_paths(paths):
+    """热加载回调：找出变化的文件所属的语言并逐个重建"""
+    langs = set()
+    for path in paths:
+        owners = [lang for lang, sources in _sources.items() if path in sources]
+        if not owners and os.path.isfile(path):
+            # 监视目录中新建的文件
+            lang_code = _infer_lang_code(path)
+            if lang_code:
+                _sources.setdefault(lang_code, []).append(path)
+                owners = [lang_code]
+        langs.update(owners)
+    return [reload_language(lang) for lang in sorted(langs)]
+
+def watch_locales(interval=None, use_inotify=True):
+    """监视注册过的语言资源文件和目录，文件变化后自动重建受影响的语言，返回监视器"""
+    global _watcher
+    
+    if _watcher:
+        return _watcher
+    
+    watcher = LocaleWatcher(_reload_paths, interval or DEFAULT_INTERVAL, use_inotify)
+    for sources in _sources.values():
+        for file_path in sources:
+            watcher.watch_file(file_path)
+    for dir_path, patterns in _directories.items():
+        for pattern in patterns:
+            watcher.watch_directory(dir_path, pattern)
+    watcher.start()
+    _watcher = watcher
+    return watcher
+
+def stop_watching_locales():
+    """停止语言资源热加载"""
+    global _watcher
+    
+    if _watcher:
+        _watcher.stop()
+        _watcher = None
+
+def get_locale_reload_stats():
+    """获取热加载统计，未启用热加载时返回None"""
+    return _watcher.stats() if _watcher else None
+
 def scan_directory_with_glob(glob_pattern):
     """使用glob模式扫描目录下的语言资源文件"""
     if not glob_pattern:
         return 0
         
-    count = 0
-    for file_path in glob.glob(os.path.expanduser(glob_pattern)):
-        if os.path.isfile(file_path) and register_locale_file(file_path):
-            count += 1
-            
-    return count
+    paths = sorted(p for p in glob.glob(os.path.expanduser(glob_pattern)) if os.path.isfile(p))
+    return _register_locale_files(paths)
 
 def auto_discover_resources():
     """自动发现语言资源文件"""
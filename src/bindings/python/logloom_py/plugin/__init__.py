@@ -33,32 +33,48 @@ Logloom Python 插件系统
 from .plugin_base import (
     Plugin, FilterPlugin, SinkPlugin, AIPlugin, LangPlugin,
     PluginType, PluginMode, PluginCapability, PluginResult,
-    PluginInfo, LogEntry, PluginHelpers
+    PluginInfo, LogEntry, PluginHelpers, PluginConfig
 )
 
+from .rules_filter import RulesFilterPlugin
+
 from .loader import (
     initialize, 
     scan_and_load, 
+    get_discovered_plugins, 
     unload_all, 
     shutdown, 
     filter_log, 
     sink_log, 
+    sink_log_async, 
+    sink_records, 
+    flush_batches, 
     ai_process, 
+    register_plugin, 
     set_plugin_enabled, 
     get_plugin, 
     get_plugin_info, 
-    get_plugins_by_type
+    get_plugins_by_type, 
+    get_stats, 
+    get_queue_stats, 
+    reload_config, 
+    add_config_listener, 
+    remove_config_listener
 )
 
 __all__ = [
     # 基础类型
     'Plugin', 'FilterPlugin', 'SinkPlugin', 'AIPlugin', 'LangPlugin',
     'PluginType', 'PluginMode', 'PluginCapability', 'PluginResult',
-    'PluginInfo', 'LogEntry', 'PluginHelpers',
+    'PluginInfo', 'LogEntry', 'PluginHelpers', 'PluginConfig',
+    
+    # 内置插件
+    'RulesFilterPlugin',
     
     # 管理函数
-    'initialize', 'scan_and_load', 'unload_all', 'shutdown',
-    'filter_log', 'sink_log', 'ai_process',
-    'set_plugin_enabled', 'get_plugin', 'get_plugin_info',
-    'get_plugins_by_type'
+    'initialize', 'scan_and_load', 'get_discovered_plugins', 'unload_all', 'shutdown',
+    'filter_log', 'sink_log', 'sink_log_async', 'sink_records', 'flush_batches', 'ai_process',
+    'register_plugin', 'set_plugin_enabled', 'get_plugin', 'get_plugin_info',
+    'get_plugins_by_type', 'get_stats', 'get_queue_stats',
+    'reload_config', 'add_config_listener', 'remove_config_listener'
 ]
\ No newline at end of file
@@ -0,0 +1,156 @@
+"""
+Logloom 翻译模板编译缓存
+========================
+
+format_text每次调用都用str.format重新解析翻译模板。本模块把模板解析一次，
+编译为由字面量片段和占位符槽位拼成的f-string渲染函数，并按模板文本放入
+LRU缓存；同一段模板文本（无论属于哪种语言、哪个键）只编译一次。
+
+只有简单占位符（自动编号、数字下标、标识符名称，以及可选的转换和不含嵌套
+字段的格式说明）会被编译；含属性访问、下标访问或嵌套格式说明的模板仍交给
+str.format处理，两种方式抛出的异常类型一致。
+"""
+
+import string
+import functools
+
+# 默认缓存的模板数量
+DEFAULT_CACHE_SIZE = 512
+
+_formatter = string.Formatter()
+
+# 渲染函数关键字参数的默认值，只读
+_EMPTY = {}
+
+
+class CompiledTemplate:
+    """
+    编译后的翻译模板
+
+    format(args, kwargs)的结果与source.format(*args, **kwargs)相同
+    """
+
+    __slots__ = ("source", "compiled", "format")
+
+    def __init__(self, source):
+        self.source = source
+        # format(args, kwargs)直接是生成的渲染函数，调用时不经过额外的方法层
+        render = _compile(source)
+        self.compiled = render is not None
+        if render is None:
+            render = functools.partial(_format_fallback, source)
+        self.format = render
+
+
+def _format_fallback(source, a=(), k=None):
+    return source.format(*a, **(k or {}))
+
+
+def _compile(source):
+    """生成模板的渲染函数，无法编译时返回None"""
+    try:
+        parsed = list(_formatter.parse(source))
+    except ValueError:
+        # 格式错误的模板交给str.format在渲染时报告同样的错误
+        return None
+
+    constants = {}
+    pieces = []
+    auto_index = 0
+    numbering = None
+
+    for literal, field_name, format_spec, conversion in parsed:
+        if literal:
+            name = f"_l{len(constants)}"
+            constants[name] = literal
+            pieces.append("{" + name + "}")
+        if field_name is None:
+            continue
+
+        if field_name == "":
+            if numbering == "manual":
+                return None
+            numbering = "auto"
+            slot = f"a[{auto_index}]"
+            auto_index += 1
+        elif field_name.isascii() and field_name.isdigit():
+            if numbering == "auto":
+                return None
+            numbering = "manual"
+            slot = f"a[{int(field_name)}]"
+        elif field_name.isidentifier():
+            name = f"_k{len(constants)}"
+            constants[name] = field_name
+            slot = f"k[{name}]"
+        else:
+            # 属性或下标访问
+            return None
+
+        if format_spec and "{" in format_spec:
+            return None
+        if conversion:
+            if conversion not in "rsa":
+                return None
+            slot += "!" + conversion
+        if format_spec:
+            name = f"_s{len(constants)}"
+            constants[name] = format_spec
+            slot += ":{" + name + "}"
+        pieces.append("{" + slot + "}")
+
+    # 字面量和格式说明都作为默认参数传入，生成的代码中只有变量名和整数下标
+    defaults = "".join(f", {name}={name}" for name in constants)
+    code = f"def _render(a=(), k=_EMPTY{defaults}):\n    return f\"{''.join(pieces)}\"\n"
+    namespace = dict(constants, _EMPTY=_EMPTY)
+    exec(code, namespace)
+    return namespace["_render"]
+
+
+def _compile_uncached(source):
+    return CompiledTemplate(source)
+
+
+_compile_cached = functools.lru_cache(maxsize=DEFAULT_CACHE_SIZE)(_compile_uncached)
+
+
+def compile_template(source):
+    """返回模板文本对应的编译结果，使用LRU缓存"""
+    return _compile_cached(source)
+
+
+def format_template(source, args=(), kwargs=None):
+    """用缓存的编译模板渲染模板文本"""
+    return _compile_cached(source).format(args, kwargs or _EMPTY)
+
+
+def set_template_cache_size(size):
+    """
+    设置模板缓存的容量，已缓存的模板会被丢弃
+
+    Parameters:
+    -----------
+    size : int
+        最多缓存的模板数量，0表示不缓存
+    """
+    global _compile_cached
+
+    size = int(size)
+    if size < 0:
+        raise ValueError("template cache size must not be negative")
+    _compile_cached = functools.lru_cache(maxsize=size)(_compile_uncached)
+
+
+def template_cache_info():
+    """返回模板缓存的命中次数、未命中次数、容量和当前大小"""
+    info = _compile_cached.cache_info()
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "maxsize": info.maxsize,
+        "size": info.currsize,
+    }
+
+
+def clear_template_cache():
+    """清空模板缓存"""
+    _compile_cached.cache_clear()
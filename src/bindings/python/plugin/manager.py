@@ -9,11 +9,13 @@ Logloom Python 插件管理工具
 - 启用/禁用插件
 - 显示插件信息
 - 创建插件配置文件
+- 显示插件处理统计
 """
 
 import os
 import sys
 import json
+import time
 import argparse
 import logging
 from typing import Dict, List, Any, Optional
@@ -29,8 +31,10 @@ try:
     # 尝试导入插件系统
     from . import (
         initialize, scan_and_load, shutdown, get_plugin, get_plugin_info,
-        get_plugins_by_type, PluginType
+        get_plugins_by_type, get_discovered_plugins, get_stats, filter_log, sink_log,
+        ai_process, flush_batches, PluginType, LogEntry
     )
+    from .loader import STATS_BUCKET_BOUNDS
 except ImportError:
     logger.error("无法导入Logloom插件系统。请确保Logloom已正确安装。")
     sys.exit(1)
@@ -138,26 +142,24 @@ def save_config(config: Dict[str, Any], config_path: Optional[str] = None) -> bo
 
 def list_plugins(args):
     """列出所有插件"""
-    config = load_config(args.config)
-    
     if initialize(None, args.config) != 0:
         logger.error("初始化插件系统失败")
         return
     
-    # 扫描并加载插件
-    loaded_count = scan_and_load()
-    logger.info(f"发现 {loaded_count} 个插件")
+    # 从插件发现缓存读取插件信息，插件文件未变化时无需导入和初始化插件
+    plugins = get_discovered_plugins()
+    logger.info(f"发现 {len(plugins)} 个插件")
     
     # 按类型分组显示插件
     for plugin_type in PluginType:
-        plugins = get_plugins_by_type(plugin_type)
-        if plugins:
+        group = [plugin for plugin in plugins if plugin["type"] == plugin_type]
+        if group:
             print(f"\n=== {plugin_type.name} 插件 ===")
-            for plugin in plugins:
-                status = "启用" if plugin.enabled else "禁用"
-                print(f"- {plugin.name} (v{plugin.info.version}) [{status}]")
-                print(f"  描述: {plugin.info.description}")
-                print(f"  作者: {plugin.info.author}")
+            for plugin in group:
+                status = "启用" if plugin["enabled"] else "禁用"
+                print(f"- {plugin['name']} (v{plugin['version']}) [{status}]")
+                print(f"  描述: {plugin['description']}")
+                print(f"  作者: {plugin['author']}")
     
     # 关闭插件系统
     shutdown()
@@ -284,6 +286,71 @@ def create_config(args):
         logger.error("保存配置失败")
 
 
+def _format_duration(seconds: float) -> str:
+    """将耗时格式化为微秒或毫秒"""
+    if seconds < 0.001:
+        return f"{seconds * 1e6:.1f}us"
+    return f"{seconds * 1e3:.2f}ms"
+
+
+def format_stats(stats: Dict[str, Dict[str, Any]]) -> str:
+    """
+    将插件处理统计格式化为表格，按累计耗时从高到低排列
+    
+    Args:
+        stats: get_stats()的返回值
+    
+    Returns:
+        格式化后的文本
+    """
+    bucket_labels = [f"<={_format_duration(bound)}" for bound in STATS_BUCKET_BOUNDS]
+    bucket_labels.append(f">{_format_duration(STATS_BUCKET_BOUNDS[-1])}")
+    
+    lines = [f"{'插件':<24}{'调用':>10}{'条目':>10}{'错误':>8}{'过滤':>8}"
+             f"{'累计':>12}{'平均':>12}{'最大':>12}{'队列':>8}{'丢弃':>8}{'熔断':>12}"]
+    ordered = sorted(stats.items(), key=lambda item: item[1]["total_time"], reverse=True)
+    for name, item in ordered:
+        queue_depth = item.get("queue_depth", "-")
+        dropped = item.get("dropped", "-")
+        lines.append(f"{name:<24}{item['calls']:>10}{item['entries']:>10}{item['errors']:>8}"
+                     f"{item['filtered']:>8}{_format_duration(item['total_time']):>12}"
+                     f"{_format_duration(item['avg_time']):>12}{_format_duration(item['max_time']):>12}"
+                     f"{queue_depth:>8}{dropped:>8}{item.get('breaker_state', '-'):>12}")
+        if item["calls"]:
+            histogram = ", ".join(
+                f"{label}: {count}" for label, count in zip(bucket_labels, item["histogram"]) if count
+            )
+            lines.append(f"  延迟分布: {histogram}")
+    return "\n".join(lines)
+
+
+def show_stats(args):
+    """加载插件，可选地发送示例日志，然后显示插件处理统计"""
+    if initialize(None, args.config) != 0:
+        logger.error("初始化插件系统失败")
+        return
+    
+    scan_and_load()
+    
+    # 发送示例日志以测量各插件的处理耗时
+    for i in range(args.sample):
+        entry = LogEntry(level=1, timestamp=int(time.time()),
+                         message=f"plugin stats sample {i}", module="manager")
+        if filter_log(entry):
+            sink_log(entry)
+            ai_process(entry)
+    flush_batches()
+    
+    stats = get_stats()
+    if stats:
+        print(format_stats(stats))
+    else:
+        print("没有已加载的插件")
+    
+    # 关闭插件系统
+    shutdown()
+
+
 def main():
     """主函数"""
     parser = argparse.ArgumentParser(description="Logloom Python 插件管理工具")
@@ -313,6 +380,11 @@ def main():
     config_parser.add_argument("--key", help="配置键")
     config_parser.add_argument("--value", help="配置值")
     
+    # stats 子命令
+    stats_parser = subparsers.add_parser("stats", help="显示插件处理统计")
+    stats_parser.add_argument("--sample", type=int, default=0,
+                              help="加载后发送的示例日志条数，用于测量插件处理耗时")
+    
     # 解析参数
     args = parser.parse_args()
     
@@ -326,6 +398,8 @@ def main():
         disable_plugin(args)
     elif args.command == "config":
         create_config(args)
+    elif args.command == "stats":
+        show_stats(args)
     else:
         parser.print_help()
 
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+内置规则过滤器插件，对应C中的src/plugin/rules_filter.c
+
+在初始化时将插件配置中的声明式规则编译为判定结构，之后每条日志只需
+一次模块查找、一次级别比较和至多两次预编译正则匹配：
+- min_level: 全局最低日志级别（级别名称或数字）
+- module_levels: 按模块的最低级别，格式为"模块:级别"
+- allow_modules: 允许的模块列表，为空表示不限制
+- deny_modules: 拒绝的模块列表
+- keywords: 包含任一关键字的日志被过滤
+- patterns: 匹配任一正则表达式的日志被过滤
+- case_sensitive: 关键字和正则是否区分大小写
+"""
+
+import re
+import logging
+from typing import Dict, FrozenSet, Optional, Pattern, Tuple
+
+from .plugin_base import (
+    FilterPlugin, PluginHelpers, PluginMode, PluginCapability, PluginResult, LogEntry
+)
+
+logger = logging.getLogger("logloom.plugin.rules_filter")
+
+# 级别名称到数值的映射，与C中的log_level_t一致
+LEVEL_VALUES = {
+    "DEBUG": 0,
+    "INFO": 1,
+    "WARN": 2,
+    "WARNING": 2,
+    "ERROR": 3,
+    "FATAL": 4,
+    "CRITICAL": 4,
+}
+
+
+def _parse_level(value: str) -> Optional[int]:
+    """解析级别名称或数字，无法识别返回None"""
+    value = value.strip()
+    if value.lstrip("-").isdigit():
+        return int(value)
+    return LEVEL_VALUES.get(value.upper())
+
+
+class RulesFilterPlugin(FilterPlugin):
+    """
+    规则过滤器插件
+    按模块、级别、关键字和正则表达式过滤日志
+    """
+
+    def __init__(self, name: str = "rules_filter"):
+        super().__init__(
+            name=name,
+            version="1.0.0",
+            author="Logloom Team",
+            mode=PluginMode.SYNC,
+            capabilities=PluginCapability.NONE,
+            description="内置规则过滤器，按模块、级别、关键字和正则表达式过滤日志"
+        )
+        self._min_level = 0
+        self._module_levels: Dict[str, int] = {}
+        self._allow_modules: Optional[FrozenSet[str]] = None
+        self._deny_modules: FrozenSet[str] = frozenset()
+        self._keywords: Optional[Pattern] = None
+        self._patterns: Tuple[Pattern, ...] = ()
+
+    def init(self, helpers: PluginHelpers) -> int:
+        """
+        编译配置中的全部规则
+
+        Args:
+            helpers: 插件辅助函数
+
+        Returns:
+            0表示成功，非0表示失败
+        """
+        self._helpers = helpers
+        self._compile_rules()
+        return 0
+
+    def on_config_change(self, old, new):
+        """配置重新加载后重新编译规则"""
+        self._compile_rules()
+
+    def _compile_rules(self):
+        """按当前配置快照编译规则，编译完成后逐个替换规则字段"""
+        flags = 0 if self.get_config_bool("case_sensitive", False) else re.IGNORECASE
+
+        self._min_level = _parse_level(self.get_config_string("min_level", "DEBUG")) or 0
+
+        module_levels = {}
+        for rule in self.get_config_array("module_levels"):
+            module, sep, level = rule.rpartition(":")
+            value = _parse_level(level) if sep and module else None
+            if value is None:
+                logger.warning(f"忽略无效的模块级别规则: {rule}")
+                continue
+            module_levels[module] = value
+        self._module_levels = module_levels
+
+        allow = self.get_config_array("allow_modules")
+        self._allow_modules = frozenset(allow) if allow else None
+        self._deny_modules = frozenset(self.get_config_array("deny_modules"))
+
+        # 关键字合并为一个转义后的多选正则，由re在C层一次扫描完成匹配
+        keywords = [keyword for keyword in self.get_config_array("keywords") if keyword]
+        if keywords:
+            keywords.sort(key=len, reverse=True)
+            self._keywords = re.compile("|".join(map(re.escape, keywords)), flags)
+        else:
+            self._keywords = None
+
+        patterns = []
+        for pattern in self.get_config_array("patterns"):
+            try:
+                patterns.append(re.compile(pattern, flags))
+            except re.error as e:
+                logger.warning(f"插件 {self.name} 中的过滤正则无效: {pattern} ({e})")
+        self._patterns = tuple(patterns)
+
+    def process(self, log_entry: LogEntry) -> int:
+        """
+        按编译后的规则判定日志条目
+
+        Args:
+            log_entry: 日志条目
+
+        Returns:
+            通过返回PluginResult.OK，过滤返回PluginResult.SKIP
+        """
+        module = log_entry.module or ""
+        if module in self._deny_modules:
+            return PluginResult.SKIP
+        if self._allow_modules is not None and module not in self._allow_modules:
+            return PluginResult.SKIP
+
+        if log_entry.level < self._module_levels.get(module, self._min_level):
+            return PluginResult.SKIP
+
+        message = log_entry.message
+        if message:
+            if self._keywords is not None and self._keywords.search(message):
+                return PluginResult.SKIP
+            for pattern in self._patterns:
+                if pattern.search(message):
+                    return PluginResult.SKIP
+
+        return PluginResult.OK
+
+    def shutdown(self):
+        """释放编译后的规则"""
+        self._module_levels = {}
+        self._allow_modules = None
+        self._deny_modules = frozenset()
+        self._keywords = None
+        self._patterns = ()
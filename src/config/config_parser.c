@@ -0,0 +1,1514 @@
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <stdint.h>
+#include <limits.h>
+#include <stdarg.h>
+#include <stddef.h>
+#include <errno.h>
+#include <math.h>
+#include <pthread.h>
+#include <sys/stat.h>
+#include "config_parser.h"
+
+/** 文档内存块的默认大小 */
+#define CONFIG_ARENA_BLOCK_SIZE 16384
+
+/** 缓存的配置文件数量 */
+#define CONFIG_DOCUMENT_CACHE_SIZE 8
+
+/**
+ * @brief 文档内存块，节点和字符串从块中顺序分配，随文档一次释放
+ */
+typedef struct config_arena_block {
+    struct config_arena_block* next;
+    size_t used;
+    size_t size;
+    max_align_t data[];
+} config_arena_block_t;
+
+struct config_document {
+    config_arena_block_t* arena;         /* 内存块链表 */
+    config_node_t* root;                 /* 根节点 */
+    struct config_document* retired;     /* 缓存中被替换后的链表 */
+};
+
+/**
+ * @brief 预处理后的一行：已去除注释和首尾空白
+ */
+typedef struct {
+    char* text;          /* 内容起始位置 */
+    size_t length;       /* 内容长度 */
+    int indent;          /* 缩进（空格数） */
+    int number;          /* 行号（从1开始） */
+    int last;            /* 跨行时最后一行的行号 */
+} config_line_t;
+
+typedef struct {
+    config_document_t* doc;
+    config_line_t* lines;
+    size_t line_count;
+    size_t pos;              /* 当前行 */
+    char* error;
+    size_t error_size;
+    bool failed;
+} config_parser_t;
+
+/**
+ * @brief 流式集合的读取位置
+ */
+typedef struct {
+    const char* text;
+    size_t length;
+    size_t pos;
+    int line;            /* 流式集合起始行号，用于错误信息 */
+} flow_cursor_t;
+
+/**
+ * @brief 缓存的配置文件，按设备号和inode识别同一文件
+ */
+typedef struct {
+    dev_t dev;
+    ino_t ino;
+    off_t size;
+    struct timespec mtime;
+    config_document_t* doc;
+} config_cache_entry_t;
+
+static config_cache_entry_t document_cache[CONFIG_DOCUMENT_CACHE_SIZE];
+static size_t document_cache_next = 0;
+static config_document_t* retired_documents = NULL;
+static pthread_mutex_t document_lock = PTHREAD_MUTEX_INITIALIZER;
+
+static config_node_t* parse_block(config_parser_t* p, int indent);
+
+/* ---------- 内存分配 ---------- */
+
+static void* arena_alloc(config_document_t* doc, size_t size) {
+    size = (size + sizeof(max_align_t) - 1) & ~(sizeof(max_align_t) - 1);
+    config_arena_block_t* block = doc->arena;
+    if (!block || block->size - block->used < size) {
+        size_t block_size = size > CONFIG_ARENA_BLOCK_SIZE ? size : CONFIG_ARENA_BLOCK_SIZE;
+        block = (config_arena_block_t*)malloc(sizeof(config_arena_block_t) + block_size);
+        if (!block) {
+            return NULL;
+        }
+        block->next = doc->arena;
+        block->used = 0;
+        block->size = block_size;
+        doc->arena = block;
+    }
+    void* ptr = (char*)block->data + block->used;
+    block->used += size;
+    return ptr;
+}
+
+static void parse_error(config_parser_t* p, int line, const char* format, ...) {
+    if (p->failed) {
+        return;
+    }
+    p->failed = true;
+    if (!p->error || p->error_size == 0) {
+        return;
+    }
+    int written = snprintf(p->error, p->error_size, "line %d: ", line);
+    if (written < 0 || (size_t)written >= p->error_size) {
+        return;
+    }
+    va_list args;
+    va_start(args, format);
+    vsnprintf(p->error + written, p->error_size - written, format, args);
+    va_end(args);
+}
+
+static config_node_t* new_node(config_parser_t* p, config_node_type_t type) {
+    config_node_t* node = (config_node_t*)arena_alloc(p->doc, sizeof(config_node_t));
+    if (!node) {
+        parse_error(p, 0, "out of memory");
+        return NULL;
+    }
+    memset(node, 0, sizeof(*node));
+    node->type = type;
+    return node;
+}
+
+static char* copy_text(config_parser_t* p, const char* text, size_t length) {
+    char* copy = (char*)arena_alloc(p->doc, length + 1);
+    if (!copy) {
+        parse_error(p, 0, "out of memory");
+        return NULL;
+    }
+    memcpy(copy, text, length);
+    copy[length] = '\0';
+    return copy;
+}
+
+/* ---------- 纯量解析 ---------- */
+
+static bool text_equals_any(const char* text, size_t length, const char* const* words) {
+    for (; *words; words++) {
+        if (strlen(*words) == length && memcmp(text, *words, length) == 0) {
+            return true;
+        }
+    }
+    return false;
+}
+
+/**
+ * @brief 解析六十进制数（如 1:30 表示90）的整数部分，除首段外各段为0到59
+ */
+static bool resolve_sexagesimal(const char* text, size_t length, bool negative, long long* value) {
+    long long result = 0;
+    size_t i = 0;
+    bool first = true;
+    while (i <= length) {
+        long long part = 0;
+        size_t digits = 0;
+        for (; i < length && text[i] != ':'; i++) {
+            if (text[i] == '_' && first) {
+                continue;
+            }
+            if (text[i] < '0' || text[i] > '9') {
+                return false;
+            }
+            if (part < LLONG_MAX / 60) {
+                part = part * 10 + (text[i] - '0');
+            }
+            digits++;
+        }
+        if (digits == 0 || (!first && (digits > 2 || part > 59))) {
+            return false;
+        }
+        result = first ? part : (result < LLONG_MAX / 60 ? result * 60 + part : LLONG_MAX);
+        first = false;
+        i++;
+    }
+    *value = negative ? -result : result;
+    return true;
+}
+
+/**
+ * @brief 按YAML 1.1规则解析整数：十进制、0x十六进制、0b二进制、0开头的八进制，可含下划线
+ */
+static bool resolve_int(const char* text, size_t length, long long* value) {
+    size_t i = 0;
+    bool negative = false;
+    if (i < length && (text[i] == '+' || text[i] == '-')) {
+        negative = text[i] == '-';
+        i++;
+    }
+    if (i >= length || text[i] < '0' || text[i] > '9') {
+        return false;
+    }
+    if (memchr(text + i, ':', length - i)) {
+        /* 六十进制整数的首段不能以0开头 */
+        return text[i] != '0' && resolve_sexagesimal(text + i, length - i, negative, value);
+    }
+
+    int base = 10;
+    if (text[i] == '0' && i + 1 < length) {
+        if (text[i + 1] == 'x') {
+            base = 16;
+            i += 2;
+        } else if (text[i + 1] == 'b') {
+            base = 2;
+            i += 2;
+        } else {
+            base = 8;
+            i += 1;
+        }
+        if (i >= length) {
+            return false;
+        }
+    } else if (text[i] == '0') {
+        *value = 0;
+        return true;
+    }
+    if (base == 10 && text[i] == '_') {
+        return false;
+    }
+
+    unsigned long long result = 0;
+    for (; i < length; i++) {
+        char c = text[i];
+        int digit;
+        if (c == '_') {
+            continue;
+        } else if (c >= '0' && c <= '9') {
+            digit = c - '0';
+        } else if (c >= 'a' && c <= 'f') {
+            digit = c - 'a' + 10;
+        } else if (c >= 'A' && c <= 'F') {
+            digit = c - 'A' + 10;
+        } else {
+            return false;
+        }
+        if (digit >= base) {
+            return false;
+        }
+        if (result > (ULLONG_MAX - digit) / base) {
+            result = ULLONG_MAX;
+        } else {
+            result = result * base + digit;
+        }
+    }
+
+    if (negative) {
+        *value = result > (unsigned long long)LLONG_MAX + 1 ? LLONG_MIN : -(long long)result;
+    } else {
+        *value = result > (unsigned long long)LLONG_MAX ? LLONG_MAX : (long long)result;
+    }
+    return true;
+}
+
+/**
+ * @brief 按YAML 1.1规则解析浮点数：必须包含小数点，指数部分必须带符号；以及.inf和.nan
+ */
+static bool resolve_float(const char* text, size_t length, double* value) {
+    static const char* const infinities[] = {".inf", ".Inf", ".INF", NULL};
+    static const char* const nans[] = {".nan", ".NaN", ".NAN", NULL};
+
+    size_t i = 0;
+    bool negative = false;
+    if (i < length && (text[i] == '+' || text[i] == '-')) {
+        negative = text[i] == '-';
+        i++;
+    }
+    if (text_equals_any(text + i, length - i, infinities)) {
+        *value = negative ? -HUGE_VAL : HUGE_VAL;
+        return true;
+    }
+    if (i == 0 && text_equals_any(text, length, nans)) {
+        *value = NAN;
+        return true;
+    }
+
+    if (memchr(text, ':', length)) {
+        /* 六十进制浮点数，如 1:30.5 */
+        const char* dot = memchr(text, '.', length);
+        long long whole;
+        if (!dot || i >= length || text[i] < '0' || text[i] > '9' ||
+            !resolve_sexagesimal(text + i, (size_t)(dot - text) - i, false, &whole)) {
+            return false;
+        }
+        double fraction = 0, scale = 0.1;
+        for (const char* c = dot + 1; c < text + length; c++) {
+            if (*c >= '0' && *c <= '9') {
+                fraction += (*c - '0') * scale;
+                scale /= 10;
+            } else if (*c != '_') {
+                return false;
+            }
+        }
+        *value = negative ? -(whole + fraction) : whole + fraction;
+        return true;
+    }
+
+    char buffer[128];
+    size_t out = 0;
+    bool has_digit = false, dot = false;
+    if (i < length && text[i] == '.') {
+        /* 以小数点开头时不允许符号 */
+        if (i != 0) {
+            return false;
+        }
+    } else {
+        if (i >= length || text[i] < '0' || text[i] > '9') {
+            return false;
+        }
+    }
+    if (negative) {
+        buffer[out++] = '-';
+    }
+    for (; i < length && out < sizeof(buffer) - 1; i++) {
+        char c = text[i];
+        if (c >= '0' && c <= '9') {
+            has_digit = true;
+            buffer[out++] = c;
+        } else if (c == '_') {
+            continue;
+        } else if (c == '.' && !dot) {
+            dot = true;
+            buffer[out++] = c;
+        } else if ((c == 'e' || c == 'E') && dot) {
+            if (i + 2 >= length || (text[i + 1] != '+' && text[i + 1] != '-')) {
+                return false;
+            }
+            buffer[out++] = 'e';
+            buffer[out++] = text[++i];
+            for (i++; i < length && out < sizeof(buffer) - 1; i++) {
+                if (text[i] < '0' || text[i] > '9') {
+                    return false;
+                }
+                buffer[out++] = text[i];
+            }
+            break;
+        } else {
+            return false;
+        }
+    }
+    if (!dot || i < length) {
+        return false;
+    }
+    if (!has_digit) {
+        /* 只有小数点 */
+        return false;
+    }
+    buffer[out] = '\0';
+    *value = strtod(buffer, NULL);
+    return true;
+}
+
+/**
+ * @brief 解析纯量的类型和值
+ */
+static config_node_t* resolve_plain(config_parser_t* p, const char* text, size_t length) {
+    static const char* const nulls[] = {"~", "null", "Null", "NULL", NULL};
+    static const char* const trues[] = {"true", "True", "TRUE", "yes", "Yes", "YES", "on", "On", "ON", NULL};
+    static const char* const falses[] = {"false", "False", "FALSE", "no", "No", "NO", "off", "Off", "OFF", NULL};
+
+    config_node_t* node = new_node(p, CONFIG_NODE_STRING);
+    if (!node) {
+        return NULL;
+    }
+    if (length == 0 || text_equals_any(text, length, nulls)) {
+        node->type = CONFIG_NODE_NULL;
+        return node;
+    }
+    node->text = copy_text(p, text, length);
+    if (!node->text) {
+        return NULL;
+    }
+
+    if (text_equals_any(text, length, trues)) {
+        node->type = CONFIG_NODE_BOOL;
+        node->bool_value = true;
+    } else if (text_equals_any(text, length, falses)) {
+        node->type = CONFIG_NODE_BOOL;
+        node->bool_value = false;
+    } else if (resolve_int(text, length, &node->int_value)) {
+        node->type = CONFIG_NODE_INT;
+    } else if (resolve_float(text, length, &node->float_value)) {
+        node->type = CONFIG_NODE_FLOAT;
+    }
+    return node;
+}
+
+static int hex_value(char c) {
+    if (c >= '0' && c <= '9') return c - '0';
+    if (c >= 'a' && c <= 'f') return c - 'a' + 10;
+    if (c >= 'A' && c <= 'F') return c - 'A' + 10;
+    return -1;
+}
+
+static size_t encode_utf8(unsigned long code, char* out) {
+    if (code < 0x80) {
+        out[0] = (char)code;
+        return 1;
+    } else if (code < 0x800) {
+        out[0] = (char)(0xC0 | (code >> 6));
+        out[1] = (char)(0x80 | (code & 0x3F));
+        return 2;
+    } else if (code < 0x10000) {
+        out[0] = (char)(0xE0 | (code >> 12));
+        out[1] = (char)(0x80 | ((code >> 6) & 0x3F));
+        out[2] = (char)(0x80 | (code & 0x3F));
+        return 3;
+    }
+    out[0] = (char)(0xF0 | (code >> 18));
+    out[1] = (char)(0x80 | ((code >> 12) & 0x3F));
+    out[2] = (char)(0x80 | ((code >> 6) & 0x3F));
+    out[3] = (char)(0x80 | (code & 0x3F));
+    return 4;
+}
+
+/**
+ * @brief 跳过引号字符串中的换行和续行缩进
+ *
+ * @param i 指向换行符，返回后指向续行的第一个非空白字符
+ * @return 其后的空行数
+ */
+static size_t skip_line_breaks(const char* text, size_t length, size_t* i) {
+    size_t blank = 0;
+    bool first = true;
+    while (*i < length && (text[*i] == '\n' || text[*i] == '\r')) {
+        if (text[*i] == '\r' && *i + 1 < length && text[*i + 1] == '\n') {
+            (*i)++;
+        }
+        (*i)++;
+        blank += first ? 0 : 1;
+        first = false;
+        while (*i < length && (text[*i] == ' ' || text[*i] == '\t')) {
+            (*i)++;
+        }
+    }
+    return blank;
+}
+
+/**
+ * @brief 解析引号字符串，*pos指向开头的引号，返回后指向结尾引号之后
+ *
+ * 跨行的字符串按YAML规则折叠：换行连同前后的空白变为一个空格，空行保留为换行。
+ * 转义后的长度最多为原文的1.5倍（\L和\P），按原文长度的2倍分配
+ */
+static char* parse_quoted(config_parser_t* p, const char* text, size_t length, size_t* pos, int line) {
+    char quote = text[*pos];
+    size_t i = *pos + 1;
+    char* out = (char*)arena_alloc(p->doc, 2 * (length - *pos) + 1);
+    if (!out) {
+        parse_error(p, line, "out of memory");
+        return NULL;
+    }
+    size_t n = 0;
+    size_t kept = 0;     /* 转义产生的空白不随换行去除 */
+
+    while (i < length) {
+        char c = text[i];
+        if (c == quote) {
+            if (quote == '\'' && i + 1 < length && text[i + 1] == '\'') {
+                out[n++] = '\'';
+                i += 2;
+                continue;
+            }
+            out[n] = '\0';
+            *pos = i + 1;
+            return out;
+        }
+        if (c == '\n' || c == '\r') {
+            while (n > kept && (out[n - 1] == ' ' || out[n - 1] == '\t')) {
+                n--;
+            }
+            size_t blank = skip_line_breaks(text, length, &i);
+            if (blank == 0) {
+                out[n++] = ' ';
+            }
+            for (; blank > 0; blank--) {
+                out[n++] = '\n';
+            }
+            continue;
+        }
+        if (c != '\\' || quote == '\'') {
+            out[n++] = c;
+            i++;
+            continue;
+        }
+
+        if (++i >= length) {
+            break;
+        }
+        if (text[i] == '\n' || text[i] == '\r') {
+            /* 转义的换行：续行直接拼接 */
+            for (size_t blank = skip_line_breaks(text, length, &i); blank > 0; blank--) {
+                out[n++] = '\n';
+            }
+            kept = n;
+            continue;
+        }
+        int digits = 0;
+        unsigned long code = 0;
+        switch (text[i]) {
+            case '0': out[n++] = '\0'; break;
+            case 'a': out[n++] = '\a'; break;
+            case 'b': out[n++] = '\b'; break;
+            case 't': case '\t': out[n++] = '\t'; break;
+            case 'n': out[n++] = '\n'; break;
+            case 'v': out[n++] = '\v'; break;
+            case 'f': out[n++] = '\f'; break;
+            case 'r': out[n++] = '\r'; break;
+            case 'e': out[n++] = '\x1b'; break;
+            case ' ': out[n++] = ' '; break;
+            case '"': out[n++] = '"'; break;
+            case '/': out[n++] = '/'; break;
+            case '\\': out[n++] = '\\'; break;
+            case 'x': digits = 2; break;
+            case 'u': digits = 4; break;
+            case 'U': digits = 8; break;
+            case 'N': code = 0x85; break;
+            case '_': code = 0xA0; break;
+            case 'L': code = 0x2028; break;
+            case 'P': code = 0x2029; break;
+            default:
+                parse_error(p, line, "invalid escape sequence '\\%c'", text[i]);
+                return NULL;
+        }
+        if (digits) {
+            for (int d = 1; d <= digits; d++) {
+                int v = i + d < length ? hex_value(text[i + d]) : -1;
+                if (v < 0) {
+                    parse_error(p, line, "invalid escape sequence");
+                    return NULL;
+                }
+                code = code * 16 + v;
+            }
+            if (code > 0x10FFFF) {
+                parse_error(p, line, "invalid unicode escape");
+                return NULL;
+            }
+            i += digits;
+        }
+        if (digits || code) {
+            n += encode_utf8(code, out + n);
+        }
+        kept = n;
+        i++;
+    }
+
+    parse_error(p, line, "unterminated quoted string");
+    return NULL;
+}
+
+/**
+ * @brief 检查纯量开头是否为不支持的YAML特性
+ */
+static bool check_unsupported(config_parser_t* p, const char* text, size_t length, int line) {
+    if (length == 0) {
+        return true;
+    }
+    switch (text[0]) {
+        case '|':
+        case '>':
+            parse_error(p, line, "block scalars are not supported");
+            return false;
+        case '&':
+            parse_error(p, line, "anchors are not supported");
+            return false;
+        case '*':
+            parse_error(p, line, "aliases are not supported");
+            return false;
+        case '!':
+            parse_error(p, line, "tags are not supported");
+            return false;
+        case '?':
+            if (length == 1 || text[1] == ' ') {
+                parse_error(p, line, "complex keys are not supported");
+                return false;
+            }
+            return true;
+        case '@':
+        case '`':
+            parse_error(p, line, "reserved indicator '%c'", text[0]);
+            return false;
+        default:
+            return true;
+    }
+}
+
+/* ---------- 流式集合 ---------- */
+
+/* 跨行拼接后的空行以换行符保留，在流式集合中同样是空白 */
+static bool is_flow_space(char c) {
+    return c == ' ' || c == '\t' || c == '\n';
+}
+
+static void flow_skip_space(flow_cursor_t* c) {
+    while (c->pos < c->length && is_flow_space(c->text[c->pos])) {
+        c->pos++;
+    }
+}
+
+/**
+ * @brief 集合的子节点链表，映射较大时用哈希表检查重复键
+ */
+typedef struct {
+    config_node_t* tail;
+    const char** keys;       /* 开放寻址哈希表，子节点超过KEY_SET_MIN_COUNT时建立 */
+    size_t capacity;
+} child_list_t;
+
+/** 子节点少于该数量时直接遍历链表检查重复键 */
+#define KEY_SET_MIN_COUNT 8
+
+static size_t key_hash(const char* key) {
+    size_t hash = 2166136261u;
+    for (const unsigned char* c = (const unsigned char*)key; *c; c++) {
+        hash = (hash ^ *c) * 16777619u;
+    }
+    return hash;
+}
+
+/**
+ * @brief 将键加入哈希表，键已存在时返回false
+ */
+static bool key_set_insert(child_list_t* list, const char* key) {
+    size_t mask = list->capacity - 1;
+    for (size_t i = key_hash(key) & mask; ; i = (i + 1) & mask) {
+        if (!list->keys[i]) {
+            list->keys[i] = key;
+            return true;
+        }
+        if (strcmp(list->keys[i], key) == 0) {
+            return false;
+        }
+    }
+}
+
+/**
+ * @brief 扩容哈希表，负载因子不超过0.5。旧表留在文档内存中，随文档释放
+ */
+static bool key_set_grow(config_parser_t* p, config_node_t* parent, child_list_t* list) {
+    size_t capacity = list->capacity ? list->capacity * 2 : KEY_SET_MIN_COUNT * 4;
+    const char** keys = (const char**)arena_alloc(p->doc, capacity * sizeof(const char*));
+    if (!keys) {
+        parse_error(p, 0, "out of memory");
+        return false;
+    }
+    memset(keys, 0, capacity * sizeof(const char*));
+    list->keys = keys;
+    list->capacity = capacity;
+    for (config_node_t* it = parent->child; it; it = it->next) {
+        key_set_insert(list, it->key);
+    }
+    return true;
+}
+
+static bool append_child(config_parser_t* p, config_node_t* parent, child_list_t* list, config_node_t* child, int line) {
+    if (parent->type == CONFIG_NODE_MAPPING) {
+        bool duplicate = false;
+        if (parent->count < KEY_SET_MIN_COUNT) {
+            for (config_node_t* it = parent->child; it && !duplicate; it = it->next) {
+                duplicate = strcmp(it->key, child->key) == 0;
+            }
+        } else {
+            if ((parent->count + 1) * 2 > list->capacity && !key_set_grow(p, parent, list)) {
+                return false;
+            }
+            duplicate = !key_set_insert(list, child->key);
+        }
+        if (duplicate) {
+            parse_error(p, line, "duplicate key '%s'", child->key);
+            return false;
+        }
+    }
+    if (list->tail) {
+        list->tail->next = child;
+    } else {
+        parent->child = child;
+    }
+    list->tail = child;
+    parent->count++;
+    return true;
+}
+
+static config_node_t* parse_flow_node(config_parser_t* p, flow_cursor_t* c);
+
+/**
+ * @brief 读取流式纯量，遇到逗号、括号或": "时结束
+ */
+static config_node_t* parse_flow_plain(config_parser_t* p, flow_cursor_t* c) {
+    size_t start = c->pos;
+    while (c->pos < c->length) {
+        char ch = c->text[c->pos];
+        if (ch == ',' || ch == ']' || ch == '}' || ch == '[' || ch == '{') {
+            break;
+        }
+        if (ch == ':' && (c->pos + 1 >= c->length || strchr(" \t\n,]}", c->text[c->pos + 1]))) {
+            break;
+        }
+        c->pos++;
+    }
+    size_t end = c->pos;
+    while (end > start && is_flow_space(c->text[end - 1])) {
+        end--;
+    }
+    if (!check_unsupported(p, c->text + start, end - start, c->line)) {
+        return NULL;
+    }
+    return resolve_plain(p, c->text + start, end - start);
+}
+
+static config_node_t* parse_flow_collection(config_parser_t* p, flow_cursor_t* c) {
+    bool mapping = c->text[c->pos] == '{';
+    char close = mapping ? '}' : ']';
+    config_node_t* node = new_node(p, mapping ? CONFIG_NODE_MAPPING : CONFIG_NODE_SEQUENCE);
+    child_list_t children = {NULL, NULL, 0};
+    if (!node) {
+        return NULL;
+    }
+    c->pos++;
+
+    while (true) {
+        flow_skip_space(c);
+        if (c->pos >= c->length) {
+            parse_error(p, c->line, "unterminated flow collection, expected '%c'", close);
+            return NULL;
+        }
+        if (c->text[c->pos] == close) {
+            c->pos++;
+            return node;
+        }
+
+        config_node_t* child;
+        if (mapping) {
+            const char* key;
+            if (c->text[c->pos] == '"' || c->text[c->pos] == '\'') {
+                key = parse_quoted(p, c->text, c->length, &c->pos, c->line);
+            } else {
+                config_node_t* key_node = parse_flow_plain(p, c);
+                key = key_node ? (key_node->text ? key_node->text : "") : NULL;
+            }
+            if (!key) {
+                return NULL;
+            }
+            if (!*key) {
+                parse_error(p, c->line, "empty key");
+                return NULL;
+            }
+            flow_skip_space(c);
+            if (c->pos < c->length && c->text[c->pos] == ':') {
+                c->pos++;
+                flow_skip_space(c);
+                if (c->pos < c->length && (c->text[c->pos] == ',' || c->text[c->pos] == '}')) {
+                    child = new_node(p, CONFIG_NODE_NULL);
+                } else {
+                    child = parse_flow_node(p, c);
+                }
+            } else {
+                child = new_node(p, CONFIG_NODE_NULL);
+            }
+            if (!child) {
+                return NULL;
+            }
+            child->key = key;
+        } else {
+            child = parse_flow_node(p, c);
+            if (!child) {
+                return NULL;
+            }
+            flow_skip_space(c);
+            if (c->pos < c->length && c->text[c->pos] == ':') {
+                /* 序列中的单个键值对 [a: b] 是只有一个成员的映射 */
+                if (!child->text || child->type == CONFIG_NODE_SEQUENCE || child->type == CONFIG_NODE_MAPPING) {
+                    parse_error(p, c->line, "complex keys are not supported");
+                    return NULL;
+                }
+                config_node_t* pair = new_node(p, CONFIG_NODE_MAPPING);
+                c->pos++;
+                flow_skip_space(c);
+                config_node_t* value = c->pos < c->length && (c->text[c->pos] == ',' || c->text[c->pos] == ']')
+                    ? new_node(p, CONFIG_NODE_NULL) : parse_flow_node(p, c);
+                if (!pair || !value) {
+                    return NULL;
+                }
+                value->key = child->text;
+                pair->child = value;
+                pair->count = 1;
+                child = pair;
+            }
+        }
+        if (!append_child(p, node, &children, child, c->line)) {
+            return NULL;
+        }
+
+        flow_skip_space(c);
+        if (c->pos >= c->length) {
+            parse_error(p, c->line, "unterminated flow collection, expected '%c'", close);
+            return NULL;
+        } else if (c->text[c->pos] == ',') {
+            c->pos++;
+        } else if (c->text[c->pos] != close) {
+            parse_error(p, c->line, "expected ',' or '%c' in flow collection", close);
+            return NULL;
+        }
+    }
+}
+
+static config_node_t* parse_flow_node(config_parser_t* p, flow_cursor_t* c) {
+    flow_skip_space(c);
+    if (c->pos >= c->length) {
+        return new_node(p, CONFIG_NODE_NULL);
+    }
+    char ch = c->text[c->pos];
+    if (ch == '[' || ch == '{') {
+        return parse_flow_collection(p, c);
+    }
+    if (ch == '"' || ch == '\'') {
+        config_node_t* node = new_node(p, CONFIG_NODE_STRING);
+        if (!node || !(node->text = parse_quoted(p, c->text, c->length, &c->pos, c->line))) {
+            return NULL;
+        }
+        return node;
+    }
+    return parse_flow_plain(p, c);
+}
+
+/**
+ * @brief 计算流式集合在一行内未闭合的括号层数
+ */
+static int flow_depth(const char* text, size_t length, int depth) {
+    char quote = 0;
+    for (size_t i = 0; i < length; i++) {
+        char c = text[i];
+        if (quote) {
+            if (c == '\\' && quote == '"') {
+                i++;
+            } else if (c == '\'' && quote == '\'' && i + 1 < length && text[i + 1] == '\'') {
+                i++;
+            } else if (c == quote) {
+                quote = 0;
+            }
+        } else if ((c == '"' || c == '\'') && (i == 0 || strchr(" \t,[{:", text[i - 1]))) {
+            /* 与scan_line相同，引号只在值的开头才开始一个字符串 */
+            quote = c;
+        } else if (c == '[' || c == '{') {
+            depth++;
+        } else if (c == ']' || c == '}') {
+            depth--;
+        }
+    }
+    return depth;
+}
+
+/* ---------- 块结构 ---------- */
+
+static bool is_sequence_item(const config_line_t* line) {
+    return line->text[0] == '-' && (line->length == 1 || line->text[1] == ' ');
+}
+
+/**
+ * @brief 查找映射键后的冒号（后面是空格或行尾），不是映射条目时返回-1
+ */
+static long find_mapping_colon(const char* text, size_t length) {
+    size_t i = 0;
+    if (length == 0 || text[0] == '[' || text[0] == '{') {
+        return -1;
+    }
+    if (text[0] == '"' || text[0] == '\'') {
+        char quote = text[0];
+        for (i = 1; i < length; i++) {
+            if (text[i] == '\\' && quote == '"') {
+                i++;
+            } else if (text[i] == quote) {
+                if (quote == '\'' && i + 1 < length && text[i + 1] == '\'') {
+                    i++;
+                    continue;
+                }
+                break;
+            }
+        }
+        for (i++; i < length && text[i] == ' '; i++) {
+        }
+        return i < length && text[i] == ':' && (i + 1 == length || text[i + 1] == ' ') ? (long)i : -1;
+    }
+    for (; i < length; i++) {
+        if (text[i] == ':' && (i + 1 == length || text[i + 1] == ' ' || text[i + 1] == '\t')) {
+            return (long)i;
+        }
+    }
+    return -1;
+}
+
+/**
+ * @brief 将当前行的值与其后到end为止的续行拼接
+ *
+ * 续行之间以空格连接，中间有空行时按YAML的折叠规则保留为换行
+ *
+ * @param length 输入为当前值的长度，返回拼接后的长度
+ * @return 拼接后的文本，由调用方free
+ */
+static char* join_lines(config_parser_t* p, const char* text, size_t* length, size_t end) {
+    size_t total = *length;
+    for (size_t i = p->pos; i < end; i++) {
+        total += (size_t)(p->lines[i].number - p->lines[i - 1].last) + p->lines[i].length;
+    }
+    char* joined = (char*)malloc(total + 1);
+    if (!joined) {
+        parse_error(p, p->lines[p->pos - 1].number, "out of memory");
+        return NULL;
+    }
+
+    memcpy(joined, text, *length);
+    size_t n = *length;
+    for (; p->pos < end; p->pos++) {
+        const config_line_t* line = &p->lines[p->pos];
+        int blank = line->number - p->lines[p->pos - 1].last - 1;
+        if (blank == 0) {
+            joined[n++] = ' ';
+        }
+        for (; blank > 0; blank--) {
+            joined[n++] = '\n';
+        }
+        memcpy(joined + n, line->text, line->length);
+        n += line->length;
+    }
+    joined[n] = '\0';
+    *length = n;
+    return joined;
+}
+
+/**
+ * @brief 解析行内的值（流式集合、引号字符串或纯量），并前进到值之后的行
+ *
+ * @param indent 值所属的键或序列项的缩进，纯量可以延续到缩进更深的后续行
+ */
+static config_node_t* parse_inline(config_parser_t* p, char* text, size_t length, int indent) {
+    config_line_t* line = &p->lines[p->pos];
+    int number = line->number;
+    p->pos++;
+
+    if (text[0] == '[' || text[0] == '{') {
+        /* 未闭合的流式集合延续到后续行 */
+        char* joined = NULL;
+        int depth = flow_depth(text, length, 0);
+        if (depth > 0) {
+            size_t end = p->pos;
+            while (depth > 0 && end < p->line_count) {
+                depth = flow_depth(p->lines[end].text, p->lines[end].length, depth);
+                end++;
+            }
+            if (!(joined = join_lines(p, text, &length, end))) {
+                return NULL;
+            }
+            text = joined;
+        }
+
+        flow_cursor_t cursor = {text, length, 0, number};
+        config_node_t* node = parse_flow_collection(p, &cursor);
+        flow_skip_space(&cursor);
+        if (node && cursor.pos < cursor.length) {
+            parse_error(p, number, "unexpected characters after flow collection");
+            node = NULL;
+        }
+        free(joined);
+        return node;
+    }
+
+    if (text[0] == '"' || text[0] == '\'') {
+        size_t pos = 0;
+        config_node_t* node = new_node(p, CONFIG_NODE_STRING);
+        if (!node || !(node->text = parse_quoted(p, text, length, &pos, number))) {
+            return NULL;
+        }
+        if (pos < length) {
+            parse_error(p, number, "unexpected characters after quoted string");
+            return NULL;
+        }
+        return node;
+    }
+
+    if (text[0] == '-' && (length == 1 || text[1] == ' ')) {
+        parse_error(p, number, "sequence entries are not allowed here");
+        return NULL;
+    }
+    if (!check_unsupported(p, text, length, number)) {
+        return NULL;
+    }
+
+    /* 多行纯量：缩进更深的后续行是同一个值 */
+    char* joined = NULL;
+    size_t end = p->pos;
+    while (end < p->line_count && p->lines[end].indent > indent) {
+        end++;
+    }
+    if (end > p->pos && !(joined = join_lines(p, text, &length, end))) {
+        return NULL;
+    }
+    if (joined) {
+        text = joined;
+    }
+
+    config_node_t* node = NULL;
+    if (find_mapping_colon(text, length) >= 0) {
+        parse_error(p, number, "mapping values are not allowed here");
+    } else {
+        node = resolve_plain(p, text, length);
+    }
+    free(joined);
+    return node;
+}
+
+/**
+ * @brief 解析映射的键（可带引号）
+ */
+static const char* parse_key(config_parser_t* p, const char* text, size_t length, int line) {
+    while (length > 0 && (text[length - 1] == ' ' || text[length - 1] == '\t')) {
+        length--;
+    }
+    if (length == 0) {
+        parse_error(p, line, "empty key");
+        return NULL;
+    }
+    if (text[0] == '"' || text[0] == '\'') {
+        size_t pos = 0;
+        return parse_quoted(p, text, length, &pos, line);
+    }
+    if (!check_unsupported(p, text, length, line)) {
+        return NULL;
+    }
+    return copy_text(p, text, length);
+}
+
+/**
+ * @brief 解析值为空的键或序列项后面的嵌套块
+ *
+ * @param indent 键或序列项所在的缩进
+ * @param allow_same_indent 是否允许同一缩进的序列（"key:"后紧跟"- item"）
+ */
+static config_node_t* parse_nested(config_parser_t* p, int indent, bool allow_same_indent) {
+    if (p->pos < p->line_count) {
+        config_line_t* next = &p->lines[p->pos];
+        if (next->indent > indent || (allow_same_indent && next->indent == indent && is_sequence_item(next))) {
+            return parse_block(p, next->indent);
+        }
+    }
+    return new_node(p, CONFIG_NODE_NULL);
+}
+
+static config_node_t* parse_mapping(config_parser_t* p, int indent) {
+    config_node_t* node = new_node(p, CONFIG_NODE_MAPPING);
+    child_list_t children = {NULL, NULL, 0};
+    if (!node) {
+        return NULL;
+    }
+
+    while (p->pos < p->line_count && !p->failed) {
+        config_line_t* line = &p->lines[p->pos];
+        if (line->indent < indent) {
+            break;
+        }
+        if (line->indent > indent) {
+            parse_error(p, line->number, "unexpected indentation");
+            return NULL;
+        }
+        if (is_sequence_item(line)) {
+            parse_error(p, line->number, "expected a mapping key, found a sequence item");
+            return NULL;
+        }
+
+        long colon = find_mapping_colon(line->text, line->length);
+        if (colon < 0) {
+            parse_error(p, line->number, "expected 'key: value'");
+            return NULL;
+        }
+        const char* key = parse_key(p, line->text, (size_t)colon, line->number);
+        if (!key) {
+            return NULL;
+        }
+
+        char* rest = line->text + colon + 1;
+        size_t rest_length = line->length - colon - 1;
+        while (rest_length > 0 && (*rest == ' ' || *rest == '\t')) {
+            rest++;
+            rest_length--;
+        }
+
+        int number = line->number;
+        config_node_t* child;
+        if (rest_length == 0) {
+            p->pos++;
+            child = parse_nested(p, indent, true);
+        } else {
+            child = parse_inline(p, rest, rest_length, indent);
+        }
+        if (!child) {
+            return NULL;
+        }
+        child->key = key;
+        if (!append_child(p, node, &children, child, number)) {
+            return NULL;
+        }
+    }
+    return p->failed ? NULL : node;
+}
+
+static config_node_t* parse_sequence(config_parser_t* p, int indent) {
+    config_node_t* node = new_node(p, CONFIG_NODE_SEQUENCE);
+    child_list_t children = {NULL, NULL, 0};
+    if (!node) {
+        return NULL;
+    }
+
+    while (p->pos < p->line_count && !p->failed) {
+        config_line_t* line = &p->lines[p->pos];
+        if (line->indent < indent || (line->indent == indent && !is_sequence_item(line))) {
+            break;
+        }
+        if (line->indent > indent) {
+            parse_error(p, line->number, "unexpected indentation");
+            return NULL;
+        }
+
+        size_t offset = 1;
+        while (offset < line->length && line->text[offset] == ' ') {
+            offset++;
+        }
+        char* rest = line->text + offset;
+        size_t rest_length = line->length - offset;
+        int number = line->number;
+
+        config_node_t* child;
+        if (rest_length == 0) {
+            p->pos++;
+            child = parse_nested(p, indent, false);
+        } else if ((rest[0] == '-' && (rest_length == 1 || rest[1] == ' ')) ||
+                   find_mapping_colon(rest, rest_length) >= 0) {
+            /* 序列项中的嵌套序列或映射：把本行视为从项内容处开始的块 */
+            line->text = rest;
+            line->length = rest_length;
+            line->indent = indent + (int)offset;
+            child = parse_block(p, line->indent);
+        } else {
+            child = parse_inline(p, rest, rest_length, indent);
+        }
+        if (!child || !append_child(p, node, &children, child, number)) {
+            return NULL;
+        }
+    }
+    return p->failed ? NULL : node;
+}
+
+static config_node_t* parse_block(config_parser_t* p, int indent) {
+    config_line_t* line = &p->lines[p->pos];
+    if (is_sequence_item(line)) {
+        return parse_sequence(p, indent);
+    }
+    if (find_mapping_colon(line->text, line->length) < 0) {
+        /* 单独一行的值，例如只包含一个流式集合的文档 */
+        return parse_inline(p, line->text, line->length, -1);
+    }
+    return parse_mapping(p, indent);
+}
+
+/* ---------- 预处理 ---------- */
+
+/**
+ * @brief 查找行尾注释的位置：#位于行首或前面是空白，且不在引号内
+ *
+ * 引号只在值的开头（行首、空白、逗号、括号或冒号之后）才开始一个字符串，
+ * 纯量中间的撇号（如 it's）不影响注释的识别。引号字符串可以跨行，
+ * quote记录行尾仍未闭合的引号
+ *
+ * @return 内容的长度（不含注释）
+ */
+static size_t scan_line(const char* text, size_t length, char* quote) {
+    for (size_t i = 0; i < length; i++) {
+        char c = text[i];
+        if (*quote) {
+            if (c == '\\' && *quote == '"') {
+                i++;
+            } else if (c == '\'' && *quote == '\'' && i + 1 < length && text[i + 1] == '\'') {
+                i++;
+            } else if (c == *quote) {
+                *quote = 0;
+            }
+            continue;
+        }
+        char prev = i > 0 ? text[i - 1] : ' ';
+        if (c == '#' && (prev == ' ' || prev == '\t')) {
+            return i;
+        }
+        if ((c == '"' || c == '\'') && strchr(" \t,[{:", prev)) {
+            *quote = c;
+        }
+    }
+    return length;
+}
+
+static size_t trim_right(const char* text, size_t length) {
+    while (length > 0 && (text[length - 1] == ' ' || text[length - 1] == '\t' || text[length - 1] == '\r')) {
+        length--;
+    }
+    return length;
+}
+
+/**
+ * @brief 判断是否为文档标记（---或...）或指令行
+ */
+static bool is_document_marker(const char* text, size_t length) {
+    if (text[0] == '%') {
+        return true;
+    }
+    if (length < 3 || (length > 3 && text[3] != ' ')) {
+        return false;
+    }
+    return memcmp(text, "---", 3) == 0 || memcmp(text, "...", 3) == 0;
+}
+
+/**
+ * @brief 将文本拆分为有内容的行，跨行的引号字符串合并为一行
+ */
+static bool split_lines(config_parser_t* p, char* buffer, size_t length) {
+    size_t capacity = 64;
+    p->lines = (config_line_t*)malloc(capacity * sizeof(config_line_t));
+    if (!p->lines) {
+        parse_error(p, 0, "out of memory");
+        return false;
+    }
+
+    size_t start = 0;
+    int number = 0;
+    char quote = 0;
+    /* 跳过UTF-8 BOM */
+    if (length >= 3 && memcmp(buffer, "\xEF\xBB\xBF", 3) == 0) {
+        start = 3;
+    }
+    while (start < length) {
+        number++;
+        char* newline = memchr(buffer + start, '\n', length - start);
+        size_t end = newline ? (size_t)(newline - buffer) : length;
+        char* text = buffer + start;
+        size_t line_length = end - start;
+        start = end + 1;
+
+        if (quote) {
+            /* 引号字符串的续行，并入上一行 */
+            config_line_t* line = &p->lines[p->line_count - 1];
+            size_t content = scan_line(text, line_length, &quote);
+            line->length = (size_t)(text - line->text) + (quote ? content : trim_right(text, content));
+            line->last = number;
+            continue;
+        }
+
+        size_t indent = 0;
+        while (indent < line_length && text[indent] == ' ') {
+            indent++;
+        }
+        text += indent;
+        line_length -= indent;
+        line_length = scan_line(text, line_length, &quote);
+        if (!quote) {
+            line_length = trim_right(text, line_length);
+        }
+        if (line_length == 0) {
+            continue;
+        }
+        if (text[0] == '\t') {
+            parse_error(p, number, "tabs are not allowed in indentation");
+            return false;
+        }
+        if (indent == 0 && !quote && is_document_marker(text, line_length)) {
+            continue;
+        }
+        if (indent > INT32_MAX) {
+            parse_error(p, number, "line is too deeply indented");
+            return false;
+        }
+
+        if (p->line_count == capacity) {
+            capacity *= 2;
+            config_line_t* lines = (config_line_t*)realloc(p->lines, capacity * sizeof(config_line_t));
+            if (!lines) {
+                parse_error(p, number, "out of memory");
+                return false;
+            }
+            p->lines = lines;
+        }
+        p->lines[p->line_count++] = (config_line_t){text, line_length, (int)indent, number, number};
+    }
+    return true;
+}
+
+/* ---------- 公共接口 ---------- */
+
+config_document_t* config_parse_string(const char* text, size_t length, char* error, size_t error_size) {
+    if (error && error_size > 0) {
+        error[0] = '\0';
+    }
+    config_document_t* doc = (config_document_t*)calloc(1, sizeof(config_document_t));
+    char* buffer = (char*)malloc(length + 1);
+    config_parser_t parser = {doc, NULL, 0, 0, error, error_size, false};
+    if (!doc || !buffer) {
+        parse_error(&parser, 0, "out of memory");
+        free(doc);
+        free(buffer);
+        return NULL;
+    }
+    memcpy(buffer, text, length);
+    buffer[length] = '\0';
+
+    if (split_lines(&parser, buffer, length)) {
+        if (parser.line_count == 0) {
+            doc->root = new_node(&parser, CONFIG_NODE_NULL);
+        } else {
+            doc->root = parse_block(&parser, parser.lines[0].indent);
+            if (doc->root && parser.pos < parser.line_count) {
+                parse_error(&parser, parser.lines[parser.pos].number, "unexpected indentation");
+            }
+        }
+    }
+
+    free(parser.lines);
+    free(buffer);
+    if (parser.failed || !doc->root) {
+        config_document_free(doc);
+        return NULL;
+    }
+    return doc;
+}
+
+void config_document_free(config_document_t* doc) {
+    if (!doc) {
+        return;
+    }
+    config_arena_block_t* block = doc->arena;
+    while (block) {
+        config_arena_block_t* next = block->next;
+        free(block);
+        block = next;
+    }
+    free(doc);
+}
+
+const config_node_t* config_document_root(const config_document_t* doc) {
+    return doc ? doc->root : NULL;
+}
+
+/**
+ * @brief 读取并解析文件，fd已打开
+ */
+static config_document_t* parse_file(FILE* file, size_t size, const char* path, char* error, size_t error_size) {
+    char* text = (char*)malloc(size + 1);
+    if (!text) {
+        snprintf(error, error_size, "%s: out of memory", path);
+        return NULL;
+    }
+    size_t length = fread(text, 1, size, file);
+    config_document_t* doc = NULL;
+    if (ferror(file)) {
+        snprintf(error, error_size, "%s: %s", path, strerror(errno));
+    } else {
+        char message[256];
+        doc = config_parse_string(text, length, message, sizeof(message));
+        if (!doc) {
+            snprintf(error, error_size, "%s: %s", path, message);
+        }
+    }
+    free(text);
+    return doc;
+}
+
+const config_document_t* config_load_document(const char* path, char* error, size_t error_size) {
+    char unused[1];
+    if (!error || error_size == 0) {
+        error = unused;
+        error_size = sizeof(unused);
+    }
+    error[0] = '\0';
+    if (!path) {
+        snprintf(error, error_size, "no config path");
+        return NULL;
+    }
+
+    FILE* file = fopen(path, "rb");
+    struct stat st;
+    if (!file || fstat(fileno(file), &st) != 0) {
+        snprintf(error, error_size, "%s: %s", path, strerror(errno));
+        if (file) {
+            fclose(file);
+        }
+        return NULL;
+    }
+
+    pthread_mutex_lock(&document_lock);
+
+    config_cache_entry_t* entry = NULL;
+    for (size_t i = 0; i < CONFIG_DOCUMENT_CACHE_SIZE; i++) {
+        if (document_cache[i].doc && document_cache[i].dev == st.st_dev && document_cache[i].ino == st.st_ino) {
+            entry = &document_cache[i];
+            break;
+        }
+    }
+    if (entry && entry->size == st.st_size && entry->mtime.tv_sec == st.st_mtim.tv_sec &&
+        entry->mtime.tv_nsec == st.st_mtim.tv_nsec) {
+        config_document_t* doc = entry->doc;
+        pthread_mutex_unlock(&document_lock);
+        fclose(file);
+        return doc;
+    }
+
+    config_document_t* doc = parse_file(file, (size_t)st.st_size, path, error, error_size);
+    fclose(file);
+    if (doc) {
+        if (!entry) {
+            for (size_t i = 0; i < CONFIG_DOCUMENT_CACHE_SIZE && !entry; i++) {
+                if (!document_cache[i].doc) {
+                    entry = &document_cache[i];
+                }
+            }
+        }
+        if (!entry) {
+            entry = &document_cache[document_cache_next];
+            document_cache_next = (document_cache_next + 1) % CONFIG_DOCUMENT_CACHE_SIZE;
+        }
+        /* 之前返回的文档可能仍在使用，保留到清理时释放 */
+        if (entry->doc) {
+            entry->doc->retired = retired_documents;
+            retired_documents = entry->doc;
+        }
+        entry->dev = st.st_dev;
+        entry->ino = st.st_ino;
+        entry->size = st.st_size;
+        entry->mtime = st.st_mtim;
+        entry->doc = doc;
+    }
+
+    pthread_mutex_unlock(&document_lock);
+    return doc;
+}
+
+void config_clear_documents(void) {
+    pthread_mutex_lock(&document_lock);
+    for (size_t i = 0; i < CONFIG_DOCUMENT_CACHE_SIZE; i++) {
+        config_document_free(document_cache[i].doc);
+        document_cache[i].doc = NULL;
+    }
+    while (retired_documents) {
+        config_document_t* next = retired_documents->retired;
+        config_document_free(retired_documents);
+        retired_documents = next;
+    }
+    document_cache_next = 0;
+    pthread_mutex_unlock(&document_lock);
+}
+
+static const config_node_t* child_n(const config_node_t* node, const char* key, size_t length) {
+    if (!node || node->type != CONFIG_NODE_MAPPING) {
+        return NULL;
+    }
+    for (const config_node_t* it = node->child; it; it = it->next) {
+        if (strncmp(it->key, key, length) == 0 && it->key[length] == '\0') {
+            return it;
+        }
+    }
+    return NULL;
+}
+
+const config_node_t* config_node_child(const config_node_t* node, const char* key) {
+    return key ? child_n(node, key, strlen(key)) : NULL;
+}
+
+const config_node_t* config_node_get(const config_node_t* node, const char* path) {
+    if (!path) {
+        return NULL;
+    }
+    while (node && *path) {
+        const char* dot = strchr(path, '.');
+        size_t length = dot ? (size_t)(dot - path) : strlen(path);
+        node = child_n(node, path, length);
+        path += length + (dot ? 1 : 0);
+    }
+    return node;
+}
+
+const char* config_node_get_string(const config_node_t* node, const char* path, const char* default_value) {
+    node = config_node_get(node, path);
+    return node && node->text ? node->text : default_value;
+}
+
+long long config_node_get_int(const config_node_t* node, const char* path, long long default_value) {
+    node = config_node_get(node, path);
+    return node && node->type == CONFIG_NODE_INT ? node->int_value : default_value;
+}
+
+bool config_node_get_bool(const config_node_t* node, const char* path, bool default_value) {
+    node = config_node_get(node, path);
+    if (!node) {
+        return default_value;
+    }
+    if (node->type == CONFIG_NODE_BOOL) {
+        return node->bool_value;
+    }
+    if (node->type == CONFIG_NODE_INT && (node->int_value == 0 || node->int_value == 1)) {
+        return node->int_value == 1;
+    }
+    return default_value;
+}
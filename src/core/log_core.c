@@ -17,7 +17,7 @@ static const char* log_level_names[] = {
     "DEBUG", "INFO", "WARN", "ERROR", "FATAL"
 };
 
-// 全局日志级别，默认为INFO
+// 全局日志级别，默认为INFO，以原子方式读写，运行时调整不需要加锁
 static int g_log_level = LOG_LEVEL_INFO;
 
 // 将字符串日志级别转换为枚举值
@@ -48,17 +48,17 @@ const char* log_level_to_string(int level) {
 
 // 获取当前日志级别的字符串表示
 const char* log_get_level_string(void) {
-    return log_level_to_string(g_log_level);
+    return log_level_to_string(log_get_level());
 }
 
 // 设置当前日志级别
 void log_set_level(const char* level) {
-    g_log_level = log_level_from_string(level);
+    __atomic_store_n(&g_log_level, log_level_from_string(level), __ATOMIC_RELAXED);
 }
 
 // 获取当前日志级别
 int log_get_level(void) {
-    return g_log_level;
+    return __atomic_load_n(&g_log_level, __ATOMIC_RELAXED);
 }
 
 // 格式化日志消息（核心功能，被其他日志函数调用）
@@ -109,5 +109,5 @@ void log_format_message(char* buffer, size_t buffer_size, int level,
 
 // 检查日志级别是否应该被记录
 int log_should_log(int level) {
-    return level >= g_log_level;
+    return level >= __atomic_load_n(&g_log_level, __ATOMIC_RELAXED);
 }
\ No newline at end of file
@@ -6,6 +6,18 @@
 #include <glob.h>   // 用于glob模式匹配
 #include <unistd.h> // 用于access函数
 #include <sys/stat.h> // 用于stat函数
+#include <sys/mman.h> // 用于映射编译语言缓存
+#include <fcntl.h>
+#include <stdint.h>
+#include <limits.h>
+#include <time.h>
+#include <errno.h>
+#include <poll.h>
+#include <pthread.h>
+#include <fnmatch.h>
+#ifdef __linux__
+#include <sys/inotify.h>
+#endif
 
 #include "lang.h"
 #include "generated/lang_registry.h"
@@ -14,18 +26,129 @@
 #define MAX_DYNAMIC_LANGS 32
 #define MAX_ENTRIES_PER_LANG 1024
 
+#define MAX_LANG_SOURCES 256
+#define MAX_LANG_WATCH_DIRS 32
+#define MAX_LANG_DIR_LISTINGS 32
+#define LANG_LOAD_MAX_THREADS 8
+#define LANG_STRING_CHUNK_SIZE 4096
+
+// 存放解析出的键值字符串的内存块，写入后地址不再变化
+typedef struct lang_string_chunk {
+    struct lang_string_chunk* next;
+    size_t used;
+    size_t capacity;
+    char data[];
+} lang_string_chunk_t;
+
 // 动态语言资源表结构
-typedef struct {
+// 注册文件时在表尾追加条目，先写入条目再发布entry_count；热加载时构建新表并整体替换
+typedef struct dynamic_lang_table {
     char lang_code[16];         // 语言代码
     int entry_count;            // 条目数量
     lang_entry_t entries[MAX_ENTRIES_PER_LANG]; // 实际条目
-    char* keys_storage;         // 存储所有键的缓冲区
-    char* values_storage;       // 存储所有值的缓冲区
+    lang_string_chunk_t* strings; // 存储键和值的内存块链表
+    struct dynamic_lang_table* retired_next; // 被替换后挂入待释放链表
 } dynamic_lang_table_t;
 
+// 注册过的语言资源文件，热加载时据此重建语言表
+typedef struct {
+    char path[PATH_MAX];
+    char lang_code[16];
+    int64_t mtime_ns;           // 上次加载时的mtime，文件不存在时为-1
+    int64_t size;
+} lang_source_t;
+
+// lang_scan_directory扫描过的目录，热加载时发现其中新增的文件
+typedef struct {
+    char path[PATH_MAX];
+    char pattern[64];
+} lang_watch_dir_t;
+
+// 按目录mtime缓存的目录列表，目录内容不变时不再遍历和逐个stat
+typedef struct {
+    char path[PATH_MAX];
+    char pattern[64];
+    int64_t mtime_ns;
+    char** files;               // 按名称排序的完整路径
+    int count;
+} lang_dir_listing_t;
+
+// 并行加载中的一个文件，先解析到私有表，再按顺序合并
+typedef struct {
+    const char* path;
+    char lang_code[16];
+    dynamic_lang_table_t* table;
+    bool ok;
+} lang_load_job_t;
+
+typedef struct {
+    lang_load_job_t* jobs;
+    int count;
+    int next;                   // 下一个待领取的文件，原子递增
+} lang_load_batch_t;
+
+// 编译语言缓存（.llc），布局与Python绑定中的logloom/locale_cache.py一致（小端）
+#define LANG_CACHE_MAGIC "LLOC"
+#define LANG_CACHE_VERSION 1
+#define LANG_CACHE_SUFFIX ".llc"
+// 设置为非空且不为"0"的值时不使用用户缓存目录，与Python绑定一致
+#define LANG_NO_USER_CACHE_ENV "LOGLOOM_NO_LOCALE_CACHE"
+#define MAX_LANG_MAPPINGS 64
+
+typedef struct {
+    char magic[4];              // 魔数"LLOC"
+    uint32_t version;           // 格式版本
+    int64_t source_mtime_ns;    // 源YAML文件的mtime（纳秒）
+    uint64_t source_size;       // 源YAML文件大小
+    uint32_t source_crc;        // 源YAML文件的CRC32
+    uint32_t count;             // 条目数
+    uint32_t bucket_count;      // 哈希桶数，为2的幂
+    uint32_t strings_size;      // 字符串区大小
+} lang_cache_header_t;
+
+typedef struct {
+    uint32_t hash;              // 键的CRC32
+    uint32_t key_offset;        // 键在字符串区中的偏移
+    uint32_t key_length;        // 键长度（不含结尾NUL）
+    uint32_t value_offset;      // 值在字符串区中的偏移
+    uint32_t value_length;      // 值长度（不含结尾NUL）
+} lang_cache_entry_t;
+
+// 已映射的缓存文件，条目直接指向其中的字符串，清理时统一解除映射
+typedef struct {
+    void* addr;
+    size_t size;
+} lang_mapping_t;
+
 // 全局变量
-static dynamic_lang_table_t dynamic_langs[MAX_DYNAMIC_LANGS]; // 动态加载的语言资源
+static lang_mapping_t lang_mappings[MAX_LANG_MAPPINGS];      // 已映射的编译语言缓存
+static int lang_mapping_count = 0;
+static dynamic_lang_table_t* dynamic_langs[MAX_DYNAMIC_LANGS]; // 动态加载的语言资源，读取时原子加载指针
 static int dynamic_lang_count = 0;                           // 动态语言资源数量
+// 被热加载替换的旧表：lang_get返回的指针可能仍指向其中的字符串，只在lang_cleanup时释放
+static dynamic_lang_table_t* retired_tables = NULL;
+
+static lang_source_t lang_sources[MAX_LANG_SOURCES];
+static int lang_source_count = 0;
+static lang_watch_dir_t lang_watch_dirs[MAX_LANG_WATCH_DIRS];
+static int lang_watch_dir_count = 0;
+static lang_dir_listing_t lang_dir_listings[MAX_LANG_DIR_LISTINGS];
+static int lang_dir_listing_count = 0;
+static pthread_mutex_t lang_listing_lock = PTHREAD_MUTEX_INITIALIZER;
+// 并行加载时多个线程可能同时映射编译缓存
+static pthread_mutex_t lang_mapping_lock = PTHREAD_MUTEX_INITIALIZER;
+
+static void clear_dir_listings(void);
+
+// 写入方（注册、热加载、监视线程）互斥，读取方不加锁
+static pthread_mutex_t lang_write_lock = PTHREAD_MUTEX_INITIALIZER;
+static lang_reload_stats_t reload_stats;
+
+// 监视线程状态
+static pthread_t watch_thread;
+static bool watch_running = false;
+static int watch_stop_pipe[2] = {-1, -1};
+static int watch_interval_ms = 1000;
 
 // 当前语言上下文
 static const lang_entry_t* current_lang_table = NULL;
@@ -34,6 +157,21 @@ static char current_lang_code[16] = "en";               // 当前语言代码
 static const char* DEFAULT_LANG = "en";                 // 默认语言代码
 static int dynamic_table_for_current_lang = -1;         // 当前语言的动态表索引
 
+// 已解析的语言上下文：内置表或动态表索引，generation与lang_generation不一致时需重新解析
+typedef struct {
+    char code[16];
+    const lang_entry_t* table;
+    int dynamic_index;
+    unsigned int generation;  // 0表示未设置
+} lang_context_t;
+
+// 动态表增加或释放时递增，使各线程缓存的解析结果失效
+static unsigned int lang_generation = 1;
+// 线程语言，设置后本线程的lang_get/lang_getf使用它，不影响其他线程
+static __thread lang_context_t thread_lang = {{0}, NULL, -1, 0};
+// lang_get_in最近一次解析的语言，按线程缓存
+static __thread lang_context_t thread_lookup_cache = {{0}, NULL, -1, 0};
+
 // 查找语言表中的键
 static const char* find_in_table(const lang_entry_t* table, const char* key) {
     if (!table || !key) return NULL;
@@ -49,21 +187,34 @@ static const char* find_in_table(const lang_entry_t* table, const char* key) {
     return NULL;
 }
 
-// 查找动态语言资源表
-static dynamic_lang_table_t* find_dynamic_lang(const char* lang_code) {
-    for (int i = 0; i < dynamic_lang_count; i++) {
-        if (strcmp(dynamic_langs[i].lang_code, lang_code) == 0) {
-            return &dynamic_langs[i];
+// 原子加载动态语言表指针，热加载可能同时替换它
+static dynamic_lang_table_t* load_dynamic_lang(int index) {
+    return __atomic_load_n(&dynamic_langs[index], __ATOMIC_ACQUIRE);
+}
+
+// 查找动态语言资源表的索引，不存在时返回-1
+static int find_dynamic_lang_index(const char* lang_code) {
+    int count = __atomic_load_n(&dynamic_lang_count, __ATOMIC_ACQUIRE);
+    for (int i = 0; i < count; i++) {
+        if (strcmp(load_dynamic_lang(i)->lang_code, lang_code) == 0) {
+            return i;
         }
     }
-    return NULL;
+    return -1;
+}
+
+// 查找动态语言资源表
+static dynamic_lang_table_t* find_dynamic_lang(const char* lang_code) {
+    int index = find_dynamic_lang_index(lang_code);
+    return index >= 0 ? load_dynamic_lang(index) : NULL;
 }
 
 // 查找动态语言表中的键
 static const char* find_in_dynamic_table(dynamic_lang_table_t* table, const char* key) {
     if (!table || !key) return NULL;
     
-    for (int i = 0; i < table->entry_count; i++) {
+    int count = __atomic_load_n(&table->entry_count, __ATOMIC_ACQUIRE);
+    for (int i = 0; i < count; i++) {
         if (strcmp(table->entries[i].key, key) == 0) {
             return table->entries[i].value;
         }
@@ -72,6 +223,28 @@ static const char* find_in_dynamic_table(dynamic_lang_table_t* table, const char
     return NULL;
 }
 
+// 分配一张空的动态语言表
+static dynamic_lang_table_t* alloc_dynamic_table(const char* lang_code) {
+    dynamic_lang_table_t* table = calloc(1, sizeof(dynamic_lang_table_t));
+    if (!table) {
+        fprintf(stderr, "[ERROR] Failed to allocate language table for %s\n", lang_code);
+        return NULL;
+    }
+    strncpy(table->lang_code, lang_code, sizeof(table->lang_code) - 1);
+    return table;
+}
+
+// 释放动态语言表及其字符串
+static void free_dynamic_table(dynamic_lang_table_t* table) {
+    lang_string_chunk_t* chunk = table->strings;
+    while (chunk) {
+        lang_string_chunk_t* next = chunk->next;
+        free(chunk);
+        chunk = next;
+    }
+    free(table);
+}
+
 // 创建新的动态语言表
 static dynamic_lang_table_t* create_dynamic_lang(const char* lang_code) {
     if (dynamic_lang_count >= MAX_DYNAMIC_LANGS) {
@@ -79,16 +252,46 @@ static dynamic_lang_table_t* create_dynamic_lang(const char* lang_code) {
         return NULL;
     }
     
-    dynamic_lang_table_t* table = &dynamic_langs[dynamic_lang_count++];
-    strncpy(table->lang_code, lang_code, sizeof(table->lang_code) - 1);
-    table->lang_code[sizeof(table->lang_code) - 1] = '\0';
-    table->entry_count = 0;
-    table->keys_storage = NULL;
-    table->values_storage = NULL;
+    dynamic_lang_table_t* table = alloc_dynamic_table(lang_code);
+    if (!table) return NULL;
+    
+    // 先放入表指针再发布数量
+    __atomic_store_n(&dynamic_langs[dynamic_lang_count], table, __ATOMIC_RELEASE);
+    __atomic_store_n(&dynamic_lang_count, dynamic_lang_count + 1, __ATOMIC_RELEASE);
+    __atomic_add_fetch(&lang_generation, 1, __ATOMIC_RELEASE);
     
     return table;
 }
 
+// 把字符串复制到语言表的内存块中，返回其稳定地址
+static const char* store_string(dynamic_lang_table_t* table, const char* str) {
+    size_t len = strlen(str) + 1;
+    lang_string_chunk_t* chunk = table->strings;
+    
+    if (!chunk || chunk->capacity - chunk->used < len) {
+        size_t capacity = len > LANG_STRING_CHUNK_SIZE ? len : LANG_STRING_CHUNK_SIZE;
+        chunk = malloc(sizeof(lang_string_chunk_t) + capacity);
+        if (!chunk) return NULL;
+        chunk->next = table->strings;
+        chunk->used = 0;
+        chunk->capacity = capacity;
+        table->strings = chunk;
+    }
+    
+    char* pos = chunk->data + chunk->used;
+    memcpy(pos, str, len);
+    chunk->used += len;
+    return pos;
+}
+
+// 在表尾写入一个条目后发布，并发的读取方要么看不到它，要么看到完整的条目
+static void publish_entry(dynamic_lang_table_t* table, const char* key, const char* value) {
+    int index = table->entry_count;
+    table->entries[index].key = key;
+    table->entries[index].value = value;
+    __atomic_store_n(&table->entry_count, index + 1, __ATOMIC_RELEASE);
+}
+
 // 将键值对添加到动态语言表
 static bool add_entry_to_dynamic_table(dynamic_lang_table_t* table, const char* key, const char* value) {
     if (table->entry_count >= MAX_ENTRIES_PER_LANG) {
@@ -96,45 +299,15 @@ static bool add_entry_to_dynamic_table(dynamic_lang_table_t* table, const char*
         return false;
     }
     
-    // 分配和复制键值对
-    size_t key_len = strlen(key);
-    size_t value_len = strlen(value);
-    
-    char* new_keys = realloc(table->keys_storage, 
-                            (table->keys_storage ? strlen(table->keys_storage) : 0) + key_len + 1);
-    if (!new_keys) {
-        fprintf(stderr, "[ERROR] Failed to allocate memory for keys\n");
+    // 键和值复制到内存块中，已有条目引用的字符串地址保持不变
+    const char* key_pos = store_string(table, key);
+    const char* value_pos = store_string(table, value);
+    if (!key_pos || !value_pos) {
+        fprintf(stderr, "[ERROR] Failed to allocate memory for language entry\n");
         return false;
     }
-    table->keys_storage = new_keys;
-    
-    char* new_values = realloc(table->values_storage,
-                             (table->values_storage ? strlen(table->values_storage) : 0) + value_len + 1);
-    if (!new_values) {
-        fprintf(stderr, "[ERROR] Failed to allocate memory for values\n");
-        return false;
-    }
-    table->values_storage = new_values;
-    
-    // 计算新键值位置
-    char* key_pos = table->keys_storage;
-    if (table->entry_count > 0) {
-        key_pos += strlen(table->keys_storage);
-    }
-    
-    char* value_pos = table->values_storage;
-    if (table->entry_count > 0) {
-        value_pos += strlen(table->values_storage);
-    }
     
-    // 复制键值
-    strcpy(key_pos, key);
-    strcpy(value_pos, value);
-    
-    // 更新条目
-    table->entries[table->entry_count].key = key_pos;
-    table->entries[table->entry_count].value = value_pos;
-    table->entry_count++;
+    publish_entry(table, key_pos, value_pos);
     
     return true;
 }
@@ -219,6 +392,169 @@ static bool parse_yaml_lang_file(const char* file_path, dynamic_lang_table_t* ta
     return true;
 }
 
+// 计算CRC32（与zlib.crc32一致）
+static uint32_t lang_crc32(uint32_t crc, const unsigned char* data, size_t len) {
+    crc = ~crc;
+    for (size_t i = 0; i < len; i++) {
+        crc ^= data[i];
+        for (int bit = 0; bit < 8; bit++) {
+            crc = (crc >> 1) ^ (0xEDB88320u & -(crc & 1u));
+        }
+    }
+    return ~crc;
+}
+
+// 计算文件内容的CRC32
+static bool file_crc32(const char* file_path, uint32_t* crc) {
+    FILE* fp = fopen(file_path, "rb");
+    if (!fp) return false;
+    
+    unsigned char buffer[8192];
+    size_t n;
+    *crc = 0;
+    while ((n = fread(buffer, 1, sizeof(buffer), fp)) > 0) {
+        *crc = lang_crc32(*crc, buffer, n);
+    }
+    
+    bool ok = !ferror(fp);
+    fclose(fp);
+    return ok;
+}
+
+// 判断缓存是否与源文件一致，源文件不存在时缓存即为唯一来源
+static bool compiled_cache_is_fresh(const lang_cache_header_t* header, const char* source_path) {
+    struct stat st;
+    if (stat(source_path, &st) != 0) return true;
+    if ((uint64_t)st.st_size != header->source_size) return false;
+    
+    int64_t mtime_ns = (int64_t)st.st_mtim.tv_sec * 1000000000LL + st.st_mtim.tv_nsec;
+    if (mtime_ns == header->source_mtime_ns) return true;
+    
+    // 只改变了mtime（如重新部署的同一文件），按内容比较
+    uint32_t crc;
+    return file_crc32(source_path, &crc) && crc == header->source_crc;
+}
+
+// 检查字符串区中的一个字符串是否越界且以NUL结尾
+static bool compiled_string_valid(const char* strings, uint32_t strings_size, uint32_t offset, uint32_t length) {
+    return offset < strings_size && length < strings_size - offset && strings[offset + length] == '\0';
+}
+
+// 映射编译语言缓存并把条目加入语言表，条目直接引用映射中的字符串
+// source_path不为NULL时先检查缓存是否与源文件一致
+static bool load_compiled_lang_file(const char* cache_path, const char* source_path, dynamic_lang_table_t* table) {
+    if (__atomic_load_n(&lang_mapping_count, __ATOMIC_RELAXED) >= MAX_LANG_MAPPINGS) return false;
+    
+    int fd = open(cache_path, O_RDONLY);
+    if (fd < 0) return false;
+    
+    struct stat st;
+    if (fstat(fd, &st) != 0 || (size_t)st.st_size < sizeof(lang_cache_header_t)) {
+        close(fd);
+        return false;
+    }
+    
+    size_t size = (size_t)st.st_size;
+    // 私有只读映射，干净的页仍与其他进程共享页缓存；写入方先写临时文件再rename替换，
+    // 不会截断或原地改写已映射的文件
+    void* addr = mmap(NULL, size, PROT_READ, MAP_PRIVATE, fd, 0);
+    close(fd);
+    if (addr == MAP_FAILED) return false;
+    
+    const lang_cache_header_t* header = addr;
+    bool valid = memcmp(header->magic, LANG_CACHE_MAGIC, 4) == 0 &&
+                 header->version == LANG_CACHE_VERSION &&
+                 header->bucket_count != 0 &&
+                 (header->bucket_count & (header->bucket_count - 1)) == 0;
+    
+    size_t entries_offset = 0;
+    size_t strings_offset = 0;
+    if (valid) {
+        entries_offset = sizeof(lang_cache_header_t) + ((size_t)header->bucket_count + 1) * sizeof(uint32_t);
+        strings_offset = entries_offset + (size_t)header->count * sizeof(lang_cache_entry_t);
+        valid = strings_offset + header->strings_size == size &&
+                table->entry_count + (int)header->count <= MAX_ENTRIES_PER_LANG;
+    }
+    
+    if (valid && source_path && !compiled_cache_is_fresh(header, source_path)) {
+        valid = false;
+    }
+    
+    const lang_cache_entry_t* entries = (const lang_cache_entry_t*)((const char*)addr + entries_offset);
+    const char* strings = (const char*)addr + strings_offset;
+    for (uint32_t i = 0; valid && i < header->count; i++) {
+        valid = compiled_string_valid(strings, header->strings_size, entries[i].key_offset, entries[i].key_length) &&
+                compiled_string_valid(strings, header->strings_size, entries[i].value_offset, entries[i].value_length);
+    }
+    
+    if (!valid) {
+        munmap(addr, size);
+        return false;
+    }
+    
+    pthread_mutex_lock(&lang_mapping_lock);
+    if (lang_mapping_count >= MAX_LANG_MAPPINGS) {
+        pthread_mutex_unlock(&lang_mapping_lock);
+        munmap(addr, size);
+        return false;
+    }
+    lang_mappings[lang_mapping_count].addr = addr;
+    lang_mappings[lang_mapping_count].size = size;
+    lang_mapping_count++;
+    pthread_mutex_unlock(&lang_mapping_lock);
+    
+    for (uint32_t i = 0; i < header->count; i++) {
+        publish_entry(table, strings + entries[i].key_offset, strings + entries[i].value_offset);
+    }
+    return true;
+}
+
+// 检查路径是否以编译语言缓存后缀结尾
+static bool is_compiled_lang_file(const char* file_path) {
+    size_t len = strlen(file_path);
+    size_t suffix_len = strlen(LANG_CACHE_SUFFIX);
+    return len > suffix_len && strcmp(file_path + len - suffix_len, LANG_CACHE_SUFFIX) == 0;
+}
+
+// 源文件同目录下的缓存路径，如locales/en.yaml对应locales/en.llc
+static bool sibling_cache_path(const char* file_path, char* out, size_t max_len) {
+    const char* slash = strrchr(file_path, '/');
+    const char* dot = strrchr(file_path, '.');
+    size_t stem_len = (dot && (!slash || dot > slash + 1)) ? (size_t)(dot - file_path) : strlen(file_path);
+    
+    int n = snprintf(out, max_len, "%.*s%s", (int)stem_len, file_path, LANG_CACHE_SUFFIX);
+    return n > 0 && (size_t)n < max_len;
+}
+
+// 用户缓存目录中的缓存路径，以源文件真实路径的CRC32区分同名文件，关闭用户缓存目录时返回false
+static bool user_cache_path(const char* file_path, char* out, size_t max_len) {
+    const char* disabled = getenv(LANG_NO_USER_CACHE_ENV);
+    if (disabled && *disabled && strcmp(disabled, "0") != 0) return false;
+    
+    char real_path[PATH_MAX];
+    if (!realpath(file_path, real_path)) return false;
+    
+    char cache_dir[PATH_MAX];
+    const char* xdg = getenv("XDG_CACHE_HOME");
+    const char* home = getenv("HOME");
+    if (xdg && *xdg) {
+        snprintf(cache_dir, sizeof(cache_dir), "%s/logloom/locales", xdg);
+    } else if (home && *home) {
+        snprintf(cache_dir, sizeof(cache_dir), "%s/.cache/logloom/locales", home);
+    } else {
+        return false;
+    }
+    
+    const char* basename = strrchr(real_path, '/');
+    basename = basename ? basename + 1 : real_path;
+    const char* dot = strrchr(basename, '.');
+    int stem_len = dot && dot != basename ? (int)(dot - basename) : (int)strlen(basename);
+    uint32_t crc = lang_crc32(0, (const unsigned char*)real_path, strlen(real_path));
+    
+    int n = snprintf(out, max_len, "%s/%.*s-%08x%s", cache_dir, stem_len, basename, crc, LANG_CACHE_SUFFIX);
+    return n > 0 && (size_t)n < max_len;
+}
+
 // 从文件名推断语言代码
 static void infer_lang_code_from_filename(const char* filename, char* lang_code, size_t max_len) {
     // 找到文件名部分（去除路径）
@@ -280,58 +616,54 @@ int lang_init(const char* default_lang) {
     return 0;
 }
 
-bool lang_set_language(const char* lang_code) {
-    if (!lang_code || !*lang_code) return false;
-    
-    // 检查是否已经是当前语言
-    if (strcmp(current_lang_code, lang_code) == 0) {
-        return true; // 已经是请求的语言
-    }
-    
-    // 首先尝试获取内置语言表
+// 解析语言代码：优先内置表，其次动态加载的表
+static bool resolve_language(const char* lang_code, lang_context_t* ctx) {
     const lang_entry_t* table = get_lang_table(lang_code);
-    if (table) {
-        // 更新当前语言
-        current_lang_table = table;
-        strncpy(current_lang_code, lang_code, sizeof(current_lang_code) - 1);
-        current_lang_code[sizeof(current_lang_code) - 1] = '\0';
-        dynamic_table_for_current_lang = -1; // 使用内置表，重置动态表索引
-        return true;
-    }
+    int dynamic_index = -1;
     
-    // 如果内置表不存在，检查动态加载的表
-    dynamic_lang_table_t* dynamic_table = find_dynamic_lang(lang_code);
-    if (dynamic_table) {
-        // 更新当前语言为动态表
-        strncpy(current_lang_code, lang_code, sizeof(current_lang_code) - 1);
-        current_lang_code[sizeof(current_lang_code) - 1] = '\0';
-        current_lang_table = NULL; // 不使用内置表
-        dynamic_table_for_current_lang = dynamic_table - dynamic_langs; // 计算表索引
-        return true;
+    if (!table) {
+        dynamic_index = find_dynamic_lang_index(lang_code);
+        if (dynamic_index < 0) return false;
     }
     
-    fprintf(stderr, "[ERROR] Failed to switch language to %s\n", lang_code);
-    return false;
+    strncpy(ctx->code, lang_code, sizeof(ctx->code) - 1);
+    ctx->code[sizeof(ctx->code) - 1] = '\0';
+    ctx->table = table;
+    ctx->dynamic_index = dynamic_index;
+    ctx->generation = __atomic_load_n(&lang_generation, __ATOMIC_ACQUIRE);
+    return true;
 }
 
-const char* lang_get(const char* key) {
-    if (!key || !*key) return NULL;
-    
-    // 首先查找当前语言表
+// 确保上下文的解析结果仍然有效，语言已不可用时返回false
+static bool refresh_context(lang_context_t* ctx) {
+    if (ctx->generation == __atomic_load_n(&lang_generation, __ATOMIC_ACQUIRE)) return true;
+    
+    char code[sizeof(ctx->code)];
+    strcpy(code, ctx->code);
+    if (!resolve_language(code, ctx)) {
+        ctx->generation = 0;
+        return false;
+    }
+    return true;
+}
+
+// 在指定的语言上下文中查找键，找不到时回退到默认语言
+static const char* lookup_in_context(const char* lang_code, const lang_entry_t* table,
+                                     int dynamic_index, const char* key) {
     const char* value = NULL;
     
     // 如果当前使用的是动态表
-    if (dynamic_table_for_current_lang >= 0) {
-        value = find_in_dynamic_table(&dynamic_langs[dynamic_table_for_current_lang], key);
+    if (dynamic_index >= 0) {
+        value = find_in_dynamic_table(load_dynamic_lang(dynamic_index), key);
     }
     // 否则使用内置表
-    else if (current_lang_table) {
-        value = find_in_table(current_lang_table, key);
+    else if (table) {
+        value = find_in_table(table, key);
     }
     
     // 如果当前语言找不到，检查是否有动态加载的表补充
-    if (!value && current_lang_table) {
-        dynamic_lang_table_t* dynamic_table = find_dynamic_lang(current_lang_code);
+    if (!value && table) {
+        dynamic_lang_table_t* dynamic_table = find_dynamic_lang(lang_code);
         if (dynamic_table) {
             value = find_in_dynamic_table(dynamic_table, key);
         }
@@ -339,11 +671,11 @@ const char* lang_get(const char* key) {
     
     // 如果在当前语言找不到并且有默认语言，从默认语言查找
     if (!value && fallback_lang_table && 
-        (current_lang_table != fallback_lang_table || dynamic_table_for_current_lang >= 0)) {
+        (table != fallback_lang_table || dynamic_index >= 0)) {
         value = find_in_table(fallback_lang_table, key);
         if (value) {
             fprintf(stderr, "[WARN] Language key not found in '%s': %s, using default language\n", 
-                    current_lang_code, key);
+                    lang_code, key);
         } else {
             // 也尝试在默认语言的动态表中查找
             dynamic_lang_table_t* dynamic_table = find_dynamic_lang(DEFAULT_LANG);
@@ -362,6 +694,73 @@ const char* lang_get(const char* key) {
     return value;
 }
 
+bool lang_set_language(const char* lang_code) {
+    if (!lang_code || !*lang_code) return false;
+    
+    // 检查是否已经是当前语言
+    if (strcmp(current_lang_code, lang_code) == 0) {
+        return true; // 已经是请求的语言
+    }
+    
+    lang_context_t ctx;
+    if (!resolve_language(lang_code, &ctx)) {
+        fprintf(stderr, "[ERROR] Failed to switch language to %s\n", lang_code);
+        return false;
+    }
+    
+    // 更新当前语言，内置表不存在时使用动态表
+    current_lang_table = ctx.table;
+    strcpy(current_lang_code, ctx.code);
+    dynamic_table_for_current_lang = ctx.dynamic_index;
+    return true;
+}
+
+bool lang_set_thread_language(const char* lang_code) {
+    // NULL或空字符串恢复使用全局语言
+    if (!lang_code || !*lang_code) {
+        thread_lang.generation = 0;
+        return true;
+    }
+    
+    if (!resolve_language(lang_code, &thread_lang)) {
+        fprintf(stderr, "[ERROR] Failed to switch thread language to %s\n", lang_code);
+        return false;
+    }
+    return true;
+}
+
+const char* lang_get(const char* key) {
+    if (!key || !*key) return NULL;
+    
+    // 设置了线程语言时使用线程语言
+    if (thread_lang.generation && refresh_context(&thread_lang)) {
+        return lookup_in_context(thread_lang.code, thread_lang.table,
+                                 thread_lang.dynamic_index, key);
+    }
+    
+    return lookup_in_context(current_lang_code, current_lang_table,
+                             dynamic_table_for_current_lang, key);
+}
+
+const char* lang_get_in(const char* lang_code, const char* key) {
+    if (!lang_code || !*lang_code) return lang_get(key);
+    if (!key || !*key) return NULL;
+    
+    // 同一线程连续按同一语言查找时复用解析结果
+    lang_context_t* ctx = &thread_lookup_cache;
+    if (!ctx->generation || strcmp(ctx->code, lang_code) != 0) {
+        if (!resolve_language(lang_code, ctx)) {
+            ctx->generation = 0;
+            fprintf(stderr, "[WARN] Language '%s' not available, using current language\n", lang_code);
+            return lang_get(key);
+        }
+    } else if (!refresh_context(ctx)) {
+        return lang_get(key);
+    }
+    
+    return lookup_in_context(ctx->code, ctx->table, ctx->dynamic_index, key);
+}
+
 char* lang_getf(const char* key, ...) {
     const char* template = lang_get(key);
     if (!template) return NULL;
@@ -396,35 +795,118 @@ char* lang_getf(const char* key, ...) {
 }
 
 const char* lang_get_current() {
+    if (thread_lang.generation && refresh_context(&thread_lang)) {
+        return thread_lang.code;
+    }
     return current_lang_code;
 }
 
 void lang_cleanup() {
     // 释放动态分配的资源
+    lang_watch_stop();
+    
     for (int i = 0; i < dynamic_lang_count; i++) {
-        free(dynamic_langs[i].keys_storage);
-        free(dynamic_langs[i].values_storage);
+        free_dynamic_table(dynamic_langs[i]);
+        dynamic_langs[i] = NULL;
+    }
+    while (retired_tables) {
+        dynamic_lang_table_t* next = retired_tables->retired_next;
+        free_dynamic_table(retired_tables);
+        retired_tables = next;
+    }
+    lang_source_count = 0;
+    lang_watch_dir_count = 0;
+    clear_dir_listings();
+    memset(&reload_stats, 0, sizeof(reload_stats));
+    
+    // 解除编译语言缓存的映射
+    for (int i = 0; i < lang_mapping_count; i++) {
+        munmap(lang_mappings[i].addr, lang_mappings[i].size);
     }
+    lang_mapping_count = 0;
     
     // 重置状态
     dynamic_lang_count = 0;
     current_lang_table = NULL;
     fallback_lang_table = NULL;
     dynamic_table_for_current_lang = -1;
+    __atomic_add_fetch(&lang_generation, 1, __ATOMIC_RELEASE);
 }
 
-bool lang_register_file(const char* file_path, const char* lang_code) {
-    if (!file_path || !*file_path) {
-        fprintf(stderr, "[ERROR] Invalid file path for language resource\n");
+// 把一个语言资源文件加载到语言表，优先使用有效的编译缓存
+static bool load_lang_source(const char* file_path, dynamic_lang_table_t* table) {
+    // 直接注册的编译缓存不需要源文件
+    if (is_compiled_lang_file(file_path)) {
+        if (load_compiled_lang_file(file_path, NULL, table)) return true;
+        fprintf(stderr, "[ERROR] Invalid compiled language file: %s\n", file_path);
         return false;
     }
     
-    // 检查文件是否存在
-    if (access(file_path, R_OK) != 0) {
-        fprintf(stderr, "[ERROR] Cannot access language file: %s\n", file_path);
-        return false;
+    // 先查找同目录下预先生成的缓存，再查找用户缓存目录
+    char cache_path[PATH_MAX];
+    if (sibling_cache_path(file_path, cache_path, sizeof(cache_path)) &&
+        load_compiled_lang_file(cache_path, file_path, table)) {
+        return true;
+    }
+    if (user_cache_path(file_path, cache_path, sizeof(cache_path)) &&
+        load_compiled_lang_file(cache_path, file_path, table)) {
+        return true;
     }
     
+    // 解析并加载语言文件
+    return parse_yaml_lang_file(file_path, table);
+}
+
+// 读取文件的mtime和大小，文件不存在时mtime为-1
+static void stat_source(const char* path, int64_t* mtime_ns, int64_t* size) {
+    struct stat st;
+    if (stat(path, &st) != 0) {
+        *mtime_ns = -1;
+        *size = -1;
+        return;
+    }
+    *mtime_ns = (int64_t)st.st_mtim.tv_sec * 1000000000LL + st.st_mtim.tv_nsec;
+    *size = (int64_t)st.st_size;
+}
+
+// 查找注册过的语言资源文件
+static lang_source_t* find_source(const char* path, const char* lang_code) {
+    for (int i = 0; i < lang_source_count; i++) {
+        if (strcmp(lang_sources[i].path, path) == 0 && strcmp(lang_sources[i].lang_code, lang_code) == 0) {
+            return &lang_sources[i];
+        }
+    }
+    return NULL;
+}
+
+// 记录注册的语言资源文件，loaded为false表示尚未加载（监视目录中新发现的文件）
+static void record_source(const char* file_path, const char* lang_code, bool loaded) {
+    char resolved[PATH_MAX];
+    if (!realpath(file_path, resolved)) {
+        snprintf(resolved, sizeof(resolved), "%s", file_path);
+    }
+    
+    lang_source_t* source = find_source(resolved, lang_code);
+    if (!source) {
+        if (lang_source_count >= MAX_LANG_SOURCES) {
+            fprintf(stderr, "[WARN] Too many language files to watch, limit is %d: %s\n",
+                    MAX_LANG_SOURCES, file_path);
+            return;
+        }
+        source = &lang_sources[lang_source_count++];
+        snprintf(source->path, sizeof(source->path), "%s", resolved);
+        snprintf(source->lang_code, sizeof(source->lang_code), "%s", lang_code);
+    }
+    
+    if (loaded) {
+        stat_source(source->path, &source->mtime_ns, &source->size);
+    } else {
+        source->mtime_ns = -2;
+        source->size = -2;
+    }
+}
+
+static bool register_file_locked(const char* file_path, const char* lang_code) {
     char inferred_lang_code[16] = {0};
     
     // 如果没有提供语言代码，从文件名推断
@@ -446,62 +928,581 @@ bool lang_register_file(const char* file_path, const char* lang_code) {
         if (!table) return false;
     }
     
-    // 解析并加载语言文件
-    return parse_yaml_lang_file(file_path, table);
+    if (!load_lang_source(file_path, table)) return false;
+    
+    record_source(file_path, lang_code, true);
+    return true;
 }
 
-int lang_scan_directory(const char* dir_path, const char* pattern) {
-    if (!dir_path || !*dir_path) {
-        fprintf(stderr, "[ERROR] Invalid directory path for language resources\n");
-        return 0;
+bool lang_register_file(const char* file_path, const char* lang_code) {
+    if (!file_path || !*file_path) {
+        fprintf(stderr, "[ERROR] Invalid file path for language resource\n");
+        return false;
     }
     
-    DIR* dir = opendir(dir_path);
-    if (!dir) {
-        fprintf(stderr, "[WARN] Cannot open directory: %s\n", dir_path);
-        return 0;
+    // 检查文件是否存在
+    if (access(file_path, R_OK) != 0) {
+        fprintf(stderr, "[ERROR] Cannot access language file: %s\n", file_path);
+        return false;
     }
     
-    int count = 0;
+    pthread_mutex_lock(&lang_write_lock);
+    bool ok = register_file_locked(file_path, lang_code);
+    pthread_mutex_unlock(&lang_write_lock);
+    return ok;
+}
+
+static double elapsed_ms(const struct timespec* start) {
+    struct timespec now;
+    clock_gettime(CLOCK_MONOTONIC, &now);
+    return (now.tv_sec - start->tv_sec) * 1000.0 + (now.tv_nsec - start->tv_nsec) / 1000000.0;
+}
+
+// 统计新旧两张表之间新增、删除和修改的键
+static void count_table_diff(dynamic_lang_table_t* old_table, dynamic_lang_table_t* new_table) {
+    for (int i = 0; i < new_table->entry_count; i++) {
+        const char* old_value = find_in_dynamic_table(old_table, new_table->entries[i].key);
+        if (!old_value) {
+            reload_stats.keys_added++;
+        } else if (strcmp(old_value, new_table->entries[i].value) != 0) {
+            reload_stats.keys_changed++;
+        }
+    }
+    for (int i = 0; i < old_table->entry_count; i++) {
+        if (!find_in_dynamic_table(new_table, old_table->entries[i].key)) {
+            reload_stats.keys_removed++;
+        }
+    }
+}
+
+// 从注册过的文件构建一种语言的新表并替换旧表，调用方持有lang_write_lock
+static bool reload_language_locked(const char* lang_code) {
+    struct timespec start;
+    clock_gettime(CLOCK_MONOTONIC, &start);
+    
+    dynamic_lang_table_t* table = alloc_dynamic_table(lang_code);
+    bool ok = table != NULL;
+    
+    // 按注册顺序加载该语言的所有文件，已删除的文件被跳过
+    for (int i = 0; ok && i < lang_source_count; i++) {
+        lang_source_t* source = &lang_sources[i];
+        if (strcmp(source->lang_code, lang_code) != 0) continue;
+        
+        stat_source(source->path, &source->mtime_ns, &source->size);
+        if (source->mtime_ns < 0) continue;
+        ok = load_lang_source(source->path, table);
+    }
+    
+    int index = find_dynamic_lang_index(lang_code);
+    if (ok && index < 0 && dynamic_lang_count >= MAX_DYNAMIC_LANGS) {
+        fprintf(stderr, "[ERROR] Too many dynamic languages, limit is %d\n", MAX_DYNAMIC_LANGS);
+        ok = false;
+    }
+    
+    if (!ok) {
+        if (table) free_dynamic_table(table);
+        reload_stats.failure_count++;
+        fprintf(stderr, "[ERROR] Failed to reload language: %s\n", lang_code);
+        return false;
+    }
+    
+    if (index < 0) {
+        // 监视目录中出现了新语言的文件
+        __atomic_store_n(&dynamic_langs[dynamic_lang_count], table, __ATOMIC_RELEASE);
+        __atomic_store_n(&dynamic_lang_count, dynamic_lang_count + 1, __ATOMIC_RELEASE);
+        reload_stats.keys_added += table->entry_count;
+    } else {
+        // 整表替换，读取方看到的要么是旧表要么是完整的新表
+        dynamic_lang_table_t* old_table = load_dynamic_lang(index);
+        count_table_diff(old_table, table);
+        __atomic_store_n(&dynamic_langs[index], table, __ATOMIC_RELEASE);
+        old_table->retired_next = retired_tables;
+        retired_tables = old_table;
+    }
+    __atomic_add_fetch(&lang_generation, 1, __ATOMIC_RELEASE);
+    
+    double latency = elapsed_ms(&start);
+    reload_stats.reload_count++;
+    reload_stats.last_latency_ms = latency;
+    reload_stats.total_latency_ms += latency;
+    if (latency > reload_stats.max_latency_ms) {
+        reload_stats.max_latency_ms = latency;
+    }
+    return true;
+}
+
+bool lang_reload_language(const char* lang_code) {
+    if (!lang_code || !*lang_code) return false;
+    
+    pthread_mutex_lock(&lang_write_lock);
+    bool ok = reload_language_locked(lang_code);
+    pthread_mutex_unlock(&lang_write_lock);
+    return ok;
+}
+
+// 记录扫描过的目录，热加载时发现其中新增的文件
+static void record_watch_dir(const char* dir_path, const char* pattern) {
+    char resolved[PATH_MAX];
+    if (!realpath(dir_path, resolved)) return;
+    if (!pattern || !*pattern) pattern = "*";
+    
+    for (int i = 0; i < lang_watch_dir_count; i++) {
+        if (strcmp(lang_watch_dirs[i].path, resolved) == 0 &&
+            strcmp(lang_watch_dirs[i].pattern, pattern) == 0) {
+            return;
+        }
+    }
+    if (lang_watch_dir_count >= MAX_LANG_WATCH_DIRS) return;
+    
+    lang_watch_dir_t* dir = &lang_watch_dirs[lang_watch_dir_count++];
+    snprintf(dir->path, sizeof(dir->path), "%s", resolved);
+    snprintf(dir->pattern, sizeof(dir->pattern), "%s", pattern);
+}
+
+// 把监视目录中新出现的文件记为未加载的源文件
+static void discover_new_sources(void) {
+    for (int i = 0; i < lang_watch_dir_count; i++) {
+        DIR* dir = opendir(lang_watch_dirs[i].path);
+        if (!dir) continue;
+        
+        struct dirent* entry;
+        while ((entry = readdir(dir)) != NULL) {
+            if (entry->d_name[0] == '.' || fnmatch(lang_watch_dirs[i].pattern, entry->d_name, 0) != 0) continue;
+            
+            // 跳过拼接后超长的路径，避免截断成另一个文件名
+            char full_path[PATH_MAX];
+            int n = snprintf(full_path, sizeof(full_path), "%s/%s", lang_watch_dirs[i].path, entry->d_name);
+            if (n < 0 || (size_t)n >= sizeof(full_path)) continue;
+            
+            char lang_code[16] = {0};
+            infer_lang_code_from_filename(full_path, lang_code, sizeof(lang_code));
+            struct stat st;
+            if (!lang_code[0] || find_source(full_path, lang_code) ||
+                stat(full_path, &st) != 0 || !S_ISREG(st.st_mode)) {
+                continue;
+            }
+            record_source(full_path, lang_code, false);
+        }
+        closedir(dir);
+    }
+}
+
+// 检查所有源文件，重建发生变化的语言，调用方持有lang_write_lock
+static int reload_changed_locked(void) {
+    discover_new_sources();
+    
+    char changed[MAX_DYNAMIC_LANGS][16];
+    int changed_count = 0;
+    
+    for (int i = 0; i < lang_source_count; i++) {
+        lang_source_t* source = &lang_sources[i];
+        int64_t mtime_ns, size;
+        stat_source(source->path, &mtime_ns, &size);
+        if (mtime_ns == source->mtime_ns && size == source->size) continue;
+        
+        bool seen = false;
+        for (int j = 0; j < changed_count && !seen; j++) {
+            seen = strcmp(changed[j], source->lang_code) == 0;
+        }
+        if (!seen && changed_count < MAX_DYNAMIC_LANGS) {
+            memcpy(changed[changed_count++], source->lang_code, sizeof(source->lang_code));
+        }
+    }
+    
+    int reloaded = 0;
+    for (int i = 0; i < changed_count; i++) {
+        if (reload_language_locked(changed[i])) reloaded++;
+    }
+    return reloaded;
+}
+
+int lang_reload_changed(void) {
+    pthread_mutex_lock(&lang_write_lock);
+    int reloaded = reload_changed_locked();
+    pthread_mutex_unlock(&lang_write_lock);
+    return reloaded;
+}
+
+void lang_get_reload_stats(lang_reload_stats_t* stats) {
+    if (!stats) return;
+    
+    pthread_mutex_lock(&lang_write_lock);
+    *stats = reload_stats;
+    pthread_mutex_unlock(&lang_write_lock);
+}
+
+#ifdef __linux__
+// 监视源文件所在的目录和扫描过的目录，重命名替换文件也会产生事件
+static void add_inotify_watches(int fd) {
+    uint32_t mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_CREATE | IN_DELETE | IN_ATTRIB;
+    
+    for (int i = 0; i < lang_source_count; i++) {
+        char dir_path[PATH_MAX];
+        int n = snprintf(dir_path, sizeof(dir_path), "%s", lang_sources[i].path);
+        if (n < 0 || (size_t)n >= sizeof(dir_path)) continue;
+        char* slash = strrchr(dir_path, '/');
+        if (!slash) continue;
+        *slash = '\0';
+        // 同一目录重复添加返回同一个监视描述符
+        inotify_add_watch(fd, dir_path[0] ? dir_path : "/", mask);
+    }
+    for (int i = 0; i < lang_watch_dir_count; i++) {
+        inotify_add_watch(fd, lang_watch_dirs[i].path, mask);
+    }
+}
+
+static void drain_fd(int fd) {
+    char buf[4096];
+    while (read(fd, buf, sizeof(buf)) > 0) {
+    }
+}
+#endif
+
+// 监视线程：有inotify事件时尽快检查，否则每隔watch_interval_ms检查一次
+static void* lang_watch_main(void* arg) {
+    (void)arg;
+    int inotify_fd = -1;
+#ifdef __linux__
+    inotify_fd = inotify_init1(IN_NONBLOCK | IN_CLOEXEC);
+    if (inotify_fd >= 0) {
+        pthread_mutex_lock(&lang_write_lock);
+        add_inotify_watches(inotify_fd);
+        pthread_mutex_unlock(&lang_write_lock);
+    }
+#endif
+    
+    struct pollfd fds[2];
+    fds[0].fd = watch_stop_pipe[0];
+    fds[0].events = POLLIN;
+    fds[1].fd = inotify_fd;
+    fds[1].events = POLLIN;
+    int nfds = inotify_fd >= 0 ? 2 : 1;
+    
+    for (;;) {
+        int rc = poll(fds, nfds, watch_interval_ms);
+        if (rc < 0 && errno != EINTR) break;
+        if (rc > 0 && fds[0].revents) break;
+        
+#ifdef __linux__
+        if (rc > 0 && inotify_fd >= 0 && (fds[1].revents & POLLIN)) {
+            // 等待同一次保存产生的事件全部到达
+            drain_fd(inotify_fd);
+            usleep(50 * 1000);
+            drain_fd(inotify_fd);
+        }
+#endif
+        
+        pthread_mutex_lock(&lang_write_lock);
+        reload_changed_locked();
+#ifdef __linux__
+        // 启动后注册的文件和目录也需要监视
+        if (inotify_fd >= 0) add_inotify_watches(inotify_fd);
+#endif
+        pthread_mutex_unlock(&lang_write_lock);
+    }
+    
+    if (inotify_fd >= 0) close(inotify_fd);
+    return NULL;
+}
+
+bool lang_watch_start(int interval_ms) {
+    if (watch_running) return true;
+    
+    if (pipe(watch_stop_pipe) != 0) {
+        fprintf(stderr, "[ERROR] Failed to create language watch pipe\n");
+        return false;
+    }
+    watch_interval_ms = interval_ms > 0 ? interval_ms : 1000;
+    
+    if (pthread_create(&watch_thread, NULL, lang_watch_main, NULL) != 0) {
+        fprintf(stderr, "[ERROR] Failed to start language watch thread\n");
+        close(watch_stop_pipe[0]);
+        close(watch_stop_pipe[1]);
+        watch_stop_pipe[0] = watch_stop_pipe[1] = -1;
+        return false;
+    }
+    watch_running = true;
+    return true;
+}
+
+void lang_watch_stop(void) {
+    if (!watch_running) return;
+    
+    // 通过管道唤醒监视线程
+    ssize_t written = write(watch_stop_pipe[1], "x", 1);
+    (void)written;
+    pthread_join(watch_thread, NULL);
+    close(watch_stop_pipe[0]);
+    close(watch_stop_pipe[1]);
+    watch_stop_pipe[0] = watch_stop_pipe[1] = -1;
+    watch_running = false;
+}
+
+// 判断文件名是否匹配lang_scan_directory的模式，只比较"*.ext"形式的扩展名
+static bool matches_scan_pattern(const char* name, const char* pattern) {
+    if (!pattern || !*pattern || strstr(pattern, "*.") == NULL) return true;
+    
+    const char* ext = strrchr(pattern, '.') + 1;
+    const char* file_ext = strrchr(name, '.');
+    return file_ext && strcmp(file_ext + 1, ext) == 0;
+}
+
+static int compare_paths(const void* a, const void* b) {
+    return strcmp(*(const char* const*)a, *(const char* const*)b);
+}
+
+static void free_file_list(char** files, int count) {
+    for (int i = 0; i < count; i++) free(files[i]);
+    free(files);
+}
+
+// 读取目录中匹配模式的普通文件，按名称排序，失败时返回-1
+static int read_dir_files(const char* dir_path, const char* pattern, char*** out) {
+    DIR* dir = opendir(dir_path);
+    if (!dir) return -1;
+    
+    char** files = NULL;
+    int count = 0, capacity = 0;
     struct dirent* entry;
     
     while ((entry = readdir(dir)) != NULL) {
         // 跳过特殊目录
         if (strcmp(entry->d_name, ".") == 0 || strcmp(entry->d_name, "..") == 0)
             continue;
-        
-        // 简单模式匹配
-        if (pattern && *pattern) {
-            // 极其简单的通配符匹配，仅支持*.yaml格式
-            if (strstr(pattern, "*.") != NULL) {
-                const char* ext = strrchr(pattern, '.');
-                if (ext) {
-                    ext++; // 跳过点
-                    const char* file_ext = strrchr(entry->d_name, '.');
-                    if (!file_ext || strcmp(file_ext + 1, ext) != 0)
-                        continue;
-                }
-            }
-        }
+        if (!matches_scan_pattern(entry->d_name, pattern))
+            continue;
         
         // 构建完整路径
-        char full_path[1024];
+        char full_path[PATH_MAX];
         snprintf(full_path, sizeof(full_path), "%s/%s", dir_path, entry->d_name);
         
         // 检查是否是普通文件
         struct stat st;
-        if (stat(full_path, &st) == 0 && S_ISREG(st.st_mode)) {
-            // 尝试注册语言文件
-            if (lang_register_file(full_path, NULL)) {
+        if (stat(full_path, &st) != 0 || !S_ISREG(st.st_mode))
+            continue;
+        
+        if (count == capacity) {
+            capacity = capacity ? capacity * 2 : 16;
+            char** grown = realloc(files, capacity * sizeof(char*));
+            if (!grown) break;
+            files = grown;
+        }
+        if (!(files[count] = strdup(full_path))) break;
+        count++;
+    }
+    closedir(dir);
+    
+    if (count > 1) qsort(files, count, sizeof(char*), compare_paths);
+    *out = files;
+    return count;
+}
+
+// 返回目录列表的副本，目录mtime未变化时使用缓存；目录不存在时返回-1
+static int list_dir_files(const char* dir_path, const char* pattern, char*** out) {
+    struct stat st;
+    if (stat(dir_path, &st) != 0 || !S_ISDIR(st.st_mode)) return -1;
+    int64_t mtime_ns = (int64_t)st.st_mtim.tv_sec * 1000000000LL + st.st_mtim.tv_nsec;
+    if (!pattern) pattern = "";
+    
+    pthread_mutex_lock(&lang_listing_lock);
+    lang_dir_listing_t* listing = NULL;
+    for (int i = 0; i < lang_dir_listing_count; i++) {
+        if (strcmp(lang_dir_listings[i].path, dir_path) == 0 &&
+            strcmp(lang_dir_listings[i].pattern, pattern) == 0) {
+            listing = &lang_dir_listings[i];
+            break;
+        }
+    }
+    
+    if (!listing || listing->mtime_ns != mtime_ns) {
+        char** files = NULL;
+        int count = read_dir_files(dir_path, pattern, &files);
+        if (count < 0) {
+            pthread_mutex_unlock(&lang_listing_lock);
+            return -1;
+        }
+        
+        if (!listing && lang_dir_listing_count < MAX_LANG_DIR_LISTINGS) {
+            listing = &lang_dir_listings[lang_dir_listing_count++];
+            snprintf(listing->path, sizeof(listing->path), "%s", dir_path);
+            snprintf(listing->pattern, sizeof(listing->pattern), "%s", pattern);
+            listing->files = NULL;
+            listing->count = 0;
+        }
+        if (!listing) {
+            // 缓存已满，直接返回本次读取的结果
+            pthread_mutex_unlock(&lang_listing_lock);
+            *out = files;
+            return count;
+        }
+        free_file_list(listing->files, listing->count);
+        listing->files = files;
+        listing->count = count;
+        listing->mtime_ns = mtime_ns;
+    }
+    
+    char** copy = malloc((listing->count ? listing->count : 1) * sizeof(char*));
+    int count = 0;
+    for (int i = 0; copy && i < listing->count; i++) {
+        if (!(copy[count] = strdup(listing->files[i]))) break;
+        count++;
+    }
+    pthread_mutex_unlock(&lang_listing_lock);
+    
+    *out = copy;
+    return copy ? count : -1;
+}
+
+// 清空目录列表缓存
+static void clear_dir_listings(void) {
+    pthread_mutex_lock(&lang_listing_lock);
+    for (int i = 0; i < lang_dir_listing_count; i++) {
+        free_file_list(lang_dir_listings[i].files, lang_dir_listings[i].count);
+    }
+    lang_dir_listing_count = 0;
+    pthread_mutex_unlock(&lang_listing_lock);
+}
+
+// 工作线程：领取文件并解析到私有表中，不访问共享的语言表
+static void* lang_load_worker(void* arg) {
+    lang_load_batch_t* batch = arg;
+    
+    for (;;) {
+        int i = __atomic_fetch_add(&batch->next, 1, __ATOMIC_RELAXED);
+        if (i >= batch->count) break;
+        
+        lang_load_job_t* job = &batch->jobs[i];
+        job->table = alloc_dynamic_table(job->lang_code);
+        job->ok = job->table && load_lang_source(job->path, job->table);
+    }
+    return NULL;
+}
+
+// 把私有表合并到语言表，先注册的值生效；键相同值不同时记为冲突。调用方持有lang_write_lock
+static bool merge_loaded_table(dynamic_lang_table_t* target, dynamic_lang_table_t* source,
+                               const char* path, int* conflicts) {
+    for (int i = 0; i < source->entry_count; i++) {
+        const char* key = source->entries[i].key;
+        const char* value = source->entries[i].value;
+        
+        // 查找时先找到的值生效，重复的键无需再占用条目
+        const char* existing = find_in_dynamic_table(target, key);
+        if (existing) {
+            // 与同一文件中先出现的值比较不算冲突，该值的字符串就属于本文件
+            if (existing != find_in_dynamic_table(source, key) && strcmp(existing, value) != 0) {
+                (*conflicts)++;
+                fprintf(stderr, "[WARN] Language key conflict in '%s': %s, ignoring value from %s\n",
+                        target->lang_code, key, path);
+            }
+            continue;
+        }
+        
+        if (target->entry_count >= MAX_ENTRIES_PER_LANG) {
+            fprintf(stderr, "[ERROR] Too many entries for language %s, limit is %d\n",
+                    target->lang_code, MAX_ENTRIES_PER_LANG);
+            return false;
+        }
+        publish_entry(target, key, value);
+    }
+    
+    // 私有表的字符串块转交给语言表
+    if (source->strings) {
+        lang_string_chunk_t* tail = source->strings;
+        while (tail->next) tail = tail->next;
+        tail->next = target->strings;
+        target->strings = source->strings;
+        source->strings = NULL;
+    }
+    return true;
+}
+
+// 在线程池中并行解析一批文件，再按给定顺序合并，返回成功注册的文件数
+static int load_lang_files(char** paths, int path_count) {
+    if (path_count <= 0) return 0;
+    
+    lang_load_job_t* jobs = calloc(path_count, sizeof(lang_load_job_t));
+    if (!jobs) return 0;
+    
+    int job_count = 0;
+    for (int i = 0; i < path_count; i++) {
+        lang_load_job_t* job = &jobs[job_count];
+        infer_lang_code_from_filename(paths[i], job->lang_code, sizeof(job->lang_code));
+        if (!job->lang_code[0]) {
+            fprintf(stderr, "[ERROR] Cannot determine language code for file: %s\n", paths[i]);
+            continue;
+        }
+        job->path = paths[i];
+        job_count++;
+    }
+    
+    lang_load_batch_t batch = {jobs, job_count, 0};
+    long cpus = sysconf(_SC_NPROCESSORS_ONLN);
+    int thread_count = job_count;
+    if (thread_count > LANG_LOAD_MAX_THREADS) thread_count = LANG_LOAD_MAX_THREADS;
+    if (cpus > 0 && thread_count > cpus) thread_count = (int)cpus;
+    
+    pthread_t threads[LANG_LOAD_MAX_THREADS];
+    int started = 0;
+    for (int i = 1; i < thread_count; i++) {
+        if (pthread_create(&threads[started], NULL, lang_load_worker, &batch) != 0) break;
+        started++;
+    }
+    // 当前线程也参与解析
+    lang_load_worker(&batch);
+    for (int i = 0; i < started; i++) {
+        pthread_join(threads[i], NULL);
+    }
+    
+    // 按文件顺序合并，结果与解析完成的先后无关
+    int count = 0, conflicts = 0;
+    pthread_mutex_lock(&lang_write_lock);
+    for (int i = 0; i < job_count; i++) {
+        lang_load_job_t* job = &jobs[i];
+        if (job->ok) {
+            dynamic_lang_table_t* table = find_dynamic_lang(job->lang_code);
+            if (!table) table = create_dynamic_lang(job->lang_code);
+            if (table && merge_loaded_table(table, job->table, job->path, &conflicts)) {
+                record_source(job->path, job->lang_code, true);
                 count++;
             }
         }
+        if (job->table) free_dynamic_table(job->table);
     }
+    pthread_mutex_unlock(&lang_write_lock);
     
-    closedir(dir);
+    if (conflicts > 0) {
+        fprintf(stderr, "[WARN] %d conflicting language keys while loading %d files\n", conflicts, job_count);
+    }
+    free(jobs);
+    return count;
+}
+
+static int scan_directory(const char* dir_path, const char* pattern, bool warn_missing) {
+    char** files = NULL;
+    int file_count = list_dir_files(dir_path, pattern, &files);
+    if (file_count < 0) {
+        if (warn_missing) fprintf(stderr, "[WARN] Cannot open directory: %s\n", dir_path);
+        return 0;
+    }
+    
+    int count = load_lang_files(files, file_count);
+    free_file_list(files, file_count);
+    
+    pthread_mutex_lock(&lang_write_lock);
+    record_watch_dir(dir_path, pattern);
+    pthread_mutex_unlock(&lang_write_lock);
     return count;
 }
 
+int lang_scan_directory(const char* dir_path, const char* pattern) {
+    if (!dir_path || !*dir_path) {
+        fprintf(stderr, "[ERROR] Invalid directory path for language resources\n");
+        return 0;
+    }
+    
+    return scan_directory(dir_path, pattern, true);
+}
+
 int lang_scan_directory_with_glob(const char* glob_pattern) {
     if (!glob_pattern || !*glob_pattern) {
         fprintf(stderr, "[ERROR] Invalid glob pattern for language resources\n");
@@ -518,18 +1519,18 @@ int lang_scan_directory_with_glob(const char* glob_pattern) {
         return 0;
     }
     
-    int count = 0;
-    for (size_t i = 0; i < globbuf.gl_pathc; i++) {
-        // 检查是否是普通文件
+    // glob的结果已排序，只保留普通文件
+    char** files = malloc((globbuf.gl_pathc ? globbuf.gl_pathc : 1) * sizeof(char*));
+    int file_count = 0;
+    for (size_t i = 0; files && i < globbuf.gl_pathc; i++) {
         struct stat st;
         if (stat(globbuf.gl_pathv[i], &st) == 0 && S_ISREG(st.st_mode)) {
-            // 尝试注册语言文件
-            if (lang_register_file(globbuf.gl_pathv[i], NULL)) {
-                count++;
-            }
+            files[file_count++] = globbuf.gl_pathv[i];
         }
     }
     
+    int count = files ? load_lang_files(files, file_count) : 0;
+    free(files);
     globfree(&globbuf);
     return count;
 }
@@ -537,8 +1538,8 @@ int lang_scan_directory_with_glob(const char* glob_pattern) {
 bool lang_auto_discover_resources(void) {
     int found = 0;
     
-    // 1. 检查当前工作目录/locales
-    found += lang_scan_directory("./locales", "*.yaml");
+    // 1. 检查当前工作目录/locales，不存在的目录只需一次stat
+    found += scan_directory("./locales", "*.yaml", false);
     
     // 2. 检查配置中定义的路径 (这里需要从配置模块获取，暂时略过)
     // const char** paths = config_get_locale_paths();
@@ -553,7 +1554,7 @@ bool lang_auto_discover_resources(void) {
     const char* home = getenv("HOME");
     if (home) {
         snprintf(app_config_path, sizeof(app_config_path), "%s/.config/logloom/locales", home);
-        found += lang_scan_directory(app_config_path, "*.yaml");
+        found += scan_directory(app_config_path, "*.yaml", false);
     }
     
     return found > 0;
@@ -606,7 +1607,7 @@ char** lang_get_supported_languages(int* count) {
     
     // 添加动态加载的语言
     for (int i = 0; i < dynamic_lang_count; i++) {
-        const char* lang = dynamic_langs[i].lang_code;
+        const char* lang = load_dynamic_lang(i)->lang_code;
         
         // 检查是否已添加
         bool already_added = false;
@@ -637,7 +1638,7 @@ char** lang_get_language_keys(const char* lang_code, int* count) {
     
     // 如果没有提供语言代码，使用当前语言
     if (!lang_code || !*lang_code) {
-        lang_code = current_lang_code;
+        lang_code = lang_get_current();
     }
     
     // 先检查是否有内置表
@@ -645,6 +1646,8 @@ char** lang_get_language_keys(const char* lang_code, int* count) {
     
     // 检查是否有动态加载的表
     dynamic_lang_table_t* dynamic_table = find_dynamic_lang(lang_code);
+    // 取一次条目数，期间追加的条目不计入
+    int dynamic_count = dynamic_table ? __atomic_load_n(&dynamic_table->entry_count, __ATOMIC_ACQUIRE) : 0;
     
     // 如果两者都没有，返回NULL
     if (!builtin_table && !dynamic_table) {
@@ -663,7 +1666,7 @@ char** lang_get_language_keys(const char* lang_code, int* count) {
     }
     
     if (dynamic_table) {
-        key_count += dynamic_table->entry_count;
+        key_count += dynamic_count;
     }
     
     if (key_count == 0) {
@@ -712,7 +1715,7 @@ char** lang_get_language_keys(const char* lang_code, int* count) {
     
     // 添加动态表的键
     if (dynamic_table) {
-        for (int i = 0; i < dynamic_table->entry_count; i++) {
+        for (int i = 0; i < dynamic_count; i++) {
             const char* key = dynamic_table->entries[i].key;
             
             // 检查是否已添加
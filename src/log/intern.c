@@ -0,0 +1,178 @@
+#include <stdlib.h>
+#include <string.h>
+#include <stdint.h>
+#include <stdbool.h>
+#include <pthread.h>
+
+#include "intern.h"
+
+// 字符串按页保存，页一经分配不再移动，按ID读取时无需加锁
+#define INTERN_PAGE_SIZE 256
+#define INTERN_PAGE_COUNT (INTERN_MAX_IDS / INTERN_PAGE_SIZE)
+
+// 线程本地的指针缓存大小（2的幂）
+#define INTERN_THREAD_CACHE_SIZE 16
+
+// 哈希表槽位，id为0表示空槽
+typedef struct {
+    uint32_t hash;
+    uint32_t id;
+} intern_slot_t;
+
+static const char** intern_pages[INTERN_PAGE_COUNT];
+static uint32_t intern_next_id = 1;
+
+// ID哈希表（开放寻址），查找持读锁，插入和扩容持写锁
+static intern_slot_t* intern_slots = NULL;
+static size_t intern_capacity = 0;
+static pthread_rwlock_t intern_lock = PTHREAD_RWLOCK_INITIALIZER;
+
+// 同一调用点通常反复传入同一个字符串常量，按指针缓存最近的结果，命中时不计算哈希也不加锁
+static __thread struct {
+    const char* ptr;
+    uint32_t id;
+} intern_thread_cache[INTERN_THREAD_CACHE_SIZE];
+
+// FNV-1a字符串哈希
+static uint32_t intern_hash(const char* str) {
+    uint32_t hash = 2166136261u;
+    for (const unsigned char* p = (const unsigned char*)str; *p; p++) {
+        hash ^= *p;
+        hash *= 16777619u;
+    }
+    return hash;
+}
+
+const char* intern_get_string(uint32_t id) {
+    if (id == 0 || id >= INTERN_MAX_IDS) {
+        return NULL;
+    }
+    const char** page = __atomic_load_n(&intern_pages[id / INTERN_PAGE_SIZE], __ATOMIC_ACQUIRE);
+    return page ? __atomic_load_n(&page[id % INTERN_PAGE_SIZE], __ATOMIC_ACQUIRE) : NULL;
+}
+
+size_t intern_get_count(void) {
+    return __atomic_load_n(&intern_next_id, __ATOMIC_ACQUIRE) - 1;
+}
+
+// 在哈希表中查找字符串，返回ID或0，调用方持有锁
+static uint32_t find_locked(const char* str, uint32_t hash) {
+    if (!intern_slots) {
+        return 0;
+    }
+    size_t mask = intern_capacity - 1;
+    for (size_t i = hash & mask; intern_slots[i].id; i = (i + 1) & mask) {
+        if (intern_slots[i].hash == hash && strcmp(intern_get_string(intern_slots[i].id), str) == 0) {
+            return intern_slots[i].id;
+        }
+    }
+    return 0;
+}
+
+// 扩容哈希表，负载因子不超过0.5，调用方持有写锁
+static bool grow_locked(void) {
+    size_t capacity = intern_capacity ? intern_capacity * 2 : 256;
+    intern_slot_t* slots = calloc(capacity, sizeof(intern_slot_t));
+    if (!slots) {
+        return false;
+    }
+    for (size_t i = 0; i < intern_capacity; i++) {
+        if (!intern_slots[i].id) continue;
+        size_t j = intern_slots[i].hash & (capacity - 1);
+        while (slots[j].id) j = (j + 1) & (capacity - 1);
+        slots[j] = intern_slots[i];
+    }
+    free(intern_slots);
+    intern_slots = slots;
+    intern_capacity = capacity;
+    return true;
+}
+
+// 查询线程本地缓存，str与缓存的字符串内容一致时才算命中
+static uint32_t thread_cache_get(const char* str, unsigned index) {
+    if (intern_thread_cache[index].ptr != str) {
+        return 0;
+    }
+    uint32_t id = intern_thread_cache[index].id;
+    const char* name = intern_get_string(id);
+    // 传入的就是驻留字符串时无需比较内容
+    return (name == str || strcmp(name, str) == 0) ? id : 0;
+}
+
+static unsigned thread_cache_index(const char* str) {
+    return (unsigned)(((uintptr_t)str >> 3) & (INTERN_THREAD_CACHE_SIZE - 1));
+}
+
+uint32_t intern_lookup(const char* str) {
+    if (!str) {
+        return 0;
+    }
+    unsigned index = thread_cache_index(str);
+    uint32_t id = thread_cache_get(str, index);
+    if (id) {
+        return id;
+    }
+
+    uint32_t hash = intern_hash(str);
+    pthread_rwlock_rdlock(&intern_lock);
+    id = find_locked(str, hash);
+    pthread_rwlock_unlock(&intern_lock);
+
+    if (id) {
+        intern_thread_cache[index].ptr = str;
+        intern_thread_cache[index].id = id;
+    }
+    return id;
+}
+
+uint32_t intern_string(const char* str) {
+    if (!str) {
+        return 0;
+    }
+    uint32_t id = intern_lookup(str);
+    if (id) {
+        return id;
+    }
+
+    uint32_t hash = intern_hash(str);
+    pthread_rwlock_wrlock(&intern_lock);
+
+    // 其他线程可能已经驻留了同一个字符串
+    id = find_locked(str, hash);
+    if (!id) {
+        id = intern_next_id;
+        char* copy = NULL;
+        const char** page = id < INTERN_MAX_IDS ? intern_pages[id / INTERN_PAGE_SIZE] : NULL;
+
+        if (id >= INTERN_MAX_IDS || (intern_next_id * 2 > intern_capacity && !grow_locked())) {
+            id = 0;
+        } else if (!page && !(page = calloc(INTERN_PAGE_SIZE, sizeof(char*)))) {
+            id = 0;
+        } else {
+            __atomic_store_n(&intern_pages[id / INTERN_PAGE_SIZE], page, __ATOMIC_RELEASE);
+            copy = strdup(str);
+        }
+
+        if (id && !copy) {
+            id = 0;
+        } else if (id) {
+            __atomic_store_n(&page[id % INTERN_PAGE_SIZE], copy, __ATOMIC_RELEASE);
+
+            size_t mask = intern_capacity - 1;
+            size_t i = hash & mask;
+            while (intern_slots[i].id) i = (i + 1) & mask;
+            intern_slots[i].hash = hash;
+            intern_slots[i].id = id;
+            __atomic_store_n(&intern_next_id, id + 1, __ATOMIC_RELEASE);
+        }
+    }
+
+    pthread_rwlock_unlock(&intern_lock);
+
+    if (id) {
+        unsigned index = thread_cache_index(str);
+        intern_thread_cache[index].ptr = str;
+        intern_thread_cache[index].id = id;
+    }
+    return id;
+}
@@ -4,17 +4,30 @@
 #include <stdarg.h>
 #include <time.h>
 #include <pthread.h>
+#include <signal.h>
+#include <unistd.h>
 #include <sys/stat.h>
 #include <errno.h>
 
 #include "log.h"
 #include "lang.h"
+#include "intern.h"
 
 // 声明rotate.c中的函数
 extern FILE* check_and_rotate_log_file(const char* log_file_path, FILE* log_file, size_t max_size);
 extern FILE* rotate_log_file(const char* log_file_path, FILE* log_file);
 
+// 待换上的日志文件，由log_swap_file在调用线程中打开
+typedef struct {
+    FILE* file;                // 新的日志文件句柄，NULL表示禁用文件输出
+    char* path;                // 新的日志文件路径
+} log_file_swap_t;
+
+// 检查日志文件是否被外部轮转的最小间隔（秒）
+#define LOG_FILE_CHECK_INTERVAL 1
+
 // 日志系统配置
+// level、console_enabled和max_file_size以原子方式读写，运行时调整不需要日志锁
 static struct {
     log_level_t level;         // 当前日志级别
     bool console_enabled;      // 是否输出到控制台
@@ -23,6 +36,11 @@ static struct {
     size_t max_file_size;      // 最大文件大小
     pthread_mutex_t lock;      // 线程锁
     bool initialized;          // 是否已初始化
+    log_record_hook_t record_hook;  // 日志记录回调
+    void* record_hook_data;    // 日志记录回调的用户数据
+    log_file_swap_t* pending_file;  // 待换上的日志文件，写日志的线程持有日志锁时换上
+    int reopen_requested;      // 重新打开日志文件的请求，可由信号处理函数设置
+    time_t last_file_check;    // 上次检查外部轮转的时间
 } log_ctx = {
     .level = LOG_LEVEL_INFO,
     .console_enabled = true,
@@ -34,12 +52,12 @@ static struct {
 
 // 日志级别对应的名称
 static const char* log_level_names[] = {
-    "DEBUG", "INFO", "WARN", "ERROR"
+    "DEBUG", "INFO", "WARN", "ERROR", "FATAL"
 };
 
 // 日志级别对应的颜色代码（ANSI）
 static const char* log_level_colors[] = {
-    "\x1B[36m", "\x1B[32m", "\x1B[33m", "\x1B[31m"
+    "\x1B[36m", "\x1B[32m", "\x1B[33m", "\x1B[31m", "\x1B[35m"
 };
 
 // 重置颜色
@@ -52,9 +70,113 @@ static void format_time(char* buffer, size_t size) {
     strftime(buffer, size, "%Y-%m-%d %H:%M:%S", tm_info);
 }
 
+// 当前日志级别，日志调用在加锁前用它过滤
+static inline log_level_t current_level(void) {
+    return __atomic_load_n(&log_ctx.level, __ATOMIC_RELAXED);
+}
+
+// 从字符串解析日志级别，无法识别时返回-1
+static int parse_level(const char* level) {
+    for (int i = LOG_LEVEL_DEBUG; i <= LOG_LEVEL_FATAL; i++) {
+        if (strcasecmp(level, log_level_names[i]) == 0) {
+            return i;
+        }
+    }
+    return -1;
+}
+
+// 释放未换上的日志文件
+static void free_file_swap(log_file_swap_t* swap) {
+    if (swap->file) {
+        fclose(swap->file);
+    }
+    free(swap->path);
+    free(swap);
+}
+
+// 换上log_swap_file发布的日志文件并关闭旧文件，调用方持有日志锁
+static void apply_pending_file(void) {
+    if (!__atomic_load_n(&log_ctx.pending_file, __ATOMIC_RELAXED)) {
+        return;
+    }
+    log_file_swap_t* swap = __atomic_exchange_n(&log_ctx.pending_file, NULL, __ATOMIC_ACQ_REL);
+    if (!swap) {
+        return;
+    }
+    
+    if (log_ctx.log_file) {
+        fclose(log_ctx.log_file);
+    }
+    free(log_ctx.log_file_path);
+    log_ctx.log_file = swap->file;
+    log_ctx.log_file_path = swap->path;
+    free(swap);
+}
+
+// 丢弃尚未换上的日志文件
+static void discard_pending_file(void) {
+    log_file_swap_t* swap = __atomic_exchange_n(&log_ctx.pending_file, NULL, __ATOMIC_ACQ_REL);
+    if (swap) {
+        free_file_swap(swap);
+    }
+}
+
+// 按当前路径重新打开日志文件，打开失败时继续写原文件，调用方持有日志锁
+static void reopen_log_file(void) {
+    FILE* file = fopen(log_ctx.log_file_path, "a");
+    if (!file) {
+        fprintf(stderr, "Failed to reopen log file: %s: %s\n", log_ctx.log_file_path, strerror(errno));
+        return;
+    }
+    fclose(log_ctx.log_file);
+    log_ctx.log_file = file;
+}
+
+// 处理外部轮转，调用方持有日志锁
+// 收到重新打开请求，或路径指向的文件已被改名、删除（inode不同）时按路径重新打开；
+// 文件被原地截断（copytruncate）时把写入位置移到文件末尾，避免在文件中留下空洞。
+// 没有请求时最多每LOG_FILE_CHECK_INTERVAL秒检查一次
+static void check_external_rotation(void) {
+    bool requested = __atomic_exchange_n(&log_ctx.reopen_requested, 0, __ATOMIC_ACQ_REL) != 0;
+    if (!log_ctx.log_file || !log_ctx.log_file_path) {
+        return;
+    }
+    if (requested) {
+        reopen_log_file();
+        return;
+    }
+    
+    time_t now = time(NULL);
+    if (now - log_ctx.last_file_check < LOG_FILE_CHECK_INTERVAL) {
+        return;
+    }
+    log_ctx.last_file_check = now;
+    
+    struct stat file_st, path_st;
+    if (fstat(fileno(log_ctx.log_file), &file_st) != 0) {
+        return;
+    }
+    if (stat(log_ctx.log_file_path, &path_st) != 0 ||
+        path_st.st_ino != file_st.st_ino || path_st.st_dev != file_st.st_dev) {
+        reopen_log_file();
+        return;
+    }
+    long position = ftell(log_ctx.log_file);
+    if (position > file_st.st_size) {
+        fseek(log_ctx.log_file, 0, SEEK_END);
+    }
+}
+
+// 换上运行时切换的日志文件并处理外部轮转，调用方持有日志锁
+static void prepare_log_file(void) {
+    apply_pending_file();
+    check_external_rotation();
+}
+
 // 检查文件大小并轮转（如果需要）
 static void check_and_rotate_log(void) {
-    if (!log_ctx.log_file || !log_ctx.log_file_path || log_ctx.max_file_size <= 0) {
+    size_t max_size = __atomic_load_n(&log_ctx.max_file_size, __ATOMIC_RELAXED);
+    if (!log_ctx.log_file || !log_ctx.log_file_path || max_size <= 0) {
         return;
     }
     
@@ -62,7 +184,7 @@ static void check_and_rotate_log(void) {
     FILE* new_file = check_and_rotate_log_file(
         log_ctx.log_file_path, 
         log_ctx.log_file, 
-        log_ctx.max_file_size
+        max_size
     );
     
     // 如果文件指针发生变化，更新上下文
@@ -80,21 +202,9 @@ int log_init(const char* level_str, const char* log_file) {
         return 0;
     }
     
-    // 设置日志级别
+    // 设置日志级别，如果无法识别，保持默认级别
     if (level_str) {
-        // 从字符串解析日志级别
-        if (strcasecmp(level_str, "DEBUG") == 0) {
-            log_ctx.level = LOG_LEVEL_DEBUG;
-        } else if (strcasecmp(level_str, "INFO") == 0) {
-            log_ctx.level = LOG_LEVEL_INFO;
-        } else if (strcasecmp(level_str, "WARN") == 0) {
-            log_ctx.level = LOG_LEVEL_WARN;
-        } else if (strcasecmp(level_str, "ERROR") == 0) {
-            log_ctx.level = LOG_LEVEL_ERROR;
-        } else if (strcasecmp(level_str, "FATAL") == 0) {
-            log_ctx.level = LOG_LEVEL_FATAL;
-        }
-        // 如果无法识别，保持默认级别
+        log_set_level(level_str);
     }
     
     // 初始化互斥锁
@@ -119,6 +229,9 @@ int log_init(const char* level_str, const char* log_file) {
 bool log_set_output_file(const char* filepath) {
     pthread_mutex_lock(&log_ctx.lock);
     
+    // 之前通过log_swap_file发布但尚未换上的文件被本次设置取代
+    discard_pending_file();
+    
     // 如果已有打开的文件，先关闭
     if (log_ctx.log_file) {
         fclose(log_ctx.log_file);
@@ -163,42 +276,104 @@ void log_set_file(const char* filepath) {
     log_set_output_file(filepath);
 }
 
+// 日志级别以一次原子写入切换，不等待正在写日志的线程
 void log_set_level(const char* level) {
-    pthread_mutex_lock(&log_ctx.lock);
+    // 从字符串解析日志级别，如果无法识别，保持原有级别
+    int value = level ? parse_level(level) : -1;
+    if (value >= 0) {
+        __atomic_store_n(&log_ctx.level, (log_level_t)value, __ATOMIC_RELAXED);
+    }
+}
+
+void log_set_output_console(bool enabled) {
+    __atomic_store_n(&log_ctx.console_enabled, enabled, __ATOMIC_RELAXED);
+}
+
+void log_set_max_file_size(size_t max_bytes) {
+    __atomic_store_n(&log_ctx.max_file_size, max_bytes, __ATOMIC_RELAXED);
+}
+
+size_t log_get_max_file_size(void) {
+    return __atomic_load_n(&log_ctx.max_file_size, __ATOMIC_RELAXED);
+}
+
+// 在调用线程中打开待换上的日志文件，路径为空表示禁用文件输出，失败时返回NULL
+static log_file_swap_t* open_file_swap(const char* filepath) {
+    log_file_swap_t* swap = calloc(1, sizeof(log_file_swap_t));
+    if (!swap) {
+        return NULL;
+    }
     
-    // 从字符串解析日志级别
-    if (level) {
-        if (strcasecmp(level, "DEBUG") == 0) {
-            log_ctx.level = LOG_LEVEL_DEBUG;
-        } else if (strcasecmp(level, "INFO") == 0) {
-            log_ctx.level = LOG_LEVEL_INFO;
-        } else if (strcasecmp(level, "WARN") == 0) {
-            log_ctx.level = LOG_LEVEL_WARN;
-        } else if (strcasecmp(level, "ERROR") == 0) {
-            log_ctx.level = LOG_LEVEL_ERROR;
-        } else if (strcasecmp(level, "FATAL") == 0) {
-            log_ctx.level = LOG_LEVEL_FATAL;
+    if (filepath && *filepath) {
+        swap->path = strdup(filepath);
+        swap->file = swap->path ? fopen(filepath, "a") : NULL;
+        if (!swap->file) {
+            free(swap->path);
+            free(swap);
+            return NULL;
         }
-        // 如果无法识别，保持原有级别
+    }
+    return swap;
+}
+
+// 在调用线程中打开新文件，发布后由下一次写日志的线程换上
+bool log_swap_file(const char* filepath) {
+    // 新文件无法打开时保留原文件
+    log_file_swap_t* swap = open_file_swap(filepath);
+    if (!swap) {
+        return false;
     }
     
-    pthread_mutex_unlock(&log_ctx.lock);
+    // 连续切换时只保留最新的文件
+    log_file_swap_t* previous = __atomic_exchange_n(&log_ctx.pending_file, swap, __ATOMIC_ACQ_REL);
+    if (previous) {
+        free_file_swap(previous);
+    }
+    return true;
 }
 
-void log_set_output_console(bool enabled) {
+// 在调用线程中按当前路径重新打开日志文件，日志锁只用于读取路径
+bool log_reopen(void) {
     pthread_mutex_lock(&log_ctx.lock);
-    log_ctx.console_enabled = enabled;
+    apply_pending_file();
+    char* path = log_ctx.log_file_path ? strdup(log_ctx.log_file_path) : NULL;
     pthread_mutex_unlock(&log_ctx.lock);
+    
+    if (!path) {
+        return false;
+    }
+    log_file_swap_t* swap = open_file_swap(path);
+    free(path);
+    if (!swap) {
+        return false;
+    }
+    
+    // 已有待换上的文件时它同样是新打开的，不再用当前路径覆盖它
+    log_file_swap_t* expected = NULL;
+    if (!__atomic_compare_exchange_n(&log_ctx.pending_file, &expected, swap, false,
+                                     __ATOMIC_ACQ_REL, __ATOMIC_ACQUIRE)) {
+        free_file_swap(swap);
+    }
+    return true;
 }
 
-void log_set_max_file_size(size_t max_bytes) {
-    pthread_mutex_lock(&log_ctx.lock);
-    log_ctx.max_file_size = max_bytes;
-    pthread_mutex_unlock(&log_ctx.lock);
+// 只设置原子标志，可在信号处理函数中调用
+void log_request_reopen(void) {
+    __atomic_store_n(&log_ctx.reopen_requested, 1, __ATOMIC_RELEASE);
 }
 
-size_t log_get_max_file_size(void) {
-    return log_ctx.max_file_size;
+static void reopen_signal_handler(int signum) {
+    (void)signum;
+    log_request_reopen();
+}
+
+bool log_reopen_on_signal(int signum) {
+    struct sigaction action;
+    memset(&action, 0, sizeof(action));
+    action.sa_handler = reopen_signal_handler;
+    sigemptyset(&action.sa_mask);
+    action.sa_flags = SA_RESTART;
+    return sigaction(signum, &action, NULL) == 0;
 }
 
 // 设置最大历史日志文件数量
@@ -219,6 +394,7 @@ bool log_rotate_now(void) {
     bool success = false;
     
     pthread_mutex_lock(&log_ctx.lock);
+    prepare_log_file();
     
     if (log_ctx.log_file && log_ctx.log_file_path) {
         FILE* new_file = rotate_log_file(log_ctx.log_file_path, log_ctx.log_file);
@@ -232,10 +408,16 @@ bool log_rotate_now(void) {
     return success;
 }
 
+// 驻留字符串并返回驻留的副本，驻留失败时返回原字符串，id为0
+static const char* intern_field(const char* str, uint32_t* id) {
+    *id = intern_string(str);
+    return *id ? intern_get_string(*id) : str;
+}
+
 // 内部日志写入函数
 static void log_write_internal(log_level_t level, const char* module, const char* message) {
     // 如果日志级别低于当前设置，忽略
-    if (level < log_ctx.level) {
+    if (level < current_level()) {
         return;
     }
     
@@ -252,13 +434,14 @@ static void log_write_internal(log_level_t level, const char* module, const char
              time_str, level_name, module ? module : "SYSTEM");
     
     // 写入到控制台
-    if (log_ctx.console_enabled) {
+    if (__atomic_load_n(&log_ctx.console_enabled, __ATOMIC_RELAXED)) {
         // 使用ANSI颜色突出显示日志级别
         fprintf(stderr, "%s%s%s%s\n", 
                 prefix, log_level_colors[level], message, reset_color);
     }
     
-    // 写入到文件
+    // 写入到文件，先换上运行时切换的日志文件并处理外部轮转
+    prepare_log_file();
     if (log_ctx.log_file) {
         // 首先检查是否需要轮转日志
         check_and_rotate_log();
@@ -275,19 +458,29 @@ static void log_write_internal(log_level_t level, const char* module, const char
 // 可变参数的日志接口实现
 #define IMPLEMENT_LOG_FUNC(name, level_value) \
     void log_##name(const char* module, const char* fmt, ...) { \
-        if ((level_value) < log_ctx.level) return; \
+        if ((level_value) < current_level()) return; \
         \
         va_list args; \
         va_start(args, fmt); \
         \
         char buffer[4096]; /* 足够大的缓冲区 */ \
         vsnprintf(buffer, sizeof(buffer), fmt, args); \
+        uint32_t module_id; \
+        const char* module_name = intern_field(module ? module : "SYSTEM", &module_id); \
         \
         pthread_mutex_lock(&log_ctx.lock); \
-        log_write_internal((level_value), module, buffer); \
+        log_write_internal((level_value), module_name, buffer); \
+        log_record_hook_t hook = log_ctx.record_hook; \
+        void* hook_data = log_ctx.record_hook_data; \
         pthread_mutex_unlock(&log_ctx.lock); \
         \
         va_end(args); \
+        \
+        if (hook) { \
+            log_entry_t entry = { (unsigned long)time(NULL), (level_value), \
+                                  module_name, buffer, NULL, module_id, 0 }; \
+            hook(&entry, hook_data); \
+        } \
     }
 
 IMPLEMENT_LOG_FUNC(debug, LOG_LEVEL_DEBUG)
@@ -295,32 +488,139 @@ IMPLEMENT_LOG_FUNC(info, LOG_LEVEL_INFO)
 IMPLEMENT_LOG_FUNC(warn, LOG_LEVEL_WARN)
 IMPLEMENT_LOG_FUNC(error, LOG_LEVEL_ERROR)
 
+// 批量日志接口：一次加锁，文件只写一次
+size_t log_write_batch(const log_entry_t* entries, size_t count) {
+    if (!entries || count == 0) {
+        return 0;
+    }
+    
+    size_t capacity = 4096;
+    size_t length = 0;
+    size_t written = 0;
+    char* buffer = malloc(capacity);
+    if (!buffer) {
+        return 0;
+    }
+    
+    // 同一批次共用一个时间戳
+    char time_str[32];
+    format_time(time_str, sizeof(time_str));
+    
+    pthread_mutex_lock(&log_ctx.lock);
+    
+    // 同一批次使用同一个级别和控制台设置
+    log_level_t min_level = current_level();
+    bool console_enabled = __atomic_load_n(&log_ctx.console_enabled, __ATOMIC_RELAXED);
+    
+    for (size_t i = 0; i < count; i++) {
+        const log_entry_t* entry = &entries[i];
+        if (!entry->message || entry->level < min_level || entry->level > LOG_LEVEL_FATAL) {
+            continue;
+        }
+        
+        const char* module = entry->module ? entry->module : "SYSTEM";
+        
+        if (console_enabled) {
+            fprintf(stderr, "[%s] [%s] [%s] %s%s%s\n", time_str, log_level_names[entry->level],
+                    module, log_level_colors[entry->level], entry->message, reset_color);
+        }
+        
+        size_t needed = strlen(time_str) + strlen(module) + strlen(entry->message) + 32;
+        if (length + needed > capacity) {
+            size_t new_capacity = capacity * 2;
+            while (length + needed > new_capacity) {
+                new_capacity *= 2;
+            }
+            char* new_buffer = realloc(buffer, new_capacity);
+            if (!new_buffer) {
+                break;
+            }
+            buffer = new_buffer;
+            capacity = new_capacity;
+        }
+        
+        length += snprintf(buffer + length, capacity - length, "[%s] [%s] [%s] %s\n",
+                           time_str, log_level_names[entry->level], module, entry->message);
+        written++;
+    }
+    
+    if (length > 0) {
+        prepare_log_file();
+    }
+    if (length > 0 && log_ctx.log_file) {
+        check_and_rotate_log();
+        if (log_ctx.log_file) {
+            fwrite(buffer, 1, length, log_ctx.log_file);
+            fflush(log_ctx.log_file);
+        }
+    }
+    
+    log_record_hook_t hook = log_ctx.record_hook;
+    void* hook_data = log_ctx.record_hook_data;
+    pthread_mutex_unlock(&log_ctx.lock);
+    
+    free(buffer);
+    
+    if (hook && written > 0) {
+        unsigned long now = (unsigned long)time(NULL);
+        for (size_t i = 0; i < count; i++) {
+            if (!entries[i].message || entries[i].level < min_level || entries[i].level > LOG_LEVEL_FATAL) {
+                continue;
+            }
+            log_entry_t record = entries[i];
+            record.timestamp = now;
+            if (!record.module_id) {
+                record.module = intern_field(record.module ? record.module : "SYSTEM", &record.module_id);
+            }
+            if (record.lang_key && !record.lang_key_id) {
+                record.lang_key = intern_field(record.lang_key, &record.lang_key_id);
+            }
+            hook(&record, hook_data);
+        }
+    }
+    return written;
+}
+
+// 设置日志记录回调
+void log_set_record_hook(log_record_hook_t hook, void* user_data) {
+    pthread_mutex_lock(&log_ctx.lock);
+    log_ctx.record_hook = hook;
+    log_ctx.record_hook_data = user_data;
+    pthread_mutex_unlock(&log_ctx.lock);
+}
+
 // 使用语言键的日志接口
 void log_with_lang(log_level_t level, const char* module, const char* lang_key, ...) {
-    if (level < log_ctx.level) return;
+    if (level < current_level()) return;
+    
+    log_entry_t entry = { (unsigned long)time(NULL), level, NULL, NULL, NULL, 0, 0 };
+    entry.module = intern_field(module ? module : "SYSTEM", &entry.module_id);
+    entry.lang_key = lang_key ? intern_field(lang_key, &entry.lang_key_id) : NULL;
     
     // 获取语言字符串
     const char* template = lang_get(lang_key);
+    char buffer[4096];
     if (!template) {
         // 如果语言键未找到，直接用键名作为消息
-        pthread_mutex_lock(&log_ctx.lock);
-        log_write_internal(level, module, lang_key);
-        pthread_mutex_unlock(&log_ctx.lock);
-        return;
+        entry.message = lang_key;
+    } else {
+        // 格式化消息
+        va_list args;
+        va_start(args, lang_key);
+        vsnprintf(buffer, sizeof(buffer), template, args);
+        va_end(args);
+        entry.message = buffer;
     }
     
-    // 格式化消息
-    va_list args;
-    va_start(args, lang_key);
-    
-    char buffer[4096];
-    vsnprintf(buffer, sizeof(buffer), template, args);
-    
     pthread_mutex_lock(&log_ctx.lock);
-    log_write_internal(level, module, buffer);
+    log_write_internal(level, entry.module, entry.message);
+    log_record_hook_t hook = log_ctx.record_hook;
+    void* hook_data = log_ctx.record_hook_data;
     pthread_mutex_unlock(&log_ctx.lock);
     
-    va_end(args);
+    if (hook && entry.message) {
+        hook(&entry, hook_data);
+    }
 }
 
 // 为兼容头文件定义的API提供别名
@@ -331,20 +631,27 @@ void log_set_console_enabled(int enabled) {
 
 // 修改log_get_level函数使其返回int类型，与头文件一致
 int log_get_level(void) {
-    return (int)log_ctx.level;
+    return (int)current_level();
 }
 
 bool log_is_console_enabled(void) {
-    return log_ctx.console_enabled;
+    return __atomic_load_n(&log_ctx.console_enabled, __ATOMIC_RELAXED);
 }
 
 const char* log_get_file_path(void) {
-    return log_ctx.log_file_path;
+    // 已切换但还没有日志写入时，先换上新文件
+    pthread_mutex_lock(&log_ctx.lock);
+    apply_pending_file();
+    const char* path = log_ctx.log_file_path;
+    pthread_mutex_unlock(&log_ctx.lock);
+    return path;
 }
 
 void log_cleanup(void) {
     pthread_mutex_lock(&log_ctx.lock);
     
+    discard_pending_file();
+    
     // 关闭日志文件
     if (log_ctx.log_file) {
         fclose(log_ctx.log_file);
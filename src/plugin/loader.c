@@ -18,6 +18,7 @@
 #include <sys/stat.h>
 #include <errno.h>
 #include <limits.h>  // 添加limits.h用于INT_MAX定义
+#include <time.h>
 #include <cjson/cJSON.h>
 
 // 兼容性定义：某些系统可能没有定义DT_REG
@@ -28,11 +29,56 @@
 #include "plugin.h"
 #include "log.h"
 #include "lang.h"  // 添加语言模块头文件
+#include "intern.h"
+#include "rules_filter.h"
 #include "generated/config_gen.h"
 
 // 最大插件路径数量
 #define MAX_PLUGIN_PATHS 10
 
+// 异步插件队列默认容量
+#define DEFAULT_ASYNC_QUEUE_SIZE 1024
+
+// 同步批处理插件默认的批次大小和最长累积时间（毫秒）
+#define DEFAULT_BATCH_SIZE 64
+#define DEFAULT_BATCH_INTERVAL_MS 1000
+
+/**
+ * @brief 异步插件的有界队列
+ * 
+ * 每个PLUGIN_MODE_ASYNC插件拥有一个环形队列和一个工作线程，
+ * 日志线程只负责复制条目入队，由工作线程调用插件处理函数
+ */
+typedef struct {
+    log_entry_t* entries;        /**< 环形缓冲区（条目字符串为深拷贝） */
+    size_t capacity;             /**< 队列容量 */
+    size_t head;                 /**< 队首位置 */
+    size_t count;                /**< 当前队列深度 */
+    bool block_when_full;        /**< 队列满时阻塞（true）或丢弃（false） */
+    bool running;                /**< 工作线程是否运行 */
+    unsigned long dropped;       /**< 因队列满而丢弃的条目数 */
+    unsigned long processed;     /**< 已处理的条目数 */
+    pthread_mutex_t lock;        /**< 队列锁 */
+    pthread_cond_t not_empty;    /**< 队列非空条件 */
+    pthread_cond_t not_full;     /**< 队列未满条件 */
+    pthread_t worker;            /**< 工作线程 */
+} plugin_async_queue_t;
+
+/**
+ * @brief 同步批处理插件的累积缓冲
+ * 
+ * 声明了PLUGIN_CAP_BATCH能力的SYNC模式输出插件逐条收到的日志先复制到缓冲中，
+ * 累积到batch_size条，或最早的条目已等待batch_interval_ms毫秒时整批交给插件
+ */
+typedef struct {
+    log_entry_t* entries;        /**< 缓冲区（条目字符串为深拷贝） */
+    size_t capacity;             /**< 批次大小 */
+    size_t count;                /**< 已累积的条目数 */
+    uint64_t interval_ns;        /**< 最长累积时间（纳秒） */
+    uint64_t started_ns;         /**< 第一条条目进入缓冲的时间 */
+    pthread_mutex_t lock;        /**< 缓冲锁，交付期间持有以保证批次顺序 */
+} plugin_batch_t;
+
 /**
  * @brief 插件实例结构
  */
@@ -43,18 +89,60 @@ typedef struct plugin_instance {
     plugin_info_t info;          /**< 插件信息副本 */
     plugin_init_func_t init;     /**< 初始化函数 */
     plugin_process_func_t process; /**< 处理函数 */
+    plugin_process_batch_func_t process_batch; /**< 批处理函数（可选） */
+    plugin_config_changed_func_t config_changed; /**< 配置变化回调（可选） */
     plugin_shutdown_func_t shutdown; /**< 关闭函数 */
     bool enabled;                /**< 是否启用 */
     int order;                   /**< 执行顺序（数字越小优先级越高） */
     cJSON* config;               /**< 插件特定配置 */
+    plugin_async_queue_t* async_queue; /**< 异步队列（仅ASYNC模式的输出/AI插件） */
+    plugin_batch_t* batch;       /**< 累积缓冲（仅声明批处理能力的SYNC模式输出插件） */
+    plugin_stats_t stats;        /**< 处理统计（原子更新，队列字段在查询时填充） */
     struct plugin_instance* next; /**< 链表下一节点 */
 } plugin_instance_t;
 
+/**
+ * @brief 插件配置快照中的一个配置项
+ * 
+ * 配置键在构建快照时驻留为ID，读取时只比较整数；字符串数组预先展开为指针数组
+ */
+typedef struct {
+    uint32_t key_id;             /**< 配置键的驻留ID */
+    const cJSON* value;          /**< 配置值 */
+    const char** array;          /**< 字符串数组元素（值为数组时） */
+    int array_count;             /**< 字符串数组元素数量 */
+} plugin_config_item_t;
+
+/**
+ * @brief 单个插件的配置快照
+ */
+typedef struct {
+    uint32_t name_id;            /**< 插件名称的驻留ID */
+    cJSON* config;               /**< 插件配置节 */
+    plugin_config_item_t* items; /**< 配置项 */
+    size_t count;                /**< 配置项数量 */
+} plugin_config_snapshot_t;
+
+/**
+ * @brief 全部插件的配置快照集合
+ * 
+ * 加载或重新加载配置时构建一次，之后只读。重新加载时整体替换，
+ * 旧集合挂在新集合的retired链上直到插件系统清理，
+ * 之前返回给插件的字符串在插件系统生命周期内保持有效
+ */
+typedef struct plugin_config_set {
+    cJSON* root;                         /**< 插件配置JSON */
+    plugin_config_snapshot_t* plugins;   /**< 各插件的快照 */
+    size_t count;                        /**< 插件数量 */
+    unsigned version;                    /**< 配置版本号，每次重新加载递增 */
+    struct plugin_config_set* retired;   /**< 被替换的旧集合 */
+} plugin_config_set_t;
+
 // 插件系统全局状态
 static struct {
     plugin_instance_t* plugin_list;  /**< 插件链表头 */
     size_t plugin_count;             /**< 已加载插件数量 */
-    pthread_mutex_t lock;            /**< 线程锁 */
+    pthread_rwlock_t lock;           /**< 读写锁：日志分发持读锁，加载/卸载/启停持写锁 */
     char plugin_paths[MAX_PLUGIN_PATHS][256]; /**< 插件目录 */
     int plugin_paths_count;          /**< 插件目录数量 */
     char** enabled_plugins;          /**< 启用的插件列表 */
@@ -63,7 +151,7 @@ static struct {
     int disabled_plugins_count;      /**< 禁用的插件数量 */
     char** ordered_plugins;          /**< 顺序插件列表 */
     int ordered_plugins_count;       /**< 顺序插件数量 */
-    cJSON* plugin_configs;           /**< 插件特定配置 */
+    plugin_config_set_t* config_set; /**< 插件特定配置快照（原子替换） */
     bool initialized;                /**< 是否已初始化 */
 } plugin_ctx = {
     .plugin_list = NULL,
@@ -73,7 +161,7 @@ static struct {
     .enabled_plugins_count = 0,
     .disabled_plugins_count = 0,
     .ordered_plugins_count = 0,
-    .plugin_configs = NULL
+    .config_set = NULL
 };
 
 // 前向声明
@@ -85,6 +173,43 @@ static void free_plugin_config(void);
 static int get_plugin_order(const char* plugin_name);
 static bool is_plugin_enabled(const char* plugin_name);
 static cJSON* get_plugin_specific_config(const char* plugin_name);
+static plugin_config_set_t* build_config_set(const char* json);
+static void free_config_set(plugin_config_set_t* set);
+static bool async_queue_start(plugin_instance_t* plugin);
+static void async_queue_stop(plugin_instance_t* plugin);
+static void async_queue_push(plugin_async_queue_t* queue, const log_entry_t* entry);
+static bool batch_start(plugin_instance_t* plugin);
+static void batch_stop(plugin_instance_t* plugin);
+static void batch_append(plugin_instance_t* plugin, const log_entry_t* entries, size_t count);
+static void batch_flush(plugin_instance_t* plugin);
+static void start_plugin(plugin_instance_t* plugin, const plugin_helpers_t* helpers);
+static size_t load_builtin_plugins(const plugin_helpers_t* helpers);
+static int call_process(plugin_instance_t* plugin, const log_entry_t* entry);
+static int call_process_batch(plugin_instance_t* plugin, const log_entry_t* entries, size_t count);
+
+/**
+ * @brief 内置插件描述
+ */
+typedef struct {
+    const char* name;                /**< 插件名称 */
+    plugin_init_func_t init;         /**< 初始化函数 */
+    plugin_process_func_t process;   /**< 处理函数 */
+    plugin_shutdown_func_t shutdown; /**< 关闭函数 */
+    plugin_info_func_t info;         /**< 信息函数 */
+    plugin_config_changed_func_t config_changed; /**< 配置变化回调 */
+} builtin_plugin_t;
+
+// 随插件系统一起编译的内置插件
+static const builtin_plugin_t builtin_plugins[] = {
+    {
+        RULES_FILTER_PLUGIN_NAME,
+        rules_filter_plugin_init,
+        rules_filter_plugin_process,
+        rules_filter_plugin_shutdown,
+        rules_filter_plugin_info,
+        rules_filter_plugin_init  // 重新编译全部规则
+    }
+};
 
 // 配置辅助函数前向声明
 int plugin_get_config_int(const char* plugin_name, const char* key, int default_value);
@@ -92,6 +217,14 @@ const char* plugin_get_config_string(const char* plugin_name, const char* key, c
 bool plugin_get_config_bool(const char* plugin_name, const char* key, bool default_value);
 int plugin_get_config_string_array(const char* plugin_name, const char* key, const char** values, int max_count);
 
+// 传给插件的辅助函数
+static const plugin_helpers_t config_helpers = {
+    .get_config_int = plugin_get_config_int,
+    .get_config_string = plugin_get_config_string,
+    .get_config_bool = plugin_get_config_bool,
+    .get_config_array = plugin_get_config_string_array
+};
+
 /**
  * @brief 解析插件配置
  * 
@@ -192,9 +325,9 @@ static bool parse_plugin_config(void) {
         }
     }
     
-    // 解析插件特定配置
-    plugin_ctx.plugin_configs = cJSON_Parse(LOGLOOM_PLUGIN_CONFIG_JSON);
-    if (!plugin_ctx.plugin_configs) {
+    // 解析插件特定配置并构建快照
+    plugin_ctx.config_set = build_config_set(LOGLOOM_PLUGIN_CONFIG_JSON);
+    if (!plugin_ctx.config_set) {
         log_warn("PLUGIN", "%s", lang_get("plugin.warning.config_parse_failed"));
     }
     
@@ -243,11 +376,155 @@ static void free_plugin_config(void) {
         plugin_ctx.ordered_plugins_count = 0;
     }
     
-    // 释放插件特定配置
-    if (plugin_ctx.plugin_configs) {
-        cJSON_Delete(plugin_ctx.plugin_configs);
-        plugin_ctx.plugin_configs = NULL;
+    // 释放插件特定配置快照（包括被替换的旧快照）
+    plugin_config_set_t* set = plugin_ctx.config_set;
+    plugin_ctx.config_set = NULL;
+    while (set) {
+        plugin_config_set_t* retired = set->retired;
+        free_config_set(set);
+        set = retired;
+    }
+}
+
+/**
+ * @brief 释放一个配置快照集合（不含retired链）
+ * 
+ * @param set 配置快照集合
+ */
+static void free_config_set(plugin_config_set_t* set) {
+    if (!set) {
+        return;
+    }
+    for (size_t i = 0; i < set->count; i++) {
+        for (size_t j = 0; j < set->plugins[i].count; j++) {
+            free(set->plugins[i].items[j].array);
+        }
+        free(set->plugins[i].items);
     }
+    free(set->plugins);
+    cJSON_Delete(set->root);
+    free(set);
+}
+
+/**
+ * @brief 解析插件配置JSON并构建各插件的配置快照
+ * 
+ * 插件名称和配置键驻留为ID，字符串数组展开为指针数组，
+ * 读取配置时不再遍历JSON树
+ * 
+ * @param json 插件配置JSON（插件名称到配置节的对象）
+ * @return 配置快照集合，解析失败或内存不足时返回NULL
+ */
+static plugin_config_set_t* build_config_set(const char* json) {
+    plugin_config_set_t* set = (plugin_config_set_t*)calloc(1, sizeof(plugin_config_set_t));
+    if (!set) {
+        return NULL;
+    }
+    
+    set->root = cJSON_Parse(json);
+    if (!set->root || !cJSON_IsObject(set->root)) {
+        free_config_set(set);
+        return NULL;
+    }
+    
+    int plugin_count = cJSON_GetArraySize(set->root);
+    set->plugins = (plugin_config_snapshot_t*)calloc(plugin_count > 0 ? plugin_count : 1,
+                                                     sizeof(plugin_config_snapshot_t));
+    if (!set->plugins) {
+        free_config_set(set);
+        return NULL;
+    }
+    
+    cJSON* config = NULL;
+    cJSON_ArrayForEach(config, set->root) {
+        if (!cJSON_IsObject(config) || !config->string) {
+            continue;
+        }
+        
+        plugin_config_snapshot_t* snapshot = &set->plugins[set->count];
+        snapshot->name_id = intern_string(config->string);
+        snapshot->config = config;
+        if (!snapshot->name_id) {
+            continue;
+        }
+        set->count++;
+        
+        int item_count = cJSON_GetArraySize(config);
+        if (item_count <= 0) {
+            continue;
+        }
+        snapshot->items = (plugin_config_item_t*)calloc(item_count, sizeof(plugin_config_item_t));
+        if (!snapshot->items) {
+            free_config_set(set);
+            return NULL;
+        }
+        
+        cJSON* value = NULL;
+        cJSON_ArrayForEach(value, config) {
+            plugin_config_item_t* item = &snapshot->items[snapshot->count];
+            item->key_id = value->string ? intern_string(value->string) : 0;
+            item->value = value;
+            if (!item->key_id) {
+                continue;
+            }
+            snapshot->count++;
+            
+            int size = cJSON_IsArray(value) ? cJSON_GetArraySize(value) : 0;
+            if (size <= 0) {
+                continue;
+            }
+            item->array = (const char**)calloc(size, sizeof(const char*));
+            if (!item->array) {
+                free_config_set(set);
+                return NULL;
+            }
+            cJSON* element = NULL;
+            cJSON_ArrayForEach(element, value) {
+                if (cJSON_IsString(element) && element->valuestring) {
+                    item->array[item->array_count++] = element->valuestring;
+                }
+            }
+        }
+    }
+    
+    return set;
+}
+
+/**
+ * @brief 在当前配置快照中查找插件的配置项
+ * 
+ * 插件名称和配置键按驻留ID查找，同一调用点重复传入同一字符串常量时
+ * 由驻留表的线程本地缓存直接命中，无需加锁
+ * 
+ * @param plugin_name 插件名称
+ * @param key 配置键
+ * @return 配置项，未找到返回NULL
+ */
+static const plugin_config_item_t* find_config_item(const char* plugin_name, const char* key) {
+    const plugin_config_set_t* set = __atomic_load_n(&plugin_ctx.config_set, __ATOMIC_ACQUIRE);
+    if (!set || !plugin_name || !key) {
+        return NULL;
+    }
+    
+    uint32_t name_id = intern_lookup(plugin_name);
+    uint32_t key_id = intern_lookup(key);
+    if (!name_id || !key_id) {
+        return NULL;
+    }
+    
+    for (size_t i = 0; i < set->count; i++) {
+        const plugin_config_snapshot_t* snapshot = &set->plugins[i];
+        if (snapshot->name_id != name_id) {
+            continue;
+        }
+        for (size_t j = 0; j < snapshot->count; j++) {
+            if (snapshot->items[j].key_id == key_id) {
+                return &snapshot->items[j];
+            }
+        }
+        return NULL;
+    }
+    return NULL;
 }
 
 /**
@@ -301,11 +578,11 @@ static bool is_plugin_enabled(const char* plugin_name) {
  * @return 插件配置对象，如果未找到则返回NULL
  */
 static cJSON* get_plugin_specific_config(const char* plugin_name) {
-    if (!plugin_ctx.plugin_configs) {
+    if (!plugin_ctx.config_set) {
         return NULL;
     }
     
-    return cJSON_GetObjectItem(plugin_ctx.plugin_configs, plugin_name);
+    return cJSON_GetObjectItem(plugin_ctx.config_set->root, plugin_name);
 }
 
 /**
@@ -321,7 +598,7 @@ int plugin_system_init(const char* plugin_dir) {
     }
     
     // 初始化互斥锁
-    if (pthread_mutex_init(&plugin_ctx.lock, NULL) != 0) {
+    if (pthread_rwlock_init(&plugin_ctx.lock, NULL) != 0) {
         char* msg = lang_getf("plugin.error.mutex_init_failed", strerror(errno));
         log_error("PLUGIN", "%s", msg);
         free(msg);
@@ -491,6 +768,12 @@ static bool load_plugin_symbols(plugin_instance_t* plugin) {
         return false;
     }
     
+    // 加载批处理函数（可选）
+    plugin->process_batch = (plugin_process_batch_func_t)dlsym(plugin->handle, "plugin_process_batch");
+    
+    // 加载配置变化回调（可选）
+    plugin->config_changed = (plugin_config_changed_func_t)dlsym(plugin->handle, "plugin_config_changed");
+    
     // 加载关闭函数（必需）
     plugin->shutdown = (plugin_shutdown_func_t)dlsym(plugin->handle, "plugin_shutdown");
     if (!plugin->shutdown) {
@@ -526,13 +809,8 @@ size_t plugin_scan_and_load(void) {
     
     size_t loaded_count = 0;
     
-    // 创建插件辅助函数结构体
-    plugin_helpers_t helpers = {
-        .get_config_int = plugin_get_config_int,
-        .get_config_string = plugin_get_config_string,
-        .get_config_bool = plugin_get_config_bool,
-        .get_config_array = plugin_get_config_string_array
-    };
+    // 先注册内置插件
+    loaded_count += load_builtin_plugins(&config_helpers);
     
     // 遍历所有配置的插件目录
     for (int dir_idx = 0; dir_idx < plugin_ctx.plugin_paths_count; dir_idx++) {
@@ -564,14 +842,14 @@ size_t plugin_scan_and_load(void) {
                      plugin_ctx.plugin_paths[dir_idx], entry->d_name);
             
             // 加载插件
-            pthread_mutex_lock(&plugin_ctx.lock);
+            pthread_rwlock_wrlock(&plugin_ctx.lock);
             
             // 检查插件是否已加载
             if (find_plugin_by_name(entry->d_name)) {
                 char* msg = lang_getf("plugin.warning.already_loaded", entry->d_name);
                 log_warn("PLUGIN", "%s", msg);
                 free(msg);
-                pthread_mutex_unlock(&plugin_ctx.lock);
+                pthread_rwlock_unlock(&plugin_ctx.lock);
                 continue;
             }
             
@@ -584,21 +862,10 @@ size_t plugin_scan_and_load(void) {
                 loaded_count++;
                 
                 // 初始化插件，传递辅助函数
-                int init_result = plugin->init(&helpers);
-                if (init_result != 0) {
-                    char* msg = lang_getf("plugin.error.init_failed", 
-                              plugin->name, init_result);
-                    log_error("PLUGIN", "%s", msg);
-                    free(msg);
-                    plugin->enabled = false;
-                } else {
-                    char* msg = lang_getf("plugin.info.init_success", plugin->name);
-                    log_info("PLUGIN", "%s", msg);
-                    free(msg);
-                }
+                start_plugin(plugin, &config_helpers);
             }
             
-            pthread_mutex_unlock(&plugin_ctx.lock);
+            pthread_rwlock_unlock(&plugin_ctx.lock);
         }
         
         closedir(dir);
@@ -610,6 +877,108 @@ size_t plugin_scan_and_load(void) {
     return loaded_count;
 }
 
+/**
+ * @brief 初始化已加入插件列表的插件（调用方需持有写锁）
+ * 
+ * 初始化失败的插件保持加载但被禁用；异步模式的输出/AI插件在此启动工作线程
+ * 
+ * @param plugin 插件实例
+ * @param helpers 插件辅助函数结构体
+ */
+static void start_plugin(plugin_instance_t* plugin, const plugin_helpers_t* helpers) {
+    int init_result = plugin->init(helpers);
+    if (init_result != 0) {
+        char* msg = lang_getf("plugin.error.init_failed", plugin->name, init_result);
+        log_error("PLUGIN", "%s", msg);
+        free(msg);
+        plugin->enabled = false;
+        return;
+    }
+    
+    char* msg = lang_getf("plugin.info.init_success", plugin->name);
+    log_info("PLUGIN", "%s", msg);
+    free(msg);
+    
+    // 异步模式的输出/AI插件交由独立工作线程处理
+    if (plugin->info.mode == PLUGIN_MODE_ASYNC &&
+        (plugin->info.type == PLUGIN_TYPE_SINK || plugin->info.type == PLUGIN_TYPE_AI) &&
+        !async_queue_start(plugin)) {
+        msg = lang_getf("plugin.error.async_worker_failed", plugin->name);
+        log_error("PLUGIN", "%s", msg);
+        free(msg);
+        plugin->enabled = false;
+    }
+    
+    // 同步模式的批处理输出插件先累积再整批交付，缓冲分配失败时退回逐条处理
+    if (plugin->enabled && plugin->info.mode != PLUGIN_MODE_ASYNC) {
+        batch_start(plugin);
+    }
+}
+
+/**
+ * @brief 注册内置插件
+ * 
+ * 内置插件只有在插件配置中存在对应配置节且未被禁用时才会注册
+ * 
+ * @param helpers 插件辅助函数结构体
+ * @return 注册的插件数量
+ */
+static size_t load_builtin_plugins(const plugin_helpers_t* helpers) {
+    size_t loaded_count = 0;
+    
+    for (size_t i = 0; i < sizeof(builtin_plugins) / sizeof(builtin_plugins[0]); i++) {
+        const builtin_plugin_t* builtin = &builtin_plugins[i];
+        if (!get_plugin_specific_config(builtin->name) || !is_plugin_enabled(builtin->name)) {
+            continue;
+        }
+        
+        pthread_rwlock_wrlock(&plugin_ctx.lock);
+        
+        if (find_plugin_by_name(builtin->name)) {
+            pthread_rwlock_unlock(&plugin_ctx.lock);
+            continue;
+        }
+        
+        plugin_instance_t* plugin = (plugin_instance_t*)calloc(1, sizeof(plugin_instance_t));
+        if (!plugin) {
+            char* msg = lang_getf("plugin.error.memory_allocation_failed", builtin->name);
+            log_error("PLUGIN", "%s", msg);
+            free(msg);
+            pthread_rwlock_unlock(&plugin_ctx.lock);
+            continue;
+        }
+        
+        const plugin_info_t* info = builtin->info();
+        strncpy(plugin->name, builtin->name, sizeof(plugin->name) - 1);
+        strncpy(plugin->path, "<builtin>", sizeof(plugin->path) - 1);
+        plugin->init = builtin->init;
+        plugin->process = builtin->process;
+        plugin->shutdown = builtin->shutdown;
+        plugin->config_changed = builtin->config_changed;
+        plugin->info.name = strdup(info->name);
+        plugin->info.version = strdup(info->version);
+        plugin->info.author = strdup(info->author);
+        plugin->info.type = info->type;
+        plugin->info.mode = info->mode;
+        plugin->info.capabilities = info->capabilities;
+        plugin->info.description = strdup(info->description);
+        plugin->order = get_plugin_order(plugin->name);
+        plugin->config = get_plugin_specific_config(plugin->name);
+        plugin->enabled = true;
+        
+        plugin->next = plugin_ctx.plugin_list;
+        plugin_ctx.plugin_list = plugin;
+        plugin_ctx.plugin_count++;
+        loaded_count++;
+        
+        start_plugin(plugin, helpers);
+        
+        pthread_rwlock_unlock(&plugin_ctx.lock);
+    }
+    
+    return loaded_count;
+}
+
 /**
  * @brief 通过名称查找插件
  * 
@@ -635,12 +1004,16 @@ void plugin_unload_all(void) {
         return;
     }
     
-    pthread_mutex_lock(&plugin_ctx.lock);
+    pthread_rwlock_wrlock(&plugin_ctx.lock);
     
     plugin_instance_t* current = plugin_ctx.plugin_list;
     while (current) {
         plugin_instance_t* next = current->next;
         
+        // 先处理完异步队列和累积缓冲中剩余的条目
+        async_queue_stop(current);
+        batch_stop(current);
+        
         // 调用关闭函数
         if (current->enabled && current->shutdown) {
             char* msg = lang_getf("plugin.info.shutting_down", current->name);
@@ -668,7 +1041,7 @@ void plugin_unload_all(void) {
     plugin_ctx.plugin_list = NULL;
     plugin_ctx.plugin_count = 0;
     
-    pthread_mutex_unlock(&plugin_ctx.lock);
+    pthread_rwlock_unlock(&plugin_ctx.lock);
     log_info("PLUGIN", "%s", lang_get("plugin.info.all_plugins_unloaded"));
 }
 
@@ -684,26 +1057,118 @@ bool plugin_set_enabled(const char* name, bool enabled) {
         return false;
     }
     
-    pthread_mutex_lock(&plugin_ctx.lock);
+    pthread_rwlock_wrlock(&plugin_ctx.lock);
     
     plugin_instance_t* plugin = find_plugin_by_name(name);
     if (!plugin) {
-        pthread_mutex_unlock(&plugin_ctx.lock);
+        pthread_rwlock_unlock(&plugin_ctx.lock);
         char* msg = lang_getf("plugin.error.plugin_not_found", name);
         log_error("PLUGIN", "%s", msg);
         free(msg);
         return false;
     }
     
+    // 禁用前交付已累积的条目，避免它们滞留到重新启用或卸载时
+    if (!enabled && plugin->enabled && plugin->batch) {
+        batch_flush(plugin);
+    }
     plugin->enabled = enabled;
     
-    pthread_mutex_unlock(&plugin_ctx.lock);
+    pthread_rwlock_unlock(&plugin_ctx.lock);
     char* msg = lang_getf("plugin.info.plugin_state_changed", name, enabled ? lang_get("plugin.enabled") : lang_get("plugin.disabled"));
     log_info("PLUGIN", "%s", msg);
     free(msg);
     return true;
 }
 
+// 延迟直方图各桶上界（微秒）
+static const uint64_t stats_bucket_bounds_us[PLUGIN_STATS_BUCKETS - 1] = PLUGIN_STATS_BUCKET_BOUNDS_US;
+
+/**
+ * @brief 获取单调时钟的当前时间（纳秒）
+ */
+static uint64_t monotonic_ns(void) {
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return (uint64_t)ts.tv_sec * 1000000000ULL + (uint64_t)ts.tv_nsec;
+}
+
+/**
+ * @brief 记录一次插件处理调用
+ * 
+ * 同步插件可能被多个日志线程并发调用，计数器使用原子操作更新
+ * 
+ * @param plugin 插件实例
+ * @param elapsed_ns 调用耗时（纳秒）
+ * @param entries 本次处理的条目数
+ * @param result 处理函数的返回值
+ */
+static void stats_record(plugin_instance_t* plugin, uint64_t elapsed_ns, size_t entries, int result) {
+    plugin_stats_t* stats = &plugin->stats;
+    
+    size_t bucket = 0;
+    while (bucket < PLUGIN_STATS_BUCKETS - 1 && elapsed_ns > stats_bucket_bounds_us[bucket] * 1000) {
+        bucket++;
+    }
+    
+    __atomic_fetch_add(&stats->calls, 1, __ATOMIC_RELAXED);
+    __atomic_fetch_add(&stats->entries, (unsigned long)entries, __ATOMIC_RELAXED);
+    __atomic_fetch_add(&stats->total_ns, elapsed_ns, __ATOMIC_RELAXED);
+    __atomic_fetch_add(&stats->histogram[bucket], 1, __ATOMIC_RELAXED);
+    if (result == PLUGIN_RESULT_ERROR) {
+        __atomic_fetch_add(&stats->errors, 1, __ATOMIC_RELAXED);
+    }
+    
+    uint64_t max = __atomic_load_n(&stats->max_ns, __ATOMIC_RELAXED);
+    while (elapsed_ns > max &&
+           !__atomic_compare_exchange_n(&stats->max_ns, &max, elapsed_ns, true,
+                                        __ATOMIC_RELAXED, __ATOMIC_RELAXED)) {
+    }
+}
+
+/**
+ * @brief 调用插件处理函数并记录统计
+ */
+static int call_process(plugin_instance_t* plugin, const log_entry_t* entry) {
+    uint64_t start = monotonic_ns();
+    int result = plugin->process(entry);
+    stats_record(plugin, monotonic_ns() - start, 1, result);
+    return result;
+}
+
+/**
+ * @brief 调用插件批处理函数并记录统计
+ */
+static int call_process_batch(plugin_instance_t* plugin, const log_entry_t* entries, size_t count) {
+    uint64_t start = monotonic_ns();
+    int result = plugin->process_batch(entries, count);
+    stats_record(plugin, monotonic_ns() - start, count, result);
+    return result;
+}
+
+/**
+ * @brief 补齐条目中模块名称和语言键的驻留ID
+ * 
+ * 插件按ID匹配模块，调用方直接构造的条目可能没有设置ID
+ * 
+ * @param entry 日志条目
+ * @param local 需要补齐时使用的副本
+ * @return ID已齐全时返回entry本身，否则返回填充后的local
+ */
+static const log_entry_t* intern_entry(const log_entry_t* entry, log_entry_t* local) {
+    if ((entry->module_id || !entry->module) && (entry->lang_key_id || !entry->lang_key)) {
+        return entry;
+    }
+    *local = *entry;
+    if (!local->module_id) {
+        local->module_id = intern_string(local->module);
+    }
+    if (!local->lang_key_id) {
+        local->lang_key_id = intern_string(local->lang_key);
+    }
+    return local;
+}
+
 /**
  * @brief 调用所有启用的过滤器插件处理日志条目
  * 
@@ -716,8 +1181,10 @@ bool plugin_filter_log(const log_entry_t* entry) {
     }
     
     bool should_pass = true;
+    log_entry_t local;
+    entry = intern_entry(entry, &local);
     
-    pthread_mutex_lock(&plugin_ctx.lock);
+    pthread_rwlock_rdlock(&plugin_ctx.lock);
     
     plugin_instance_t* current = plugin_ctx.plugin_list;
     while (current) {
@@ -726,9 +1193,10 @@ bool plugin_filter_log(const log_entry_t* entry) {
             current->info.type == PLUGIN_TYPE_FILTER && 
             current->process) {
             
-            int result = current->process(entry);
+            int result = call_process(current, entry);
             if (result != PLUGIN_RESULT_OK) {
                 // 过滤器插件要求过滤
+                __atomic_fetch_add(&current->stats.filtered, 1, __ATOMIC_RELAXED);
                 should_pass = false;
                 break;
             }
@@ -736,7 +1204,7 @@ bool plugin_filter_log(const log_entry_t* entry) {
         current = current->next;
     }
     
-    pthread_mutex_unlock(&plugin_ctx.lock);
+    pthread_rwlock_unlock(&plugin_ctx.lock);
     return should_pass;
 }
 
@@ -750,7 +1218,9 @@ void plugin_sink_log(const log_entry_t* entry) {
         return;
     }
     
-    pthread_mutex_lock(&plugin_ctx.lock);
+    log_entry_t local;
+    entry = intern_entry(entry, &local);
+    pthread_rwlock_rdlock(&plugin_ctx.lock);
     
     plugin_instance_t* current = plugin_ctx.plugin_list;
     while (current) {
@@ -759,12 +1229,483 @@ void plugin_sink_log(const log_entry_t* entry) {
             current->info.type == PLUGIN_TYPE_SINK && 
             current->process) {
             
-            current->process(entry);
+            if (current->async_queue) {
+                async_queue_push(current->async_queue, entry);
+            } else if (current->batch) {
+                batch_append(current, entry, 1);
+            } else {
+                call_process(current, entry);
+            }
         }
         current = current->next;
     }
     
-    pthread_mutex_unlock(&plugin_ctx.lock);
+    pthread_rwlock_unlock(&plugin_ctx.lock);
+}
+
+/**
+ * @brief 调用所有启用的输出插件批量处理日志条目
+ * 
+ * 异步插件逐条入队；同步批处理插件将整组条目追加到累积缓冲，
+ * 与plugin_sink_log送入的条目按相同的阈值交付；其余插件逐条处理
+ * 
+ * @param entries 日志条目数组
+ * @param count 条目数量
+ */
+void plugin_sink_log_batch(const log_entry_t* entries, size_t count) {
+    if (!plugin_ctx.initialized || !entries || count == 0) {
+        return;
+    }
+    
+    pthread_rwlock_rdlock(&plugin_ctx.lock);
+    
+    plugin_instance_t* current = plugin_ctx.plugin_list;
+    while (current) {
+        if (current->enabled && current->info.type == PLUGIN_TYPE_SINK) {
+            if (current->async_queue) {
+                for (size_t i = 0; i < count; i++) {
+                    async_queue_push(current->async_queue, &entries[i]);
+                }
+            } else if (current->batch) {
+                batch_append(current, entries, count);
+            } else if (current->process) {
+                for (size_t i = 0; i < count; i++) {
+                    call_process(current, &entries[i]);
+                }
+            }
+        }
+        current = current->next;
+    }
+    
+    pthread_rwlock_unlock(&plugin_ctx.lock);
+}
+
+/**
+ * @brief 释放队列条目中复制的字符串（驻留的模块名称和语言键不需要释放）
+ */
+static void async_entry_free(log_entry_t* entry) {
+    if (!entry->module_id) {
+        free((void*)entry->module);
+    }
+    free((void*)entry->message);
+    if (!entry->lang_key_id) {
+        free((void*)entry->lang_key);
+    }
+    memset(entry, 0, sizeof(log_entry_t));
+}
+
+/**
+ * @brief 取得队列条目中的模块名称或语言键：已驻留时直接引用，否则复制
+ * 
+ * @param str 字符串
+ * @param id 输入为条目中的驻留ID，为0时尝试驻留，输出最终的ID
+ * @return 驻留字符串或复制的字符串
+ */
+static const char* async_entry_field(const char* str, uint32_t* id) {
+    if (!str) {
+        *id = 0;
+        return NULL;
+    }
+    if (!*id) {
+        *id = intern_string(str);
+    }
+    const char* interned = intern_get_string(*id);
+    if (interned) {
+        return interned;
+    }
+    *id = 0;
+    return strdup(str);
+}
+
+/**
+ * @brief 深拷贝日志条目（异步队列和累积缓冲共用，用async_entry_free释放）
+ * 
+ * @param slot 目标条目
+ * @param entry 源条目
+ */
+static void async_entry_copy(log_entry_t* slot, const log_entry_t* entry) {
+    slot->timestamp = entry->timestamp;
+    slot->level = entry->level;
+    slot->module_id = entry->module_id;
+    slot->module = async_entry_field(entry->module, &slot->module_id);
+    slot->message = entry->message ? strdup(entry->message) : NULL;
+    slot->lang_key_id = entry->lang_key_id;
+    slot->lang_key = async_entry_field(entry->lang_key, &slot->lang_key_id);
+}
+
+/**
+ * @brief 异步插件工作线程
+ * 
+ * 每次取出队列中全部待处理条目，在队列锁外调用插件处理函数；
+ * 声明了批处理能力的插件一次性接收整批条目
+ */
+static void* async_queue_worker(void* arg) {
+    plugin_instance_t* plugin = (plugin_instance_t*)arg;
+    plugin_async_queue_t* queue = plugin->async_queue;
+    log_entry_t* batch = (log_entry_t*)calloc(queue->capacity, sizeof(log_entry_t));
+    if (!batch) {
+        // 无法处理任何条目，停止接收新条目
+        pthread_mutex_lock(&queue->lock);
+        queue->running = false;
+        pthread_cond_broadcast(&queue->not_full);
+        pthread_mutex_unlock(&queue->lock);
+        return NULL;
+    }
+    
+    pthread_mutex_lock(&queue->lock);
+    while (true) {
+        while (queue->count == 0 && queue->running) {
+            pthread_cond_wait(&queue->not_empty, &queue->lock);
+        }
+        if (queue->count == 0) {
+            break;  // 已停止且队列为空
+        }
+        
+        // 取出全部条目，腾出队列空间
+        size_t taken = queue->count;
+        for (size_t i = 0; i < taken; i++) {
+            batch[i] = queue->entries[(queue->head + i) % queue->capacity];
+        }
+        queue->head = (queue->head + taken) % queue->capacity;
+        queue->count = 0;
+        pthread_cond_broadcast(&queue->not_full);
+        pthread_mutex_unlock(&queue->lock);
+        
+        if (plugin->process_batch && (plugin->info.capabilities & PLUGIN_CAP_BATCH)) {
+            call_process_batch(plugin, batch, taken);
+        } else {
+            for (size_t i = 0; i < taken; i++) {
+                call_process(plugin, &batch[i]);
+            }
+        }
+        for (size_t i = 0; i < taken; i++) {
+            async_entry_free(&batch[i]);
+        }
+        
+        pthread_mutex_lock(&queue->lock);
+        queue->processed += taken;
+    }
+    pthread_mutex_unlock(&queue->lock);
+    
+    free(batch);
+    return NULL;
+}
+
+/**
+ * @brief 为异步插件创建队列并启动工作线程
+ * 
+ * 队列容量和满队列策略分别读取插件配置中的queue_size和queue_policy（"drop"或"block"）
+ * 
+ * @param plugin 插件实例
+ * @return 成功返回true，失败返回false
+ */
+static bool async_queue_start(plugin_instance_t* plugin) {
+    int capacity = plugin_get_config_int(plugin->name, "queue_size", DEFAULT_ASYNC_QUEUE_SIZE);
+    const char* policy = plugin_get_config_string(plugin->name, "queue_policy", "drop");
+    if (capacity <= 0) {
+        capacity = DEFAULT_ASYNC_QUEUE_SIZE;
+    }
+    
+    plugin_async_queue_t* queue = (plugin_async_queue_t*)calloc(1, sizeof(plugin_async_queue_t));
+    if (!queue) {
+        return false;
+    }
+    queue->entries = (log_entry_t*)calloc((size_t)capacity, sizeof(log_entry_t));
+    if (!queue->entries) {
+        free(queue);
+        return false;
+    }
+    queue->capacity = (size_t)capacity;
+    queue->block_when_full = strcmp(policy, "block") == 0;
+    queue->running = true;
+    pthread_mutex_init(&queue->lock, NULL);
+    pthread_cond_init(&queue->not_empty, NULL);
+    pthread_cond_init(&queue->not_full, NULL);
+    
+    plugin->async_queue = queue;
+    if (pthread_create(&queue->worker, NULL, async_queue_worker, plugin) != 0) {
+        plugin->async_queue = NULL;
+        pthread_cond_destroy(&queue->not_full);
+        pthread_cond_destroy(&queue->not_empty);
+        pthread_mutex_destroy(&queue->lock);
+        free(queue->entries);
+        free(queue);
+        return false;
+    }
+    return true;
+}
+
+/**
+ * @brief 停止异步插件的工作线程
+ * 
+ * 工作线程处理完队列中剩余的条目后退出
+ * 
+ * @param plugin 插件实例
+ */
+static void async_queue_stop(plugin_instance_t* plugin) {
+    plugin_async_queue_t* queue = plugin->async_queue;
+    if (!queue) {
+        return;
+    }
+    
+    pthread_mutex_lock(&queue->lock);
+    queue->running = false;
+    pthread_cond_broadcast(&queue->not_empty);
+    pthread_cond_broadcast(&queue->not_full);
+    pthread_mutex_unlock(&queue->lock);
+    pthread_join(queue->worker, NULL);
+    
+    // 工作线程分配缓冲失败提前退出时可能遗留条目
+    for (size_t i = 0; i < queue->count; i++) {
+        async_entry_free(&queue->entries[(queue->head + i) % queue->capacity]);
+    }
+    
+    pthread_cond_destroy(&queue->not_full);
+    pthread_cond_destroy(&queue->not_empty);
+    pthread_mutex_destroy(&queue->lock);
+    free(queue->entries);
+    free(queue);
+    plugin->async_queue = NULL;
+}
+
+/**
+ * @brief 复制日志条目并放入异步队列
+ * 
+ * 队列已满时按策略阻塞等待或丢弃条目
+ * 
+ * @param queue 异步队列
+ * @param entry 日志条目
+ */
+static void async_queue_push(plugin_async_queue_t* queue, const log_entry_t* entry) {
+    pthread_mutex_lock(&queue->lock);
+    
+    while (queue->count == queue->capacity && queue->block_when_full && queue->running) {
+        pthread_cond_wait(&queue->not_full, &queue->lock);
+    }
+    if (queue->count == queue->capacity || !queue->running) {
+        queue->dropped++;
+        pthread_mutex_unlock(&queue->lock);
+        return;
+    }
+    
+    async_entry_copy(&queue->entries[(queue->head + queue->count) % queue->capacity], entry);
+    queue->count++;
+    
+    pthread_cond_signal(&queue->not_empty);
+    pthread_mutex_unlock(&queue->lock);
+}
+
+/**
+ * @brief 为同步批处理插件创建累积缓冲
+ * 
+ * 只对声明了PLUGIN_CAP_BATCH能力并导出plugin_process_batch的输出插件生效。
+ * 批次大小和最长累积时间分别读取插件配置中的batch_size和batch_interval_ms，
+ * batch_size不大于1时不累积
+ * 
+ * @param plugin 插件实例
+ * @return 创建了缓冲返回true，否则返回false
+ */
+static bool batch_start(plugin_instance_t* plugin) {
+    if (plugin->info.type != PLUGIN_TYPE_SINK || !plugin->process_batch ||
+        !(plugin->info.capabilities & PLUGIN_CAP_BATCH)) {
+        return false;
+    }
+    
+    int size = plugin_get_config_int(plugin->name, "batch_size", DEFAULT_BATCH_SIZE);
+    int interval_ms = plugin_get_config_int(plugin->name, "batch_interval_ms", DEFAULT_BATCH_INTERVAL_MS);
+    if (size <= 1) {
+        return false;
+    }
+    if (interval_ms < 0) {
+        interval_ms = DEFAULT_BATCH_INTERVAL_MS;
+    }
+    
+    plugin_batch_t* batch = (plugin_batch_t*)calloc(1, sizeof(plugin_batch_t));
+    if (!batch) {
+        return false;
+    }
+    batch->entries = (log_entry_t*)calloc((size_t)size, sizeof(log_entry_t));
+    if (!batch->entries) {
+        free(batch);
+        return false;
+    }
+    batch->capacity = (size_t)size;
+    batch->interval_ns = (uint64_t)interval_ms * 1000000ULL;
+    pthread_mutex_init(&batch->lock, NULL);
+    plugin->batch = batch;
+    return true;
+}
+
+/**
+ * @brief 将累积的条目整批交给插件（调用方持有缓冲锁）
+ */
+static void batch_deliver_locked(plugin_instance_t* plugin) {
+    plugin_batch_t* batch = plugin->batch;
+    if (batch->count == 0) {
+        return;
+    }
+    call_process_batch(plugin, batch->entries, batch->count);
+    for (size_t i = 0; i < batch->count; i++) {
+        async_entry_free(&batch->entries[i]);
+    }
+    batch->count = 0;
+}
+
+/**
+ * @brief 复制条目到累积缓冲，达到批次大小或最长累积时间时交付
+ * 
+ * 没有定时线程，最长累积时间在下一次追加或plugin_flush_batches时检查
+ * 
+ * @param plugin 插件实例
+ * @param entries 日志条目数组
+ * @param count 条目数量
+ */
+static void batch_append(plugin_instance_t* plugin, const log_entry_t* entries, size_t count) {
+    plugin_batch_t* batch = plugin->batch;
+    pthread_mutex_lock(&batch->lock);
+    
+    for (size_t i = 0; i < count; i++) {
+        if (batch->count == 0) {
+            batch->started_ns = monotonic_ns();
+        }
+        async_entry_copy(&batch->entries[batch->count++], &entries[i]);
+        if (batch->count == batch->capacity) {
+            batch_deliver_locked(plugin);
+        }
+    }
+    if (batch->count > 0 && monotonic_ns() - batch->started_ns >= batch->interval_ns) {
+        batch_deliver_locked(plugin);
+    }
+    
+    pthread_mutex_unlock(&batch->lock);
+}
+
+/**
+ * @brief 交付累积缓冲中的全部条目
+ * 
+ * @param plugin 插件实例
+ */
+static void batch_flush(plugin_instance_t* plugin) {
+    plugin_batch_t* batch = plugin->batch;
+    if (!batch) {
+        return;
+    }
+    pthread_mutex_lock(&batch->lock);
+    batch_deliver_locked(plugin);
+    pthread_mutex_unlock(&batch->lock);
+}
+
+/**
+ * @brief 交付剩余条目并释放累积缓冲
+ * 
+ * @param plugin 插件实例
+ */
+static void batch_stop(plugin_instance_t* plugin) {
+    plugin_batch_t* batch = plugin->batch;
+    if (!batch) {
+        return;
+    }
+    if (plugin->enabled) {
+        batch_flush(plugin);
+    }
+    for (size_t i = 0; i < batch->count; i++) {
+        async_entry_free(&batch->entries[i]);
+    }
+    pthread_mutex_destroy(&batch->lock);
+    free(batch->entries);
+    free(batch);
+    plugin->batch = NULL;
+}
+
+/**
+ * @brief 交付所有同步批处理插件已累积的条目
+ * 
+ * 累积缓冲没有定时线程，日志稀疏的应用可定期调用，
+ * 使条目不会在缓冲中停留远超batch_interval_ms
+ */
+void plugin_flush_batches(void) {
+    if (!plugin_ctx.initialized) {
+        return;
+    }
+    
+    pthread_rwlock_rdlock(&plugin_ctx.lock);
+    for (plugin_instance_t* current = plugin_ctx.plugin_list; current; current = current->next) {
+        if (current->enabled && current->batch) {
+            batch_flush(current);
+        }
+    }
+    pthread_rwlock_unlock(&plugin_ctx.lock);
+}
+
+/**
+ * @brief 获取异步插件的队列统计
+ * 
+ * @param name 插件名称
+ * @param depth 输出当前队列深度（可为NULL）
+ * @param capacity 输出队列容量（可为NULL）
+ * @param dropped 输出已丢弃的条目数（可为NULL）
+ * @return 插件存在且为异步模式返回true，否则返回false
+ */
+bool plugin_get_queue_stats(const char* name, size_t* depth, size_t* capacity, unsigned long* dropped) {
+    if (!plugin_ctx.initialized || !name) {
+        return false;
+    }
+    
+    pthread_rwlock_rdlock(&plugin_ctx.lock);
+    
+    plugin_instance_t* plugin = find_plugin_by_name(name);
+    plugin_async_queue_t* queue = plugin ? plugin->async_queue : NULL;
+    if (queue) {
+        pthread_mutex_lock(&queue->lock);
+        if (depth) *depth = queue->count;
+        if (capacity) *capacity = queue->capacity;
+        if (dropped) *dropped = queue->dropped;
+        pthread_mutex_unlock(&queue->lock);
+    }
+    
+    pthread_rwlock_unlock(&plugin_ctx.lock);
+    return queue != NULL;
+}
+
+/**
+ * @brief 获取插件处理统计
+ * 
+ * @param name 插件名称
+ * @param stats 输出统计信息
+ * @return 插件存在返回true，否则返回false
+ */
+bool plugin_get_stats(const char* name, plugin_stats_t* stats) {
+    if (!plugin_ctx.initialized || !name || !stats) {
+        return false;
+    }
+    
+    pthread_rwlock_rdlock(&plugin_ctx.lock);
+    
+    plugin_instance_t* plugin = find_plugin_by_name(name);
+    if (plugin) {
+        plugin_stats_t* src = &plugin->stats;
+        memset(stats, 0, sizeof(plugin_stats_t));
+        stats->calls = __atomic_load_n(&src->calls, __ATOMIC_RELAXED);
+        stats->entries = __atomic_load_n(&src->entries, __ATOMIC_RELAXED);
+        stats->errors = __atomic_load_n(&src->errors, __ATOMIC_RELAXED);
+        stats->filtered = __atomic_load_n(&src->filtered, __ATOMIC_RELAXED);
+        stats->total_ns = __atomic_load_n(&src->total_ns, __ATOMIC_RELAXED);
+        stats->max_ns = __atomic_load_n(&src->max_ns, __ATOMIC_RELAXED);
+        for (size_t i = 0; i < PLUGIN_STATS_BUCKETS; i++) {
+            stats->histogram[i] = __atomic_load_n(&src->histogram[i], __ATOMIC_RELAXED);
+        }
+        
+        plugin_async_queue_t* queue = plugin->async_queue;
+        if (queue) {
+            pthread_mutex_lock(&queue->lock);
+            stats->queue_depth = queue->count;
+            stats->dropped = queue->dropped;
+            pthread_mutex_unlock(&queue->lock);
+        }
+    }
+    
+    pthread_rwlock_unlock(&plugin_ctx.lock);
+    return plugin != NULL;
 }
 
 /**
@@ -777,7 +1718,9 @@ void plugin_ai_process(const log_entry_t* entry) {
         return;
     }
     
-    pthread_mutex_lock(&plugin_ctx.lock);
+    log_entry_t local;
+    entry = intern_entry(entry, &local);
+    pthread_rwlock_rdlock(&plugin_ctx.lock);
     
     plugin_instance_t* current = plugin_ctx.plugin_list;
     while (current) {
@@ -786,12 +1729,16 @@ void plugin_ai_process(const log_entry_t* entry) {
             current->info.type == PLUGIN_TYPE_AI && 
             current->process) {
             
-            current->process(entry);
+            if (current->async_queue) {
+                async_queue_push(current->async_queue, entry);
+            } else {
+                call_process(current, entry);
+            }
         }
         current = current->next;
     }
     
-    pthread_mutex_unlock(&plugin_ctx.lock);
+    pthread_rwlock_unlock(&plugin_ctx.lock);
 }
 
 /**
@@ -814,7 +1761,7 @@ const plugin_info_t* plugin_get_info(size_t index) {
         return NULL;
     }
     
-    pthread_mutex_lock(&plugin_ctx.lock);
+    pthread_rwlock_rdlock(&plugin_ctx.lock);
     
     plugin_instance_t* current = plugin_ctx.plugin_list;
     size_t current_index = 0;
@@ -826,7 +1773,7 @@ const plugin_info_t* plugin_get_info(size_t index) {
     
     const plugin_info_t* info = current ? &current->info : NULL;
     
-    pthread_mutex_unlock(&plugin_ctx.lock);
+    pthread_rwlock_unlock(&plugin_ctx.lock);
     return info;
 }
 
@@ -841,12 +1788,12 @@ const plugin_info_t* plugin_get_info_by_name(const char* name) {
         return NULL;
     }
     
-    pthread_mutex_lock(&plugin_ctx.lock);
+    pthread_rwlock_rdlock(&plugin_ctx.lock);
     
     plugin_instance_t* plugin = find_plugin_by_name(name);
     const plugin_info_t* info = plugin ? &plugin->info : NULL;
     
-    pthread_mutex_unlock(&plugin_ctx.lock);
+    pthread_rwlock_unlock(&plugin_ctx.lock);
     return info;
 }
 
@@ -861,8 +1808,8 @@ void plugin_system_cleanup(void) {
     // 卸载所有插件
     plugin_unload_all();
     
-    // 销毁互斥锁
-    pthread_mutex_destroy(&plugin_ctx.lock);
+    // 销毁读写锁
+    pthread_rwlock_destroy(&plugin_ctx.lock);
     
     // 释放配置资源
     free_plugin_config();
@@ -871,6 +1818,71 @@ void plugin_system_cleanup(void) {
     log_info("PLUGIN", "%s", lang_get("plugin.system.cleanup"));
 }
 
+/**
+ * @brief 重新加载插件特定配置
+ * 
+ * 构建新的配置快照并原子替换，之后对配置节发生变化的已启用插件调用
+ * 可选的plugin_config_changed回调。回调在持有写锁时调用，
+ * 期间没有日志分发到同步插件
+ * 
+ * @param config_json 插件配置JSON，NULL表示重新读取生成的配置
+ * @return 配置发生变化的插件数量，解析失败返回-1
+ */
+int plugin_reload_config(const char* config_json) {
+    if (!plugin_ctx.initialized) {
+        log_error("PLUGIN", "%s", lang_get("plugin.error.not_initialized"));
+        return -1;
+    }
+    
+    plugin_config_set_t* set = build_config_set(config_json ? config_json : LOGLOOM_PLUGIN_CONFIG_JSON);
+    if (!set) {
+        log_warn("PLUGIN", "%s", lang_get("plugin.warning.config_parse_failed"));
+        return -1;
+    }
+    
+    pthread_rwlock_wrlock(&plugin_ctx.lock);
+    
+    plugin_config_set_t* old = plugin_ctx.config_set;
+    set->version = old ? old->version + 1 : 1;
+    set->retired = old;
+    __atomic_store_n(&plugin_ctx.config_set, set, __ATOMIC_RELEASE);
+    
+    int changed = 0;
+    for (plugin_instance_t* plugin = plugin_ctx.plugin_list; plugin; plugin = plugin->next) {
+        cJSON* config = cJSON_GetObjectItem(set->root, plugin->name);
+        bool same = plugin->config == config ||
+                    (plugin->config && config && cJSON_Compare(plugin->config, config, true));
+        plugin->config = config;
+        if (same) {
+            continue;
+        }
+        changed++;
+        
+        // 按新配置重建累积缓冲，已累积的条目先按旧阈值交付
+        batch_stop(plugin);
+        if (plugin->enabled && plugin->info.mode != PLUGIN_MODE_ASYNC) {
+            batch_start(plugin);
+        }
+        
+        if (plugin->enabled && plugin->config_changed) {
+            int result = plugin->config_changed(&config_helpers);
+            if (result != 0) {
+                char* msg = lang_getf("plugin.error.config_changed_failed", plugin->name, result);
+                log_error("PLUGIN", "%s", msg);
+                free(msg);
+                plugin->enabled = false;
+            }
+        }
+    }
+    
+    pthread_rwlock_unlock(&plugin_ctx.lock);
+    
+    char* msg = lang_getf("plugin.info.config_reloaded", changed);
+    log_info("PLUGIN", "%s", msg);
+    free(msg);
+    return changed;
+}
+
 /**
  * @brief 获取插件特定配置值（整数）
  * 
@@ -880,21 +1892,12 @@ void plugin_system_cleanup(void) {
  * @return 配置值，如果未找到则返回默认值
  */
 int plugin_get_config_int(const char* plugin_name, const char* key, int default_value) {
-    if (!plugin_ctx.plugin_configs) {
-        return default_value;
-    }
-    
-    cJSON* plugin_config = cJSON_GetObjectItem(plugin_ctx.plugin_configs, plugin_name);
-    if (!plugin_config) {
-        return default_value;
-    }
-    
-    cJSON* value = cJSON_GetObjectItem(plugin_config, key);
-    if (!value || !cJSON_IsNumber(value)) {
+    const plugin_config_item_t* item = find_config_item(plugin_name, key);
+    if (!item || !cJSON_IsNumber(item->value)) {
         return default_value;
     }
     
-    return value->valueint;
+    return item->value->valueint;
 }
 
 /**
@@ -906,21 +1909,12 @@ int plugin_get_config_int(const char* plugin_name, const char* key, int default_
  * @return 配置值，如果未找到则返回默认值
  */
 const char* plugin_get_config_string(const char* plugin_name, const char* key, const char* default_value) {
-    if (!plugin_ctx.plugin_configs) {
+    const plugin_config_item_t* item = find_config_item(plugin_name, key);
+    if (!item || !cJSON_IsString(item->value)) {
         return default_value;
     }
     
-    cJSON* plugin_config = cJSON_GetObjectItem(plugin_ctx.plugin_configs, plugin_name);
-    if (!plugin_config) {
-        return default_value;
-    }
-    
-    cJSON* value = cJSON_GetObjectItem(plugin_config, key);
-    if (!value || !cJSON_IsString(value)) {
-        return default_value;
-    }
-    
-    return value->valuestring;
+    return item->value->valuestring;
 }
 
 /**
@@ -932,21 +1926,12 @@ const char* plugin_get_config_string(const char* plugin_name, const char* key, c
  * @return 配置值，如果未找到则返回默认值
  */
 bool plugin_get_config_bool(const char* plugin_name, const char* key, bool default_value) {
-    if (!plugin_ctx.plugin_configs) {
-        return default_value;
-    }
-    
-    cJSON* plugin_config = cJSON_GetObjectItem(plugin_ctx.plugin_configs, plugin_name);
-    if (!plugin_config) {
-        return default_value;
-    }
-    
-    cJSON* value = cJSON_GetObjectItem(plugin_config, key);
-    if (!value || !cJSON_IsBool(value)) {
+    const plugin_config_item_t* item = find_config_item(plugin_name, key);
+    if (!item || !cJSON_IsBool(item->value)) {
         return default_value;
     }
     
-    return cJSON_IsTrue(value);
+    return cJSON_IsTrue(item->value);
 }
 
 /**
@@ -960,27 +1945,16 @@ bool plugin_get_config_bool(const char* plugin_name, const char* key, bool defau
  */
 int plugin_get_config_string_array(const char* plugin_name, const char* key, 
                                    const char** values, int max_count) {
-    if (!plugin_ctx.plugin_configs || !values || max_count <= 0) {
+    if (!values || max_count <= 0) {
         return 0;
     }
     
-    cJSON* plugin_config = cJSON_GetObjectItem(plugin_ctx.plugin_configs, plugin_name);
-    if (!plugin_config) {
+    const plugin_config_item_t* item = find_config_item(plugin_name, key);
+    if (!item || !item->array) {
         return 0;
     }
     
-    cJSON* array = cJSON_GetObjectItem(plugin_config, key);
-    if (!array || !cJSON_IsArray(array)) {
-        return 0;
-    }
-    
-    int count = 0;
-    for (int i = 0; i < cJSON_GetArraySize(array) && i < max_count; i++) {
-        cJSON* item = cJSON_GetArrayItem(array, i);
-        if (cJSON_IsString(item) && item->valuestring) {
-            values[count++] = item->valuestring;
-        }
-    }
-    
+    int count = item->array_count < max_count ? item->array_count : max_count;
+    memcpy(values, item->array, count * sizeof(const char*));
     return count;
 }
\ No newline at end of file
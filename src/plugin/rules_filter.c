@@ -0,0 +1,446 @@
+/**
+ * @file rules_filter.c
+ * @brief Logloom内置规则过滤器插件实现
+ *
+ * 配置示例（config.yaml中的logloom.plugin.config.rules_filter）：
+ * - min_level: 全局最低日志级别
+ * - module_levels: 按模块的最低级别，格式为"模块:级别"
+ * - allow_modules: 允许的模块列表，为空表示不限制
+ * - deny_modules: 拒绝的模块列表
+ * - keywords: 包含任一关键字的日志被过滤
+ * - patterns: 匹配任一正则表达式（POSIX扩展语法）的日志被过滤
+ * - case_sensitive: 关键字和正则是否区分大小写
+ *
+ * 所有规则在初始化时编译，之后只读，可被多个日志线程并发使用
+ */
+
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <strings.h>
+#include <ctype.h>
+#include <stdint.h>
+#include <regex.h>
+
+#include "rules_filter.h"
+#include "log.h"
+#include "lang.h"
+#include "intern.h"
+
+// 单个规则列表的最大条目数
+#define RULES_FILTER_MAX_RULES 1024
+
+// 模块规则标志
+#define MODULE_RULE_ALLOW 0x01
+#define MODULE_RULE_DENY  0x02
+
+/**
+ * @brief 模块规则（按模块名称的驻留ID索引）
+ */
+typedef struct {
+    bool used;                   /**< 是否配置了该模块的规则 */
+    int min_level;               /**< 模块最低级别，-1表示使用全局级别 */
+    unsigned int flags;          /**< MODULE_RULE_*标志 */
+} module_rule_t;
+
+/**
+ * @brief Aho-Corasick自动机（已展开为DFA转移表）
+ */
+typedef struct {
+    int (*next)[256];            /**< 状态转移表 */
+    bool* output;                /**< 状态是否匹配到关键字 */
+    int node_count;              /**< 状态数量 */
+} keyword_automaton_t;
+
+/**
+ * @brief 编译后的规则集
+ */
+static struct {
+    module_rule_t* modules;      /**< 模块规则表，下标为模块名称的驻留ID */
+    size_t module_capacity;      /**< 规则表大小（最大ID + 1） */
+    bool has_allow_list;         /**< 是否配置了允许列表 */
+    int min_level;               /**< 全局最低级别 */
+    bool case_sensitive;         /**< 是否区分大小写 */
+    keyword_automaton_t keywords; /**< 关键字自动机 */
+    regex_t* patterns;           /**< 预编译的正则表达式 */
+    int pattern_count;           /**< 正则表达式数量 */
+} rules = {
+    .modules = NULL,
+    .module_capacity = 0,
+    .has_allow_list = false,
+    .min_level = LOG_LEVEL_DEBUG,
+    .case_sensitive = false,
+    .keywords = { NULL, NULL, 0 },
+    .patterns = NULL,
+    .pattern_count = 0
+};
+
+/**
+ * @brief 解析日志级别名称
+ *
+ * @param level 级别名称（不区分大小写）
+ * @return 日志级别，无法识别返回-1
+ */
+static int parse_level(const char* level) {
+    static const struct { const char* name; int level; } names[] = {
+        { "DEBUG", LOG_LEVEL_DEBUG },
+        { "INFO", LOG_LEVEL_INFO },
+        { "WARN", LOG_LEVEL_WARN },
+        { "WARNING", LOG_LEVEL_WARN },
+        { "ERROR", LOG_LEVEL_ERROR },
+        { "FATAL", LOG_LEVEL_FATAL },
+        { "CRITICAL", LOG_LEVEL_FATAL }
+    };
+
+    if (!level) {
+        return -1;
+    }
+    for (size_t i = 0; i < sizeof(names) / sizeof(names[0]); i++) {
+        if (strcasecmp(level, names[i].name) == 0) {
+            return names[i].level;
+        }
+    }
+    return -1;
+}
+
+/**
+ * @brief 查找模块规则
+ *
+ * @param module_id 模块名称的驻留ID
+ * @return 模块规则指针，该模块没有规则时返回NULL
+ */
+static const module_rule_t* find_module_rule(uint32_t module_id) {
+    if (module_id >= rules.module_capacity || !rules.modules[module_id].used) {
+        return NULL;
+    }
+    return &rules.modules[module_id];
+}
+
+/**
+ * @brief 获取或创建模块规则，按需扩大规则表
+ *
+ * @param module 模块名称
+ * @return 模块规则指针，失败返回NULL
+ */
+static module_rule_t* add_module_rule(const char* module) {
+    uint32_t id = intern_string(module);
+    if (!id) {
+        return NULL;
+    }
+
+    if (id >= rules.module_capacity) {
+        size_t capacity = rules.module_capacity ? rules.module_capacity : 16;
+        while (capacity <= id) {
+            capacity <<= 1;
+        }
+        module_rule_t* modules = (module_rule_t*)realloc(rules.modules, capacity * sizeof(module_rule_t));
+        if (!modules) {
+            return NULL;
+        }
+        memset(modules + rules.module_capacity, 0, (capacity - rules.module_capacity) * sizeof(module_rule_t));
+        rules.modules = modules;
+        rules.module_capacity = capacity;
+    }
+
+    module_rule_t* rule = &rules.modules[id];
+    if (!rule->used) {
+        rule->used = true;
+        rule->min_level = -1;
+        rule->flags = 0;
+    }
+    return rule;
+}
+
+/**
+ * @brief 构建关键字Aho-Corasick自动机
+ *
+ * 先构建字典树，再按广度优先顺序计算失败链接并展开为完整的转移表，
+ * 匹配时每个字节只需一次查表
+ *
+ * @param keywords 关键字数组
+ * @param count 关键字数量
+ * @return 成功返回true，失败返回false
+ */
+static bool build_keyword_automaton(const char** keywords, int count) {
+    keyword_automaton_t* ac = &rules.keywords;
+    size_t max_nodes = 1;
+    for (int i = 0; i < count; i++) {
+        max_nodes += strlen(keywords[i]);
+    }
+
+    ac->next = malloc(max_nodes * sizeof(*ac->next));
+    ac->output = (bool*)calloc(max_nodes, sizeof(bool));
+    int* fail = (int*)calloc(max_nodes, sizeof(int));
+    int* queue = (int*)malloc(max_nodes * sizeof(int));
+    if (!ac->next || !ac->output || !fail || !queue) {
+        free(fail);
+        free(queue);
+        return false;
+    }
+
+    memset(ac->next[0], -1, sizeof(ac->next[0]));
+    ac->node_count = 1;
+
+    // 构建字典树
+    for (int i = 0; i < count; i++) {
+        const unsigned char* p = (const unsigned char*)keywords[i];
+        if (!*p) {
+            continue;
+        }
+        int state = 0;
+        for (; *p; p++) {
+            int c = rules.case_sensitive ? *p : tolower(*p);
+            if (ac->next[state][c] < 0) {
+                memset(ac->next[ac->node_count], -1, sizeof(ac->next[0]));
+                ac->next[state][c] = ac->node_count++;
+            }
+            state = ac->next[state][c];
+        }
+        ac->output[state] = true;
+    }
+
+    // 计算失败链接并展开转移表
+    int head = 0, tail = 0;
+    for (int c = 0; c < 256; c++) {
+        int child = ac->next[0][c];
+        if (child < 0) {
+            ac->next[0][c] = 0;
+        } else {
+            fail[child] = 0;
+            queue[tail++] = child;
+        }
+    }
+    while (head < tail) {
+        int state = queue[head++];
+        ac->output[state] = ac->output[state] || ac->output[fail[state]];
+        for (int c = 0; c < 256; c++) {
+            int child = ac->next[state][c];
+            if (child < 0) {
+                ac->next[state][c] = ac->next[fail[state]][c];
+            } else {
+                fail[child] = ac->next[fail[state]][c];
+                queue[tail++] = child;
+            }
+        }
+    }
+
+    free(fail);
+    free(queue);
+    return true;
+}
+
+/**
+ * @brief 判断消息是否包含任一关键字
+ */
+static bool match_keywords(const char* message) {
+    const keyword_automaton_t* ac = &rules.keywords;
+    if (ac->node_count <= 1) {
+        return false;
+    }
+
+    int state = 0;
+    for (const unsigned char* p = (const unsigned char*)message; *p; p++) {
+        int c = rules.case_sensitive ? *p : tolower(*p);
+        state = ac->next[state][c];
+        if (ac->output[state]) {
+            return true;
+        }
+    }
+    return false;
+}
+
+/**
+ * @brief 编译正则表达式列表
+ *
+ * @param patterns 正则表达式数组
+ * @param count 正则表达式数量
+ * @return 成功返回true，失败返回false
+ */
+static bool compile_patterns(const char** patterns, int count) {
+    if (count == 0) {
+        return true;
+    }
+
+    rules.patterns = (regex_t*)calloc((size_t)count, sizeof(regex_t));
+    if (!rules.patterns) {
+        return false;
+    }
+
+    int flags = REG_EXTENDED | REG_NOSUB | (rules.case_sensitive ? 0 : REG_ICASE);
+    for (int i = 0; i < count; i++) {
+        if (regcomp(&rules.patterns[rules.pattern_count], patterns[i], flags) != 0) {
+            char* msg = lang_getf("plugin.error.invalid_filter_pattern", RULES_FILTER_PLUGIN_NAME, patterns[i]);
+            log_warn("PLUGIN", "%s", msg);
+            free(msg);
+            continue;
+        }
+        rules.pattern_count++;
+    }
+    return true;
+}
+
+/**
+ * @brief 初始化规则过滤器，编译配置中的全部规则
+ *
+ * @param helpers 插件辅助函数结构体
+ * @return 0表示成功，非0表示失败
+ */
+int rules_filter_plugin_init(const plugin_helpers_t* helpers) {
+    const char* name = RULES_FILTER_PLUGIN_NAME;
+    static const char* values[RULES_FILTER_MAX_RULES];
+
+    rules_filter_plugin_shutdown();
+
+    rules.case_sensitive = helpers->get_config_bool(name, "case_sensitive", false);
+
+    const char* min_level = helpers->get_config_string(name, "min_level", NULL);
+    rules.min_level = min_level ? parse_level(min_level)
+                                : helpers->get_config_int(name, "min_level", LOG_LEVEL_DEBUG);
+    if (rules.min_level < 0) {
+        rules.min_level = LOG_LEVEL_DEBUG;
+    }
+
+    // 模块规则：三个列表共用一张按模块ID索引的规则表
+    int allow_count = helpers->get_config_array(name, "allow_modules", values, RULES_FILTER_MAX_RULES);
+    for (int i = 0; i < allow_count; i++) {
+        module_rule_t* rule = add_module_rule(values[i]);
+        if (!rule) {
+            goto fail;
+        }
+        rule->flags |= MODULE_RULE_ALLOW;
+    }
+    rules.has_allow_list = allow_count > 0;
+
+    int deny_count = helpers->get_config_array(name, "deny_modules", values, RULES_FILTER_MAX_RULES);
+    for (int i = 0; i < deny_count; i++) {
+        module_rule_t* rule = add_module_rule(values[i]);
+        if (!rule) {
+            goto fail;
+        }
+        rule->flags |= MODULE_RULE_DENY;
+    }
+
+    int level_count = helpers->get_config_array(name, "module_levels", values, RULES_FILTER_MAX_RULES);
+    for (int i = 0; i < level_count; i++) {
+        const char* sep = strrchr(values[i], ':');
+        if (!sep || sep == values[i]) {
+            continue;
+        }
+        char module[128];
+        size_t len = (size_t)(sep - values[i]);
+        if (len >= sizeof(module)) {
+            continue;
+        }
+        memcpy(module, values[i], len);
+        module[len] = '\0';
+
+        int level = parse_level(sep + 1);
+        if (level < 0) {
+            continue;
+        }
+        module_rule_t* rule = add_module_rule(module);
+        if (!rule) {
+            goto fail;
+        }
+        rule->min_level = level;
+    }
+
+    int keyword_count = helpers->get_config_array(name, "keywords", values, RULES_FILTER_MAX_RULES);
+    if (!build_keyword_automaton(values, keyword_count)) {
+        goto fail;
+    }
+
+    int pattern_count = helpers->get_config_array(name, "patterns", values, RULES_FILTER_MAX_RULES);
+    if (!compile_patterns(values, pattern_count)) {
+        goto fail;
+    }
+
+    return 0;
+
+fail:
+    rules_filter_plugin_shutdown();
+    return 1;
+}
+
+/**
+ * @brief 按编译后的规则判定日志条目
+ *
+ * 判定顺序：模块拒绝/允许列表、级别阈值、关键字、正则表达式；
+ * 模块规则按条目的module_id直接索引
+ *
+ * @param entry 日志条目
+ * @return 通过返回PLUGIN_RESULT_OK，过滤返回PLUGIN_RESULT_SKIP
+ */
+int rules_filter_plugin_process(const log_entry_t* entry) {
+    if (!entry) {
+        return PLUGIN_RESULT_OK;
+    }
+
+    // 条目没有驻留ID时按名称查找，未驻留过的模块不可能有规则
+    uint32_t module_id = entry->module_id ? entry->module_id : intern_lookup(entry->module ? entry->module : "");
+    const module_rule_t* rule = find_module_rule(module_id);
+    if (rule && (rule->flags & MODULE_RULE_DENY)) {
+        return PLUGIN_RESULT_SKIP;
+    }
+    if (rules.has_allow_list && !(rule && (rule->flags & MODULE_RULE_ALLOW))) {
+        return PLUGIN_RESULT_SKIP;
+    }
+
+    int min_level = (rule && rule->min_level >= 0) ? rule->min_level : rules.min_level;
+    if ((int)entry->level < min_level) {
+        return PLUGIN_RESULT_SKIP;
+    }
+
+    if (entry->message) {
+        if (match_keywords(entry->message)) {
+            return PLUGIN_RESULT_SKIP;
+        }
+        for (int i = 0; i < rules.pattern_count; i++) {
+            if (regexec(&rules.patterns[i], entry->message, 0, NULL, 0) == 0) {
+                return PLUGIN_RESULT_SKIP;
+            }
+        }
+    }
+
+    return PLUGIN_RESULT_OK;
+}
+
+/**
+ * @brief 释放编译后的规则
+ */
+void rules_filter_plugin_shutdown(void) {
+    free(rules.modules);
+    rules.modules = NULL;
+    rules.module_capacity = 0;
+    rules.has_allow_list = false;
+
+    free(rules.keywords.next);
+    free(rules.keywords.output);
+    rules.keywords.next = NULL;
+    rules.keywords.output = NULL;
+    rules.keywords.node_count = 0;
+
+    for (int i = 0; i < rules.pattern_count; i++) {
+        regfree(&rules.patterns[i]);
+    }
+    free(rules.patterns);
+    rules.patterns = NULL;
+    rules.pattern_count = 0;
+}
+
+/**
+ * @brief 规则过滤器插件信息
+ */
+static const plugin_info_t rules_filter_info = {
+    .name = RULES_FILTER_PLUGIN_NAME,
+    .version = "1.0.0",
+    .author = "Logloom Team",
+    .type = PLUGIN_TYPE_FILTER,
+    .mode = PLUGIN_MODE_SYNC,
+    .capabilities = PLUGIN_CAP_NONE,
+    .description = "内置规则过滤器，按模块、级别、关键字和正则表达式过滤日志"
+};
+
+const plugin_info_t* rules_filter_plugin_info(void) {
+    return &rules_filter_info;
+}
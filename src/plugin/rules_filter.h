@@ -0,0 +1,35 @@
+/**
+ * @file rules_filter.h
+ * @brief Logloom内置规则过滤器插件
+ *
+ * 规则过滤器在初始化时将配置中的声明式规则编译为判定结构：
+ * - 模块允许/拒绝集合与按模块的级别阈值（以模块名称的驻留ID为下标的数组）
+ * - 关键字列表（Aho-Corasick自动机）
+ * - 正则表达式（预编译）
+ *
+ * 该插件随插件系统一起编译，不需要单独的动态库，
+ * 在插件配置中存在rules_filter配置节且插件启用时由加载器注册
+ */
+
+#ifndef LOGLOOM_RULES_FILTER_H
+#define LOGLOOM_RULES_FILTER_H
+
+#include "plugin.h"
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+/** 内置规则过滤器插件名称 */
+#define RULES_FILTER_PLUGIN_NAME "rules_filter"
+
+int rules_filter_plugin_init(const plugin_helpers_t* helpers);
+int rules_filter_plugin_process(const log_entry_t* entry);
+void rules_filter_plugin_shutdown(void);
+const plugin_info_t* rules_filter_plugin_info(void);
+
+#ifdef __cplusplus
+}
+#endif
+
+#endif /* LOGLOOM_RULES_FILTER_H */
@@ -1,74 +1,129 @@
 #include <stdio.h>
 #include <stdlib.h>
 #include <string.h>
+#include <strings.h>
 #include <stdbool.h>
 #include <unistd.h>
 #include "config.h"
+#include "config_parser.h"
 #include "../shared/platform.h"
 
 /** 默认配置文件路径 */
 #define DEFAULT_CONFIG_PATH "/etc/logloom/config.yaml"
 
+/** 上次成功加载的配置文件路径，供config_reload使用 */
+static char g_config_path[256];
+
 /* 声明在config_core.c中定义的函数 */
 extern void config_set_defaults(logloom_config_t* cfg);
 extern logloom_config_t g_config;
 
 /**
- * @brief 从YAML文件解析配置（简化版，仅读取键值对）
- * 此处为简单实现，实际项目中应使用libyaml或yaml-cpp等库
- * 
+ * @brief 复制字符串配置项，超长时截断
+ */
+static void copy_setting(char* dest, size_t size, const config_node_t* root, const char* path) {
+    const char* value = config_node_get_string(root, path, NULL);
+    if (value) {
+        snprintf(dest, size, "%s", value);
+    }
+}
+
+/**
+ * @brief 将解析后的配置应用到配置结构体
+ *
+ * 配置项位于logloom节点下；没有logloom节点时从文档根节点读取
+ *
+ * @param root 文档根节点
+ * @param cfg 配置结构体指针
+ */
+static void apply_config(const config_node_t* root, logloom_config_t* cfg) {
+    const config_node_t* section = config_node_child(root, "logloom");
+    if (section) {
+        root = section;
+    }
+
+    copy_setting(cfg->language, sizeof(cfg->language), root, "language");
+    copy_setting(cfg->log.level, sizeof(cfg->log.level), root, "log.level");
+    copy_setting(cfg->log.file, sizeof(cfg->log.file), root, "log.file");
+
+    long long max_size = config_node_get_int(root, "log.max_size", -1);
+    if (max_size >= 0) {
+        cfg->log.max_size = (size_t)max_size;
+    }
+    cfg->log.console = config_node_get_bool(root, "log.console", cfg->log.console);
+}
+
+/**
+ * @brief 从YAML文件解析配置
+ *
+ * 文件由config_parser解析并在进程内缓存，Python绑定读取同一文件时复用解析结果
+ *
  * @param path 配置文件路径
  * @param cfg 配置结构体指针
  * @return 0表示成功，非0表示失败
  */
 static int parse_yaml_file(const char* path, logloom_config_t* cfg) {
-    FILE* file = fopen(path, "r");
-    if (!file) {
-        LOGLOOM_WARN("无法打开配置文件: %s", path);
+    char error[256];
+    const config_document_t* doc = config_load_document(path, error, sizeof(error));
+    if (!doc) {
+        LOGLOOM_WARN("无法解析配置文件: %s", error);
         return -1;
     }
 
-    char line[512];
-    char key[128];
-    char value[256];
-    
-    /* 简单解析YAML文件的键值对 */
-    while (fgets(line, sizeof(line), file)) {
-        /* 跳过注释和空行 */
-        if (line[0] == '#' || line[0] == '\n') continue;
-        
-        /* 尝试解析键值对，格式为：key: value */
-        if (sscanf(line, "%[^:]: %[^\n]", key, value) == 2) {
-            /* 去除可能的引号 */
-            if (value[0] == '"' && value[strlen(value)-1] == '"') {
-                value[strlen(value)-1] = '\0';
-                memmove(value, value+1, strlen(value));
-            }
-            
-            /* 处理特定配置项 */
-            if (strstr(key, "language") != NULL) {
-                strncpy(cfg->language, value, sizeof(cfg->language) - 1);
-            } 
-            else if (strstr(key, "log.level") != NULL) {
-                strncpy(cfg->log.level, value, sizeof(cfg->log.level) - 1);
-            }
-            else if (strstr(key, "log.file") != NULL) {
-                strncpy(cfg->log.file, value, sizeof(cfg->log.file) - 1);
-            }
-            else if (strstr(key, "log.max_size") != NULL) {
-                cfg->log.max_size = atoi(value);
-            }
-            else if (strstr(key, "log.console") != NULL) {
-                if (strcmp(value, "true") == 0 || strcmp(value, "1") == 0) {
-                    cfg->log.console = 1;
-                } else if (strcmp(value, "false") == 0 || strcmp(value, "0") == 0) {
-                    cfg->log.console = 0;
-                }
-            }
+    apply_config(config_document_root(doc), cfg);
+    return 0;
+}
+
+/**
+ * @brief 比较两份配置，返回发生变化的配置项
+ */
+static unsigned int config_diff(const logloom_config_t* old_cfg, const logloom_config_t* new_cfg) {
+    unsigned int changed = 0;
+
+    if (strcmp(old_cfg->language, new_cfg->language) != 0) {
+        changed |= CONFIG_CHANGED_LANGUAGE;
+    }
+    if (strcasecmp(old_cfg->log.level, new_cfg->log.level) != 0) {
+        changed |= CONFIG_CHANGED_LOG_LEVEL;
+    }
+    if (strcmp(old_cfg->log.file, new_cfg->log.file) != 0) {
+        changed |= CONFIG_CHANGED_LOG_FILE;
+    }
+    if (old_cfg->log.max_size != new_cfg->log.max_size) {
+        changed |= CONFIG_CHANGED_MAX_SIZE;
+    }
+    if (old_cfg->log.console != new_cfg->log.console) {
+        changed |= CONFIG_CHANGED_CONSOLE;
+    }
+    return changed;
+}
+
+int config_reload(const char* path, unsigned int* changed) {
+    if (changed) {
+        *changed = 0;
+    }
+    if (!path) {
+        if (!g_config_path[0]) {
+            LOGLOOM_WARN("没有可重新加载的配置文件");
+            return -1;
         }
+        path = g_config_path;
+    }
+
+    /* 在独立的结构体中解析，成功后才替换当前配置 */
+    logloom_config_t cfg;
+    config_set_defaults(&cfg);
+    if (parse_yaml_file(path, &cfg) != 0) {
+        return -1;
+    }
+
+    if (changed) {
+        *changed = config_diff(&g_config, &cfg);
+    }
+    g_config = cfg;
+    if (path != g_config_path) {
+        snprintf(g_config_path, sizeof(g_config_path), "%s", path);
     }
-    
-    fclose(file);
     return 0;
 }
 
@@ -94,7 +149,11 @@ int config_load_from_file(const char* path) {
     /* 尝试解析配置文件 */
     if (access(config_path, R_OK) == 0) {
         LOGLOOM_INFO("加载配置文件: %s", config_path);
-        return parse_yaml_file(config_path, &g_config);
+        int result = parse_yaml_file(config_path, &g_config);
+        if (result == 0) {
+            snprintf(g_config_path, sizeof(g_config_path), "%s", config_path);
+        }
+        return result;
     } else {
         LOGLOOM_WARN("配置文件不存在或无法访问: %s，使用默认设置", config_path);
         return -1;
@@ -102,5 +161,6 @@ int config_load_from_file(const char* path) {
 }
 
 void config_cleanup(void) {
-    /* 目前没有需要清理的资源，预留接口以便未来扩展 */
+    /* 释放缓存的配置文档 */
+    config_clear_documents();
 }
\ No newline at end of file
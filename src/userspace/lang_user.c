@@ -12,6 +12,10 @@ static const lang_entry_t* current_lang_table = NULL;
 static const lang_entry_t* fallback_lang_table = NULL; // 默认语言表
 static char current_lang_code[8] = "en";  // 当前语言代码
 
+// 线程语言，设置后本线程的查找使用它；语言表是静态数据，线程可以直接持有表指针
+static __thread const lang_entry_t* thread_lang_table = NULL;
+static __thread char thread_lang_code[8] = "";
+
 /* 声明在lang_core.c中定义的函数 */
 extern const char* lang_find_in_table(const lang_entry_t* table, const char* key);
 extern const char* lang_get_default_code(void);
@@ -70,21 +74,19 @@ bool lang_set_language(const char* lang_code) {
     return true;
 }
 
-const char* lang_get(const char* key) {
-    if (!key || !*key) return NULL;
-    
-    // 从当前语言查找
+// 在指定语言表中查找键，找不到时回退到默认语言
+static const char* lookup_in_table(const char* lang_code, const lang_entry_t* table, const char* key) {
     const char* value = NULL;
-    if (current_lang_table) {
-        value = lang_find_in_table(current_lang_table, key);
+    if (table) {
+        value = lang_find_in_table(table, key);
     }
     
     // 如果在当前语言找不到并且有默认语言，从默认语言查找
-    if (!value && fallback_lang_table && current_lang_table != fallback_lang_table) {
+    if (!value && fallback_lang_table && table != fallback_lang_table) {
         value = lang_find_in_table(fallback_lang_table, key);
         if (value) {
             LOGLOOM_WARN("Language key not found in '%s': %s, using default language",
-                    current_lang_code, key);
+                    lang_code, key);
         }
     }
     
@@ -97,6 +99,48 @@ const char* lang_get(const char* key) {
     return value;
 }
 
+bool lang_set_thread_language(const char* lang_code) {
+    // NULL或空字符串恢复使用全局语言
+    if (!lang_code || !*lang_code) {
+        thread_lang_table = NULL;
+        thread_lang_code[0] = '\0';
+        return true;
+    }
+    
+    const lang_entry_t* table = get_lang_table(lang_code);
+    if (!table) {
+        LOGLOOM_ERROR("Failed to switch thread language to %s", lang_code);
+        return false;
+    }
+    
+    thread_lang_table = table;
+    strncpy(thread_lang_code, lang_code, sizeof(thread_lang_code) - 1);
+    thread_lang_code[sizeof(thread_lang_code) - 1] = '\0';
+    return true;
+}
+
+const char* lang_get(const char* key) {
+    if (!key || !*key) return NULL;
+    
+    // 设置了线程语言时使用线程语言
+    if (thread_lang_table) {
+        return lookup_in_table(thread_lang_code, thread_lang_table, key);
+    }
+    return lookup_in_table(current_lang_code, current_lang_table, key);
+}
+
+const char* lang_get_in(const char* lang_code, const char* key) {
+    if (!lang_code || !*lang_code) return lang_get(key);
+    if (!key || !*key) return NULL;
+    
+    const lang_entry_t* table = get_lang_table(lang_code);
+    if (!table) {
+        LOGLOOM_WARN("Language '%s' not available, using current language", lang_code);
+        return lang_get(key);
+    }
+    return lookup_in_table(lang_code, table, key);
+}
+
 char* lang_getf(const char* key, ...) {
     const char* template = lang_get(key);
     if (!template) return NULL;
@@ -131,6 +175,9 @@ char* lang_getf(const char* key, ...) {
 }
 
 const char* lang_get_current() {
+    if (thread_lang_table) {
+        return thread_lang_code;
+    }
     return current_lang_code;
 }
 
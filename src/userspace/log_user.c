@@ -7,8 +7,10 @@
 #include <sys/time.h>
 #include <unistd.h>
 #include <pthread.h>
+#include <signal.h>
 #include "log.h"
 #include "config.h"
+#include "intern.h"
 #include "../shared/platform.h"
 
 /* 声明在log_core.c中定义的函数 */
@@ -18,6 +20,7 @@ extern void log_format_message(char* buffer, size_t buffer_size, int level,
 
 #define LOG_BUFFER_SIZE 4096
 #define MAX_FILEPATH_LENGTH 256
+#define LOG_FILE_CHECK_INTERVAL 1  /* 检查日志文件是否被外部轮转的最小间隔（秒） */
 
 /* 日志文件路径 */
 static char g_log_file[MAX_FILEPATH_LENGTH] = {0};
@@ -25,15 +28,34 @@ static char g_log_file[MAX_FILEPATH_LENGTH] = {0};
 /* 日志锁 */
 static pthread_mutex_t log_mutex = PTHREAD_MUTEX_INITIALIZER;
 
-/* 控制台输出标志 */
+/* 控制台输出标志，以原子方式读写 */
 static int g_console_enabled = 1;
 
 /* 日志文件句柄 */
 static FILE* g_log_file_handle = NULL;
 
-/* 日志文件最大大小（字节） */
+/* 日志文件最大大小（字节），以原子方式读写 */
 static size_t g_max_file_size = 1048576; /* 默认 1MB */
 
+/* 待换上的日志文件，由log_swap_file在调用线程中打开 */
+typedef struct {
+    FILE* handle;                       /* 新的日志文件句柄，NULL表示禁用文件输出 */
+    char path[MAX_FILEPATH_LENGTH];     /* 新的日志文件路径 */
+} log_file_swap_t;
+
+/* 待换上的日志文件，写日志的线程持有日志锁时换上 */
+static log_file_swap_t* g_pending_file = NULL;
+
+/* 重新打开日志文件的请求，可由信号处理函数设置 */
+static int g_reopen_requested = 0;
+
+/* 上次检查外部轮转的时间 */
+static time_t g_last_file_check = 0;
+
+/* 日志记录回调 */
+static log_record_hook_t g_record_hook = NULL;
+static void* g_record_hook_data = NULL;
+
 /**
  * @brief 获取当前时间戳字符串
  * 
@@ -50,6 +72,103 @@ static void get_timestamp(char* buffer, size_t size) {
     strftime(buffer, size, "%Y%m%d-%H%M%S", time_info);
 }
 
+/**
+ * @brief 释放未换上的日志文件
+ */
+static void free_file_swap(log_file_swap_t* swap) {
+    if (swap->handle) {
+        fclose(swap->handle);
+    }
+    free(swap);
+}
+
+/**
+ * @brief 换上log_swap_file发布的日志文件并关闭旧文件，调用方持有日志锁
+ */
+static void apply_pending_file(void) {
+    if (!__atomic_load_n(&g_pending_file, __ATOMIC_RELAXED)) {
+        return;
+    }
+    log_file_swap_t* swap = __atomic_exchange_n(&g_pending_file, NULL, __ATOMIC_ACQ_REL);
+    if (!swap) {
+        return;
+    }
+    
+    if (g_log_file_handle) {
+        fclose(g_log_file_handle);
+    }
+    g_log_file_handle = swap->handle;
+    memcpy(g_log_file, swap->path, sizeof(g_log_file));
+    free(swap);
+}
+
+/**
+ * @brief 丢弃尚未换上的日志文件
+ */
+static void discard_pending_file(void) {
+    log_file_swap_t* swap = __atomic_exchange_n(&g_pending_file, NULL, __ATOMIC_ACQ_REL);
+    if (swap) {
+        free_file_swap(swap);
+    }
+}
+
+/**
+ * @brief 按当前路径重新打开日志文件，打开失败时继续写原文件，调用方持有日志锁
+ */
+static void reopen_log_file(void) {
+    FILE* handle = fopen(g_log_file, "a");
+    if (!handle) {
+        fprintf(stderr, "[ERROR] 无法重新打开日志文件: %s\n", g_log_file);
+        return;
+    }
+    fclose(g_log_file_handle);
+    g_log_file_handle = handle;
+}
+
+/**
+ * @brief 处理外部轮转，调用方持有日志锁
+ * 收到重新打开请求，或路径指向的文件已被改名、删除（inode不同）时按路径重新打开；
+ * 文件被原地截断（copytruncate）时把写入位置移到文件末尾。
+ * 没有请求时最多每LOG_FILE_CHECK_INTERVAL秒检查一次
+ */
+static void check_external_rotation(void) {
+    int requested = __atomic_exchange_n(&g_reopen_requested, 0, __ATOMIC_ACQ_REL);
+    if (!g_log_file[0] || !g_log_file_handle) {
+        return;
+    }
+    if (requested) {
+        reopen_log_file();
+        return;
+    }
+    
+    time_t now = time(NULL);
+    if (now - g_last_file_check < LOG_FILE_CHECK_INTERVAL) {
+        return;
+    }
+    g_last_file_check = now;
+    
+    struct stat file_st, path_st;
+    if (fstat(fileno(g_log_file_handle), &file_st) != 0) {
+        return;
+    }
+    if (stat(g_log_file, &path_st) != 0 ||
+        path_st.st_ino != file_st.st_ino || path_st.st_dev != file_st.st_dev) {
+        reopen_log_file();
+        return;
+    }
+    if (ftell(g_log_file_handle) > file_st.st_size) {
+        fseek(g_log_file_handle, 0, SEEK_END);
+    }
+}
+
+/**
+ * @brief 换上运行时切换的日志文件并处理外部轮转，调用方持有日志锁
+ */
+static void prepare_log_file(void) {
+    apply_pending_file();
+    check_external_rotation();
+}
+
 /**
  * @brief 轮转日志文件
  * 当日志文件达到最大大小时，将其重命名为带时间戳的备份文件
@@ -100,7 +219,7 @@ static void check_and_rotate(void) {
     // 获取文件大小
     struct stat st;
     if (stat(g_log_file, &st) == 0) {
-        if ((size_t)st.st_size >= g_max_file_size) {
+        if ((size_t)st.st_size >= __atomic_load_n(&g_max_file_size, __ATOMIC_RELAXED)) {
             rotate_log_file();
         }
     }
@@ -113,11 +232,12 @@ static void check_and_rotate(void) {
  */
 static void write_log(const char* msg) {
     // 输出到控制台
-    if (g_console_enabled) {
+    if (__atomic_load_n(&g_console_enabled, __ATOMIC_RELAXED)) {
         printf("%s\n", msg);
     }
     
-    // 输出到文件
+    // 输出到文件，先换上运行时切换的日志文件并处理外部轮转
+    prepare_log_file();
     if (g_log_file_handle) {
         check_and_rotate();
         fprintf(g_log_file_handle, "%s\n", msg);
@@ -142,10 +262,10 @@ int log_init(const char* level, const char* log_file) {
     }
     
     // 从配置中获取控制台输出设置
-    g_console_enabled = config_is_console_enabled();
+    __atomic_store_n(&g_console_enabled, config_is_console_enabled(), __ATOMIC_RELAXED);
     
     // 从配置中获取最大文件大小
-    g_max_file_size = config_get_max_log_size();
+    __atomic_store_n(&g_max_file_size, config_get_max_log_size(), __ATOMIC_RELAXED);
     
     pthread_mutex_unlock(&log_mutex);
     
@@ -155,6 +275,8 @@ int log_init(const char* level, const char* log_file) {
 void log_cleanup(void) {
     pthread_mutex_lock(&log_mutex);
     
+    discard_pending_file();
+    
     if (g_log_file_handle) {
         fclose(g_log_file_handle);
         g_log_file_handle = NULL;
@@ -166,6 +288,9 @@ void log_cleanup(void) {
 void log_set_file(const char* file_path) {
     pthread_mutex_lock(&log_mutex);
     
+    // 之前通过log_swap_file发布但尚未换上的文件被本次设置取代
+    discard_pending_file();
+    
     if (g_log_file_handle) {
         fclose(g_log_file_handle);
         g_log_file_handle = NULL;
@@ -186,16 +311,108 @@ void log_set_file(const char* file_path) {
     pthread_mutex_unlock(&log_mutex);
 }
 
-void log_set_max_file_size(size_t max_size) {
+/**
+ * @brief 在调用线程中打开待换上的日志文件，路径为空表示禁用文件输出，失败时返回NULL
+ */
+static log_file_swap_t* open_file_swap(const char* file_path) {
+    log_file_swap_t* swap = calloc(1, sizeof(log_file_swap_t));
+    if (!swap) {
+        return NULL;
+    }
+    
+    if (file_path && *file_path) {
+        strncpy(swap->path, file_path, sizeof(swap->path) - 1);
+        swap->handle = fopen(swap->path, "a");
+        if (!swap->handle) {
+            fprintf(stderr, "[ERROR] 无法打开日志文件: %s\n", swap->path);
+            free(swap);
+            return NULL;
+        }
+    }
+    return swap;
+}
+
+bool log_swap_file(const char* file_path) {
+    // 新文件无法打开时保留原文件
+    log_file_swap_t* swap = open_file_swap(file_path);
+    if (!swap) {
+        return false;
+    }
+    
+    // 连续切换时只保留最新的文件
+    log_file_swap_t* previous = __atomic_exchange_n(&g_pending_file, swap, __ATOMIC_ACQ_REL);
+    if (previous) {
+        free_file_swap(previous);
+    }
+    return true;
+}
+
+bool log_reopen(void) {
+    // 日志锁只用于读取路径，新文件在调用线程中打开
+    char path[MAX_FILEPATH_LENGTH];
     pthread_mutex_lock(&log_mutex);
-    g_max_file_size = max_size > 0 ? max_size : 1048576;
+    apply_pending_file();
+    memcpy(path, g_log_file, sizeof(path));
     pthread_mutex_unlock(&log_mutex);
+    
+    if (!path[0]) {
+        return false;
+    }
+    log_file_swap_t* swap = open_file_swap(path);
+    if (!swap) {
+        return false;
+    }
+    
+    // 已有待换上的文件时它同样是新打开的，不再用当前路径覆盖它
+    log_file_swap_t* expected = NULL;
+    if (!__atomic_compare_exchange_n(&g_pending_file, &expected, swap, false,
+                                     __ATOMIC_ACQ_REL, __ATOMIC_ACQUIRE)) {
+        free_file_swap(swap);
+    }
+    return true;
 }
 
-void log_set_console_enabled(int enabled) {
+void log_request_reopen(void) {
+    // 只设置原子标志，可在信号处理函数中调用
+    __atomic_store_n(&g_reopen_requested, 1, __ATOMIC_RELEASE);
+}
+
+static void reopen_signal_handler(int signum) {
+    (void)signum;
+    log_request_reopen();
+}
+
+bool log_reopen_on_signal(int signum) {
+    struct sigaction action;
+    memset(&action, 0, sizeof(action));
+    action.sa_handler = reopen_signal_handler;
+    sigemptyset(&action.sa_mask);
+    action.sa_flags = SA_RESTART;
+    return sigaction(signum, &action, NULL) == 0;
+}
+
+const char* log_get_file_path(void) {
+    // 已切换但还没有日志写入时，先换上新文件
     pthread_mutex_lock(&log_mutex);
-    g_console_enabled = enabled;
+    apply_pending_file();
     pthread_mutex_unlock(&log_mutex);
+    return g_log_file[0] ? g_log_file : NULL;
+}
+
+void log_set_max_file_size(size_t max_size) {
+    __atomic_store_n(&g_max_file_size, max_size > 0 ? max_size : 1048576, __ATOMIC_RELAXED);
+}
+
+size_t log_get_max_file_size(void) {
+    return __atomic_load_n(&g_max_file_size, __ATOMIC_RELAXED);
+}
+
+void log_set_console_enabled(int enabled) {
+    __atomic_store_n(&g_console_enabled, enabled, __ATOMIC_RELAXED);
+}
+
+bool log_is_console_enabled(void) {
+    return __atomic_load_n(&g_console_enabled, __ATOMIC_RELAXED) != 0;
 }
 
 void log_lock(void) {
@@ -206,6 +423,14 @@ void log_unlock(void) {
     pthread_mutex_unlock(&log_mutex);
 }
 
+/**
+ * @brief 驻留字符串并返回驻留的副本，驻留失败时返回原字符串，id为0
+ */
+static const char* intern_field(const char* str, uint32_t* id) {
+    *id = intern_string(str);
+    return *id ? intern_get_string(*id) : str;
+}
+
 /**
  * @brief 通用日志记录函数
  */
@@ -216,11 +441,44 @@ static void log_message(int level, const char* module, const char* format, va_li
     
     char buffer[LOG_BUFFER_SIZE];
     
+    // 设置了记录回调时需要再格式化一次消息正文，先保留一份参数
+    log_record_hook_t hook = g_record_hook;
+    va_list hook_args;
+    if (hook) {
+        va_copy(hook_args, args);
+    }
+    
     log_format_message(buffer, sizeof(buffer), level, module, format, args);
     
     pthread_mutex_lock(&log_mutex);
     write_log(buffer);
     pthread_mutex_unlock(&log_mutex);
+    
+    if (hook) {
+        char message[LOG_BUFFER_SIZE];
+        vsnprintf(message, sizeof(message), format, hook_args);
+        va_end(hook_args);
+        
+        uint32_t module_id;
+        const char* module_name = intern_field(module ? module : "SYSTEM", &module_id);
+        log_entry_t entry = {
+            .timestamp = (unsigned long)time(NULL),
+            .level = (log_level_t)level,
+            .module = module_name,
+            .message = message,
+            .lang_key = NULL,
+            .module_id = module_id,
+            .lang_key_id = 0
+        };
+        hook(&entry, g_record_hook_data);
+    }
+}
+
+void log_set_record_hook(log_record_hook_t hook, void* user_data) {
+    pthread_mutex_lock(&log_mutex);
+    g_record_hook_data = user_data;
+    g_record_hook = hook;
+    pthread_mutex_unlock(&log_mutex);
 }
 
 void log_debug(const char* module, const char* format, ...) {
@@ -256,4 +514,106 @@ void log_fatal(const char* module, const char* format, ...) {
     va_start(args, format);
     log_message(LOG_LEVEL_FATAL, module, format, args);
     va_end(args);
-}
\ No newline at end of file
+}
+
+/**
+ * @brief 将一行日志追加到批量缓冲区，必要时扩容
+ * 
+ * @return 成功返回0，内存不足返回-1
+ */
+static int batch_append(char** buffer, size_t* length, size_t* capacity,
+                        const char* header, const char* module, const char* message) {
+    size_t needed = strlen(header) + strlen(module) + strlen(message) + 4;
+    
+    if (*length + needed + 1 > *capacity) {
+        size_t new_capacity = *capacity * 2;
+        while (*length + needed + 1 > new_capacity) {
+            new_capacity *= 2;
+        }
+        char* new_buffer = realloc(*buffer, new_capacity);
+        if (!new_buffer) {
+            return -1;
+        }
+        *buffer = new_buffer;
+        *capacity = new_capacity;
+    }
+    
+    *length += snprintf(*buffer + *length, *capacity - *length,
+                        "%s[%s] %s\n", header, module, message);
+    return 0;
+}
+
+size_t log_write_batch(const log_entry_t* entries, size_t count) {
+    if (!entries || count == 0) {
+        return 0;
+    }
+    
+    size_t capacity = LOG_BUFFER_SIZE;
+    size_t length = 0;
+    size_t written = 0;
+    char* buffer = malloc(capacity);
+    if (!buffer) {
+        return 0;
+    }
+    
+    // 同一批次共用一个时间戳
+    char time_str[32];
+    time_t now = time(NULL);
+    strftime(time_str, sizeof(time_str), "%Y-%m-%d %H:%M:%S", localtime(&now));
+    
+    for (size_t i = 0; i < count; i++) {
+        const log_entry_t* entry = &entries[i];
+        if (!entry->message || !log_should_log(entry->level)) {
+            continue;
+        }
+        
+        char header[64];
+        snprintf(header, sizeof(header), "[%s][%s]", time_str, log_level_to_string(entry->level));
+        
+        if (batch_append(&buffer, &length, &capacity, header,
+                         entry->module ? entry->module : "SYSTEM", entry->message) != 0) {
+            break;
+        }
+        written++;
+    }
+    
+    if (length > 0) {
+        pthread_mutex_lock(&log_mutex);
+        
+        if (__atomic_load_n(&g_console_enabled, __ATOMIC_RELAXED)) {
+            fwrite(buffer, 1, length, stdout);
+        }
+        
+        prepare_log_file();
+        if (g_log_file_handle) {
+            check_and_rotate();
+            if (g_log_file_handle) {
+                fwrite(buffer, 1, length, g_log_file_handle);
+                fflush(g_log_file_handle);
+            }
+        }
+        
+        pthread_mutex_unlock(&log_mutex);
+    }
+    
+    free(buffer);
+    
+    log_record_hook_t hook = g_record_hook;
+    if (hook && written > 0) {
+        for (size_t i = 0; i < count; i++) {
+            if (!entries[i].message || !log_should_log(entries[i].level)) {
+                continue;
+            }
+            log_entry_t record = entries[i];
+            record.timestamp = (unsigned long)now;
+            if (!record.module_id) {
+                record.module = intern_field(record.module ? record.module : "SYSTEM", &record.module_id);
+            }
+            if (record.lang_key && !record.lang_key_id) {
+                record.lang_key = intern_field(record.lang_key, &record.lang_key_id);
+            }
+            hook(&record, g_record_hook_data);
+        }
+    }
+    return written;
+}
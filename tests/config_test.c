@@ -3,6 +3,7 @@
 #include <string.h>
 #include <assert.h>
 #include "config.h"
+#include "config_parser.h"
 
 /**
  * 测试配置系统默认值
@@ -62,12 +63,197 @@ void test_header_generation() {
     printf("头文件生成完成，路径: include/generated/config_gen.h\n\n");
 }
 
+/**
+ * 解析配置文本，失败时打印错误
+ */
+static config_document_t* parse_text(const char* text) {
+    char error[256];
+    config_document_t* doc = config_parse_string(text, strlen(text), error, sizeof(error));
+    if (!doc) {
+        printf("解析失败: %s\n", error);
+    }
+    return doc;
+}
+
+/**
+ * 测试配置解析器：嵌套映射、序列、流式集合和纯量类型
+ */
+void test_parser_values() {
+    printf("测试配置解析器...\n");
+
+    const char* text =
+        "# 注释\n"
+        "logloom:\n"
+        "  language: \"zh\"\n"
+        "  log:\n"
+        "    level: WARN   # 行尾注释\n"
+        "    max_size: 0x100000\n"
+        "    console: no\n"
+        "  plugin:\n"
+        "    paths:\n"
+        "    - ./plugins\n"
+        "    - '/usr/lib/logloom # plugins'\n"
+        "    keywords: [\"ERROR\", FATAL,\n"
+        "               CRITICAL]\n"
+        "    limits: {rate: 1.5, burst: 10, empty: ~}\n"
+        "    rules:\n"
+        "      - module: db\n"
+        "        level: WARN\n"
+        "      - module: net\n"
+        "    description: first line\n"
+        "      second line\n";
+    config_document_t* doc = parse_text(text);
+    assert(doc != NULL);
+    const config_node_t* root = config_document_root(doc);
+
+    assert(strcmp(config_node_get_string(root, "logloom.language", NULL), "zh") == 0);
+    assert(strcmp(config_node_get_string(root, "logloom.log.level", NULL), "WARN") == 0);
+    assert(config_node_get_int(root, "logloom.log.max_size", 0) == 0x100000);
+    assert(config_node_get_bool(root, "logloom.log.console", true) == false);
+
+    const config_node_t* paths = config_node_get(root, "logloom.plugin.paths");
+    assert(paths && paths->type == CONFIG_NODE_SEQUENCE && paths->count == 2);
+    assert(strcmp(paths->child->next->text, "/usr/lib/logloom # plugins") == 0);
+
+    const config_node_t* keywords = config_node_get(root, "logloom.plugin.keywords");
+    assert(keywords && keywords->type == CONFIG_NODE_SEQUENCE && keywords->count == 3);
+    assert(strcmp(keywords->child->next->next->text, "CRITICAL") == 0);
+
+    const config_node_t* limits = config_node_get(root, "logloom.plugin.limits");
+    assert(config_node_child(limits, "rate")->type == CONFIG_NODE_FLOAT);
+    assert(config_node_child(limits, "rate")->float_value == 1.5);
+    assert(config_node_get_int(limits, "burst", 0) == 10);
+    assert(config_node_child(limits, "empty")->type == CONFIG_NODE_NULL);
+
+    const config_node_t* rules = config_node_get(root, "logloom.plugin.rules");
+    assert(rules && rules->count == 2);
+    assert(rules->child->type == CONFIG_NODE_MAPPING && rules->child->count == 2);
+    assert(strcmp(config_node_get_string(rules->child->next, "module", NULL), "net") == 0);
+
+    assert(strcmp(config_node_get_string(root, "logloom.plugin.description", NULL),
+                  "first line second line") == 0);
+    assert(config_node_get(root, "logloom.missing.key") == NULL);
+
+    config_document_free(doc);
+    printf("配置解析器测试通过\n\n");
+}
+
+/**
+ * 测试配置解析器的错误报告
+ */
+void test_parser_errors() {
+    printf("测试配置解析错误...\n");
+
+    const char* invalid[] = {
+        "a:\n\tb: 1\n",             /* 缩进中的制表符 */
+        "a: 1\na: 2\n",             /* 重复的键 */
+        "a: 1\n  b: 2\n",           /* 错误的缩进 */
+        "a: [1, 2\n",               /* 未闭合的流式序列 */
+        "a: \"open\n",              /* 未闭合的字符串 */
+        "a: &anchor 1\n",           /* 不支持锚点 */
+        "a: |\n  block\n",          /* 不支持块纯量 */
+        NULL
+    };
+    for (int i = 0; invalid[i]; i++) {
+        char error[256] = "";
+        assert(config_parse_string(invalid[i], strlen(invalid[i]), error, sizeof(error)) == NULL);
+        assert(strncmp(error, "line ", 5) == 0);
+    }
+
+    char error[256];
+    assert(config_parse_string("a: 1\na: 2\n", 10, error, sizeof(error)) == NULL);
+    assert(strcmp(error, "line 2: duplicate key 'a'") == 0);
+
+    printf("配置解析错误测试通过\n\n");
+}
+
+/**
+ * 测试配置文档缓存：文件未变化时返回同一文档，变化后重新解析
+ */
+void test_document_cache() {
+    printf("测试配置文档缓存...\n");
+
+    char path[] = "/tmp/logloom_config_test_XXXXXX";
+    int fd = mkstemp(path);
+    assert(fd >= 0);
+    FILE* file = fdopen(fd, "w");
+    fputs("logloom:\n  language: en\n", file);
+    fclose(file);
+
+    const config_document_t* first = config_load_document(path, NULL, 0);
+    assert(first != NULL);
+    assert(config_load_document(path, NULL, 0) == first);
+
+    file = fopen(path, "w");
+    fputs("logloom:\n  language: zh\n  log:\n    level: ERROR\n", file);
+    fclose(file);
+
+    const config_document_t* second = config_load_document(path, NULL, 0);
+    assert(second != NULL && second != first);
+    assert(strcmp(config_node_get_string(config_document_root(second), "logloom.language", NULL), "zh") == 0);
+    /* 旧文档在清理前保持有效 */
+    assert(strcmp(config_node_get_string(config_document_root(first), "logloom.language", NULL), "en") == 0);
+
+    assert(config_load_from_file(path) == 0);
+    assert(strcmp(config_get_language(), "zh") == 0);
+    assert(strcmp(config_get_log_level(), "ERROR") == 0);
+
+    char error[256];
+    assert(config_load_document("/nonexistent/logloom.yaml", error, sizeof(error)) == NULL);
+    assert(strstr(error, "/nonexistent/logloom.yaml") != NULL);
+
+    config_clear_documents();
+    remove(path);
+    printf("配置文档缓存测试通过\n\n");
+}
+
+void test_config_reload() {
+    printf("测试配置重新加载...\n");
+
+    char path[] = "/tmp/logloom_reload_test_XXXXXX";
+    int fd = mkstemp(path);
+    assert(fd >= 0);
+    FILE* file = fdopen(fd, "w");
+    fputs("logloom:\n  language: en\n  log:\n    level: INFO\n    max_size: 1024\n", file);
+    fclose(file);
+
+    unsigned int changed = 0;
+    assert(config_load_from_file(path) == 0);
+    assert(config_reload(NULL, &changed) == 0);
+    assert(changed == 0 && "文件未变化时不应有变化的配置项");
+
+    file = fopen(path, "w");
+    fputs("logloom:\n  language: en\n  log:\n    level: DEBUG\n    max_size: 4096\n    file: app.log\n", file);
+    fclose(file);
+    assert(config_reload(NULL, &changed) == 0);
+    assert(changed == (CONFIG_CHANGED_LOG_LEVEL | CONFIG_CHANGED_MAX_SIZE | CONFIG_CHANGED_LOG_FILE));
+    assert(strcmp(config_get_log_level(), "DEBUG") == 0);
+    assert(config_get_max_log_size() == 4096);
+
+    /* 解析失败时保留当前配置 */
+    file = fopen(path, "w");
+    fputs("logloom:\n  log:\n    level: WARN\n    level: ERROR\n", file);
+    fclose(file);
+    assert(config_reload(path, &changed) != 0);
+    assert(changed == 0);
+    assert(strcmp(config_get_log_level(), "DEBUG") == 0);
+    assert(strcmp(config_get_log_file(), "app.log") == 0);
+
+    config_clear_documents();
+    remove(path);
+    printf("配置重新加载测试通过\n\n");
+}
+
 int main() {
     printf("===== Logloom 配置系统测试 =====\n\n");
     
     test_default_config();
     test_load_from_file();
     test_header_generation();
+    test_parser_values();
+    test_parser_errors();
+    test_document_cache();
+    test_config_reload();
     
     config_cleanup();
     
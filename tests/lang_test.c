@@ -6,6 +6,8 @@
 #include <stdlib.h>
 #include <string.h>
 #include <assert.h>
+#include <pthread.h>
+#include <unistd.h>
 
 #include "lang.h"
 #include "generated/lang_registry.h"
@@ -89,6 +91,135 @@ void test_lang_error_handling() {
     printf("测试4通过！\n\n");
 }
 
+// 线程语言测试的工作线程：设置线程语言后读取文本
+static void* thread_language_worker(void* arg) {
+    const char** out = (const char**)arg;
+    bool ok = lang_set_thread_language("zh");
+    assert(ok && "设置线程语言应该成功");
+    out[0] = lang_get("system.start_message");
+    out[1] = lang_get_current();
+    return NULL;
+}
+
+// 测试线程语言和按语言查找不影响全局语言
+void test_lang_thread_language() {
+    printf("测试5：测试线程语言和按语言查找\n");
+    
+    const char* text_en = lang_get("system.start_message");
+    const char* text_zh = lang_get_in("zh", "system.start_message");
+    assert(strcmp(text_en, text_zh) != 0 && "按语言查找应该返回该语言的文本");
+    assert(strcmp(lang_get_current(), "en") == 0 && "按语言查找不应切换全局语言");
+    
+    // 工作线程的线程语言不影响本线程
+    const char* results[2] = {NULL, NULL};
+    pthread_t thread;
+    pthread_create(&thread, NULL, thread_language_worker, results);
+    pthread_join(thread, NULL);
+    assert(strcmp(results[0], text_zh) == 0 && "工作线程应该使用线程语言");
+    assert(strcmp(results[1], "zh") == 0 && "工作线程的当前语言应该是线程语言");
+    assert(strcmp(lang_get("system.start_message"), text_en) == 0 && "本线程应该仍使用全局语言");
+    
+    // 设置后再清除本线程的线程语言
+    assert(lang_set_thread_language("zh"));
+    assert(strcmp(lang_get("system.start_message"), text_zh) == 0);
+    assert(lang_set_thread_language(NULL));
+    assert(strcmp(lang_get_current(), "en") == 0 && "清除线程语言后应恢复全局语言");
+    
+    printf("测试5通过！\n\n");
+}
+
+// 写入测试用的语言资源文件
+static void write_lang_file(const char* path, const char* content) {
+    FILE* fp = fopen(path, "w");
+    assert(fp && "应该能创建测试语言文件");
+    fputs(content, fp);
+    fclose(fp);
+}
+
+// 测试热加载：修改文件后重建语言表并统计键差异
+void test_lang_hot_reload() {
+    printf("测试6：测试语言资源热加载\n");
+    
+    char dir_template[] = "/tmp/logloom_lang_test_XXXXXX";
+    char* dir = mkdtemp(dir_template);
+    assert(dir && "应该能创建临时目录");
+    char path[512];
+    snprintf(path, sizeof(path), "%s/xx.yaml", dir);
+    
+    write_lang_file(path, "app:\n  title: \"Old\"\n  gone: \"Bye\"\n");
+    assert(lang_register_file(path, "xx"));
+    assert(strcmp(lang_get_in("xx", "app.title"), "Old") == 0);
+    const char* old_title = lang_get_in("xx", "app.title");
+    
+    // 修改后手动检查一次（文件大小变化，不依赖mtime精度）
+    write_lang_file(path, "app:\n  title: \"Brand new\"\n  added: \"Hi\"\n");
+    assert(lang_reload_changed() == 1 && "应该重建一种语言");
+    assert(strcmp(lang_get_in("xx", "app.title"), "Brand new") == 0);
+    assert(strcmp(lang_get_in("xx", "app.added"), "Hi") == 0);
+    assert(strcmp(old_title, "Old") == 0 && "旧表中的字符串应保持有效");
+    
+    lang_reload_stats_t stats;
+    lang_get_reload_stats(&stats);
+    assert(stats.reload_count == 1);
+    assert(stats.keys_added == 1 && stats.keys_removed == 1 && stats.keys_changed == 1);
+    printf("重建耗时：%.3f ms\n", stats.last_latency_ms);
+    
+    // 监视线程自动发现修改
+    assert(lang_watch_start(50));
+    write_lang_file(path, "app:\n  title: \"From watcher\"\n");
+    for (int i = 0; i < 100 && strcmp(lang_get_in("xx", "app.title"), "From watcher") != 0; i++) {
+        usleep(20 * 1000);
+    }
+    lang_watch_stop();
+    assert(strcmp(lang_get_in("xx", "app.title"), "From watcher") == 0 && "监视线程应该重新加载修改的文件");
+    
+    unlink(path);
+    rmdir(dir);
+    printf("测试6通过！\n\n");
+}
+
+// 测试并行加载目录：多个文件的键合并，冲突时先注册（文件名靠前）的值生效
+void test_lang_parallel_scan() {
+    printf("测试7：测试并行加载语言资源目录\n");
+    
+    char dir_template[] = "/tmp/logloom_lang_scan_XXXXXX";
+    char* dir = mkdtemp(dir_template);
+    assert(dir && "应该能创建临时目录");
+    
+    char path[512], content[256];
+    for (int i = 0; i < 12; i++) {
+        snprintf(path, sizeof(path), "%s/p%02d_qq.yaml", dir, i);
+        snprintf(content, sizeof(content), "plugin%02d:\n  name: \"Plugin %d\"\napp:\n  title: \"Title %d\"\n", i, i, i);
+        write_lang_file(path, content);
+    }
+    snprintf(path, sizeof(path), "%s/notes.txt", dir);
+    write_lang_file(path, "not a language file\n");
+    
+    assert(lang_scan_directory(dir, "*.yaml") == 12 && "应该加载所有yaml文件");
+    assert(strcmp(lang_get_in("qq", "plugin00.name"), "Plugin 0") == 0);
+    assert(strcmp(lang_get_in("qq", "plugin11.name"), "Plugin 11") == 0);
+    assert(strcmp(lang_get_in("qq", "app.title"), "Title 0") == 0 && "冲突的键应保留排序靠前文件的值");
+    
+    // 目录未变化时使用缓存的列表，重复扫描结果相同
+    assert(lang_scan_directory(dir, "*.yaml") == 12);
+    assert(strcmp(lang_get_in("qq", "app.title"), "Title 0") == 0);
+    
+    // 新增文件会更新目录mtime，缓存的列表随之刷新
+    snprintf(path, sizeof(path), "%s/p12_qq.yaml", dir);
+    write_lang_file(path, "plugin12:\n  name: \"Plugin 12\"\n");
+    assert(lang_scan_directory(dir, "*.yaml") == 13);
+    assert(strcmp(lang_get_in("qq", "plugin12.name"), "Plugin 12") == 0);
+    
+    for (int i = 0; i <= 12; i++) {
+        snprintf(path, sizeof(path), "%s/p%02d_qq.yaml", dir, i);
+        unlink(path);
+    }
+    snprintf(path, sizeof(path), "%s/notes.txt", dir);
+    unlink(path);
+    rmdir(dir);
+    printf("测试7通过！\n\n");
+}
+
 int main() {
     printf("=== 开始语言模块测试 ===\n\n");
     
@@ -97,6 +228,9 @@ int main() {
     test_lang_format();
     test_lang_switch();
     test_lang_error_handling();
+    test_lang_thread_language();
+    test_lang_hot_reload();
+    test_lang_parallel_scan();
     
     // 清理资源
     lang_cleanup();
@@ -2,8 +2,12 @@
 #include <stdlib.h>
 #include <string.h>
 #include <unistd.h>
+#include <assert.h>
+#include <signal.h>
+#include <sys/stat.h>
 #include "log.h"
 #include "lang.h"
+#include "intern.h"
 
 // 测试模块名称
 #define TEST_MODULE "TEST"
@@ -71,6 +75,154 @@ void test_console_disable() {
     printf("Console output re-enabled\n\n");
 }
 
+// 记录回调收到的条目
+static log_entry_t hooked_entries[4];
+static int hooked_count = 0;
+
+static void capture_hook(const log_entry_t* entry, void* user_data) {
+    (void)user_data;
+    if (hooked_count < 4) {
+        hooked_entries[hooked_count++] = *entry;
+    }
+}
+
+// 测试模块名称和语言键的驻留
+void test_interned_records() {
+    printf("Testing interned module names and language keys...\n");
+    
+    uint32_t id = intern_string(TEST_MODULE);
+    assert(id != 0 && intern_string("TEST") == id && "同一字符串应得到同一ID");
+    assert(intern_lookup("never.interned.module") == 0);
+    assert(strcmp(intern_get_string(id), TEST_MODULE) == 0);
+    assert(intern_get_string(0) == NULL);
+    
+    char module[16];
+    snprintf(module, sizeof(module), "%s", "OTHER");
+    uint32_t other = intern_string(module);
+    snprintf(module, sizeof(module), "%s", "THIRD");
+    assert(intern_string(module) != other && "复用的缓冲区内容变化后应得到新ID");
+    
+    log_set_console_enabled(0);
+    log_set_record_hook(capture_hook, NULL);
+    log_info(TEST_MODULE, "first");
+    log_warn(TEST_MODULE, "second");
+    log_with_lang(LOG_LEVEL_INFO, TEST_MODULE, "test.hello", "World");
+    log_set_record_hook(NULL, NULL);
+    log_set_console_enabled(1);
+    
+    assert(hooked_count == 3);
+    assert(hooked_entries[0].module_id == id && hooked_entries[1].module_id == id);
+    assert(hooked_entries[0].module == hooked_entries[1].module && "模块名称应只保存一份");
+    assert(hooked_entries[2].lang_key_id == intern_lookup("test.hello"));
+    assert(strcmp(hooked_entries[2].lang_key, "test.hello") == 0);
+    
+    printf("Done testing interned records\n\n");
+}
+
+// 统计文件中包含指定文本的行数
+static int count_lines(const char* path, const char* text) {
+    FILE* file = fopen(path, "r");
+    if (!file) {
+        return -1;
+    }
+    char line[512];
+    int count = 0;
+    while (fgets(line, sizeof(line), file)) {
+        if (strstr(line, text)) {
+            count++;
+        }
+    }
+    fclose(file);
+    return count;
+}
+
+// 测试运行时切换日志文件和级别
+void test_swap_file() {
+    printf("Testing runtime log file swap...\n");
+    
+    const char* swapped = "log_test_swap.log";
+    remove(swapped);
+    log_set_console_enabled(0);
+    
+    log_info(TEST_MODULE, "before swap");
+    assert(log_swap_file(swapped));
+    assert(strcmp(log_get_file_path(), swapped) == 0);
+    log_info(TEST_MODULE, "after swap");
+    assert(!log_swap_file("/nonexistent/dir/log_test.log") && "无法打开的文件不应替换当前文件");
+    
+    log_set_level("ERROR");
+    assert(log_get_level() == LOG_LEVEL_ERROR);
+    log_warn(TEST_MODULE, "filtered after level swap");
+    log_set_level("INFO");
+    
+    assert(log_swap_file(LOG_TEST_FILE));
+    log_info(TEST_MODULE, "swapped back");
+    log_set_console_enabled(1);
+    
+    assert(count_lines(swapped, "before swap") == 0);
+    assert(count_lines(swapped, "after swap") == 1);
+    assert(count_lines(swapped, "filtered after level swap") == 0);
+    assert(count_lines(swapped, "swapped back") == 0);
+    assert(count_lines(LOG_TEST_FILE, "swapped back") >= 1);
+    remove(swapped);
+    
+    printf("Done testing log file swap\n\n");
+}
+
+// 测试外部轮转后重新打开日志文件
+void test_external_rotation() {
+    printf("Testing reopen after external rotation...\n");
+    
+    const char* path = "log_test_reopen.log";
+    const char* rotated = "log_test_reopen.log.1";
+    remove(path);
+    remove(rotated);
+    log_set_console_enabled(0);
+    log_set_max_file_size(1024 * 1024);
+    assert(log_swap_file(path));
+    
+    // SIGHUP只设置标志，下一次写日志时重新打开
+    assert(log_reopen_on_signal(SIGHUP));
+    log_info(TEST_MODULE, "before rotate");
+    assert(rename(path, rotated) == 0);
+    raise(SIGHUP);
+    log_info(TEST_MODULE, "after signal");
+    assert(count_lines(rotated, "before rotate") == 1);
+    assert(count_lines(rotated, "after signal") == 0);
+    assert(count_lines(path, "after signal") == 1);
+    
+    // log_reopen在调用线程打开新文件
+    remove(rotated);
+    assert(rename(path, rotated) == 0);
+    assert(log_reopen());
+    log_info(TEST_MODULE, "after reopen");
+    assert(count_lines(path, "after reopen") == 1);
+    
+    // 没有请求时按inode发现文件被改名，按大小发现文件被截断
+    remove(rotated);
+    assert(rename(path, rotated) == 0);
+    sleep(1);
+    log_info(TEST_MODULE, "after rename");
+    assert(count_lines(rotated, "after rename") == 0);
+    assert(count_lines(path, "after rename") == 1);
+    
+    assert(truncate(path, 0) == 0);
+    sleep(1);
+    log_info(TEST_MODULE, "after truncate");
+    struct stat st;
+    assert(stat(path, &st) == 0);
+    assert(count_lines(path, "after truncate") == 1);
+    assert(st.st_size < 128 && "截断后不应在文件开头留下空洞");
+    
+    assert(log_swap_file(LOG_TEST_FILE));
+    log_set_max_file_size(1024);
+    log_set_console_enabled(1);
+    remove(path);
+    remove(rotated);
+    
+    printf("Done testing external rotation\n\n");
+}
+
 int main() {
     // 初始化语言系统
     if (lang_init("en") != 0) {
@@ -99,6 +251,9 @@ int main() {
     test_log_filtering();
     test_multilanguage();
     test_console_disable();
+    test_interned_records();
+    test_swap_file();
+    test_external_rotation();
     
     // 生成足够多的日志以触发轮转
     printf("Testing log rotation (generating many logs)...\n");
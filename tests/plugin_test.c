@@ -35,6 +35,7 @@ extern const plugin_info_t* plugin_get_info_by_name(const char* name);
 extern int plugin_get_config_int(const char* plugin_name, const char* key, int default_value);
 extern const char* plugin_get_config_string(const char* plugin_name, const char* key, const char* default_value);
 extern bool plugin_get_config_bool(const char* plugin_name, const char* key, bool default_value);
+extern int plugin_get_config_string_array(const char* plugin_name, const char* key, const char** values, int max_count);
 
 // 测试插件实现函数
 int plugin_init(const plugin_helpers_t* helpers) {
@@ -175,6 +176,137 @@ static void test_sample_filter_plugin(void) {
            should_pass_lower_error ? "通过" : "过滤");
 }
 
+// 测试插件处理统计
+static void test_plugin_stats(void) {
+    printf("\n===== 测试插件处理统计 =====\n");
+    
+    plugin_stats_t stats;
+    if (!plugin_get_stats("sample_filter", &stats)) {
+        printf("未加载示例过滤器插件，跳过统计检查\n");
+        return;
+    }
+    
+    printf("调用次数：%lu，过滤次数：%lu，错误次数：%lu\n", stats.calls, stats.filtered, stats.errors);
+    printf("平均耗时：%.2f 微秒，最大耗时：%.2f 微秒\n",
+           stats.calls ? stats.total_ns / 1000.0 / stats.calls : 0.0, stats.max_ns / 1000.0);
+    
+    // 示例过滤器测试中处理了5条日志
+    assert(stats.calls >= 5);
+    assert(stats.filtered <= stats.calls);
+    
+    unsigned long histogram_total = 0;
+    for (size_t i = 0; i < PLUGIN_STATS_BUCKETS; i++) {
+        histogram_total += stats.histogram[i];
+    }
+    assert(histogram_total == stats.calls);
+    
+    assert(!plugin_get_stats("no_such_plugin", &stats));
+}
+
+// 测试插件配置快照的重新加载
+static void test_plugin_config_reload(void) {
+    printf("\n===== 测试插件配置重新加载 =====\n");
+    
+    const char* values[4];
+    int changed = plugin_reload_config(
+        "{\"config_test\": {\"limit\": 42, \"name\": \"first\", \"verbose\": true, "
+        "\"tags\": [\"a\", 1, \"b\"]}}");
+    assert(changed >= 0);
+    assert(plugin_get_config_int("config_test", "limit", 0) == 42);
+    assert(strcmp(plugin_get_config_string("config_test", "name", ""), "first") == 0);
+    assert(plugin_get_config_bool("config_test", "verbose", false));
+    assert(plugin_get_config_string_array("config_test", "tags", values, 4) == 2);
+    assert(strcmp(values[1], "b") == 0);
+    
+    // 类型不匹配或不存在的键返回默认值
+    assert(plugin_get_config_int("config_test", "name", 7) == 7);
+    assert(plugin_get_config_int("config_test", "missing", 7) == 7);
+    assert(plugin_get_config_int("no_such_plugin", "limit", 7) == 7);
+    
+    // 替换后读取新值，之前返回的字符串仍然有效
+    const char* old_name = plugin_get_config_string("config_test", "name", "");
+    assert(plugin_reload_config("{\"config_test\": {\"limit\": 5, \"name\": \"second\"}}") >= 0);
+    assert(plugin_get_config_int("config_test", "limit", 0) == 5);
+    assert(strcmp(plugin_get_config_string("config_test", "name", ""), "second") == 0);
+    assert(!plugin_get_config_bool("config_test", "verbose", false));
+    assert(strcmp(old_name, "first") == 0);
+    
+    assert(plugin_reload_config("not json") == -1);
+    assert(plugin_get_config_int("config_test", "limit", 0) == 5);
+    
+    // 恢复生成的默认配置
+    assert(plugin_reload_config(NULL) >= 0);
+    printf("插件配置重新加载测试通过\n");
+}
+
+// 读取插件统计中的调用次数和条目数
+static void get_call_counts(const char* name, unsigned long* calls, unsigned long* entries) {
+    plugin_stats_t stats;
+    assert(plugin_get_stats(name, &stats));
+    *calls = stats.calls;
+    *entries = stats.entries;
+}
+
+// 测试同步批处理输出插件的批次累积
+static void test_plugin_batch_sink(void) {
+    printf("\n===== 测试批处理输出插件 =====\n");
+    
+    if (!plugin_get_info_by_name("sample_batch_sink")) {
+        printf("未加载示例批处理插件，跳过批次累积检查\n");
+        return;
+    }
+    
+    unsigned long calls, entries, base_calls, base_entries;
+    plugin_flush_batches();
+    assert(plugin_reload_config(
+        "{\"sample_batch_sink\": {\"batch_size\": 4, \"batch_interval_ms\": 60000}}") >= 1);
+    get_call_counts("sample_batch_sink", &base_calls, &base_entries);
+    
+    // 未达到批次大小时条目留在缓冲中
+    log_entry_t batch[6];
+    for (int i = 0; i < 6; i++) {
+        batch[i] = create_test_log_entry("批处理测试日志");
+    }
+    for (int i = 0; i < 3; i++) {
+        plugin_sink_log(&batch[i]);
+    }
+    get_call_counts("sample_batch_sink", &calls, &entries);
+    assert(calls == base_calls && entries == base_entries);
+    
+    // 第4条达到批次大小，整批交付一次
+    plugin_sink_log(&batch[3]);
+    get_call_counts("sample_batch_sink", &calls, &entries);
+    assert(calls == base_calls + 1 && entries == base_entries + 4);
+    
+    // 批量分发与逐条分发共用缓冲：6条交付一批4条，剩余2条由flush交付
+    plugin_sink_log_batch(batch, 6);
+    get_call_counts("sample_batch_sink", &calls, &entries);
+    assert(calls == base_calls + 2 && entries == base_entries + 8);
+    plugin_flush_batches();
+    get_call_counts("sample_batch_sink", &calls, &entries);
+    assert(calls == base_calls + 3 && entries == base_entries + 10);
+    
+    // 最早的条目超过最长累积时间后，下一次分发时交付
+    assert(plugin_reload_config(
+        "{\"sample_batch_sink\": {\"batch_size\": 4, \"batch_interval_ms\": 200}}") >= 1);
+    plugin_sink_log(&batch[0]);
+    usleep(300000);
+    plugin_sink_log(&batch[1]);
+    get_call_counts("sample_batch_sink", &calls, &entries);
+    assert(calls == base_calls + 4 && entries == base_entries + 12);
+    
+    // 禁用插件时交付已累积的条目
+    plugin_sink_log(&batch[2]);
+    assert(plugin_set_enabled("sample_batch_sink", false));
+    get_call_counts("sample_batch_sink", &calls, &entries);
+    assert(calls == base_calls + 5 && entries == base_entries + 13);
+    assert(plugin_set_enabled("sample_batch_sink", true));
+    
+    // 恢复生成的默认配置
+    assert(plugin_reload_config(NULL) >= 0);
+    printf("批处理输出插件测试通过\n");
+}
+
 // 测试插件API调用
 static void test_plugin_api(void) {
     printf("\n===== 测试插件API调用 =====\n");
@@ -213,6 +345,15 @@ int main(int argc, char* argv[]) {
     // 测试示例过滤器插件
     test_sample_filter_plugin();
     
+    // 测试插件处理统计
+    test_plugin_stats();
+    
+    // 测试插件配置重新加载
+    test_plugin_config_reload();
+    
+    // 测试批处理输出插件
+    test_plugin_batch_sink();
+    
     // 测试插件API调用
     test_plugin_api();
     
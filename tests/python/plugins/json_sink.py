@@ -45,7 +45,7 @@ class JsonSinkPlugin(SinkPlugin):
             version="1.0.0",
             author="Logloom Team",
             mode=PluginMode.SYNC,
-            capabilities=PluginCapability.JSON,
+            capabilities=PluginCapability.JSON | PluginCapability.BATCH,
             description="将日志条目输出为JSON格式"
         )
         self._output_file = None
@@ -92,21 +92,9 @@ class JsonSinkPlugin(SinkPlugin):
             print("[JsonSinkPlugin] 未初始化输出文件")
             return PluginResult.ERROR
         
-        # 构建JSON记录
-        log_record = {
-            "timestamp": log_entry.timestamp,
-            "datetime": datetime.fromtimestamp(log_entry.timestamp).isoformat(),
-            "level": log_entry.level,
-            "message": log_entry.message,
-            "module": log_entry.module,
-            "file": log_entry.file,
-            "line": log_entry.line,
-            "context": log_entry.context
-        }
-        
         try:
             # 写入JSON记录
-            json_line = json.dumps(log_record)
+            json_line = json.dumps(self._build_record(log_entry))
             self._output_file.write(json_line + "\n")
             self._output_file.flush()
             print(f"[JsonSinkPlugin] 写入日志: {log_entry.message}")
@@ -115,6 +103,44 @@ class JsonSinkPlugin(SinkPlugin):
             print(f"[JsonSinkPlugin] 写入日志失败: {str(e)}")
             return PluginResult.ERROR
     
+    def process_batch(self, entries):
+        """
+        批量处理日志条目，整批写入后只刷新一次文件
+        
+        Args:
+            entries: 日志条目列表
+        
+        Returns:
+            处理结果状态码
+        """
+        if not self._output_file:
+            print("[JsonSinkPlugin] 未初始化输出文件")
+            return PluginResult.ERROR
+        
+        try:
+            self._output_file.write("".join(
+                json.dumps(self._build_record(entry)) + "\n" for entry in entries
+            ))
+            self._output_file.flush()
+            print(f"[JsonSinkPlugin] 批量写入日志: {len(entries)} 条")
+            return PluginResult.OK
+        except Exception as e:
+            print(f"[JsonSinkPlugin] 批量写入日志失败: {str(e)}")
+            return PluginResult.ERROR
+    
+    def _build_record(self, log_entry):
+        """构建单条日志的JSON记录"""
+        return {
+            "timestamp": log_entry.timestamp,
+            "datetime": datetime.fromtimestamp(log_entry.timestamp).isoformat(),
+            "level": log_entry.level,
+            "message": log_entry.message,
+            "module": log_entry.module,
+            "file": log_entry.file,
+            "line": log_entry.line,
+            "context": log_entry.context
+        }
+    
     def shutdown(self):
         """关闭插件"""
         if self._output_file:
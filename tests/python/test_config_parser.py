@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Logloom 配置解析器测试
+====================
+
+测试配置解析器与PyYAML的safe_load结果一致、错误报告和解析缓存
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import yaml
+
+# 添加模块路径
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src' / 'bindings' / 'python'))
+
+from logloom_py import config_loader
+from logloom_py.config_loader import ConfigError, parse_config_text, load_config
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+
+def make_plugin_config(count):
+    """生成包含count个插件配置的大配置文件内容"""
+    plugins = {}
+    for i in range(count):
+        plugins[f"plugin_{i}"] = {
+            "enabled": i % 2 == 0,
+            "priority": i,
+            "threshold": i * 0.5,
+            "keywords": [f"kw{j}" for j in range(5)],
+            "module_levels": [f"mod{j}:WARN" for j in range(3)],
+            "output": {"format": "json", "path": f"/var/log/p{i}.log", "max_size": 1048576},
+            "description": f"plugin #{i} isn't \"quoted\" # not a comment",
+        }
+    doc = {"logloom": {"language": "en", "plugin": {"enabled": list(plugins)[:5], "config": plugins}}}
+    return yaml.safe_dump(doc, sort_keys=False, allow_unicode=True)
+
+
+class ConfigParserTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        config_loader.clear_config_cache()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_matches_safe_load(self):
+        """测试项目配置文件和生成的大插件配置与safe_load结果一致"""
+        with open(PROJECT_ROOT / 'config.yaml', encoding='utf-8') as f:
+            text = f.read()
+        self.assertEqual(parse_config_text(text), yaml.safe_load(text))
+
+        text = make_plugin_config(200)
+        for flow_style in (False, None, True):
+            text = yaml.safe_dump(yaml.safe_load(text), default_flow_style=flow_style, width=2 ** 30)
+            self.assertEqual(parse_config_text(text), yaml.safe_load(text))
+
+    def test_scalars_and_layout(self):
+        """测试YAML 1.1纯量规则、多行值和序列中的映射"""
+        text = (
+            "ints: [0x1F, 017, 0b101, 1_000, -5, 1:30]\n"
+            "floats: [1.5, 1.0e+3, .inf, -.inf]\n"
+            "bools: [yes, No, on, OFF, true]\n"
+            "nulls: [~, null, ]\n"
+            "strings: [1e3, '1', 2001-12-14, it's]\n"
+            "quoted: \"tab\\t\\u00e9 \\\n"
+            "  joined\"\n"
+            "folded: 'first\n"
+            "\n"
+            "  second'\n"
+            "plain: one\n"
+            "  two\n"
+            "rules:\n"
+            "- module: db\n"
+            "  level: WARN\n"
+            "- [a, b]\n"
+        )
+        result = parse_config_text(text)
+        self.assertEqual(result["ints"], [31, 15, 5, 1000, -5, 90])
+        self.assertEqual(result["floats"], [1.5, 1000.0, float("inf"), float("-inf")])
+        self.assertEqual(result["bools"], [True, False, True, False, True])
+        self.assertEqual(result["nulls"], [None, None])
+        self.assertEqual(result["strings"], ["1e3", "1", "2001-12-14", "it's"])
+        self.assertEqual(result["quoted"], "tab\té joined")
+        self.assertEqual(result["folded"], "first\nsecond")
+        self.assertEqual(result["plain"], "one two")
+        self.assertEqual(result["rules"], [{"module": "db", "level": "WARN"}, ["a", "b"]])
+
+    def test_errors(self):
+        """测试语法错误和不支持的特性报告行号"""
+        cases = {
+            "a:\n\tb: 1\n": "line 2: tabs are not allowed in indentation",
+            "a: 1\nb: 2\na: 3\n": "line 3: duplicate key 'a'",
+            "a: 1\n  b: 2\n": "line 1: mapping values are not allowed here",
+            "a: [1, 2\n": "line 1: unterminated flow collection, expected ']'",
+            "a: &x 1\n": "line 1: anchors are not supported",
+            "a: |\n  text\n": "line 1: block scalars are not supported",
+            "a: \"\\q\"\n": "line 1: invalid escape sequence '\\q'",
+        }
+        for text, message in cases.items():
+            with self.subTest(text=text):
+                with self.assertRaises(ConfigError) as ctx:
+                    parse_config_text(text)
+                self.assertEqual(str(ctx.exception), message)
+
+    def test_load_config_cache(self):
+        """测试文件未变化时复用解析结果，返回的副本互不影响"""
+        path = os.path.join(self.temp_dir, "config.yaml")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("logloom:\n  language: en\n  log:\n    level: INFO\n")
+
+        first = load_config(path)
+        first["logloom"]["language"] = "changed"
+        self.assertEqual(load_config(path)["logloom"]["language"], "en")
+        self.assertEqual(len(config_loader._cache), 1)
+
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("logloom:\n  language: zh\n")
+        self.assertEqual(load_config(path), {"logloom": {"language": "zh"}})
+
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("logloom:\n  language: zh\n  language: en\n")
+        with self.assertRaises(ConfigError) as ctx:
+            load_config(path)
+        self.assertIn("line 3: duplicate key 'language'", str(ctx.exception))
+
+        with self.assertRaises(OSError):
+            load_config(os.path.join(self.temp_dir, "missing.yaml"))
+
+
+if __name__ == "__main__":
+    unittest.main()
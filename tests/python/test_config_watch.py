@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Logloom 运行时重新配置测试
+========================
+
+测试配置项提取与比较、只应用变化的配置项、配置文件监视和插件列表切换
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+# 添加模块路径
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src' / 'bindings' / 'python'))
+
+from logloom_py import logloom_pure, config_loader
+from logloom_py.config_loader import ConfigError
+from logloom_py.config_watch import ConfigWatcher, DEFAULT_SETTINGS, config_settings, diff_settings
+from logloom.plugin import SinkPlugin, PluginResult
+from logloom.plugin.loader import PluginManager
+
+
+class NamedSink(SinkPlugin):
+    """不做任何处理的输出插件"""
+
+    def __init__(self, name):
+        super().__init__(name=name, version="1.0.0", author="test")
+
+    def init(self, helpers):
+        return 0
+
+    def process(self, log_entry):
+        return PluginResult.OK
+
+    def shutdown(self):
+        pass
+
+
+class ConfigWatchTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_path = os.path.join(self.temp_dir, "config.yaml")
+        config_loader.clear_config_cache()
+
+    def tearDown(self):
+        logloom_pure.cleanup()
+        logloom_pure.set_log_file(None)
+        logloom_pure.set_log_level("INFO")
+        logloom_pure.set_output_console(True)
+        logloom_pure._config_path = None
+        shutil.rmtree(self.temp_dir)
+
+    def write_config(self, log, extra=""):
+        """写入只包含log节的配置文件，并保证mtime与上一次不同"""
+        lines = ["logloom:", "  language: en", "  log:"]
+        lines += [f"    {key}: {value}" for key, value in log.items()]
+        with open(self.config_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n" + extra)
+        stat = os.stat(self.config_path)
+        os.utime(self.config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000))
+
+    def test_config_settings_and_diff(self):
+        """测试缺失的配置项取默认值，diff只包含变化的配置项"""
+        self.assertEqual(config_settings({}), DEFAULT_SETTINGS)
+
+        settings = config_settings({"logloom": {
+            "log": {"level": "debug", "file": "", "max_size": "2048"},
+            "plugin": {"enabled": ["a", "b"]},
+        }})
+        self.assertEqual(settings["level"], "DEBUG")
+        self.assertIsNone(settings["file"])
+        self.assertEqual(settings["max_size"], 2048)
+        self.assertTrue(settings["console"])
+        self.assertEqual(settings["plugins_enabled"], ("a", "b"))
+        self.assertNotIn("plugins_disabled", settings)
+
+        live = dict(DEFAULT_SETTINGS, plugins_enabled=("a", "b"))
+        self.assertEqual(diff_settings(live, settings), {"level": ("INFO", "DEBUG"),
+                                                         "max_size": (1048576, 2048)})
+
+    def test_reconfigure_applies_deltas(self):
+        """测试reconfigure只应用变化的配置项，错误的配置保持当前状态"""
+        log_file = os.path.join(self.temp_dir, "first.log")
+        self.write_config({"level": "INFO", "file": log_file, "console": "false"})
+        self.assertTrue(logloom_pure.initialize(self.config_path))
+        logloom_pure.set_output_console(False)
+        self.assertEqual(logloom_pure.reconfigure(), {})
+
+        second = os.path.join(self.temp_dir, "logs", "second.log")
+        self.write_config({"level": "DEBUG", "file": second, "console": "false"})
+        changes = logloom_pure.reconfigure()
+        self.assertEqual(changes, {"level": ("INFO", "DEBUG"), "file": (log_file, second)})
+        self.assertEqual(logloom_pure._log_level, "DEBUG")
+        self.assertTrue(os.path.exists(second))
+
+        self.write_config({"level": "VERBOSE", "file": second})
+        with self.assertRaises(ConfigError):
+            logloom_pure.reconfigure()
+        self.assertEqual(logloom_pure._log_level, "DEBUG")
+
+    def test_watcher_check(self):
+        """测试监视器在文件变化时重新配置，删除文件时保持当前配置"""
+        self.write_config({"level": "INFO"})
+        self.assertTrue(logloom_pure.initialize(self.config_path))
+        watcher = ConfigWatcher(self.config_path, logloom_pure.reconfigure, use_inotify=False)
+        self.assertEqual(watcher.check(), {})
+
+        self.write_config({"level": "ERROR"})
+        self.assertEqual(watcher.check(), {"level": ("INFO", "ERROR")})
+        self.assertEqual(logloom_pure._log_level, "ERROR")
+
+        self.write_config({"level": "ERROR", "max_size": "oops"})
+        self.assertEqual(watcher.check(), {})
+        os.unlink(self.config_path)
+        self.assertEqual(watcher.check(), {})
+
+        stats = watcher.stats()
+        self.assertEqual(stats["backend"], "polling")
+        self.assertEqual(stats["reloads"], 1)
+        self.assertEqual(stats["failures"], 1)
+        self.assertEqual(stats["settings_changed"], 1)
+        self.assertEqual(logloom_pure._log_level, "ERROR")
+
+    def test_apply_plugin_lists(self):
+        """测试只切换按新旧列表应处于不同状态的插件"""
+        manager = PluginManager()
+        manager.initialize()
+        for name in ("a", "b", "c"):
+            self.assertTrue(manager.register_plugin(NamedSink(name), "<test>"))
+
+        self.assertEqual(manager.apply_plugin_lists(enabled=["a", "b"]), {"c": False})
+        self.assertFalse(manager.plugin_list["c"].enabled)
+
+        # 手动禁用的插件不受无关修改的影响
+        manager.set_plugin_enabled("a", False)
+        self.assertEqual(manager.apply_plugin_lists(disabled=["b"]), {"b": False})
+        self.assertFalse(manager.plugin_list["a"].enabled)
+
+        self.assertEqual(manager.apply_plugin_lists(enabled=[], disabled=[]), {"b": True, "c": True})
+        manager.unload_all_plugins()
+
+
+if __name__ == "__main__":
+    unittest.main()
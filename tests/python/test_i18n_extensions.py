@@ -6,8 +6,11 @@
 
 import os
 import sys
+import shutil
+import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
 
 # 将Logloom模块目录添加到Python路径
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src' / 'bindings' / 'python'))
@@ -89,5 +92,165 @@ class TestI18nExtensions(unittest.TestCase):
         en_keys = logloom.get_language_keys()
         self.assertIn("system.welcome", en_keys, "英语键列表中应该包含system.welcome")
 
+    def test_compiled_locale_cache(self):
+        """测试首次加载写入编译缓存，之后优先使用缓存，源文件变化后缓存失效"""
+        from logloom import locale_cache
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            source = os.path.join(tmp_dir, 'fr.yaml')
+            shutil.copy(self.fr_yaml_path, source)
+            cache_dir = os.path.join(tmp_dir, 'cache')
+            
+            with mock.patch.object(locale_cache, 'DEFAULT_CACHE_DIR', cache_dir):
+                parsed = locale_cache.load_locale_file(source)
+                self.assertIsInstance(parsed, dict)
+                self.assertTrue(os.path.isfile(locale_cache.user_cache_path(source)))
+                
+                compiled = locale_cache.load_locale_file(source)
+                self.assertIsInstance(compiled, locale_cache.CompiledLocale)
+                self.assertEqual(compiled.path, locale_cache.user_cache_path(source))
+                self.assertEqual(dict(compiled), parsed)
+                self.assertNotIn("test.missing", compiled)
+                compiled.close()
+                
+                # 命令行生成的同目录缓存优先于用户缓存目录
+                self.assertEqual(locale_cache.main(['--check', tmp_dir]), 1)
+                self.assertEqual(locale_cache.main([tmp_dir]), 0)
+                self.assertEqual(locale_cache.main(['--check', tmp_dir]), 0)
+                compiled = locale_cache.load_locale_file(source)
+                self.assertEqual(compiled.path, locale_cache.sibling_cache_path(source))
+                self.assertEqual(compiled["test.hello"], "Bonjour, {0}!")
+                compiled.close()
+                
+                self.assertTrue(logloom.register_locale_file(source))
+                logloom.set_language("fr")
+                self.assertEqual(logloom.format_text("test.hello", "monde"), "Bonjour, monde!")
+                
+                with open(source, 'a', encoding='utf-8') as f:
+                    f.write('\n  late_key: "clé tardive"\n')
+                reloaded = locale_cache.load_locale_file(source)
+                self.assertIsInstance(reloaded, dict)
+                self.assertEqual(reloaded["test.late_key"], "clé tardive")
+                self.assertEqual(locale_cache.main(['--check', tmp_dir]), 1)
+
+    def test_user_cache_opt_out(self):
+        """测试设置LOGLOOM_NO_LOCALE_CACHE后不读写用户缓存目录，同目录缓存仍然可用"""
+        from logloom import locale_cache
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            source = os.path.join(tmp_dir, 'fr.yaml')
+            shutil.copy(self.fr_yaml_path, source)
+            cache_dir = os.path.join(tmp_dir, 'cache')
+            
+            with mock.patch.object(locale_cache, 'DEFAULT_CACHE_DIR', cache_dir):
+                locale_cache.load_locale_file(source)
+                self.assertTrue(os.path.isfile(locale_cache.user_cache_path(source)))
+                
+                with mock.patch.dict(os.environ, {locale_cache.NO_USER_CACHE_ENV: "1"}):
+                    # 已有的用户缓存也不再读取
+                    self.assertIsInstance(locale_cache.load_locale_file(source), dict)
+                    shutil.rmtree(cache_dir)
+                    self.assertIsInstance(locale_cache.load_locale_file(source), dict)
+                    self.assertFalse(os.path.exists(cache_dir))
+                    
+                    self.assertEqual(locale_cache.main([tmp_dir]), 0)
+                    compiled = locale_cache.load_locale_file(source)
+                    self.assertEqual(compiled.path, locale_cache.sibling_cache_path(source))
+                    compiled.close()
+                
+                with mock.patch.dict(os.environ, {locale_cache.NO_USER_CACHE_ENV: "0"}):
+                    self.assertTrue(locale_cache.user_cache_enabled())
+
+    def test_locale_hot_reload(self):
+        """测试语言资源文件变化后只重建该语言，并记录键差异和延迟"""
+        import time
+        from logloom import lang
+        
+        with tempfile.TemporaryDirectory() as tmp_dir, \
+                mock.patch('logloom.locale_cache.DEFAULT_CACHE_DIR', os.path.join(tmp_dir, 'cache')):
+            source = os.path.join(tmp_dir, 'hot.yaml')
+            with open(source, 'w', encoding='utf-8') as f:
+                f.write('app:\n  title: "Old"\n  gone: "Bye"\n')
+            self.assertTrue(lang.register_locale_file(source, "hot"))
+            old_table = lang._resources["hot"]
+            
+            watcher = lang.watch_locales(interval=0.05, use_inotify=False)
+            try:
+                with open(source, 'w', encoding='utf-8') as f:
+                    f.write('app:\n  title: "Brand new"\n  added: "Hi"\n')
+                diffs = watcher.check()
+                self.assertEqual(diffs, [{"lang": "hot", "added": ["app.added"],
+                                          "removed": ["app.gone"], "changed": ["app.title"]}])
+                # 新表整体替换旧表，持有旧表的读取方不受影响
+                self.assertIsNot(lang._resources["hot"], old_table)
+                self.assertEqual(old_table["app.title"], "Old")
+                self.assertEqual(logloom.format_text("app.title", lang="hot"), "Brand new")
+                
+                # 后台线程自动发现修改
+                with open(source, 'w', encoding='utf-8') as f:
+                    f.write('app:\n  title: "From watcher"\n')
+                deadline = time.monotonic() + 5
+                while lang._resources["hot"].get("app.title") != "From watcher" and time.monotonic() < deadline:
+                    time.sleep(0.02)
+                self.assertEqual(lang._resources["hot"]["app.title"], "From watcher")
+                
+                stats = lang.get_locale_reload_stats()
+                self.assertEqual(stats["backend"], "polling")
+                self.assertGreaterEqual(stats["reloads"], 2)
+                self.assertEqual(stats["failures"], 0)
+                self.assertGreaterEqual(stats["keys_removed"], 2)
+                self.assertGreater(stats["total_latency_ms"], 0)
+            finally:
+                lang.stop_watching_locales()
+            self.assertIsNone(lang.get_locale_reload_stats())
+
+    def test_parallel_locale_loading(self):
+        """测试并行加载按路径顺序合并并报告冲突，目录列表按目录mtime缓存"""
+        from logloom import lang, locale_loader
+        
+        with tempfile.TemporaryDirectory() as tmp_dir, \
+                mock.patch('logloom.locale_cache.DEFAULT_CACHE_DIR', os.path.join(tmp_dir, 'cache')):
+            for plugin, title in (("a", "Alpha"), ("b", "Beta"), ("c", "Alpha")):
+                os.makedirs(os.path.join(tmp_dir, plugin))
+                with open(os.path.join(tmp_dir, plugin, 'qz.yaml'), 'w', encoding='utf-8') as f:
+                    f.write(f'app:\n  title: "{title}"\n  {plugin}_only: "{plugin}"\n')
+            
+            count = lang.scan_directory_with_glob(os.path.join(tmp_dir, '*', 'qz.yaml'))
+            self.assertEqual(count, 3)
+            self.assertEqual(lang._resources["qz"]["app.title"], "Alpha")
+            self.assertEqual(lang._resources["qz"]["app.b_only"], "b")
+            # 所有文件合并为一个查找表，maps[0]保留给直接写入的条目
+            self.assertEqual(len(lang._resources["qz"].maps), 2)
+            
+            conflicts = [c for c in lang.get_locale_conflicts() if c["lang"] == "qz"]
+            self.assertEqual(len(conflicts), 1)
+            self.assertEqual(conflicts[0]["key"], "app.title")
+            self.assertEqual([os.path.basename(os.path.dirname(p)) for p in conflicts[0]["files"]],
+                             ["a", "b", "c"])
+            
+            # 并行加载的结果与输入顺序一致
+            paths = [os.path.join(tmp_dir, d, 'qz.yaml') for d in "cab"]
+            loaded = locale_loader.load_locale_files(paths, max_workers=3)
+            self.assertEqual([p for p, _, _ in loaded], paths)
+            self.assertEqual([data["app.title"] for _, data, _ in loaded], ["Alpha", "Alpha", "Beta"])
+            
+            # 目录未变化时不再遍历
+            plugin_dir = os.path.join(tmp_dir, "a")
+            self.assertEqual(len(locale_loader.list_locale_files(plugin_dir)), 1)
+            with mock.patch('logloom.locale_loader.os.scandir', side_effect=AssertionError):
+                self.assertEqual(len(locale_loader.list_locale_files(plugin_dir)), 1)
+            self.assertEqual(locale_loader.list_locale_files(os.path.join(tmp_dir, "missing")), [])
+            
+            # 之后注册的文件合并进同一个查找表并优先
+            late = os.path.join(tmp_dir, 'late', 'qz.yaml')
+            os.makedirs(os.path.dirname(late))
+            with open(late, 'w', encoding='utf-8') as f:
+                f.write('app:\n  title: "Late"\n')
+            self.assertTrue(lang.register_locale_file(late))
+            self.assertEqual(len(lang._resources["qz"].maps), 2)
+            self.assertEqual(lang._resources["qz"]["app.title"], "Late")
+            self.assertEqual(lang._resources["qz"]["app.c_only"], "c")
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
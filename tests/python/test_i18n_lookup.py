@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Logloom 翻译键查找测试
+====================
+
+测试缺失翻译键的严格/宽松模式以及负查找缓存
+"""
+
+import os
+import sys
+import threading
+import unittest
+from pathlib import Path
+
+# 添加模块路径
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src' / 'bindings' / 'python'))
+
+import logloom_py
+from logloom_py import logloom_pure, templates
+
+
+class I18nLookupTest(unittest.TestCase):
+    def setUp(self):
+        """每个测试都从宽松模式和空的负查找缓存开始"""
+        logloom_py.set_strict_mode(False)
+        logloom_pure._missing_keys.clear()
+        self.fr_yaml_path = os.path.join(os.path.dirname(__file__), 'test_locales', 'fr.yaml')
+
+    def tearDown(self):
+        logloom_py.set_strict_mode(False)
+
+    def test_lenient_mode_returns_key(self):
+        """测试宽松模式下缺失的键返回键名本身"""
+        self.assertEqual(logloom_py.get_text("missing.lenient_key"), "missing.lenient_key")
+        # 第二次查找命中负查找缓存，结果不变
+        self.assertEqual(logloom_py.get_text("missing.lenient_key"), "missing.lenient_key")
+        self.assertIn("missing.lenient_key", logloom_pure._missing_keys[logloom_py.get_language()])
+
+    def test_strict_mode_raises(self):
+        """测试严格模式下缺失的键抛出KeyError，缓存命中时同样抛出"""
+        logloom_py.set_strict_mode(True)
+        self.assertTrue(logloom_py.is_strict_mode())
+
+        for _ in range(2):
+            with self.assertRaises(KeyError):
+                logloom_py.get_text("missing.strict_key")
+
+    def test_register_invalidates_negative_cache(self):
+        """测试注册新的语言资源后负查找缓存失效"""
+        self.assertTrue(logloom_pure.register_locale_file(self.fr_yaml_path, "fr"))
+        self.assertTrue(logloom_py.set_language("fr"))
+        try:
+            self.assertEqual(logloom_py.get_text("test.late_key"), "test.late_key")
+
+            logloom_pure._resources["fr"]["test.late_key"] = "clé tardive"
+            # 直接修改资源字典不会使缓存失效，重新注册资源文件才会
+            self.assertEqual(logloom_py.get_text("test.late_key"), "test.late_key")
+
+            self.assertTrue(logloom_pure.register_locale_file(self.fr_yaml_path, "fr"))
+            self.assertEqual(logloom_py.get_text("test.late_key"), "clé tardive")
+        finally:
+            logloom_pure._resources["fr"].pop("test.late_key", None)
+            logloom_py.set_language("en")
+
+    def test_format_text_lang_override(self):
+        """测试format_text的lang参数只影响本次查找，不切换当前语言"""
+        self.assertTrue(logloom_pure.register_locale_file(self.fr_yaml_path, "fr"))
+        current = logloom_pure.get_language()
+        self.assertNotEqual(current, "fr")
+
+        self.assertEqual(logloom_pure.format_text("test.hello", "monde", lang="fr"), "Bonjour, monde!")
+        self.assertEqual(logloom_pure.format_text("error.invalid_value", lang="fr", value=1, expected=2),
+                         "Valeur invalide: 1, attendue: 2")
+        self.assertEqual(logloom_pure.get_language(), current)
+
+    def test_compiled_template_cache(self):
+        """测试编译模板与str.format结果一致，并且同一模板只编译一次"""
+        templates.clear_template_cache()
+
+        cases = [
+            ("Bonjour, {0}!", ("monde",), {}),
+            ("{} / {}", (1, 2), {}),
+            ("{{literal}} {value:>4} {value!r}", (), {"value": 7}),
+            ("{0.real}", (3,), {}),
+        ]
+        for source, args, kwargs in cases:
+            for _ in range(2):
+                self.assertEqual(templates.compile_template(source).format(args, kwargs),
+                                 source.format(*args, **kwargs))
+        self.assertFalse(templates.compile_template("{0.real}").compiled)
+        with self.assertRaises(KeyError):
+            templates.compile_template("{missing}").format((), {})
+
+        info = templates.template_cache_info()
+        self.assertEqual(info["misses"], len(cases) + 1)
+        self.assertGreaterEqual(info["hits"], len(cases))
+
+        # 省略kwargs时与str.format一样报告缺少的命名参数
+        with self.assertRaises(KeyError):
+            templates.format_template("{name}")
+        self.assertEqual(templates.format_template("{name}", kwargs={"name": "x"}), "x")
+        self.assertEqual(templates.format_template("{0}", ("a",)), "a")
+
+        templates.set_template_cache_size(1)
+        try:
+            templates.compile_template("a {}")
+            templates.compile_template("b {}")
+            self.assertEqual(templates.template_cache_info()["size"], 1)
+        finally:
+            templates.set_template_cache_size(templates.DEFAULT_CACHE_SIZE)
+
+    def test_use_language_is_context_local(self):
+        """测试上下文语言只影响当前线程，退出with块后恢复全局语言"""
+        self.assertTrue(logloom_pure.register_locale_file(self.fr_yaml_path, "fr"))
+        # 全局语言固定为en，不依赖其他测试留下的状态
+        self.addCleanup(setattr, logloom_pure, "_current_language", logloom_pure._current_language)
+        logloom_pure._current_language = current = "en"
+
+        results = {}
+        entered = threading.Event()
+        checked = threading.Event()
+
+        def worker():
+            with logloom_py.use_language("fr"):
+                entered.set()
+                checked.wait(5)
+                results["worker"] = logloom_py.format_text("test.hello", "monde")
+                results["worker_lang"] = logloom_py.get_language()
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        self.assertTrue(entered.wait(5))
+        # 工作线程已进入fr上下文，本线程仍使用全局语言
+        self.assertEqual(logloom_py.get_language(), current)
+        checked.set()
+        thread.join(5)
+
+        self.assertEqual(results["worker"], "Bonjour, monde!")
+        self.assertEqual(results["worker_lang"], "fr")
+
+        token = logloom_py.set_context_language("fr")
+        try:
+            self.assertEqual(logloom_py.get_context_language(), "fr")
+            # 显式的lang参数优先于上下文语言
+            self.assertNotEqual(logloom_py.format_text("test.hello", "world", lang=current),
+                                "Bonjour, world!")
+        finally:
+            logloom_py.reset_context_language(token)
+        self.assertIsNone(logloom_py.get_context_language())
+        self.assertEqual(logloom_py.get_language(), current)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Logloom 外部轮转测试
+==================
+
+测试logrotate改名、copytruncate截断和SIGHUP请求后日志写入新文件
+"""
+
+import os
+import sys
+import signal
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+# 添加模块路径
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src' / 'bindings' / 'python'))
+
+from logloom_py import logloom_pure
+
+
+def read_lines(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read().splitlines()
+
+
+class LogReopenTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "app.log")
+        self.rotated = self.path + ".1"
+        logloom_pure.set_output_console(False)
+        logloom_pure.set_log_level("INFO")
+        self.assertTrue(logloom_pure.set_log_file(self.path))
+
+    def tearDown(self):
+        logloom_pure.set_log_file(None)
+        logloom_pure.set_log_level("INFO")
+        logloom_pure.set_output_console(True)
+        shutil.rmtree(self.temp_dir)
+
+    def lines_with(self, path, text):
+        return [line for line in read_lines(path) if text in line]
+
+    def test_rename_and_reopen(self):
+        """测试文件被改名后自动重新打开，reopen请求在下一次写日志时生效"""
+        logloom_pure.info("test", "before rotate")
+        os.rename(self.path, self.rotated)
+        logloom_pure.info("test", "after rotate")
+        self.assertEqual(len(self.lines_with(self.rotated, "before rotate")), 1)
+        self.assertEqual(self.lines_with(self.rotated, "after rotate"), [])
+        self.assertEqual(len(self.lines_with(self.path, "after rotate")), 1)
+
+        self.assertTrue(logloom_pure.reopen())
+        logloom_pure.info("test", "after reopen")
+        self.assertEqual(len(self.lines_with(self.path, "after reopen")), 1)
+
+    def test_copytruncate(self):
+        """测试文件被原地截断后从文件开头继续写，不留下空洞"""
+        logloom_pure.info("test", "before truncate " + "x" * 200)
+        shutil.copyfile(self.path, self.rotated)
+        os.truncate(self.path, 0)
+        logloom_pure.info("test", "after truncate")
+
+        with open(self.path, "rb") as f:
+            data = f.read()
+        self.assertNotIn(b"\0", data)
+        self.assertEqual(len(self.lines_with(self.path, "after truncate")), 1)
+        self.assertEqual(len(self.lines_with(self.rotated, "before truncate")), 1)
+
+    @unittest.skipUnless(hasattr(signal, "SIGHUP"), "平台不支持SIGHUP")
+    def test_reopen_on_signal(self):
+        """测试SIGHUP只设置请求，下一次写日志时重新打开日志文件"""
+        handler = next(h for h in logloom_pure.logger.handlers
+                       if isinstance(h, logloom_pure._ReopeningFileHandler))
+        previous = logloom_pure.reopen_on_signal()
+        try:
+            logloom_pure.info("test", "before signal")
+            stream = handler.stream
+            os.kill(os.getpid(), signal.SIGHUP)
+            self.assertTrue(handler._reopen_requested)
+            self.assertIs(handler.stream, stream)
+            logloom_pure.info("test", "after signal")
+        finally:
+            signal.signal(signal.SIGHUP, previous)
+
+        self.assertFalse(handler._reopen_requested)
+        self.assertIsNot(handler.stream, stream)
+        self.assertEqual(len(self.lines_with(self.path, "after signal")), 1)
+
+    def test_reopen_without_file(self):
+        """测试未设置日志文件时reopen返回False"""
+        logloom_pure.set_log_file(None)
+        self.assertFalse(logloom_pure.reopen())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -11,6 +11,8 @@ import sys
 import unittest
 import tempfile
 import shutil
+import subprocess
+from importlib.machinery import EXTENSION_SUFFIXES
 from pathlib import Path
 
 # 导入测试适配器
@@ -84,5 +86,26 @@ class LogloomBasicTest(unittest.TestCase):
         self.logger.set_level("DEBUG")
         self.assertEqual(self.logger.get_level(), "DEBUG", "日志级别应该正确设置为DEBUG")
 
+
+# Python绑定目录，build_ext --inplace后C扩展模块位于此目录
+MODULE_PATH = Path(__file__).parent.parent.parent / 'src' / 'bindings' / 'python'
+
+
+@unittest.skipUnless(any((MODULE_PATH / ('logloom' + suffix)).is_file() for suffix in EXTENSION_SUFFIXES),
+                     "未构建C扩展模块")
+class LogloomExtensionImportTest(unittest.TestCase):
+    def test_import_with_extension(self):
+        """测试加载C扩展后sys.modules中仍是本包，子模块可以正常导入"""
+        env = dict(os.environ, PYTHONPATH=str(MODULE_PATH))
+        script = ("import sys, logloom; from logloom import records; "
+                  "assert logloom._c_module is not None; "
+                  "assert sys.modules['logloom'] is logloom; "
+                  "assert records.RecordBatch is logloom.RecordBatch; "
+                  "print(logloom.__file__)")
+        result = subprocess.run([sys.executable, "-c", script],
+                                env=env, capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertTrue(result.stdout.strip().endswith("__init__.py"))
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
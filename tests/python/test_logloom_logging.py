@@ -10,11 +10,16 @@ import os
 import sys
 import unittest
 import time
+import asyncio
+import importlib.util
 from pathlib import Path
 
 # 导入测试适配器
 sys.path.insert(0, os.path.dirname(__file__))
 from test_adapter import logger as ll, initialize, cleanup, Logger, LogLevel
+import logloom
+
+LOGGER_PATH = Path(__file__).parent.parent.parent / 'src' / 'bindings' / 'python' / 'logloom' / 'logger.py'
 
 class LogloomLoggingTest(unittest.TestCase):
     def setUp(self):
@@ -84,7 +89,170 @@ class LogloomLoggingTest(unittest.TestCase):
         # 验证过滤是否正常工作
         self.assertNotIn("这条调试信息不应该被记录", log_content, "DEBUG级别的日志应该被过滤")
         self.assertIn("这条INFO信息应该被记录", log_content, "INFO级别的日志应该被记录")
-    
+
+    def test_instance_level_survives_global_level(self):
+        """测试纯Python回退实现中修改全局级别不会覆盖实例通过set_level设置的级别"""
+        # 不作为logloom子模块加载时相对导入失败，logger.py使用纯Python回退实现
+        spec = importlib.util.spec_from_file_location("logloom_fallback_logger", LOGGER_PATH)
+        fallback = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(fallback)
+        self.assertFalse(fallback._has_c_extension)
+
+        instance_logger = fallback.Logger("instance_level_test")
+        instance_logger.set_file(self.log_file)
+        instance_logger.set_level("DEBUG")
+        global_logger = fallback.Logger("global_level_test")
+        global_logger.set_file(self.log_file)
+
+        # 与纯Python模式的set_log_level相同，修改全局级别后同步级别缓存
+        fallback._set_log_level("ERROR")
+        fallback._sync_level_cache("ERROR")
+
+        instance_logger.debug("全局级别为ERROR时的实例调试信息")
+        global_logger.warning("全局级别为ERROR时的警告")
+        with open(self.log_file, 'r') as f:
+            log_content = f.read()
+        self.assertIn("全局级别为ERROR时的实例调试信息", log_content)
+        # 没有设置实例级别的Logger仍然跟随全局级别
+        self.assertNotIn("全局级别为ERROR时的警告", log_content)
+
+    def test_filtered_message_not_formatted(self):
+        """测试被级别过滤的日志不会触发消息格式化"""
+        class FormatCounter:
+            def __init__(self):
+                self.count = 0
+
+            def __format__(self, spec):
+                self.count += 1
+                return "counted"
+
+        counter = FormatCounter()
+        self.logger.set_level(LogLevel.WARN)
+
+        self.logger.debug("调试参数: {}", counter)
+        self.logger.info("信息参数: {}", counter)
+        self.assertEqual(counter.count, 0, "被过滤的日志不应格式化参数")
+
+        self.logger.warning("警告参数: {}", counter)
+        self.assertEqual(counter.count, 1, "需要记录的日志应格式化参数")
+
+    def test_async_logger_flush(self):
+        """测试异步日志记录器在flush后写出全部记录"""
+        async_logger = logloom.AsyncLogger("python_async_test")
+        async_logger.set_file(self.log_file)
+
+        async def produce():
+            for i in range(20):
+                async_logger.info("异步消息 {}", i)
+            await async_logger.flush()
+
+        asyncio.run(produce())
+
+        with open(self.log_file, 'r') as f:
+            log_content = f.read()
+        self.assertIn("异步消息 0", log_content)
+        self.assertIn("异步消息 19", log_content)
+
+    def test_async_writer_survives_closed_loop(self):
+        """测试刷新等待所在的事件循环已关闭时写入线程继续写出记录"""
+        from logloom.logger import _async_writer, _AsyncWriter
+
+        closed_loop = asyncio.new_event_loop()
+        stale = closed_loop.create_future()
+        closed_loop.close()
+        _async_writer.submit((_AsyncWriter._FLUSH, stale))
+
+        async_logger = logloom.AsyncLogger("python_async_test")
+        async_logger.set_file(self.log_file)
+
+        async def produce():
+            async_logger.info("事件循环关闭后的消息")
+            await asyncio.wait_for(async_logger.flush(), 5)
+
+        asyncio.run(produce())
+
+        with open(self.log_file, 'r') as f:
+            self.assertIn("事件循环关闭后的消息", f.read())
+
+    def test_log_many(self):
+        """测试批量日志接口的级别过滤和写出"""
+        logloom.set_log_file(self.log_file)
+        logloom.set_log_level("INFO")
+        try:
+            written = logloom.log_many([
+                ("DEBUG", "batch", "批量调试消息"),
+                ("INFO", "batch", "批量信息消息"),
+                (LogLevel.ERROR, "batch", "批量错误消息"),
+            ])
+        finally:
+            logloom.set_log_file("")
+        
+        self.assertEqual(written, 2)
+        with open(self.log_file, 'r') as f:
+            log_content = f.read()
+        self.assertNotIn("批量调试消息", log_content)
+        self.assertIn("[INFO][batch] 批量信息消息", log_content)
+        self.assertIn("[ERROR][batch] 批量错误消息", log_content)
+        
+        with self.assertRaises(ValueError):
+            logloom.log_many([("VERBOSE", "batch", "无效级别")])
+
+    def test_record_sink_batches(self):
+        """测试记录接收函数按批收到日志记录视图，剩余记录在flush时交付"""
+        batches = []
+        logloom.set_log_file(self.log_file)
+        logloom.set_log_level("INFO")
+        logloom.set_record_batch_size(3)
+        self.assertTrue(logloom.add_record_sink(batches.append))
+        try:
+            logloom.debug("records", "被过滤的消息")
+            for i in range(4):
+                logloom.info("records", f"记录消息 {i}")
+            logloom.log_many([("ERROR", "records", "批量记录消息")])
+            self.assertEqual([len(batch) for batch in batches], [3])
+            self.assertEqual(logloom.flush_records(), 2)
+        finally:
+            self.assertTrue(logloom.remove_record_sink(batches.append))
+            logloom.set_record_batch_size(256)
+            logloom.set_log_file("")
+
+        self.assertIsInstance(batches[0], logloom.RecordBatch)
+        self.assertEqual(batches[0].levels(), [1, 1, 1])
+        records = [record for batch in batches for record in batch]
+        self.assertEqual([record[3] for record in records],
+                         [f"记录消息 {i}" for i in range(4)] + ["批量记录消息"])
+        self.assertEqual(batches[1][-1][1:], (3, "records", "批量记录消息"))
+        self.assertFalse(logloom.remove_record_sink(batches.append))
+
+    def test_record_module_interning(self):
+        """测试记录中的模块名称按驻留ID共享，每批只写入一次"""
+        module_id = logloom.intern_id("interned.module")
+        self.assertEqual(logloom.intern_id("interned.module"), module_id)
+        self.assertEqual(logloom.interned_name(module_id), "interned.module")
+        self.assertIsNone(logloom.interned_name(logloom.intern_count() + 1))
+
+        batches = []
+        logloom.set_log_file(self.log_file)
+        logloom.set_log_level("INFO")
+        self.assertTrue(logloom.add_record_sink(batches.append))
+        try:
+            for i in range(3):
+                logloom.info("interned.module", f"驻留消息 {i}")
+            logloom.info("other.module", "其他模块")
+            logloom.flush_records()
+        finally:
+            self.assertTrue(logloom.remove_record_sink(batches.append))
+            logloom.set_log_file("")
+
+        batch = batches[0]
+        other_id = logloom.intern_id("other.module")
+        self.assertEqual(batch.module_ids(), [module_id] * 3 + [other_id])
+        records = list(batch)
+        self.assertIs(records[0][2], records[2][2])
+        self.assertEqual(records[3][2], "other.module")
+        # 模块名称在文本区中只出现一次
+        self.assertEqual(bytes(batch.text).count("interned.module".encode()), 1)
+
     def test_log_formatting(self):
         """测试日志格式化"""
         # 使用格式化参数记录日志
@@ -10,11 +10,13 @@ import os
 import sys
 import unittest
 import time
+import subprocess
 from pathlib import Path
 
 # 导入测试适配器
 sys.path.insert(0, os.path.dirname(__file__))
 from test_adapter import logger, initialize, cleanup, Logger
+import logloom
 
 class LogloomPerformanceTest(unittest.TestCase):
     def setUp(self):
@@ -65,6 +67,46 @@ class LogloomPerformanceTest(unittest.TestCase):
         # 但可以检查文件是否存在，确认日志确实被写入
         self.assertTrue(os.path.exists(self.log_file), "日志文件应该被创建")
     
+    def test_batch_logging_throughput(self):
+        """测试批量日志接口的吞吐量"""
+        num_logs = 10000
+        message = "这是一条测试日志消息，用于测试Logloom的批量写入性能"
+        records = [("INFO", "perf_test", f"{message}: {i}") for i in range(num_logs)]
+        
+        logloom.set_log_file(self.log_file)
+        try:
+            start_time = time.time()
+            written = logloom.log_many(records)
+            duration = time.time() - start_time
+        finally:
+            logloom.set_log_file("")
+        
+        print(f"\n批量性能测试结果: 记录了 {written} 条日志，耗时 {duration:.4f} 秒")
+        print(f"吞吐量: {num_logs / max(duration, 1e-9):.2f} 日志/秒")
+        
+        self.assertEqual(written, num_logs, "INFO级别的日志应全部写出")
+        with open(self.log_file, 'r') as f:
+            self.assertEqual(sum(1 for _ in f), num_logs)
+    
+    def test_import_time(self):
+        """测试导入logloom包的耗时，以及重量级子模块是否被延迟导入"""
+        module_path = str(Path(__file__).parent.parent.parent / 'src' / 'bindings' / 'python')
+        env = dict(os.environ, PYTHONPATH=module_path)
+        script = ("import sys, logloom; "
+                  "print(','.join(m for m in ('yaml', 'logloom.lang', 'logloom.plugin') if m in sys.modules))")
+        
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", script],
+                                env=env, capture_output=True, text=True, check=True)
+        
+        # importtime输出的最后一行为顶层logloom包，格式为 "import time: self | cumulative | name"
+        import_lines = [line for line in result.stderr.splitlines()
+                        if line.startswith("import time:") and line.rstrip().endswith("| logloom")]
+        if import_lines:
+            cumulative_us = int(import_lines[-1].split("|")[1])
+            print(f"\n导入耗时: {cumulative_us / 1000:.2f} 毫秒")
+        
+        self.assertEqual(result.stdout.strip(), "", "导入logloom时不应加载PyYAML、lang或plugin模块")
+    
     def test_logging_latency(self):
         """测试日志记录的延迟"""
         num_samples = 100
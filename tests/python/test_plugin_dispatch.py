@@ -0,0 +1,493 @@
+#!/usr/bin/env python3
+"""
+Logloom Python插件分发测试
+========================
+
+测试PluginManager将日志条目分发给各类插件的行为
+"""
+
+import os
+import sys
+import time
+import asyncio
+import tempfile
+import textwrap
+import threading
+import unittest
+from pathlib import Path
+
+# 添加模块路径
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src' / 'bindings' / 'python'))
+
+from logloom.plugin import (
+    FilterPlugin, SinkPlugin, PluginResult, PluginMode, PluginCapability, LogEntry
+)
+from logloom.plugin.loader import PluginManager
+
+
+# 导入时在计数文件中追加一行的插件模块，用于检查模块是否被导入
+COUNTING_PLUGIN_SOURCE = textwrap.dedent("""
+    import os
+    from logloom.plugin import SinkPlugin, PluginResult
+
+    with open(os.path.join(os.path.dirname(__file__), "imports.txt"), "a") as f:
+        f.write("imported\\n")
+
+    class CountingPlugin(SinkPlugin):
+        def __init__(self):
+            super().__init__(name="counting_sink", version="2.0.0", author="test",
+                             description="counting")
+
+        def init(self, helpers):
+            return 0
+
+        def process(self, log_entry):
+            return PluginResult.OK
+
+        def shutdown(self):
+            pass
+""")
+
+
+class RecordingSink(SinkPlugin):
+    """记录收到的日志消息的同步输出插件"""
+
+    def __init__(self, name="recording_sink"):
+        super().__init__(name=name, version="1.0.0", author="test")
+        self.messages = []
+
+    def init(self, helpers):
+        return 0
+
+    def process(self, log_entry):
+        self.messages.append(log_entry.message)
+        return PluginResult.OK
+
+    def shutdown(self):
+        pass
+
+
+class AsyncRecordingSink(RecordingSink):
+    """记录收到的日志消息的异步输出插件"""
+
+    def __init__(self, name="async_recording_sink"):
+        super().__init__(name=name)
+
+    async def process(self, log_entry):
+        await asyncio.sleep(0)
+        self.messages.append(log_entry.message)
+        return PluginResult.OK
+
+
+class BatchRecordingSink(RecordingSink):
+    """声明批处理能力、记录每批大小的输出插件"""
+
+    def __init__(self, name="batch_recording_sink"):
+        super().__init__(name=name)
+        self.info.capabilities = PluginCapability.BATCH
+        self.batches = []
+
+    def process_batch(self, entries):
+        self.batches.append(len(entries))
+        return super().process_batch(entries)
+
+
+class BlockingAsyncSink(RecordingSink):
+    """ASYNC模式的输出插件，收到第一条日志后阻塞直到被放行"""
+
+    def __init__(self, name="blocking_async_sink"):
+        super().__init__(name=name)
+        self.info.mode = PluginMode.ASYNC
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def process(self, log_entry):
+        self.started.set()
+        self.release.wait(5)
+        return super().process(log_entry)
+
+
+class FailingAsyncSink(BlockingAsyncSink):
+    """ASYNC模式的输出插件，被放行后每条日志都抛出异常"""
+
+    def process(self, log_entry):
+        self.started.set()
+        self.release.wait(5)
+        raise RuntimeError("sink failure")
+
+
+class EvenFilter(FilterPlugin):
+    """拒绝消息以偶数结尾的日志的过滤器插件"""
+
+    def __init__(self):
+        super().__init__(name="even_filter", version="1.0.0", author="test")
+
+    def init(self, helpers):
+        return 0
+
+    def process(self, log_entry):
+        return PluginResult.SKIP if int(log_entry.message[-1]) % 2 == 0 else PluginResult.OK
+
+    def shutdown(self):
+        pass
+
+
+class FailingSink(RecordingSink):
+    """每隔一条日志抛出异常的输出插件"""
+
+    def process(self, log_entry):
+        if len(self.messages) % 2:
+            self.messages.append(None)
+            raise RuntimeError("sink failure")
+        return super().process(log_entry)
+
+
+class FlakySink(RecordingSink):
+    """按healthy标志决定成功、抛出异常或请求重试的输出插件"""
+
+    def __init__(self, name="flaky_sink"):
+        super().__init__(name=name)
+        self.healthy = False
+        self.retry = False
+
+    def process(self, log_entry):
+        if self.retry:
+            return PluginResult.RETRY
+        if not self.healthy:
+            raise RuntimeError("backend down")
+        return super().process(log_entry)
+
+
+class PluginDispatchTest(unittest.TestCase):
+    def setUp(self):
+        """创建一个独立的插件管理器"""
+        self.manager = PluginManager()
+        self.manager.initialize()
+
+    def add_plugin(self, plugin):
+        """向管理器注册插件实例"""
+        self.assertTrue(self.manager.register_plugin(plugin, "<test>"))
+
+    def make_entry(self, message):
+        return LogEntry(level=1, timestamp=0, message=message, module="test")
+
+    def test_dispatch_order_and_enable(self):
+        """测试分发顺序遵循plugin_order，且启用状态变化后分发列表随之更新"""
+        self.manager.ordered_plugins = ["second", "first"]
+        first = RecordingSink("first")
+        second = RecordingSink("second")
+        self.add_plugin(first)
+        self.add_plugin(second)
+
+        self.assertEqual([p.name for p in self.manager.get_sink_plugins()], ["second", "first"])
+
+        self.manager.set_plugin_enabled("second", False)
+        self.manager.process_with_sinks(self.make_entry("only-first"))
+        self.assertEqual(first.messages, ["only-first"])
+        self.assertEqual(second.messages, [])
+
+        self.manager.set_plugin_enabled("second", True)
+        self.manager.process_with_sinks(self.make_entry("both"))
+        self.assertEqual(second.messages, ["both"])
+
+        self.manager.unload_all_plugins()
+        self.assertEqual(self.manager.get_sink_plugins(), [])
+
+    def test_batch_sink_size_threshold(self):
+        """测试批处理输出插件按批大小交付，剩余条目在flush或卸载时交付"""
+        self.manager.batch_size = 4
+        self.manager.batch_interval = 60
+        sink = BatchRecordingSink()
+        self.add_plugin(sink)
+
+        for i in range(10):
+            self.manager.process_with_sinks(self.make_entry(f"batch-{i}"))
+        self.assertEqual(sink.batches, [4, 4])
+
+        self.manager.flush_batches()
+        self.assertEqual(sink.batches, [4, 4, 2])
+        self.assertEqual(sink.messages, [f"batch-{i}" for i in range(10)])
+
+        self.manager.process_with_sinks(self.make_entry("tail"))
+        self.manager.unload_all_plugins()
+        self.assertEqual(sink.batches, [4, 4, 2, 1])
+
+    def test_batch_sink_time_threshold(self):
+        """测试未满批的条目在超过刷新间隔后由后台线程交付"""
+        self.manager.batch_size = 100
+        self.manager.batch_interval = 0.05
+        sink = BatchRecordingSink()
+        self.add_plugin(sink)
+
+        self.manager.process_with_sinks(self.make_entry("late"))
+        deadline = time.monotonic() + 2
+        while not sink.batches and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(sink.messages, ["late"])
+
+        self.manager.shutdown()
+
+    def test_record_batch_reaches_sinks(self):
+        """测试原生记录批次交给输出插件，批处理插件一次性接收整批且保持顺序"""
+        from logloom.records import RecordBuffer
+
+        self.manager.batch_size = 100
+        self.manager.batch_interval = 60
+        batch_sink = BatchRecordingSink()
+        plain_sink = RecordingSink()
+        self.add_plugin(batch_sink)
+        self.add_plugin(plain_sink)
+
+        self.manager.process_with_sinks(self.make_entry("pending"))
+        buffer = RecordBuffer()
+        for i in range(3):
+            buffer.append(1, "native", f"record-{i}")
+        self.manager.process_record_batch(buffer.detach())
+
+        self.assertEqual(batch_sink.batches, [1, 3])
+        self.assertEqual(batch_sink.messages, ["pending", "record-0", "record-1", "record-2"])
+        self.assertEqual(plain_sink.messages, ["pending", "record-0", "record-1", "record-2"])
+        self.assertEqual(self.manager.get_stats("recording_sink")["recording_sink"]["entries"], 4)
+        self.manager.unload_all_plugins()
+
+    def test_async_mode_queue_drops_when_full(self):
+        """测试ASYNC模式插件在工作线程中处理，队列满时按丢弃策略计数"""
+        self.manager.plugin_configs = {"blocking_async_sink": {"queue_size": 2, "queue_policy": "drop"}}
+        slow = BlockingAsyncSink()
+        fast = RecordingSink("fast_sink")
+        self.add_plugin(slow)
+        self.add_plugin(fast)
+
+        self.manager.process_with_sinks(self.make_entry("msg-0"))
+        self.assertTrue(slow.started.wait(2))
+        # 工作线程阻塞在第一条日志上，后续日志只有两条能入队
+        for i in range(1, 5):
+            self.manager.process_with_sinks(self.make_entry(f"msg-{i}"))
+
+        self.assertEqual(len(fast.messages), 5)
+        stats = self.manager.get_queue_stats("blocking_async_sink")["blocking_async_sink"]
+        self.assertEqual(stats["queue_depth"], 2)
+        self.assertEqual(stats["queue_capacity"], 2)
+        self.assertEqual(stats["dropped"], 2)
+
+        slow.release.set()
+        self.manager.unload_all_plugins()
+        self.assertEqual(slow.messages, ["msg-0", "msg-1", "msg-2"])
+        self.assertEqual(self.manager.get_queue_stats(), {})
+
+    def test_plugin_stats(self):
+        """测试每个插件的调用次数、错误数、过滤数和耗时直方图"""
+        self.add_plugin(EvenFilter())
+        self.add_plugin(FailingSink("failing_sink"))
+
+        for i in range(6):
+            entry = self.make_entry(f"msg-{i}")
+            if self.manager.process_with_filters(entry):
+                self.manager.process_with_sinks(entry)
+
+        stats = self.manager.get_stats()
+        self.assertEqual(list(stats), ["even_filter", "failing_sink"])
+        self.assertEqual(stats["even_filter"]["calls"], 6)
+        self.assertEqual(stats["even_filter"]["filtered"], 3)
+        self.assertEqual(stats["failing_sink"]["calls"], 3)
+        self.assertEqual(stats["failing_sink"]["errors"], 1)
+        for item in stats.values():
+            self.assertEqual(sum(item["histogram"]), item["calls"])
+            self.assertGreaterEqual(item["max_time"], item["avg_time"])
+
+        from logloom.plugin.manager import format_stats
+        table = format_stats(stats)
+        self.assertIn("even_filter", table)
+        self.assertIn("failing_sink", table)
+
+        self.assertEqual(list(self.manager.get_stats("failing_sink")), ["failing_sink"])
+        self.manager.unload_all_plugins()
+        self.assertEqual(self.manager.get_stats(), {})
+
+    def wait_for(self, condition, timeout=2):
+        """轮询等待条件成立"""
+        deadline = time.monotonic() + timeout
+        while not condition() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return condition()
+
+    def test_circuit_breaker_trips_and_recovers(self):
+        """测试插件持续失败时熔断并暂停调用，超时后探测成功即恢复"""
+        self.manager.plugin_configs = {
+            "flaky_sink": {"breaker_window": 4, "breaker_error_rate": 0.5, "breaker_reset_timeout": 0.1}
+        }
+        sink = FlakySink()
+        self.add_plugin(sink)
+
+        with self.assertLogs("logloom.plugin.loader", level="WARNING") as logs:
+            for i in range(3):
+                self.manager.process_with_sinks(self.make_entry(f"down-{i}"))
+            self.assertTrue(self.wait_for(lambda: not self.manager.get_sink_plugins()))
+        self.assertEqual(len([line for line in logs.output if "熔断" in line]), 1)
+
+        stats = self.manager.get_stats("flaky_sink")["flaky_sink"]
+        self.assertEqual(stats["breaker_state"], "open")
+        self.assertEqual(stats["breaker_trips"], 1)
+        self.assertEqual(stats["calls"], 2)
+
+        # 探测调用请求重试时再次熔断
+        sink.retry = True
+        self.assertTrue(self.wait_for(lambda: self.manager.get_sink_plugins()))
+        self.manager.process_with_sinks(self.make_entry("retry"))
+        self.assertTrue(self.wait_for(lambda: not self.manager.get_sink_plugins()))
+        self.assertEqual(self.manager.get_stats("flaky_sink")["flaky_sink"]["breaker_trips"], 2)
+
+        sink.retry = False
+        sink.healthy = True
+        self.assertTrue(self.wait_for(lambda: self.manager.get_sink_plugins()))
+        self.manager.process_with_sinks(self.make_entry("recovered"))
+        self.manager.process_with_sinks(self.make_entry("normal"))
+        self.assertEqual(sink.messages, ["recovered", "normal"])
+        self.assertEqual(self.manager.get_stats("flaky_sink")["flaky_sink"]["breaker_state"], "closed")
+
+    def test_disable_slow_async_plugin_does_not_block(self):
+        """测试禁用积压的慢速ASYNC插件时，等待队列处理完不阻塞注册和分发"""
+        self.manager.plugin_configs = {"blocking_async_sink": {"queue_size": 100, "queue_policy": "block"}}
+        slow = BlockingAsyncSink()
+        self.add_plugin(slow)
+
+        for i in range(20):
+            self.manager.process_with_sinks(self.make_entry(f"msg-{i}"))
+        self.assertTrue(slow.started.wait(2))
+
+        disabler = threading.Thread(target=self.manager.set_plugin_enabled, args=("blocking_async_sink", False))
+        disabler.start()
+        self.assertTrue(self.wait_for(lambda: not self.manager.get_sink_plugins()))
+
+        # 慢速插件的队列仍在处理中，其他插件的注册、启停和分发只停止自己移除的工作线程，不需要等待
+        fast = RecordingSink("fast_sink")
+        start = time.monotonic()
+        self.add_plugin(fast)
+        self.assertTrue(self.manager.set_plugin_enabled("fast_sink", False))
+        self.assertTrue(self.manager.set_plugin_enabled("fast_sink", True))
+        self.manager.process_with_sinks(self.make_entry("fast"))
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual(fast.messages, ["fast"])
+        self.assertTrue(disabler.is_alive())
+
+        slow.release.set()
+        disabler.join(5)
+        self.assertFalse(disabler.is_alive())
+        self.assertEqual(slow.messages, [f"msg-{i}" for i in range(20)])
+        self.manager.unload_all_plugins()
+
+    def test_disable_failing_async_plugin(self):
+        """测试禁用仍在处理积压失败条目的ASYNC插件不会死锁，熔断也不会重新启用它"""
+        self.manager.plugin_configs = {"failing_async_sink": {
+            "queue_size": 500, "queue_policy": "block",
+            "breaker_window": 4, "breaker_error_rate": 0.5, "breaker_reset_timeout": 0.1,
+        }}
+        sink = FailingAsyncSink("failing_async_sink")
+        self.add_plugin(sink)
+
+        for i in range(200):
+            self.manager.process_with_sinks(self.make_entry(f"msg-{i}"))
+        self.assertTrue(sink.started.wait(2))
+
+        disabler = threading.Thread(target=self.manager.set_plugin_enabled, args=("failing_async_sink", False))
+        disabler.start()
+        time.sleep(0.05)
+        sink.release.set()
+        disabler.join(5)
+        self.assertFalse(disabler.is_alive(), "禁用插件时死锁")
+
+        # 积压条目触发的熔断不应在重置超时后重新启用被手动禁用的插件
+        time.sleep(0.3)
+        self.assertEqual(self.manager.get_sink_plugins(), [])
+        self.assertFalse(self.manager.plugin_list["failing_async_sink"].enabled)
+        self.manager.unload_all_plugins()
+
+    def test_log_entry_shared_serialization(self):
+        """测试日志条目无实例字典、context延迟创建且序列化结果被缓存"""
+        entry = self.make_entry("cached")
+        self.assertFalse(hasattr(entry, "__dict__"))
+        self.assertIsNone(entry._context)
+
+        first = entry.to_dict()
+        self.assertIs(entry.to_dict(), first)
+        self.assertEqual(first["context"], {})
+        self.assertIs(entry.to_json(), entry.to_json())
+
+        entry.context = {"request_id": 7}
+        self.assertEqual(entry.to_dict()["context"], {"request_id": 7})
+        self.assertIn('"request_id": 7', entry.to_json())
+
+        entry.message = "changed"
+        entry.invalidate()
+        self.assertEqual(entry.to_dict()["message"], "changed")
+
+    def test_discovery_cache_defers_disabled_plugins(self):
+        """测试发现缓存持久化到磁盘，禁用的插件在首次启用前不会被导入"""
+        with tempfile.TemporaryDirectory() as tmp:
+            plugin_dir = os.path.join(tmp, "plugins")
+            os.mkdir(plugin_dir)
+            with open(os.path.join(plugin_dir, "counting.py"), "w") as f:
+                f.write(COUNTING_PLUGIN_SOURCE)
+            imports_file = os.path.join(plugin_dir, "imports.txt")
+            cache_path = os.path.join(tmp, "cache", "plugin_cache.json")
+
+            def imports():
+                with open(imports_file) as f:
+                    return len(f.readlines())
+
+            def make_manager(disabled):
+                manager = PluginManager()
+                manager.initialize()
+                manager.plugin_paths = [plugin_dir]
+                manager.discovery_cache_path = cache_path
+                manager.disabled_plugins = set(disabled)
+                return manager
+
+            first = make_manager(["counting_sink"])
+            self.assertEqual(first.load_all_plugins(), 0)
+            self.assertEqual(imports(), 1)
+            self.assertTrue(os.path.isfile(cache_path))
+
+            # 缓存命中时列出和加载被禁用的插件都不导入模块
+            second = make_manager(["counting_sink"])
+            discovered = second.get_discovered_plugins()
+            self.assertEqual([(p["name"], p["version"], p["enabled"]) for p in discovered],
+                             [("counting_sink", "2.0.0", False)])
+            self.assertEqual(second.load_all_plugins(), 0)
+            self.assertIsNone(second.get_plugin("counting_sink"))
+            self.assertEqual(imports(), 1)
+
+            self.assertTrue(second.set_plugin_enabled("counting_sink", True))
+            self.assertEqual(second.get_plugin("counting_sink").info.version, "2.0.0")
+            self.assertEqual([p.name for p in second.get_sink_plugins()], ["counting_sink"])
+            self.assertEqual(imports(), 2)
+            second.shutdown()
+
+    def test_async_sink_awaited_on_loop(self):
+        """测试异步输出插件在事件循环中被直接等待"""
+        sync_sink = RecordingSink()
+        async_sink = AsyncRecordingSink()
+        self.add_plugin(sync_sink)
+        self.add_plugin(async_sink)
+
+        async def dispatch():
+            for i in range(3):
+                await self.manager.process_with_sinks_async(self.make_entry(f"msg-{i}"))
+
+        asyncio.run(dispatch())
+
+        self.assertEqual(sync_sink.messages, ["msg-0", "msg-1", "msg-2"])
+        self.assertEqual(async_sink.messages, ["msg-0", "msg-1", "msg-2"])
+
+    def test_async_sink_from_sync_path(self):
+        """测试同步分发路径在没有事件循环时也能执行异步输出插件"""
+        async_sink = AsyncRecordingSink()
+        self.add_plugin(async_sink)
+
+        self.manager.process_with_sinks(self.make_entry("sync-call"))
+
+        self.assertEqual(async_sink.messages, ["sync-call"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Logloom 内置规则过滤器测试
+========================
+
+测试RulesFilterPlugin按模块、级别、关键字和正则表达式过滤日志
+"""
+
+import os
+import sys
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+# 添加模块路径
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src' / 'bindings' / 'python'))
+
+from logloom.plugin import LogEntry, RulesFilterPlugin, PluginConfig
+from logloom.plugin.loader import PluginManager
+
+
+class RulesFilterTest(unittest.TestCase):
+    def setUp(self):
+        """创建带有规则过滤器配置的插件管理器"""
+        self.manager = PluginManager()
+        self.manager.initialize()
+        self.manager.plugin_configs = {
+            "rules_filter": {
+                "min_level": "INFO",
+                "module_levels": ["db:ERROR", "invalid"],
+                "deny_modules": ["noisy"],
+                "keywords": ["secret", "he", "hers"],
+                "patterns": ["user=[0-9]+", "(unbalanced"],
+            }
+        }
+
+    def tearDown(self):
+        self.manager.shutdown()
+
+    def passes(self, level, module, message):
+        entry = LogEntry(level=level, timestamp=0, message=message, module=module)
+        return self.manager.process_with_filters(entry)
+
+    def test_builtin_registered_from_config(self):
+        """测试存在配置节时load_all_plugins注册内置规则过滤器"""
+        self.manager.plugin_paths = []
+        self.assertEqual(self.manager.load_all_plugins(), 1)
+        self.assertIsInstance(self.manager.get_plugin("rules_filter"), RulesFilterPlugin)
+
+    def test_rules(self):
+        """测试各类规则的判定结果"""
+        self.assertTrue(self.manager.register_plugin(RulesFilterPlugin()))
+
+        self.assertTrue(self.passes(1, "app", "all good"))
+        self.assertFalse(self.passes(0, "app", "below min level"))
+        self.assertFalse(self.passes(3, "noisy", "denied module"))
+        self.assertFalse(self.passes(2, "db", "below module level"))
+        self.assertTrue(self.passes(3, "db", "at module level"))
+        self.assertFalse(self.passes(1, "app", "the SECRET value"))
+        self.assertFalse(self.passes(1, "app", "usHErs"))
+        self.assertFalse(self.passes(1, "app", "login user=42"))
+        self.assertTrue(self.passes(1, "app", "user=anonymous"))
+
+    def test_allow_modules(self):
+        """测试配置允许列表后只有列出的模块能通过"""
+        self.manager.plugin_configs["rules_filter"]["allow_modules"] = ["api"]
+        self.assertTrue(self.manager.register_plugin(RulesFilterPlugin()))
+
+        self.assertTrue(self.passes(1, "api", "request"))
+        self.assertFalse(self.passes(1, "app", "request"))
+
+
+    def test_config_snapshot(self):
+        """测试配置快照的属性访问、按类型读取和schema默认值"""
+        class SchemaFilter(RulesFilterPlugin):
+            config_schema = {"min_level": "DEBUG", "limit": 10, "verbose": False}
+
+        config = PluginConfig("rules_filter", {"min_level": "INFO", "limit": "25", "verbose": "yes"},
+                              schema=SchemaFilter.config_schema)
+        self.assertEqual(config.limit, 25)
+        self.assertIs(config.verbose, True)
+        self.assertEqual(config.get_int("limit", 0), 25)
+        self.assertEqual(config.get_int("min_level", 7), 7)
+        self.assertEqual(config.get_array("missing"), [])
+        with self.assertRaises(AttributeError):
+            config.limit = 1
+
+        plugin = SchemaFilter()
+        self.assertTrue(self.manager.register_plugin(plugin))
+        self.assertEqual(plugin.config.min_level, "INFO")
+        self.assertEqual(plugin.config.limit, 10)
+        self.assertEqual(plugin.get_config_array("deny_modules"), ["noisy"])
+
+    def test_reload_config_notifies(self):
+        """测试重新加载配置后插件重新编译规则，监听器只收到变化的插件"""
+        self.assertTrue(self.manager.register_plugin(RulesFilterPlugin()))
+        self.assertFalse(self.passes(3, "noisy", "denied module"))
+
+        changes = []
+        self.manager.add_config_listener(lambda name, old, new: changes.append((name, old, new)))
+
+        configs = dict(self.manager.plugin_configs)
+        configs["rules_filter"] = dict(configs["rules_filter"], deny_modules=["other"])
+        configs["unused"] = {"value": 1}
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_path = os.path.join(temp_dir, "plugins.json")
+            with open(config_path, "w") as f:
+                json.dump({"plugin_configs": configs}, f)
+            self.assertEqual(self.manager.reload_config(config_path), 0)
+            self.assertEqual(sorted(name for name, _, _ in changes), ["rules_filter", "unused"])
+
+            # 内容未变化时不再通知
+            self.assertEqual(self.manager.reload_config(), 0)
+            self.assertEqual(len(changes), 2)
+
+        old, new = next((old, new) for name, old, new in changes if name == "rules_filter")
+        self.assertEqual(old.deny_modules, ["noisy"])
+        self.assertEqual(new.deny_modules, ["other"])
+        self.assertGreater(new.version, old.version)
+        self.assertTrue(self.passes(3, "noisy", "no longer denied"))
+        self.assertFalse(self.passes(3, "other", "now denied"))
+
+
+if __name__ == "__main__":
+    unittest.main()
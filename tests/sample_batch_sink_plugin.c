@@ -0,0 +1,86 @@
+/**
+ * @file sample_batch_sink_plugin.c
+ * @brief 示例批处理输出插件
+ *
+ * 声明PLUGIN_CAP_BATCH能力的同步输出插件，用于测试加载器的批次累积。
+ * 插件只打印每个批次的条目数，交付次数和条目数通过plugin_get_stats检查
+ */
+
+#include <stdio.h>
+#include "plugin.h"
+
+/**
+ * @brief 打印一个批次
+ */
+static int print_batch(const log_entry_t* entries, size_t count) {
+    if (!entries || count == 0) {
+        return PLUGIN_RESULT_ERROR;
+    }
+    printf("[示例批处理插件] 收到 %zu 条日志，首条: %s\n", count, entries[0].message);
+    return PLUGIN_RESULT_OK;
+}
+
+/**
+ * @brief 插件初始化函数
+ *
+ * @param helpers 插件辅助函数
+ * @return 0表示成功，非0表示失败
+ */
+int plugin_init(const plugin_helpers_t* helpers) {
+    (void)helpers;
+    printf("[示例批处理插件] 初始化成功\n");
+    return 0;
+}
+
+/**
+ * @brief 插件处理函数
+ *
+ * 加载器为批处理插件累积条目后调用plugin_process_batch，
+ * 只有关闭批次累积（batch_size不大于1）时才会逐条调用
+ *
+ * @param entry 日志条目
+ * @return 处理结果状态码
+ */
+int plugin_process(const log_entry_t* entry) {
+    return print_batch(entry, 1);
+}
+
+/**
+ * @brief 插件批处理函数
+ *
+ * @param entries 日志条目数组
+ * @param count 条目数量
+ * @return 处理结果状态码
+ */
+int plugin_process_batch(const log_entry_t* entries, size_t count) {
+    return print_batch(entries, count);
+}
+
+/**
+ * @brief 插件关闭函数
+ */
+void plugin_shutdown(void) {
+    printf("[示例批处理插件] 关闭成功\n");
+}
+
+/**
+ * @brief 插件信息结构
+ */
+static const plugin_info_t batch_sink_plugin_info = {
+    .name = "sample_batch_sink",
+    .version = "1.0.0",
+    .author = "Logloom Team",
+    .type = PLUGIN_TYPE_SINK,
+    .mode = PLUGIN_MODE_SYNC,
+    .capabilities = PLUGIN_CAP_BATCH,
+    .description = "示例批处理输出插件，打印加载器交付的每个批次"
+};
+
+/**
+ * @brief 获取插件信息
+ *
+ * @return 插件信息结构指针
+ */
+const plugin_info_t* plugin_info(void) {
+    return &batch_sink_plugin_info;
+}
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+配置解析器基准测试
+
+生成包含大量插件配置段的配置文件，比较PyYAML（safe_load，以及可用时的
+CSafeLoader）、纯Python配置解析器和C配置解析器（C扩展已构建时）的解析耗时，
+并检查各解析器的结果与safe_load一致。
+
+使用:
+  python tools/bench_config_parser.py                 # 默认1000个插件配置段
+  python tools/bench_config_parser.py --plugins 5000  # 指定插件配置段数量
+  python tools/bench_config_parser.py --file config.yaml --repeat 20
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+import yaml
+
+# 项目根目录
+PROJECT_ROOT = Path(__file__).parent.parent.absolute()
+# Python绑定目录
+PYTHON_BIND_DIR = PROJECT_ROOT / "src" / "bindings" / "python"
+
+sys.path.insert(0, str(PYTHON_BIND_DIR))
+from logloom_py.config_loader import parse_config_text
+
+
+def generate_config(plugin_count):
+    """生成包含plugin_count个插件配置段的配置文本"""
+    plugins = {}
+    for i in range(plugin_count):
+        plugins[f"plugin_{i}"] = {
+            "enabled": i % 2 == 0,
+            "priority": i,
+            "threshold": i * 0.25,
+            "keywords": [f"keyword_{j}" for j in range(8)],
+            "module_levels": [f"module_{j}:WARN" for j in range(4)],
+            "output": {
+                "format": "json",
+                "path": f"/var/log/logloom/plugin_{i}.log",
+                "rotate": {"max_size": 1048576, "backups": 5},
+            },
+            "description": f"Plugin {i} filters 'noisy' records # not a comment",
+        }
+    config = {
+        "logloom": {
+            "language": "en",
+            "log": {"level": "INFO", "file": "logloom.log", "max_size": 1048576, "console": True},
+            "plugin": {
+                "paths": ["./plugins", "/usr/lib/logloom/plugins"],
+                "enabled": list(plugins)[:10],
+                "config": plugins,
+            },
+        }
+    }
+    return yaml.safe_dump(config, sort_keys=False, allow_unicode=True)
+
+
+def load_native_parser():
+    """返回C扩展的parse_config，未构建时返回None"""
+    try:
+        import logloom
+    except ImportError:
+        return None
+    return getattr(getattr(logloom, "_c_module", None), "parse_config", None)
+
+
+def bench(name, func, repeat, expected):
+    """运行func repeat次，打印最短耗时并检查结果"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    status = "OK" if result == expected else "结果不一致"
+    print(f"  {name:<28} {best * 1000:10.2f} ms  {status}")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Logloom 配置解析器基准测试")
+    parser.add_argument("--plugins", type=int, default=1000, help="生成的插件配置段数量")
+    parser.add_argument("--file", help="使用已有的配置文件而不是生成")
+    parser.add_argument("--repeat", type=int, default=3, help="每个解析器的运行次数，取最短耗时")
+    args = parser.parse_args()
+
+    if args.file:
+        with open(args.file, "r", encoding="utf-8") as f:
+            text = f.read()
+    else:
+        text = generate_config(args.plugins)
+
+    with tempfile.NamedTemporaryFile("w", suffix=".yaml", delete=False, encoding="utf-8") as f:
+        f.write(text)
+        path = f.name
+
+    try:
+        print(f"配置大小: {len(text.encode('utf-8')) / 1024:.1f} KiB，{text.count(chr(10))} 行")
+        expected = yaml.safe_load(text)
+
+        baseline = bench("yaml.safe_load", lambda: yaml.safe_load(text), args.repeat, expected)
+        if hasattr(yaml, "CSafeLoader"):
+            bench("yaml.load(CSafeLoader)", lambda: yaml.load(text, Loader=yaml.CSafeLoader),
+                  args.repeat, expected)
+        pure = bench("parse_config_text", lambda: parse_config_text(text), args.repeat, expected)
+        print(f"  纯Python解析器相对safe_load: {baseline / pure:.1f}x")
+
+        native = load_native_parser()
+        if native is None:
+            print("  C扩展未构建，跳过C解析器")
+        else:
+            # C解析器缓存同一文件的解析结果，每次运行前修改mtime使其重新解析
+            def parse_native():
+                os.utime(path, ns=(time.time_ns(), time.time_ns()))
+                return native(path)
+            fast = bench("parse_config (C)", parse_native, args.repeat, expected)
+            print(f"  C解析器相对safe_load: {baseline / fast:.1f}x")
+    finally:
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()